@@ -13,6 +13,9 @@ from .models import (
 from .jobs import (
     AssetGenerator,
     AssetManifest,
+    BatchItemResult,
+    BatchReport,
+    PreviewCandidate,
     otter_player_spec,
     otter_npc_male_spec,
     otter_npc_female_spec,
@@ -20,6 +23,17 @@ from .jobs import (
     cattail_reeds_spec,
     wooden_dock_spec
 )
+from .matrix import SpecMatrix, SpeciesEntry, VariantEntry, MatrixEntry, asset_spec_hash
+from .scoring import PreviewScorer
+from .progress import (
+    ProgressEvent,
+    TaskSubmitted,
+    TaskProgress,
+    StageChanged,
+    ArtifactDownloaded,
+    AssetCompleted,
+    AssetFailed
+)
 
 __all__ = [
     "MeshyClient",
@@ -33,6 +47,22 @@ __all__ = [
     "Image3DRequest",
     "AssetGenerator",
     "AssetManifest",
+    "BatchItemResult",
+    "BatchReport",
+    "PreviewCandidate",
+    "PreviewScorer",
+    "SpecMatrix",
+    "SpeciesEntry",
+    "VariantEntry",
+    "MatrixEntry",
+    "asset_spec_hash",
+    "ProgressEvent",
+    "TaskSubmitted",
+    "TaskProgress",
+    "StageChanged",
+    "ArtifactDownloaded",
+    "AssetCompleted",
+    "AssetFailed",
     "otter_player_spec",
     "otter_npc_male_spec",
     "otter_npc_female_spec",
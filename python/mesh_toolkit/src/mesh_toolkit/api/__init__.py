@@ -1,4 +1,5 @@
 """Low-level HTTP API clients"""
 from .base_client import BaseHttpClient, RateLimitError
+from .rate_limiter import RateLimiter
 
-__all__ = ["BaseHttpClient", "RateLimitError"]
+__all__ = ["BaseHttpClient", "RateLimitError", "RateLimiter"]
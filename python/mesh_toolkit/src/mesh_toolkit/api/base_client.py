@@ -1,9 +1,11 @@
 """Base HTTP client with retry/rate-limit logic"""
 import os
 import time
+import threading
 import httpx
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+from .rate_limiter import RateLimiter
 
 
 class RateLimitError(Exception):
@@ -11,6 +13,14 @@ class RateLimitError(Exception):
     pass
 
 
+_BACKOFF = wait_exponential(multiplier=1, min=2, max=30)
+
+
+def _scaled_backoff(retry_state) -> float:
+    """Exponential backoff, compressed for clients on a simulated clock"""
+    return _BACKOFF(retry_state) / retry_state.args[0].time_scale
+
+
 class BaseHttpClient:
     """Shared HTTP client with rate limiting and retries"""
     
@@ -20,18 +30,35 @@ class BaseHttpClient:
         self,
         api_key: str = None,
         timeout: float = 300.0,
-        min_request_interval: float = 0.5
+        min_request_interval: float = 0.5,
+        rate_limiter: Optional[RateLimiter] = None,
+        transport: Optional[httpx.BaseTransport] = None,
+        time_scale: float = 1.0
     ):
+        """Initialize client
+        
+        Args:
+            api_key: Meshy API key (defaults to MESHY_API_KEY env var)
+            timeout: Request timeout in seconds
+            min_request_interval: Minimum seconds between requests
+            rate_limiter: Optional token bucket shared with other clients
+            transport: httpx transport override, e.g. a simulated backend
+            time_scale: Simulated seconds per real second; request spacing,
+                Retry-After and backoff waits are divided by it
+        """
         self.api_key = api_key or os.getenv("MESHY_API_KEY")
         if not self.api_key:
             raise ValueError("MESHY_API_KEY not set")
         
         self.timeout = timeout
-        self.client = httpx.Client(timeout=timeout)
+        self.time_scale = time_scale
+        self.client = httpx.Client(timeout=timeout, transport=transport)
         
         # Rate limiting state
         self.last_request_time = 0
         self.min_request_interval = min_request_interval
+        self._rate_lock = threading.Lock()
+        self.rate_limiter = rate_limiter
     
     def _headers(self) -> Dict[str, str]:
         return {
@@ -40,17 +67,26 @@ class BaseHttpClient:
         }
     
     def _rate_limit(self):
-        """Simple rate limiting"""
-        now = time.time()
-        time_since_last = now - self.last_request_time
-        if time_since_last < self.min_request_interval:
-            time.sleep(self.min_request_interval - time_since_last)
-        self.last_request_time = time.time()
+        """Space requests at least min_request_interval apart across threads
+        
+        Each caller reserves the next free slot under the lock and sleeps
+        outside it, so concurrent submissions queue up instead of bursting.
+        A shared token bucket (rate_limiter) additionally caps requests per
+        minute across every client using it.
+        """
+        with self._rate_lock:
+            now = time.time()
+            slot = max(now, self.last_request_time + self.min_request_interval / self.time_scale)
+            self.last_request_time = slot
+        if slot > now:
+            time.sleep(slot - now)
+        if self.rate_limiter:
+            self.rate_limiter.acquire()
     
     @retry(
         retry=retry_if_exception_type((RateLimitError, httpx.TimeoutException)),
         stop=stop_after_attempt(5),
-        wait=wait_exponential(multiplier=1, min=2, max=30)
+        wait=_scaled_backoff
     )
     def request(
         self,
@@ -75,10 +111,10 @@ class BaseHttpClient:
             retry_after = response.headers.get("retry-after", "5")
             try:
                 wait_seconds = float(retry_after)
-                # Sleep for Retry-After duration before raising
-                time.sleep(wait_seconds)
             except ValueError:
-                time.sleep(5)  # Default to 5s if header invalid
+                wait_seconds = 5.0  # Default to 5s if header invalid
+            # Sleep for Retry-After duration before raising
+            time.sleep(wait_seconds / self.time_scale)
             raise RateLimitError(f"Rate limit exceeded, waited {retry_after}s")
         
         # Retry on 5xx errors
@@ -0,0 +1,80 @@
+"""Token bucket rate limiter shared by API callers"""
+import threading
+import time
+from typing import Callable, Optional
+
+
+class RateLimiter:
+    """Token bucket rate limiter
+    
+    Tokens refill continuously at requests_per_minute / 60 per second up to
+    `burst`. acquire() takes one token, blocking until one is available.
+    """
+    
+    def __init__(
+        self,
+        requests_per_minute: float = 100,
+        burst: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        """Initialize limiter
+        
+        Args:
+            requests_per_minute: Sustained request rate
+            burst: Bucket size (default: one second's worth, at least 1)
+            clock: Monotonic time source
+            sleep: Sleep function (injectable for tests and simulations)
+        """
+        if requests_per_minute <= 0:
+            raise ValueError("requests_per_minute must be positive")
+        
+        self.rate = requests_per_minute / 60.0
+        self.capacity = burst if burst is not None else max(1.0, self.rate)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+    
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+    
+    def try_acquire(self) -> bool:
+        """Take a token if one is available right now"""
+        with self._lock:
+            self._refill(self._clock())
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+    
+    def time_until_available(self) -> float:
+        """Seconds until a token can be taken (0 if one is available)"""
+        with self._lock:
+            self._refill(self._clock())
+            return max(0.0, (1 - self._tokens) / self.rate)
+    
+    def acquire(self, timeout: Optional[float] = None) -> None:
+        """Block until a token is available
+        
+        Args:
+            timeout: Maximum seconds to wait (None = wait indefinitely)
+        
+        Raises:
+            TimeoutError: If no token became available within timeout
+        """
+        deadline = None if timeout is None else self._clock() + timeout
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            
+            if deadline is not None and now + wait > deadline:
+                raise TimeoutError(f"No request token available within {timeout}s")
+            self._sleep(wait)
@@ -2,7 +2,8 @@
 import os
 import time
 import asyncio
-from typing import Optional, Dict, Any, Union
+import threading
+from typing import Optional, Dict, Any, Union, AsyncIterator
 import httpx
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
@@ -22,6 +23,14 @@ class RateLimitError(Exception):
     pass
 
 
+_BACKOFF = wait_exponential(multiplier=1, min=2, max=10)
+
+
+def _scaled_backoff(retry_state) -> float:
+    """Exponential backoff, compressed for clients on a simulated clock"""
+    return _BACKOFF(retry_state) / retry_state.args[0].time_scale
+
+
 class MeshyClient:
     """Client for Meshy API with rate limiting and retries"""
     
@@ -32,20 +41,33 @@ class MeshyClient:
         self,
         api_key: Optional[str] = None,
         timeout: float = 300.0,
-        max_retries: int = 3
+        max_retries: int = 3,
+        transport: Optional[httpx.BaseTransport] = None,
+        time_scale: float = 1.0
     ):
+        """Initialize client
+        
+        Args:
+            api_key: Meshy API key (defaults to MESHY_API_KEY env var)
+            timeout: Request timeout in seconds
+            max_retries: Retry attempts for failed requests
+            transport: httpx transport override, e.g. a simulated backend
+            time_scale: Simulated seconds per real second; request spacing
+                and retry backoff are divided by it
+        """
         self.api_key = api_key or os.getenv("MESHY_API_KEY")
         if not self.api_key:
             raise ValueError("MESHY_API_KEY not set")
         
         self.timeout = timeout
         self.max_retries = max_retries
-        self.client = httpx.Client(timeout=timeout)
-        self.async_client = httpx.AsyncClient(timeout=timeout)
+        self.time_scale = time_scale
+        self.client = httpx.Client(timeout=timeout, transport=transport)
         
-        # Rate limiting state
+        # Rate limiting state (shared by all threads using this client)
         self.last_request_time = 0
         self.min_request_interval = 0.5  # 500ms between requests
+        self._rate_lock = threading.Lock()
     
     def _headers(self) -> Dict[str, str]:
         return {
@@ -54,17 +76,22 @@ class MeshyClient:
         }
     
     def _rate_limit(self):
-        """Simple rate limiting"""
-        now = time.time()
-        time_since_last = now - self.last_request_time
-        if time_since_last < self.min_request_interval:
-            time.sleep(self.min_request_interval - time_since_last)
-        self.last_request_time = time.time()
+        """Space requests at least min_request_interval apart across threads
+        
+        Each caller reserves the next free slot under the lock and sleeps
+        outside it, so concurrent callers queue up instead of bursting.
+        """
+        with self._rate_lock:
+            now = time.time()
+            slot = max(now, self.last_request_time + self.min_request_interval / self.time_scale)
+            self.last_request_time = slot
+        if slot > now:
+            time.sleep(slot - now)
     
     @retry(
         retry=retry_if_exception_type((httpx.HTTPStatusError, httpx.TimeoutException, RateLimitError)),
         stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10)
+        wait=_scaled_backoff
     )
     def _request(
         self,
@@ -109,6 +136,20 @@ class MeshyClient:
         data = response.json()
         return data.get("result")
     
+    def refine_text_to_3d(self, preview_task_id: str, enable_pbr: bool = True) -> str:
+        """Create a refine task for a finished preview. Returns task_id"""
+        response = self._request(
+            "POST",
+            "text-to-3d",
+            json={
+                "mode": "refine",
+                "preview_task_id": preview_task_id,
+                "enable_pbr": enable_pbr
+            }
+        )
+        data = response.json()
+        return data.get("result")
+    
     def get_text_to_3d(self, task_id: str) -> Text3DResult:
         """Get text-to-3D task status"""
         response = self._request("GET", f"text-to-3d/{task_id}")
@@ -223,16 +264,7 @@ class MeshyClient:
     
     # Polling helpers
     
-    def poll_until_complete(
-        self,
-        task_id: str,
-        task_type: str = "text-to-3d",
-        poll_interval: float = 5.0,
-        max_wait: float = 600.0
-    ) -> Union[Text3DResult, TextTextureResult, Image3DResult, RiggingResult, AnimationResult, RetextureResult]:
-        """Poll task until complete or timeout"""
-        start_time = time.time()
-        
+    def _get_func(self, task_type: str):
         get_func = {
             "text-to-3d": self.get_text_to_3d,
             "text-to-texture": self.get_text_to_texture,
@@ -244,6 +276,18 @@ class MeshyClient:
         
         if not get_func:
             raise ValueError(f"Unknown task type: {task_type}")
+        return get_func
+    
+    def poll_until_complete(
+        self,
+        task_id: str,
+        task_type: str = "text-to-3d",
+        poll_interval: float = 5.0,
+        max_wait: float = 600.0
+    ) -> Union[Text3DResult, TextTextureResult, Image3DResult, RiggingResult, AnimationResult, RetextureResult]:
+        """Poll task until complete or timeout"""
+        start_time = time.time()
+        get_func = self._get_func(task_type)
         
         while True:
             result = get_func(task_id)
@@ -263,6 +307,38 @@ class MeshyClient:
             
             time.sleep(poll_interval)
     
+    async def watch_task(
+        self,
+        task_id: str,
+        task_type: str = "text-to-3d",
+        poll_interval: float = 5.0,
+        max_wait: float = 600.0
+    ) -> AsyncIterator[Union[Text3DResult, TextTextureResult, Image3DResult, RiggingResult, AnimationResult, RetextureResult]]:
+        """Async counterpart of poll_until_complete yielding every polled status
+        
+        Each request runs in a worker thread, but the wait between polls is
+        an asyncio sleep, so many tasks can be watched from one event loop.
+        The last result yielded has a terminal status; unlike
+        poll_until_complete, failures are yielded rather than raised.
+        
+        Raises:
+            TimeoutError: If the task is still running after max_wait
+        """
+        start_time = time.time()
+        get_func = self._get_func(task_type)
+        
+        while True:
+            result = await asyncio.to_thread(get_func, task_id)
+            yield result
+            
+            if result.status in (TaskStatus.SUCCEEDED, TaskStatus.FAILED, TaskStatus.EXPIRED):
+                return
+            
+            if time.time() - start_time > max_wait:
+                raise TimeoutError(f"Task timed out after {max_wait}s")
+            
+            await asyncio.sleep(poll_interval)
+    
     def download_file(self, url: str, output_path: str) -> int:
         """Download file from URL. Returns file size in bytes"""
         response = httpx.get(url)
@@ -275,9 +351,8 @@ class MeshyClient:
         return len(response.content)
     
     def close(self):
-        """Close HTTP clients"""
+        """Close HTTP client"""
         self.client.close()
-        self.async_client.close()
     
     def __enter__(self):
         return self
@@ -1,9 +1,13 @@
 """High-level job orchestration for game asset generation"""
 import json
+import time
+import asyncio
 import hashlib
+import itertools
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait as wait_futures
 from pathlib import Path
-from typing import List, Dict, Any, Optional
-from dataclasses import dataclass, asdict
+from typing import List, Dict, Any, Optional, Callable, Tuple, AsyncIterator, Iterable
+from dataclasses import dataclass, asdict, field
 
 from .client import MeshyClient
 from .models import (
@@ -13,8 +17,25 @@ from .models import (
     ArtStyle,
     AssetIntent,
     Text3DResult,
-    TextTextureResult
+    TextTextureResult,
+    TaskStatus
 )
+from .matrix import asset_spec_hash
+from .processing.glb import GlbError, inspect_glb
+from .scoring import PreviewScorer
+from .progress import (
+    ProgressEvent,
+    TaskSubmitted,
+    TaskProgress,
+    StageChanged,
+    ArtifactDownloaded,
+    AssetCompleted,
+    AssetFailed
+)
+
+
+# Local status for previews abandoned once a winner was picked
+CANCELED = "CANCELED"
 
 
 @dataclass
@@ -31,6 +52,9 @@ class AssetManifest:
     polycount_target: Optional[int] = None
     polycount_estimate: Optional[int] = None
     metadata: Dict[str, Any] = None
+    spec_hash: Optional[str] = None  # asset_spec_hash of the generating spec
+    texture_lods: Optional[Dict[str, List[str]]] = None  # map type -> path per LOD (processing.textures)
+    atlas: Optional[Dict[str, Any]] = None  # atlas textures and UV offset/scale (processing.textures)
     
     def __post_init__(self):
         if self.metadata is None:
@@ -40,6 +64,67 @@ class AssetManifest:
         return asdict(self)
 
 
+@dataclass
+class BatchItemResult:
+    """Outcome of one spec in a batch"""
+    index: int
+    asset_id: str
+    intent: str
+    succeeded: bool
+    manifest: Optional[AssetManifest] = None
+    error: Optional[str] = None
+    duration_seconds: float = 0.0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["manifest"] = self.manifest.to_dict() if self.manifest else None
+        return data
+
+
+@dataclass
+class BatchReport:
+    """Structured result of AssetGenerator.batch_generate"""
+    results: List[BatchItemResult] = field(default_factory=list)
+    max_concurrent: int = 1
+    wall_seconds: float = 0.0
+    
+    @property
+    def succeeded(self) -> List[BatchItemResult]:
+        return [r for r in self.results if r.succeeded]
+    
+    @property
+    def failed(self) -> List[BatchItemResult]:
+        return [r for r in self.results if not r.succeeded]
+    
+    @property
+    def manifests(self) -> List[AssetManifest]:
+        """Manifests of successful assets, in spec order"""
+        return [r.manifest for r in self.succeeded]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total": len(self.results),
+            "succeeded": len(self.succeeded),
+            "failed": len(self.failed),
+            "max_concurrent": self.max_concurrent,
+            "wall_seconds": self.wall_seconds,
+            "results": [r.to_dict() for r in self.results],
+        }
+
+
+@dataclass
+class PreviewCandidate:
+    """One seeded preview in a best-of-N generation"""
+    seed: int
+    task_id: str
+    status: str = TaskStatus.PENDING.value
+    score: Optional[float] = None
+    error: Optional[str] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
 class AssetGenerator:
     """Orchestrates asset generation for game needs"""
     
@@ -64,39 +149,43 @@ class AssetGenerator:
         desc_hash = hashlib.md5(spec.description.encode()).hexdigest()[:8]
         return f"{spec.intent.value}_{desc_hash}"
     
-    def generate_model(
-        self,
-        spec: GameAssetSpec,
-        wait: bool = True,
-        poll_interval: float = 5.0
-    ) -> AssetManifest:
-        """Generate 3D model from spec"""
-        
-        # Generate unique asset ID
-        asset_id = self._generate_asset_id(spec)
-        
-        # Build request
-        request = Text3DRequest(
-            mode="preview",  # Use "refine" for higher quality
+    def _preview_request(self, spec: GameAssetSpec, seed: Optional[int] = None) -> Text3DRequest:
+        return Text3DRequest(
+            mode="preview",
             prompt=spec.description,
             art_style=spec.art_style,
             negative_prompt="low quality, blurry, distorted, extra limbs, bad topology",
             target_polycount=spec.target_polycount,
-            enable_pbr=spec.enable_pbr
+            enable_pbr=spec.enable_pbr,
+            seed=seed
         )
-        
-        # Create task
-        task_id = self.client.create_text_to_3d(request)
-        
-        manifest = AssetManifest(
+    
+    def _new_manifest(self, spec: GameAssetSpec, asset_id: str, task_id: str) -> AssetManifest:
+        return AssetManifest(
             asset_id=asset_id,
             intent=spec.intent.value,
             description=spec.description,
             art_style=spec.art_style.value,
             task_id=task_id,
             polycount_target=spec.target_polycount,
-            metadata=spec.metadata.copy()
+            metadata=spec.metadata.copy(),
+            spec_hash=asset_spec_hash(spec)
         )
+    
+    def generate_model(
+        self,
+        spec: GameAssetSpec,
+        wait: bool = True,
+        poll_interval: float = 5.0
+    ) -> AssetManifest:
+        """Generate 3D model from spec"""
+        
+        # Generate unique asset ID
+        asset_id = self._generate_asset_id(spec)
+        
+        # Create task (use generate_best_of for refined output)
+        task_id = self.client.create_text_to_3d(self._preview_request(spec))
+        manifest = self._new_manifest(spec, asset_id, task_id)
         
         if not wait:
             return manifest
@@ -108,39 +197,265 @@ class AssetGenerator:
             poll_interval=poll_interval
         )
         
-        # Download assets
+        self._save_outputs(result, spec, manifest)
+        
+        return manifest
+    
+    def _output_files(
+        self,
+        result: Text3DResult,
+        spec: GameAssetSpec,
+        manifest: AssetManifest
+    ) -> List[Tuple[str, str, Path]]:
+        """(artifact, url, local path) for each file of a finished task"""
         output_dir = self.output_root / spec.output_path
-        output_dir.mkdir(parents=True, exist_ok=True)
+        files = []
         
         if result.model_urls and result.model_urls.glb:
-            glb_path = output_dir / f"{asset_id}.glb"
-            self.client.download_file(result.model_urls.glb, str(glb_path))
-            manifest.model_path = str(glb_path.relative_to(self.output_root))
+            files.append(("model", result.model_urls.glb, output_dir / f"{manifest.asset_id}.glb"))
         
         if result.texture_urls and len(result.texture_urls) > 0:
             textures = result.texture_urls[0]
-            texture_paths = {}
-            
             for map_type, url in textures.model_dump(exclude_none=True).items():
                 if url:
-                    tex_path = output_dir / f"{asset_id}_{map_type}.png"
-                    self.client.download_file(url, str(tex_path))
-                    texture_paths[map_type] = str(tex_path.relative_to(self.output_root))
-            
-            manifest.texture_paths = texture_paths
+                    files.append((f"texture:{map_type}", url, output_dir / f"{manifest.asset_id}_{map_type}.png"))
         
         if result.thumbnail_url:
-            thumb_path = output_dir / f"{asset_id}_thumb.png"
-            self.client.download_file(result.thumbnail_url, str(thumb_path))
-            manifest.thumbnail_path = str(thumb_path.relative_to(self.output_root))
+            files.append(("thumbnail", result.thumbnail_url, output_dir / f"{manifest.asset_id}_thumb.png"))
         
-        # Save manifest
-        manifest_path = output_dir / f"{asset_id}_manifest.json"
+        return files
+    
+    def _record_output(self, manifest: AssetManifest, artifact: str, path: Path) -> None:
+        relative = str(path.relative_to(self.output_root))
+        if artifact == "model":
+            manifest.model_path = relative
+            try:
+                manifest.polycount_estimate = inspect_glb(path).triangle_count
+            except (GlbError, OSError) as e:
+                print(f"⚠️  Could not inspect {path.name}: {e}")
+        elif artifact == "thumbnail":
+            manifest.thumbnail_path = relative
+        else:
+            map_type = artifact.split(":", 1)[1]
+            manifest.texture_paths = {**(manifest.texture_paths or {}), map_type: relative}
+    
+    def _write_manifest(self, spec: GameAssetSpec, manifest: AssetManifest) -> None:
+        output_dir = self.output_root / spec.output_path
+        output_dir.mkdir(parents=True, exist_ok=True)
+        manifest_path = output_dir / f"{manifest.asset_id}_manifest.json"
         with open(manifest_path, 'w') as f:
             json.dump(manifest.to_dict(), f, indent=2)
         
+    def _save_outputs(self, result: Text3DResult, spec: GameAssetSpec, manifest: AssetManifest) -> None:
+        """Download a finished task's files and write the asset manifest"""
+        for artifact, url, path in self._output_files(result, spec, manifest):
+            self.client.download_file(url, str(path))
+            self._record_output(manifest, artifact, path)
+        self._write_manifest(spec, manifest)
+    
+    def generate_best_of(
+        self,
+        spec: GameAssetSpec,
+        n: int = 4,
+        seeds: Optional[List[int]] = None,
+        scorer: Optional[Callable[[Text3DResult, GameAssetSpec], float]] = None,
+        accept_score: Optional[float] = None,
+        refine: bool = True,
+        poll_interval: float = 5.0,
+        max_wait: float = 600.0
+    ) -> AssetManifest:
+        """Generate N preview seeds and refine only the best one
+        
+        Previews are scored as they complete. As soon as one reaches
+        accept_score the others are marked CANCELED and no longer polled;
+        otherwise all previews are awaited and the highest score wins.
+        Refine is the expensive step, so it is spent on the winner only.
+        
+        Args:
+            spec: Asset spec
+            n: Number of previews (ignored if seeds is given)
+            seeds: Explicit preview seeds (default: 1..n)
+            scorer: Callable scoring a finished preview (default: PreviewScorer)
+            accept_score: Score at which to stop waiting for other previews
+            refine: Refine the winner (False keeps the winning preview)
+            poll_interval: Seconds between status polls
+            max_wait: Seconds to wait for previews and for the refine
+        
+        Returns:
+            AssetManifest of the refined winner; metadata["candidates"]
+            records every preview's seed, task, status and score
+        
+        Raises:
+            RuntimeError: If no preview succeeded
+        """
+        asset_id = self._generate_asset_id(spec)
+        scorer = scorer or PreviewScorer()
+        seeds = seeds or list(range(1, n + 1))
+        
+        candidates = [
+            PreviewCandidate(seed=seed, task_id=self.client.create_text_to_3d(self._preview_request(spec, seed)))
+            for seed in seeds
+        ]
+        winner, result = self._select_preview(candidates, spec, scorer, accept_score, poll_interval, max_wait)
+        
+        task_id = winner.task_id
+        if refine:
+            task_id = self.client.refine_text_to_3d(winner.task_id, enable_pbr=spec.enable_pbr)
+            result = self.client.poll_until_complete(
+                task_id,
+                task_type="text-to-3d",
+                poll_interval=poll_interval,
+                max_wait=max_wait
+            )
+        
+        manifest = self._new_manifest(spec, asset_id, task_id)
+        manifest.metadata["preview_task_id"] = winner.task_id
+        manifest.metadata["candidates"] = [c.to_dict() for c in candidates]
+        self._save_outputs(result, spec, manifest)
         return manifest
     
+    def _select_preview(
+        self,
+        candidates: List["PreviewCandidate"],
+        spec: GameAssetSpec,
+        scorer: Callable[[Text3DResult, GameAssetSpec], float],
+        accept_score: Optional[float],
+        poll_interval: float,
+        max_wait: float
+    ) -> Tuple["PreviewCandidate", Text3DResult]:
+        """Poll and score previews until one is good enough or all are done"""
+        deadline = time.time() + max_wait
+        results: Dict[str, Text3DResult] = {}
+        
+        while True:
+            for candidate in candidates:
+                if candidate.status != TaskStatus.PENDING.value:
+                    continue
+                result = self.client.get_text_to_3d(candidate.task_id)
+                if result.status == TaskStatus.SUCCEEDED:
+                    candidate.status = result.status.value
+                    results[candidate.task_id] = result
+                    try:
+                        candidate.score = scorer(result, spec)
+                    except Exception as e:
+                        candidate.score = 0.0
+                        candidate.error = f"Scoring failed: {e}"
+                elif result.status in (TaskStatus.FAILED, TaskStatus.EXPIRED):
+                    candidate.status = result.status.value
+                    candidate.error = result.error
+            
+            scored = [c for c in candidates if c.score is not None]
+            best = max(scored, key=lambda c: c.score, default=None)
+            pending = [c for c in candidates if c.status == TaskStatus.PENDING.value]
+            
+            if not pending or (best and accept_score is not None and best.score >= accept_score):
+                break
+            if time.time() > deadline:
+                if best is None:
+                    raise TimeoutError(f"No preview finished within {max_wait}s")
+                break
+            time.sleep(poll_interval)
+        
+        # Stop tracking the losers still in flight
+        for candidate in pending:
+            candidate.status = CANCELED
+        
+        if best is None:
+            errors = "; ".join(f"seed {c.seed}: {c.error}" for c in candidates)
+            raise RuntimeError(f"All {len(candidates)} previews failed ({errors})")
+        
+        print(f"🏆 Preview seed {best.seed} won with score {best.score:.2f} "
+              f"({len(scored)}/{len(candidates)} scored)")
+        return best, results[best.task_id]
+    
+    async def stream_model(
+        self,
+        spec: GameAssetSpec,
+        poll_interval: float = 5.0,
+        max_wait: float = 600.0
+    ) -> AsyncIterator[ProgressEvent]:
+        """Generate a model like generate_model, yielding progress events
+        
+        Yields TaskSubmitted, then StageChanged/TaskProgress as Meshy reports
+        them, one ArtifactDownloaded per saved file and finally
+        AssetCompleted. Errors end the stream with AssetFailed instead of
+        raising, so one asset cannot break a consumer's loop.
+        
+        Example:
+            async for event in generator.stream_model(spec):
+                print(event.kind, event.to_dict())
+        """
+        asset_id = self._generate_asset_id(spec)
+        task_id = None
+        try:
+            task_id = await asyncio.to_thread(self.client.create_text_to_3d, self._preview_request(spec))
+            manifest = self._new_manifest(spec, asset_id, task_id)
+            yield TaskSubmitted(asset_id=asset_id, task_id=task_id)
+            
+            status = None
+            percent = None
+            result = None
+            async for result in self.client.watch_task(task_id, poll_interval=poll_interval, max_wait=max_wait):
+                if result.status.value != status:
+                    yield StageChanged(asset_id=asset_id, task_id=task_id, status=result.status.value, previous=status)
+                    status = result.status.value
+                if result.progress != percent:
+                    yield TaskProgress(asset_id=asset_id, task_id=task_id, percent=result.progress)
+                    percent = result.progress
+            
+            if result.status != TaskStatus.SUCCEEDED:
+                yield AssetFailed(asset_id=asset_id, task_id=task_id, error=result.error or f"Task {status.lower()}")
+                return
+            
+            for artifact, url, path in self._output_files(result, spec, manifest):
+                size = await asyncio.to_thread(self.client.download_file, url, str(path))
+                self._record_output(manifest, artifact, path)
+                yield ArtifactDownloaded(asset_id=asset_id, task_id=task_id, artifact=artifact,
+                                         path=str(path), size_bytes=size)
+            
+            self._write_manifest(spec, manifest)
+            yield AssetCompleted(asset_id=asset_id, task_id=task_id, manifest=manifest)
+        except Exception as e:
+            yield AssetFailed(asset_id=asset_id, task_id=task_id, error=str(e))
+    
+    async def stream_batch(
+        self,
+        specs: Iterable[GameAssetSpec],
+        max_concurrent: int = 3,
+        poll_interval: float = 5.0,
+        max_wait: float = 600.0
+    ) -> AsyncIterator[ProgressEvent]:
+        """Stream events for many assets, interleaved as they happen
+        
+        Up to max_concurrent assets are generated at once. Every asset ends
+        with either AssetCompleted or AssetFailed; the stream ends when all
+        of them have.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        semaphore = asyncio.Semaphore(max(1, max_concurrent))
+        done = object()
+        
+        async def run(spec: GameAssetSpec) -> None:
+            try:
+                async with semaphore:
+                    async for event in self.stream_model(spec, poll_interval=poll_interval, max_wait=max_wait):
+                        queue.put_nowait(event)
+            finally:
+                queue.put_nowait(done)
+        
+        tasks = [asyncio.create_task(run(spec)) for spec in specs]
+        remaining = len(tasks)
+        try:
+            while remaining:
+                event = await queue.get()
+                if event is done:
+                    remaining -= 1
+                    continue
+                yield event
+        finally:
+            for task in tasks:
+                task.cancel()
+    
     def retexture_model(
         self,
         model_path: str,
@@ -158,21 +473,82 @@ class AssetGenerator:
     
     def batch_generate(
         self,
-        specs: List[GameAssetSpec],
-        max_concurrent: int = 3
-    ) -> List[AssetManifest]:
-        """Generate multiple assets (respecting rate limits)"""
-        manifests = []
+        specs: Iterable[GameAssetSpec],
+        max_concurrent: int = 3,
+        poll_interval: float = 5.0,
+        best_of: int = 1
+    ) -> BatchReport:
+        """Generate multiple assets concurrently
         
-        for spec in specs:
+        Up to max_concurrent assets are created, polled and downloaded at
+        once. All workers share this generator's client, so its rate limit
+        applies to the batch as a whole. A failing asset is recorded in the
+        report and does not affect the others.
+        
+        Specs are pulled from the iterable only as workers free up, so a
+        lazy source such as SpecMatrix.specs() is never expanded in full.
+        
+        Args:
+            specs: Asset specs to generate
+            max_concurrent: Maximum assets in flight
+            poll_interval: Seconds between status polls per asset
+            best_of: Previews per asset; above 1 each asset goes through
+                generate_best_of and only the winner is refined
+        
+        Returns:
+            BatchReport with one result per spec, in spec order
+        """
+        start = time.time()
+        
+        def run(index: int, spec: GameAssetSpec) -> BatchItemResult:
+            item_start = time.time()
+            asset_id = self._generate_asset_id(spec)
             try:
-                manifest = self.generate_model(spec, wait=True)
-                manifests.append(manifest)
-                print(f"✓ Generated: {spec.intent.value}")
+                if best_of > 1:
+                    manifest = self.generate_best_of(spec, n=best_of, poll_interval=poll_interval)
+                else:
+                    manifest = self.generate_model(spec, wait=True, poll_interval=poll_interval)
+                return BatchItemResult(
+                    index=index,
+                    asset_id=asset_id,
+                    intent=spec.intent.value,
+                    succeeded=True,
+                    manifest=manifest,
+                    duration_seconds=time.time() - item_start
+                )
             except Exception as e:
-                print(f"✗ Failed {spec.intent.value}: {e}")
+                return BatchItemResult(
+                    index=index,
+                    asset_id=asset_id,
+                    intent=spec.intent.value,
+                    succeeded=False,
+                    error=str(e),
+                    duration_seconds=time.time() - item_start
+                )
+        
+        workers = max(1, max_concurrent)
+        pending_specs = enumerate(specs)
+        results: List[BatchItemResult] = []
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(run, i, spec) for i, spec in itertools.islice(pending_specs, workers)}
+            while futures:
+                finished, futures = wait_futures(futures, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    result = future.result()
+                    results.append(result)
+                    if result.succeeded:
+                        print(f"✓ Generated: {result.asset_id} ({result.duration_seconds:.0f}s)")
+                    else:
+                        print(f"✗ Failed {result.asset_id}: {result.error}")
+                    for i, spec in itertools.islice(pending_specs, 1):
+                        futures.add(pool.submit(run, i, spec))
         
-        return manifests
+        results.sort(key=lambda r: r.index)
+        return BatchReport(
+            results=results,
+            max_concurrent=max_concurrent,
+            wall_seconds=time.time() - start
+        )
 
 
 # Preset specs for common game assets
@@ -0,0 +1,311 @@
+"""Declarative species x intent x style x variant spec matrix
+
+Instead of one preset function per asset, a SpecMatrix lists species,
+variants and styles once and expands their product into GameAssetSpecs:
+    
+    matrix = SpecMatrix(
+        species=[
+            SpeciesEntry("otter", "River otter with brown fur and white belly",
+                         intents=[AssetIntent.PLAYER_CHARACTER, AssetIntent.NPC_CHARACTER]),
+            SpeciesEntry("bass", "Largemouth bass, green and silver scales",
+                         intents=[AssetIntent.CREATURE_PREY]),
+        ],
+        variants=[VariantEntry("base"), VariantEntry("winter", "thick winter coat")],
+        styles=[ArtStyle.REALISTIC],
+        defaults={"target_polycount": 12000},
+    )
+    generator.batch_generate(matrix.specs(changed_only=True, output_root="client/public"))
+
+Expansion is lazy, asset ids are derived from the combination and every
+spec carries a stable spec hash. AssetGenerator stores that hash in the
+asset manifest, so changed_only skips combinations whose manifest already
+has a model generated from an identical spec.
+"""
+import itertools
+import json
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+from .models import ArtStyle, AssetIntent, GameAssetSpec
+from .persistence.utils import compute_spec_hash
+from .workflows.pipeline import AssetPipelineSpec
+
+# Where each intent's assets live under the output root
+INTENT_OUTPUT_PATHS: Dict[AssetIntent, str] = {
+    AssetIntent.PLAYER_CHARACTER: "models/characters",
+    AssetIntent.NPC_CHARACTER: "models/characters",
+    AssetIntent.CREATURE_PREDATOR: "models/creatures",
+    AssetIntent.CREATURE_PREY: "models/creatures",
+    AssetIntent.PROP_INTERACTABLE: "models/props",
+    AssetIntent.PROP_DECORATION: "models/props",
+    AssetIntent.TERRAIN_ELEMENT: "models/terrain",
+    AssetIntent.TEXTURE_TERRAIN: "textures/terrain",
+    AssetIntent.TEXTURE_MATERIAL: "textures/materials",
+}
+
+# Intents whose models get rigged and animated in pipeline_specs
+RIGGED_INTENTS = {
+    AssetIntent.PLAYER_CHARACTER,
+    AssetIntent.NPC_CHARACTER,
+    AssetIntent.CREATURE_PREDATOR,
+    AssetIntent.CREATURE_PREY,
+}
+
+# Spec fields owned by the matrix axes; overrides may not set them
+_AXIS_FIELDS = {"intent", "art_style", "asset_id"}
+
+
+def asset_spec_hash(spec: GameAssetSpec) -> str:
+    """Stable hash of everything that affects a generated asset"""
+    return compute_spec_hash(spec.model_dump(mode="json"))
+
+
+def _slug(value: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", value.lower()).strip("_")
+
+
+@dataclass
+class SpeciesEntry:
+    """One species row of the matrix"""
+    name: str
+    description: str
+    intents: List[AssetIntent] = field(default_factory=lambda: [AssetIntent.PROP_DECORATION])
+    variants: Optional[List[str]] = None  # restrict to these variant names
+    overrides: Dict[str, Any] = field(default_factory=dict)  # GameAssetSpec fields
+    
+    def __post_init__(self):
+        self.intents = [AssetIntent(intent) for intent in self.intents]
+
+
+@dataclass
+class VariantEntry:
+    """A prompt variation applied to every species"""
+    name: str
+    prompt: str = ""
+    overrides: Dict[str, Any] = field(default_factory=dict)  # GameAssetSpec fields
+
+
+@dataclass
+class MatrixEntry:
+    """One expanded combination"""
+    species: str
+    intent: AssetIntent
+    style: ArtStyle
+    variant: str
+    spec: GameAssetSpec
+    spec_hash: str
+    
+    @property
+    def asset_id(self) -> str:
+        return self.spec.asset_id
+    
+    def manifest_path(self, output_root: Union[str, Path]) -> Path:
+        """Where AssetGenerator writes this entry's manifest"""
+        return Path(output_root) / self.spec.output_path / f"{self.asset_id}_manifest.json"
+    
+    def is_current(self, output_root: Union[str, Path]) -> bool:
+        """True if a model generated from this exact spec already exists"""
+        path = self.manifest_path(output_root)
+        if not path.exists():
+            return False
+        with open(path) as f:
+            manifest = json.load(f)
+        return bool(manifest.get("model_path")) and manifest.get("spec_hash") == self.spec_hash
+
+
+class SpecMatrix:
+    """Lazy expansion of species x intent x style x variant into asset specs
+    
+    Spec fields are resolved from, lowest precedence first: the intent's
+    output path, `defaults`, `intent_defaults[intent]`, the species'
+    overrides and the variant's overrides. The prompt is the species
+    description followed by the variant prompt and `prompt_suffix`.
+    """
+    
+    def __init__(
+        self,
+        species: List[SpeciesEntry],
+        variants: Optional[List[VariantEntry]] = None,
+        styles: Optional[List[ArtStyle]] = None,
+        defaults: Optional[Dict[str, Any]] = None,
+        intent_defaults: Optional[Dict[AssetIntent, Dict[str, Any]]] = None,
+        prompt_suffix: str = "game-ready low-poly"
+    ):
+        """Initialize matrix
+        
+        Args:
+            species: Species rows
+            variants: Prompt variants (default: a single "base" variant)
+            styles: Art styles (default: realistic)
+            defaults: GameAssetSpec fields shared by every entry
+            intent_defaults: GameAssetSpec fields per intent
+            prompt_suffix: Appended to every prompt
+        """
+        self.species = species
+        self.variants = variants or [VariantEntry("base")]
+        self.styles = [ArtStyle(style) for style in (styles or [ArtStyle.REALISTIC])]
+        self.defaults = defaults or {}
+        self.intent_defaults = {AssetIntent(k): v for k, v in (intent_defaults or {}).items()}
+        self.prompt_suffix = prompt_suffix
+        
+        names = [variant.name for variant in self.variants]
+        if len(set(names)) != len(names):
+            raise ValueError("Variant names must be unique")
+        for entry in species:
+            unknown = set(entry.variants or []) - set(names)
+            if unknown:
+                raise ValueError(f"Species {entry.name} references unknown variants: {sorted(unknown)}")
+        for overrides in [self.defaults, *self.intent_defaults.values(),
+                          *(s.overrides for s in species), *(v.overrides for v in self.variants)]:
+            if _AXIS_FIELDS & overrides.keys():
+                raise ValueError(f"Overrides may not set {sorted(_AXIS_FIELDS & overrides.keys())}")
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SpecMatrix":
+        """Build a matrix from its JSON form
+        
+        {"species": [{"name": ..., "description": ..., "intents": [...]}],
+         "variants": [{"name": ..., "prompt": ...}], "styles": [...],
+         "defaults": {...}, "intent_defaults": {"npc_character": {...}},
+         "prompt_suffix": "..."}
+        """
+        return cls(
+            species=[SpeciesEntry(**item) for item in data["species"]],
+            variants=[VariantEntry(**item) for item in data.get("variants", [])] or None,
+            styles=data.get("styles"),
+            defaults=data.get("defaults"),
+            intent_defaults=data.get("intent_defaults"),
+            prompt_suffix=data.get("prompt_suffix", "game-ready low-poly")
+        )
+    
+    @classmethod
+    def from_file(cls, path: Union[str, Path]) -> "SpecMatrix":
+        """Load a matrix from a JSON file"""
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+    
+    def __len__(self) -> int:
+        return sum(
+            len(entry.intents) * len(self.styles) * len(self._variants_for(entry))
+            for entry in self.species
+        )
+    
+    def __iter__(self) -> Iterator[MatrixEntry]:
+        return self.entries()
+    
+    def _variants_for(self, entry: SpeciesEntry) -> List[VariantEntry]:
+        if entry.variants is None:
+            return self.variants
+        return [variant for variant in self.variants if variant.name in entry.variants]
+    
+    def entries(
+        self,
+        species: Optional[str] = None,
+        intent: Optional[AssetIntent] = None,
+        style: Optional[ArtStyle] = None,
+        variant: Optional[str] = None
+    ) -> Iterator[MatrixEntry]:
+        """Expand combinations one at a time, optionally filtered by axis"""
+        for entry in self.species:
+            if species and entry.name != species:
+                continue
+            combos = itertools.product(entry.intents, self.styles, self._variants_for(entry))
+            for entry_intent, entry_style, entry_variant in combos:
+                if intent and entry_intent != AssetIntent(intent):
+                    continue
+                if style and entry_style != ArtStyle(style):
+                    continue
+                if variant and entry_variant.name != variant:
+                    continue
+                yield self._expand(entry, entry_intent, entry_style, entry_variant)
+    
+    def _expand(
+        self,
+        entry: SpeciesEntry,
+        intent: AssetIntent,
+        style: ArtStyle,
+        variant: VariantEntry
+    ) -> MatrixEntry:
+        fields: Dict[str, Any] = {"output_path": INTENT_OUTPUT_PATHS[intent]}
+        fields.update(self.defaults)
+        fields.update(self.intent_defaults.get(intent, {}))
+        fields.update(entry.overrides)
+        fields.update(variant.overrides)
+        
+        prompt = ", ".join(p for p in (entry.description, variant.prompt, self.prompt_suffix) if p)
+        metadata = {
+            **fields.pop("metadata", {}),
+            "matrix": {"species": entry.name, "style": style.value, "variant": variant.name},
+        }
+        spec = GameAssetSpec(
+            intent=intent,
+            description=prompt,
+            art_style=style,
+            asset_id=_slug(f"{entry.name}_{intent.value}_{style.value}_{variant.name}"),
+            metadata=metadata,
+            **fields
+        )
+        return MatrixEntry(
+            species=entry.name,
+            intent=intent,
+            style=style,
+            variant=variant.name,
+            spec=spec,
+            spec_hash=asset_spec_hash(spec)
+        )
+    
+    def changed(self, output_root: Union[str, Path], **filters) -> Iterator[MatrixEntry]:
+        """Entries with no manifest yet or whose spec changed since generation"""
+        return (entry for entry in self.entries(**filters) if not entry.is_current(output_root))
+    
+    def specs(
+        self,
+        changed_only: bool = False,
+        output_root: Union[str, Path] = "client/public",
+        **filters
+    ) -> Iterator[GameAssetSpec]:
+        """GameAssetSpecs for AssetGenerator.batch_generate/stream_batch
+        
+        Args:
+            changed_only: Skip combinations already generated from an identical spec
+            output_root: Generator output root holding the manifests
+            **filters: species, intent, style or variant to restrict expansion to
+        """
+        entries = self.changed(output_root, **filters) if changed_only else self.entries(**filters)
+        return (entry.spec for entry in entries)
+    
+    def pipeline_specs(
+        self,
+        animations: Optional[Dict[str, str]] = None,
+        retexture_prompt: Optional[str] = None,
+        refine: bool = True,
+        **filters
+    ) -> Iterator[AssetPipelineSpec]:
+        """AssetPipelineSpecs for PipelineExecutor, one per combination
+        
+        Pipelines run under the entry's species, so all of a species'
+        combinations share its manifest; each combination is told apart by
+        its pipeline id. Combinations with identical definitions (e.g. two
+        intents with the same prompt) are yielded once. Characters and
+        creatures are rigged and get `animations`; other intents stop after
+        the model. The executor checkpoints pipelines by definition hash, so
+        restarting with an unchanged matrix resubmits nothing and only
+        edited combinations start new pipelines.
+        """
+        seen = set()
+        for entry in self.entries(**filters):
+            rig = entry.intent in RIGGED_INTENTS
+            pipeline = AssetPipelineSpec(
+                species=entry.species,
+                prompt=entry.spec.description,
+                animations=dict(animations or {}) if rig else {},
+                retexture_prompt=retexture_prompt,
+                refine=refine,
+                rig=rig,
+                text3d_options={"art_style": entry.style.value, "enable_pbr": entry.spec.enable_pbr}
+            )
+            if pipeline.pipeline_id not in seen:
+                seen.add(pipeline.pipeline_id)
+                yield pipeline
@@ -39,6 +39,7 @@ class Text3DRequest(BaseModel):
     topology: Optional[str] = None  # quad, triangle
     target_polycount: Optional[int] = None
     enable_pbr: Optional[bool] = None
+    seed: Optional[int] = None
 
 
 class ModelUrls(BaseModel):
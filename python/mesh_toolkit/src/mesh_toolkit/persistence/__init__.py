@@ -1,6 +1,7 @@
 """Persistence layer for task manifests and resume capability"""
-from .schemas import AssetManifest, SpeciesManifest, TaskGraphEntry, ArtifactRecord
+from .schemas import AssetManifest, SpeciesManifest, TaskGraphEntry, ArtifactRecord, MeshStats
 from .repository import TaskRepository
+from .events import TaskEvent, TaskEventBus, SocketEventBridge
 from .utils import compute_spec_hash, canonicalize_spec
 
 __all__ = [
@@ -8,7 +9,11 @@ __all__ = [
     "SpeciesManifest", 
     "TaskGraphEntry",
     "ArtifactRecord",
+    "MeshStats",
     "TaskRepository",
+    "TaskEvent",
+    "TaskEventBus",
+    "SocketEventBridge",
     "compute_spec_hash",
     "canonicalize_spec"
 ]
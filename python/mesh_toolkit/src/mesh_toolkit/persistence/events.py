@@ -0,0 +1,337 @@
+"""Task status notifications
+
+TaskRepository publishes a TaskEvent on every status change so callers can
+block until a task reaches a state instead of polling manifests or cassette
+files. The bus is in-process; SocketEventBridge relays events between
+processes over localhost UDP (e.g. from the webhook server to a flow runner).
+"""
+import asyncio
+import json
+import socket
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+
+@dataclass
+class TaskEvent:
+    """A task status change"""
+    task_id: str
+    status: str
+    species: Optional[str] = None
+    spec_hash: Optional[str] = None
+    service: Optional[str] = None
+    old_status: str = ""
+    source: str = "orchestrator"
+    timestamp: datetime = field(default_factory=datetime.utcnow)
+    # Set on events received from another process so bridges don't echo them
+    remote: bool = False
+    
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["timestamp"] = self.timestamp.isoformat()
+        return data
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TaskEvent":
+        data = dict(data)
+        if isinstance(data.get("timestamp"), str):
+            data["timestamp"] = datetime.fromisoformat(data["timestamp"])
+        return cls(**data)
+
+
+EventCallback = Callable[[TaskEvent], None]
+
+
+class TaskEventBus:
+    """Thread-safe in-process pub/sub for task status changes
+    
+    The latest event per task is retained so a waiter that subscribes just
+    after a status change still sees it.
+    """
+    
+    def __init__(self, max_retained: int = 10000):
+        """Initialize event bus
+        
+        Args:
+            max_retained: Number of tasks whose latest event is kept
+        """
+        self.max_retained = max_retained
+        self._lock = threading.Lock()
+        self._subscribers: Dict[Optional[str], List[EventCallback]] = {}
+        self._latest: "OrderedDict[str, TaskEvent]" = OrderedDict()
+    
+    def subscribe(
+        self,
+        callback: EventCallback,
+        task_id: Optional[str] = None
+    ) -> Callable[[], None]:
+        """Register a callback for events
+        
+        Callbacks run synchronously on the publishing thread and must not block.
+        
+        Args:
+            callback: Called with each matching TaskEvent
+            task_id: Only deliver events for this task (None = all tasks)
+        
+        Returns:
+            Function that removes the subscription
+        """
+        with self._lock:
+            self._subscribers.setdefault(task_id, []).append(callback)
+        
+        def unsubscribe():
+            with self._lock:
+                callbacks = self._subscribers.get(task_id, [])
+                if callback in callbacks:
+                    callbacks.remove(callback)
+                if not callbacks:
+                    self._subscribers.pop(task_id, None)
+        
+        return unsubscribe
+    
+    def publish(self, event: TaskEvent) -> None:
+        """Deliver an event to matching subscribers
+        
+        Args:
+            event: TaskEvent to publish
+        """
+        with self._lock:
+            self._latest[event.task_id] = event
+            self._latest.move_to_end(event.task_id)
+            while len(self._latest) > self.max_retained:
+                self._latest.popitem(last=False)
+            callbacks = (
+                list(self._subscribers.get(event.task_id, []))
+                + list(self._subscribers.get(None, []))
+            )
+        
+        for callback in callbacks:
+            try:
+                callback(event)
+            except Exception as e:
+                print(f"Task event subscriber failed: {e}")
+    
+    def latest(self, task_id: str) -> Optional[TaskEvent]:
+        """Most recent event seen for a task, if still retained"""
+        with self._lock:
+            return self._latest.get(task_id)
+    
+    def wait(
+        self,
+        task_id: str,
+        statuses: Iterable[str],
+        timeout: Optional[float] = None,
+        current: Optional[Callable[[], Optional[TaskEvent]]] = None
+    ) -> TaskEvent:
+        """Block the calling thread until a task reaches one of `statuses`
+        
+        Args:
+            task_id: Task to wait for
+            statuses: Statuses that end the wait
+            timeout: Seconds to wait (None = forever)
+            current: Optional lookup of the task's persisted state, checked
+                after subscribing so a change can't slip in between
+        
+        Returns:
+            The matching TaskEvent
+        
+        Raises:
+            TimeoutError: If no matching event arrives in time
+        """
+        statuses = set(statuses)
+        matched: List[TaskEvent] = []
+        ready = threading.Event()
+        
+        def on_event(event: TaskEvent):
+            if event.status in statuses and not ready.is_set():
+                matched.append(event)
+                ready.set()
+        
+        unsubscribe = self.subscribe(on_event, task_id=task_id)
+        try:
+            existing = self._check_existing(task_id, statuses, current)
+            if existing:
+                return existing
+            if not ready.wait(timeout):
+                raise TimeoutError(f"Task {task_id} did not reach {sorted(statuses)} within {timeout}s")
+            return matched[0]
+        finally:
+            unsubscribe()
+    
+    async def wait_async(
+        self,
+        task_id: str,
+        statuses: Iterable[str],
+        timeout: Optional[float] = None,
+        current: Optional[Callable[[], Optional[TaskEvent]]] = None
+    ) -> TaskEvent:
+        """Await a task reaching one of `statuses` without blocking the loop
+        
+        Events may be published from any thread; the result is handed to the
+        waiting event loop with call_soon_threadsafe.
+        
+        Args:
+            task_id: Task to wait for
+            statuses: Statuses that end the wait
+            timeout: Seconds to wait (None = forever)
+            current: Optional lookup of the task's persisted state
+        
+        Returns:
+            The matching TaskEvent
+        
+        Raises:
+            TimeoutError: If no matching event arrives in time
+        """
+        statuses = set(statuses)
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        
+        def resolve(event: TaskEvent):
+            if not future.done():
+                future.set_result(event)
+        
+        def on_event(event: TaskEvent):
+            if event.status in statuses:
+                loop.call_soon_threadsafe(resolve, event)
+        
+        unsubscribe = self.subscribe(on_event, task_id=task_id)
+        try:
+            existing = self._check_existing(task_id, statuses, current)
+            if existing:
+                return existing
+            try:
+                return await asyncio.wait_for(future, timeout)
+            except asyncio.TimeoutError:
+                raise TimeoutError(
+                    f"Task {task_id} did not reach {sorted(statuses)} within {timeout}s"
+                ) from None
+        finally:
+            unsubscribe()
+    
+    def _check_existing(
+        self,
+        task_id: str,
+        statuses: set,
+        current: Optional[Callable[[], Optional[TaskEvent]]]
+    ) -> Optional[TaskEvent]:
+        """Return a retained or persisted state that already satisfies a wait"""
+        latest = self.latest(task_id)
+        if latest and latest.status in statuses:
+            return latest
+        if current:
+            persisted = current()
+            if persisted and persisted.status in statuses:
+                return persisted
+        return None
+
+
+class SocketEventBridge:
+    """Relay task events between processes over UDP
+    
+    A forwarding bridge sends every local event to its peers; a listening
+    bridge republishes received events on its local bus. Events arriving from
+    a peer are marked remote and never forwarded again, so two processes can
+    bridge to each other without loops.
+    
+    Datagrams can be dropped, so waiters should still pass a timeout and a
+    `current` lookup against the repository.
+    """
+    
+    DEFAULT_PORT = 47650
+    
+    def __init__(
+        self,
+        bus: TaskEventBus,
+        listen: Optional[Tuple[str, int]] = None,
+        peers: Optional[List[Tuple[str, int]]] = None
+    ):
+        """Initialize bridge
+        
+        Args:
+            bus: Local TaskEventBus
+            listen: (host, port) to receive events on (None = don't listen)
+            peers: (host, port) addresses to forward local events to
+        """
+        self.bus = bus
+        self.peers = list(peers or [])
+        self._send_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._recv_sock: Optional[socket.socket] = None
+        self._thread: Optional[threading.Thread] = None
+        self._unsubscribe: Optional[Callable[[], None]] = None
+        self._closed = threading.Event()
+        
+        if listen:
+            self._recv_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            self._recv_sock.bind(listen)
+            self._recv_sock.settimeout(0.5)
+        
+        if self.peers:
+            self._unsubscribe = bus.subscribe(self._forward)
+    
+    @classmethod
+    def parse_address(cls, value: str, default_host: str = "127.0.0.1") -> Tuple[str, int]:
+        """Parse "host:port", ":port" or "port" (e.g. from a CLI flag)
+        
+        Raises:
+            ValueError: If the port is not a number
+        """
+        host, _, port = value.rpartition(":")
+        return host or default_host, int(port) if port else cls.DEFAULT_PORT
+    
+    @property
+    def address(self) -> Optional[Tuple[str, int]]:
+        """Bound listen address (useful when listening on port 0)"""
+        return self._recv_sock.getsockname() if self._recv_sock else None
+    
+    def start(self) -> "SocketEventBridge":
+        """Start the receive thread if listening"""
+        if self._recv_sock and not self._thread:
+            self._thread = threading.Thread(target=self._receive_loop, daemon=True)
+            self._thread.start()
+        return self
+    
+    def _forward(self, event: TaskEvent) -> None:
+        if event.remote:
+            return
+        data = json.dumps(event.to_dict()).encode()
+        for peer in self.peers:
+            try:
+                self._send_sock.sendto(data, peer)
+            except OSError as e:
+                print(f"Failed to forward task event to {peer}: {e}")
+    
+    def _receive_loop(self) -> None:
+        while not self._closed.is_set():
+            try:
+                data, _ = self._recv_sock.recvfrom(65536)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            try:
+                event = TaskEvent.from_dict(json.loads(data))
+            except (ValueError, TypeError) as e:
+                print(f"Dropping malformed task event: {e}")
+                continue
+            event.remote = True
+            self.bus.publish(event)
+    
+    def close(self) -> None:
+        """Stop forwarding and listening"""
+        self._closed.set()
+        if self._unsubscribe:
+            self._unsubscribe()
+        if self._thread:
+            self._thread.join(timeout=2)
+        if self._recv_sock:
+            self._recv_sock.close()
+        self._send_sock.close()
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, *args):
+        self.close()
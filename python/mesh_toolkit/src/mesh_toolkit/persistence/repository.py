@@ -2,9 +2,13 @@
 import os
 import json
 import tempfile
-from datetime import datetime
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple, Iterable, Iterator
+from .events import TaskEvent, TaskEventBus
+from .similarity import BKTree
 from .schemas import (
     SpeciesManifest, 
     AssetManifest, 
@@ -16,18 +20,69 @@ from .schemas import (
 )
 from .utils import compute_spec_hash as util_compute_spec_hash, canonicalize_spec
 
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to the in-process lock only
+    fcntl = None
+
+
+# Statuses after which Meshy will not send further updates for a task
+TERMINAL_STATUSES = {"SUCCEEDED", "FAILED", "EXPIRED", "CANCELED"}
+
 
 class TaskRepository:
     """File-backed repository for task manifests with atomic operations"""
     
-    def __init__(self, base_path: str = "client/public/models"):
+    def __init__(
+        self,
+        base_path: str = "client/public/models",
+        events: Optional[TaskEventBus] = None
+    ):
         self.base_path = Path(base_path)
         self.base_path.mkdir(parents=True, exist_ok=True)
+        # Serializes load-modify-save cycles so concurrent webhook handlers
+        # and workers in one process don't drop each other's updates;
+        # _manifest_lock extends this to other processes
+        self._lock = threading.RLock()
+        # Species whose manifest file lock this process holds, with depth
+        self._file_locks: Dict[str, int] = {}
+        # Status changes are published here once they are on disk
+        self.events = events or TaskEventBus()
     
     def _manifest_path(self, species: str) -> Path:
         """Get path to species manifest file"""
         return self.base_path / species / "manifest.json"
     
+    @contextmanager
+    def _manifest_lock(self, species: str) -> Iterator[None]:
+        """Hold a species manifest exclusively across threads and processes
+        
+        The in-process lock serializes threads; an flock on manifest.json.lock
+        keeps webhook hosts, workers and the post-processing watcher from
+        dropping each other's load-modify-save cycles. Re-entrant per species.
+        """
+        with self._lock:
+            if fcntl is None or species in self._file_locks:
+                self._file_locks[species] = self._file_locks.get(species, 0) + 1
+                try:
+                    yield
+                finally:
+                    self._file_locks[species] -= 1
+                    if not self._file_locks[species]:
+                        del self._file_locks[species]
+                return
+            
+            lock_path = self._manifest_path(species).with_name("manifest.json.lock")
+            lock_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(lock_path, "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                self._file_locks[species] = 1
+                try:
+                    yield
+                finally:
+                    del self._file_locks[species]
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+    
     def load_species_manifest(self, species: str) -> SpeciesManifest:
         """Load manifest for a species, creating empty one if missing
         
@@ -103,10 +158,11 @@ class TaskRepository:
             species: Species name
             asset_manifest: AssetManifest to save
         """
-        manifest = self.load_species_manifest(species)
-        asset_manifest.updated_at = datetime.utcnow()
-        manifest.asset_specs[asset_manifest.asset_spec_hash] = asset_manifest
-        self.save_species_manifest(manifest)
+        with self._manifest_lock(species):
+            manifest = self.load_species_manifest(species)
+            asset_manifest.updated_at = datetime.utcnow()
+            manifest.asset_specs[asset_manifest.asset_spec_hash] = asset_manifest
+            self.save_species_manifest(manifest)
     
     def record_task_update(
         self,
@@ -135,69 +191,126 @@ class TaskRepository:
             source: Update source (orchestrator, webhook, manual)
             error: Error message if failed
         """
-        manifest = self.load_species_manifest(species)
-        asset_record = manifest.asset_specs.get(spec_hash)
-        
-        if not asset_record:
-            raise ValueError(f"Asset {spec_hash} not found for species {species}")
-        
-        # Find existing task entry or create new
-        task_entry = None
-        for entry in asset_record.task_graph:
-            if entry.task_id == task_id:
-                task_entry = entry
-                break
-        
-        if task_entry:
-            # Update existing entry
-            old_status = task_entry.status
-            task_entry.status = status
-            task_entry.updated_at = datetime.utcnow()
+        event = None
+        with self._manifest_lock(species):
+            manifest = self.load_species_manifest(species)
+            asset_record = manifest.asset_specs.get(spec_hash)
             
-            if result_paths:
-                task_entry.result_paths.update(result_paths)
+            if not asset_record:
+                raise ValueError(f"Asset {spec_hash} not found for species {species}")
             
-            if error:
-                task_entry.error = error
+            # Find existing task entry or create new
+            task_entry = None
+            for entry in asset_record.task_graph:
+                if entry.task_id == task_id:
+                    task_entry = entry
+                    break
             
-            # Record status transition
-            asset_record.history.append(StatusHistoryEntry(
-                timestamp=datetime.utcnow(),
-                old_status=old_status,
-                new_status=status,
-                source=source,
-                task_id=task_id
-            ))
-        
-        elif service:
-            # Create new task entry
-            task_entry = TaskGraphEntry(
-                task_id=task_id,
-                service=service,
-                status=status,
-                created_at=datetime.utcnow(),
-                updated_at=datetime.utcnow(),
-                payload=payload or {},
-                result_paths=result_paths or {},
-                error=error
-            )
-            asset_record.task_graph.append(task_entry)
+            if task_entry:
+                # Update existing entry
+                old_status = task_entry.status
+                task_entry.status = status
+                task_entry.updated_at = datetime.utcnow()
+                
+                if result_paths:
+                    task_entry.result_paths.update(result_paths)
+                
+                if error:
+                    task_entry.error = error
+                
+                # Record status transition
+                asset_record.history.append(StatusHistoryEntry(
+                    timestamp=datetime.utcnow(),
+                    old_status=old_status,
+                    new_status=status,
+                    source=source,
+                    task_id=task_id
+                ))
+                event = TaskEvent(
+                    task_id=task_id,
+                    status=status,
+                    species=species,
+                    spec_hash=spec_hash,
+                    service=task_entry.service,
+                    old_status=old_status,
+                    source=source
+                )
             
-            # Record initial status
-            asset_record.history.append(StatusHistoryEntry(
-                timestamp=datetime.utcnow(),
-                old_status="",
-                new_status=status,
-                source=source,
-                task_id=task_id
-            ))
+            elif service:
+                # Create new task entry
+                task_entry = TaskGraphEntry(
+                    task_id=task_id,
+                    service=service,
+                    status=status,
+                    created_at=datetime.utcnow(),
+                    updated_at=datetime.utcnow(),
+                    payload=payload or {},
+                    result_paths=result_paths or {},
+                    error=error
+                )
+                asset_record.task_graph.append(task_entry)
+                
+                # Record initial status
+                asset_record.history.append(StatusHistoryEntry(
+                    timestamp=datetime.utcnow(),
+                    old_status="",
+                    new_status=status,
+                    source=source,
+                    task_id=task_id
+                ))
+                event = TaskEvent(
+                    task_id=task_id,
+                    status=status,
+                    species=species,
+                    spec_hash=spec_hash,
+                    service=service,
+                    source=source
+                )
+            
+            # Add artifacts if provided
+            if artifacts:
+                asset_record.artifacts.extend(artifacts)
+            
+            # Save updated manifest
+            self.save_species_manifest(manifest)
+        
+        # Publish outside the lock so subscribers can read the repository
+        if event:
+            self.events.publish(event)
+    
+    def record_artifacts(
+        self,
+        species: str,
+        spec_hash: str,
+        artifacts: Iterable[ArtifactRecord],
+        supersedes: Optional[Tuple[str, str]] = None
+    ) -> None:
+        """Add artifacts to an asset, replacing records with the same path
         
-        # Add artifacts if provided
-        if artifacts:
-            asset_record.artifacts.extend(artifacts)
+        Args:
+            species: Species name
+            spec_hash: Asset spec hash
+            artifacts: Artifacts to add (e.g. derived by post-processing)
+            supersedes: (kind, derived_from) of earlier records to drop, so
+                a stage that now writes fewer files leaves no stale ones
         
-        # Save updated manifest
-        self.save_species_manifest(manifest)
+        Raises:
+            ValueError: If the asset does not exist
+        """
+        artifacts = list(artifacts)
+        paths = {artifact.relative_path for artifact in artifacts}
+        with self._manifest_lock(species):
+            manifest = self.load_species_manifest(species)
+            asset_record = manifest.asset_specs.get(spec_hash)
+            if not asset_record:
+                raise ValueError(f"Asset {spec_hash} not found for species {species}")
+            
+            asset_record.artifacts = [
+                artifact for artifact in asset_record.artifacts
+                if artifact.relative_path not in paths
+                and (supersedes is None or (artifact.kind, artifact.derived_from) != supersedes)
+            ] + artifacts
+            self.save_species_manifest(manifest)
     
     def list_pending_assets(self, species: str) -> List[AssetManifest]:
         """List all assets with pending/in-progress tasks
@@ -211,11 +324,9 @@ class TaskRepository:
         manifest = self.load_species_manifest(species)
         pending = []
         
-        terminal_statuses = {"SUCCEEDED", "FAILED", "EXPIRED", "CANCELED"}
-        
         for asset_record in manifest.asset_specs.values():
             has_pending = any(
-                task.status not in terminal_statuses
+                task.status not in TERMINAL_STATUSES
                 for task in asset_record.task_graph
             )
             if has_pending:
@@ -238,14 +349,7 @@ class TaskRepository:
             Tuple of (species, spec_hash, AssetManifest) if found
         """
         # Determine which species to search
-        if species:
-            species_list = [species]
-        else:
-            # Search all species directories
-            species_list = [
-                d.name for d in self.base_path.iterdir()
-                if d.is_dir() and (d / "manifest.json").exists()
-            ]
+        species_list = [species] if species else self.list_species()
         
         for sp in species_list:
             manifest = self.load_species_manifest(sp)
@@ -256,6 +360,312 @@ class TaskRepository:
         
         return None
     
+    def get_task_event(
+        self,
+        task_id: str,
+        species: Optional[str] = None
+    ) -> Optional[TaskEvent]:
+        """Current persisted state of a task as a TaskEvent
+        
+        Args:
+            task_id: Meshy task ID
+            species: Optional species to narrow search
+        
+        Returns:
+            TaskEvent for the task's current status, None if not found
+        """
+        lookup = self.find_task_by_id(task_id, species=species)
+        if not lookup:
+            return None
+        
+        found_species, spec_hash, asset_record = lookup
+        task = next(t for t in asset_record.task_graph if t.task_id == task_id)
+        return TaskEvent(
+            task_id=task_id,
+            status=task.status,
+            species=found_species,
+            spec_hash=spec_hash,
+            service=task.service,
+            source="repository",
+            timestamp=task.updated_at
+        )
+    
+    async def wait_for(
+        self,
+        task_id: str,
+        statuses: Iterable[str] = TERMINAL_STATUSES,
+        timeout: Optional[float] = None,
+        species: Optional[str] = None
+    ) -> TaskEvent:
+        """Wait until a task reaches one of the given statuses
+        
+        Returns immediately if the manifest already shows a matching status,
+        otherwise wakes on the next matching event with no polling.
+        
+        Args:
+            task_id: Meshy task ID
+            statuses: Statuses that end the wait (default: terminal statuses)
+            timeout: Seconds to wait (None = forever)
+            species: Optional species to narrow the manifest lookup
+        
+        Returns:
+            TaskEvent describing the matching status
+        
+        Raises:
+            TimeoutError: If the task doesn't reach a matching status in time
+        """
+        return await self.events.wait_async(
+            task_id,
+            statuses,
+            timeout=timeout,
+            current=lambda: self.get_task_event(task_id, species=species)
+        )
+    
+    def list_species(self) -> List[str]:
+        """List species that have a manifest on disk
+        
+        Returns:
+            Sorted list of species names
+        """
+        return sorted(
+            d.name for d in self.base_path.iterdir()
+            if d.is_dir() and (d / "manifest.json").exists()
+        )
+    
+    def _image_hash_index(
+        self,
+        species: str,
+        algorithm: str
+    ) -> Tuple[List[Tuple[str, ArtifactRecord]], BKTree]:
+        """A species' hashed image artifacts and a BK-tree keyed by one hash
+        
+        Redelivered webhooks can record the same file twice; only the newest
+        record per relative_path is indexed, so a file is never its own
+        near-duplicate.
+        """
+        newest: Dict[str, Tuple[str, ArtifactRecord]] = {}
+        for spec_hash, asset_record in self.load_species_manifest(species).asset_specs.items():
+            for artifact in asset_record.artifacts:
+                if not artifact.image_hashes.get(algorithm):
+                    continue
+                seen = newest.get(artifact.relative_path)
+                if seen is None or artifact.downloaded_at >= seen[1].downloaded_at:
+                    newest[artifact.relative_path] = (spec_hash, artifact)
+        items = list(newest.values())
+        tree: BKTree = BKTree()
+        for item in items:
+            tree.add(item[1].image_hashes[algorithm], item)
+        return items, tree
+    
+    def find_similar_images(
+        self,
+        species: str,
+        image_hash: str,
+        max_distance: int = 6,
+        algorithm: str = "phash"
+    ) -> List[Tuple[int, str, ArtifactRecord]]:
+        """Find image artifacts whose perceptual hash is near a given hash
+        
+        Args:
+            species: Species name
+            image_hash: Hex hash to compare against
+            max_distance: Largest Hamming distance (of 64 bits) to include
+            algorithm: Which of ArtifactRecord.image_hashes to compare
+        
+        Returns:
+            List of (distance, spec_hash, ArtifactRecord), nearest first
+        """
+        _, tree = self._image_hash_index(species, algorithm)
+        return [
+            (distance, spec_hash, artifact)
+            for distance, (spec_hash, artifact) in tree.search(image_hash, max_distance)
+        ]
+    
+    def find_near_duplicates(
+        self,
+        species: str,
+        max_distance: int = 6,
+        algorithm: str = "phash"
+    ) -> List[List[Tuple[str, ArtifactRecord]]]:
+        """Cluster a species' image artifacts by perceptual hash
+        
+        Clusters are connected components of the "within max_distance"
+        graph, so a chain of small differences ends up in one cluster.
+        
+        Args:
+            species: Species name
+            max_distance: Largest Hamming distance (of 64 bits) between neighbours
+            algorithm: Which of ArtifactRecord.image_hashes to compare
+        
+        Returns:
+            Clusters of two or more (spec_hash, ArtifactRecord), largest first
+        """
+        items, tree = self._image_hash_index(species, algorithm)
+        
+        # Union-find over artifact paths
+        parent = {artifact.relative_path: artifact.relative_path for _, artifact in items}
+        
+        def find(path: str) -> str:
+            while parent[path] != path:
+                parent[path] = parent[parent[path]]
+                path = parent[path]
+            return path
+        
+        for _, artifact in items:
+            for _, (_, neighbour) in tree.search(artifact.image_hashes[algorithm], max_distance):
+                parent[find(neighbour.relative_path)] = find(artifact.relative_path)
+        
+        clusters: Dict[str, List[Tuple[str, ArtifactRecord]]] = {}
+        for spec_hash, artifact in items:
+            clusters.setdefault(find(artifact.relative_path), []).append((spec_hash, artifact))
+        return sorted(
+            (cluster for cluster in clusters.values() if len(cluster) > 1),
+            key=len,
+            reverse=True
+        )
+    
+    def list_stale_tasks(
+        self,
+        older_than: timedelta,
+        species: Optional[str] = None
+    ) -> List[Tuple[str, str, TaskGraphEntry]]:
+        """List non-terminal tasks that have not been updated recently
+        
+        Used to find tasks whose webhook was never delivered.
+        
+        Args:
+            older_than: Minimum age since the task's last update
+            species: Optional species to narrow search
+        
+        Returns:
+            List of (species, spec_hash, TaskGraphEntry), oldest first
+        """
+        cutoff = datetime.utcnow() - older_than
+        species_list = [species] if species else self.list_species()
+        stale = []
+        
+        for sp in species_list:
+            manifest = self.load_species_manifest(sp)
+            for spec_hash, asset_record in manifest.asset_specs.items():
+                for task in asset_record.task_graph:
+                    if task.status not in TERMINAL_STATUSES and task.updated_at <= cutoff:
+                        stale.append((sp, spec_hash, task))
+        
+        stale.sort(key=lambda item: item[2].updated_at)
+        return stale
+    
+    def find_cached_task(
+        self,
+        species: str,
+        spec_hash: str,
+        service: str,
+        ttl: Optional[timedelta] = None
+    ) -> Optional[TaskSubmission]:
+        """Find a reusable task for an identical spec
+        
+        A SUCCEEDED task is reused along with its artifacts; a PENDING or
+        IN_PROGRESS task is reused so its webhook completes both callers.
+        Failed, expired and canceled tasks are never reused.
+        
+        Args:
+            species: Species name
+            spec_hash: Hash of the task spec (excluding callback URL)
+            service: Service name (text3d, text3d_refine, ...)
+            ttl: Ignore tasks created longer ago than this
+        
+        Returns:
+            TaskSubmission with cache_hit=True, or None
+        """
+        asset_record = self.get_asset_record(species, spec_hash)
+        if not asset_record:
+            return None
+        
+        cutoff = datetime.utcnow() - ttl if ttl else None
+        candidates = [
+            task for task in asset_record.task_graph
+            if task.service == service
+            and task.status in (TaskStatus.SUCCEEDED.value, TaskStatus.PENDING.value, TaskStatus.IN_PROGRESS.value)
+            and (cutoff is None or task.created_at >= cutoff)
+        ]
+        if not candidates:
+            return None
+        
+        # Prefer finished work, then the most recent task
+        task = max(candidates, key=lambda t: (t.status == TaskStatus.SUCCEEDED.value, t.created_at))
+        return TaskSubmission(
+            task_id=task.task_id,
+            spec_hash=spec_hash,
+            species=species,
+            service=service,
+            status=TaskStatus(task.status),
+            callback_url=task.payload.get("callback_url", ""),
+            params={k: v for k, v in task.payload.items() if k != "callback_url"},
+            created_at=task.created_at,
+            updated_at=task.updated_at,
+            cache_hit=True,
+            artifacts=list(asset_record.artifacts) if task.status == TaskStatus.SUCCEEDED.value else []
+        )
+    
+    def set_resume_token(
+        self,
+        species: str,
+        spec_hash: str,
+        key: str,
+        value: Any,
+        spec_fingerprint: Optional[str] = None,
+        asset_intent: str = "creature"
+    ) -> None:
+        """Store continuation state on an asset, creating the asset if needed
+        
+        Args:
+            species: Species name
+            spec_hash: Asset spec hash
+            key: Token name (e.g. "pipeline")
+            value: JSON-serializable state
+            spec_fingerprint: Fingerprint for a newly created asset
+            asset_intent: Intent for a newly created asset
+        """
+        with self._manifest_lock(species):
+            manifest = self.load_species_manifest(species)
+            asset_record = manifest.asset_specs.get(spec_hash)
+            if not asset_record:
+                asset_record = AssetManifest(
+                    asset_spec_hash=spec_hash,
+                    spec_fingerprint=spec_fingerprint or spec_hash,
+                    species=species,
+                    asset_intent=asset_intent
+                )
+                manifest.asset_specs[spec_hash] = asset_record
+            
+            asset_record.resume_tokens[key] = value
+            asset_record.updated_at = datetime.utcnow()
+            self.save_species_manifest(manifest)
+    
+    def list_resume_tokens(
+        self,
+        key: str,
+        species: Optional[str] = None
+    ) -> List[Tuple[str, str, Any]]:
+        """List assets carrying a resume token
+        
+        Args:
+            key: Token name
+            species: Optional species to narrow search
+        
+        Returns:
+            List of (species, spec_hash, token value)
+        """
+        species_list = [species] if species else self.list_species()
+        tokens = []
+        
+        for sp in species_list:
+            manifest = self.load_species_manifest(sp)
+            for spec_hash, asset_record in manifest.asset_specs.items():
+                if key in asset_record.resume_tokens:
+                    tokens.append((sp, spec_hash, asset_record.resume_tokens[key]))
+        
+        return tokens
+    
     def compute_spec_hash(self, spec: Dict[str, Any]) -> str:
         """Compute deterministic hash for task spec
         
@@ -276,6 +686,47 @@ class TaskRepository:
         Raises:
             ValueError: If submission data is invalid
         """
+        self.record_task_submissions([submission])
+    
+    def record_task_submissions(self, submissions: Iterable[TaskSubmission]) -> None:
+        """Record many task submissions with one manifest write per species
+        
+        All submissions are validated before anything is written. Duplicates
+        of already recorded tasks are skipped as in record_task_submission.
+        
+        Args:
+            submissions: TaskSubmissions, possibly spanning several species
+        
+        Raises:
+            ValueError: If any submission is invalid or conflicts with a
+                recorded task; nothing is written for that species
+        """
+        by_species: Dict[str, List[TaskSubmission]] = {}
+        for submission in submissions:
+            self._validate_submission(submission)
+            by_species.setdefault(submission.species, []).append(submission)
+        
+        recorded = []
+        for species, batch in by_species.items():
+            with self._manifest_lock(species):
+                manifest = self.load_species_manifest(species)
+                added = [s for s in batch if self._apply_submission(manifest, s)]
+                if added:
+                    self.save_species_manifest(manifest)
+            recorded.extend(added)
+        
+        for submission in recorded:
+            self.events.publish(TaskEvent(
+                task_id=submission.task_id,
+                status=submission.status.value,
+                species=submission.species,
+                spec_hash=submission.spec_hash,
+                service=submission.service,
+                source="service"
+            ))
+    
+    def _validate_submission(self, submission: TaskSubmission) -> None:
+        """Raise ValueError for submissions missing required fields"""
         if not submission.task_id:
             raise ValueError("task_id cannot be empty")
         if not submission.callback_url:
@@ -285,8 +736,12 @@ class TaskRepository:
         if not submission.spec_hash:
             raise ValueError("spec_hash cannot be empty")
         
-        manifest = self.load_species_manifest(submission.species)
-        
+    def _apply_submission(self, manifest: SpeciesManifest, submission: TaskSubmission) -> bool:
+        """Add a submission to a loaded manifest
+            
+        Returns:
+            False if the task was already recorded with the same status
+        """
         asset_record = manifest.asset_specs.get(submission.spec_hash)
         if not asset_record:
             asset_record = AssetManifest(
@@ -301,26 +756,24 @@ class TaskRepository:
         for existing_task in asset_record.task_graph:
             if existing_task.task_id == submission.task_id:
                 if existing_task.status == submission.status.value:
-                    # Duplicate submission with same status - idempotent, return silently
-                    return
-                else:
-                    raise ValueError(
-                        f"Task {submission.task_id} already exists with different status: "
-                        f"{existing_task.status} != {submission.status.value}"
-                    )
-        
-        task_entry = TaskGraphEntry(
+                    # Duplicate submission with same status - idempotent, skip silently
+                    return False
+                raise ValueError(
+                    f"Task {submission.task_id} already exists with different status: "
+                    f"{existing_task.status} != {submission.status.value}"
+                )
+            
+        asset_record.task_graph.append(TaskGraphEntry(
             task_id=submission.task_id,
             service=submission.service,
             status=submission.status.value,
             created_at=submission.created_at,
             updated_at=submission.updated_at,
-            payload={"callback_url": submission.callback_url},
+            payload={"callback_url": submission.callback_url, **submission.params},
             result_paths={},
             error=None
-        )
-        asset_record.task_graph.append(task_entry)
-        
+        ))
+
         asset_record.history.append(StatusHistoryEntry(
             timestamp=datetime.utcnow(),
             old_status="",
@@ -328,5 +781,4 @@ class TaskRepository:
             source="service",
             task_id=submission.task_id
         ))
-        
-        self.save_species_manifest(manifest)
+        return True
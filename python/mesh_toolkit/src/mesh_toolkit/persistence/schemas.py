@@ -14,6 +14,36 @@ class TaskStatus(str, Enum):
     EXPIRED = "EXPIRED"
 
 
+class MeshStats(BaseModel):
+    """Geometry summary of a GLB artifact (see processing.glb)"""
+    triangle_count: int = 0
+    vertex_count: int = 0
+    mesh_count: int = 0
+    primitive_count: int = 0
+    bounds_min: Optional[List[float]] = None  # mesh space, no node transforms
+    bounds_max: Optional[List[float]] = None
+    material_count: int = 0
+    texture_count: int = 0
+    image_count: int = 0
+    skin_count: int = 0
+    joint_count: int = 0
+    animations: Dict[str, float] = Field(default_factory=dict)  # clip name -> seconds
+
+
+class ArtifactRecord(BaseModel):
+    """Record of a downloaded file artifact"""
+    relative_path: str  # Relative to species directory
+    sha256_hash: str
+    file_size_bytes: int
+    downloaded_at: datetime
+    source_url: Optional[str] = None
+    mesh_stats: Optional[MeshStats] = None  # GLB artifacts only
+    kind: str = "download"  # download, or the processing stage that derived it (lod, ...)
+    derived_from: Optional[str] = None  # relative_path of the source artifact
+    params: Dict[str, Any] = Field(default_factory=dict)  # stage parameters
+    image_hashes: Dict[str, str] = Field(default_factory=dict)  # images only: dhash/phash as hex
+
+
 class TaskSubmission(BaseModel):
     """Record of a task submission"""
     task_id: str
@@ -24,6 +54,9 @@ class TaskSubmission(BaseModel):
     callback_url: str
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
+    cache_hit: bool = False  # True if an existing task was reused instead of submitted
+    artifacts: List[ArtifactRecord] = Field(default_factory=list)  # Set on cache hits
+    params: Dict[str, Any] = Field(default_factory=dict)  # Request fields kept in the task payload
 
 
 class TaskGraphEntry(BaseModel):
@@ -38,15 +71,6 @@ class TaskGraphEntry(BaseModel):
     error: Optional[str] = None
 
 
-class ArtifactRecord(BaseModel):
-    """Record of a downloaded file artifact"""
-    relative_path: str  # Relative to species directory
-    sha256_hash: str
-    file_size_bytes: int
-    downloaded_at: datetime
-    source_url: Optional[str] = None
-
-
 class StatusHistoryEntry(BaseModel):
     """Record of a status transition"""
     timestamp: datetime
@@ -0,0 +1,67 @@
+"""Hamming-distance index for perceptual image hashes"""
+from typing import Any, Dict, Generic, List, Tuple, TypeVar, Union
+
+T = TypeVar("T")
+
+
+def hamming_distance(a: Union[int, str], b: Union[int, str]) -> int:
+    """Number of differing bits between two hashes (ints or hex strings)"""
+    if isinstance(a, str):
+        a = int(a, 16)
+    if isinstance(b, str):
+        b = int(b, 16)
+    return (a ^ b).bit_count()
+
+
+class BKTree(Generic[T]):
+    """Burkhard-Keller tree over integer hashes
+    
+    Each child edge is labelled with its distance to the parent, so by the
+    triangle inequality a radius query only descends into edges within
+    [d - radius, d + radius] of the query's distance to the node.
+    """
+    
+    def __init__(self):
+        # Node: [hash, items, {distance: child node}]
+        self._root: List[Any] = []
+        self._size = 0
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def add(self, key: Union[int, str], item: T) -> None:
+        """Index an item under a hash; equal hashes share a node"""
+        if isinstance(key, str):
+            key = int(key, 16)
+        self._size += 1
+        if not self._root:
+            self._root = [key, [item], {}]
+            return
+        node = self._root
+        while True:
+            distance = hamming_distance(key, node[0])
+            if distance == 0:
+                node[1].append(item)
+                return
+            children: Dict[int, List[Any]] = node[2]
+            if distance not in children:
+                children[distance] = [key, [item], {}]
+                return
+            node = children[distance]
+    
+    def search(self, key: Union[int, str], radius: int) -> List[Tuple[int, T]]:
+        """(distance, item) for every item within radius, nearest first"""
+        if isinstance(key, str):
+            key = int(key, 16)
+        found = []
+        stack = [self._root] if self._root else []
+        while stack:
+            node = stack.pop()
+            distance = hamming_distance(key, node[0])
+            if distance <= radius:
+                found.extend((distance, item) for item in node[1])
+            for edge, child in node[2].items():
+                if distance - radius <= edge <= distance + radius:
+                    stack.append(child)
+        found.sort(key=lambda pair: pair[0])
+        return found
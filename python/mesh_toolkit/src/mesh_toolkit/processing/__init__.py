@@ -0,0 +1,62 @@
+"""Local post-processing of downloaded artifacts
+
+GLB parsing and rewriting need only the standard library; the numpy-based
+stages (arrays, lod, phash, quantize, textures) import numpy and Pillow
+lazily and raise a clear error without them.
+"""
+from .bundle import BundleReader, build_species_bundle, pack_bundle
+from .clips import (
+    AnimationSet,
+    SharedMeshGroup,
+    SkeletonMismatchError,
+    extract_shared_meshes,
+    merge_animations,
+)
+from .glb import GlbBuilder, GlbError, GlbFile, build_glb, inspect_glb
+from .lod import DEFAULT_LOD_RATIOS, LodLevel, build_lod, generate_lods
+from .phash import dhash, image_hashes, phash
+from .pipeline import (
+    PostProcessingPipeline,
+    PostProcessRun,
+    PostProcessStage,
+    StageOutput,
+    default_stages,
+)
+from .quantize import QuantizeReport, quantize_artifacts, quantize_glb
+from .textures import atlas_props, process_asset_textures
+from .validate import ValidationResult, validate_glb
+
+__all__ = [
+    "GlbBuilder",
+    "GlbFile",
+    "GlbError",
+    "build_glb",
+    "inspect_glb",
+    "BundleReader",
+    "build_species_bundle",
+    "pack_bundle",
+    "AnimationSet",
+    "SharedMeshGroup",
+    "SkeletonMismatchError",
+    "extract_shared_meshes",
+    "merge_animations",
+    "DEFAULT_LOD_RATIOS",
+    "LodLevel",
+    "build_lod",
+    "generate_lods",
+    "dhash",
+    "image_hashes",
+    "phash",
+    "PostProcessingPipeline",
+    "PostProcessRun",
+    "PostProcessStage",
+    "StageOutput",
+    "default_stages",
+    "QuantizeReport",
+    "quantize_artifacts",
+    "quantize_glb",
+    "atlas_props",
+    "process_asset_textures",
+    "ValidationResult",
+    "validate_glb",
+]
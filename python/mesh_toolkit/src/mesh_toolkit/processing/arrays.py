@@ -0,0 +1,80 @@
+"""NumPy views of GLB accessors
+
+Needs numpy (pip install mesh-toolkit[mesh]).
+"""
+from typing import Optional
+
+from .glb import TYPE_COMPONENTS, GlbBuilder, GlbFile
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
+
+
+# numpy dtype -> accessor.componentType
+COMPONENT_TYPES = {
+    "int8": 5120,
+    "uint8": 5121,
+    "int16": 5122,
+    "uint16": 5123,
+    "uint32": 5125,
+    "float32": 5126,
+}
+
+ARRAY_BUFFER = 34962
+ELEMENT_ARRAY_BUFFER = 34963
+
+
+def require_numpy() -> None:
+    """Raise a helpful ImportError when numpy is missing"""
+    if np is None:
+        raise ImportError("numpy is required for mesh processing: pip install mesh-toolkit[mesh]")
+
+
+def accessor_array(glb: GlbFile, index: int) -> "np.ndarray":
+    """Read-only (count, components) array over an accessor, without copying
+    
+    Strided (interleaved) accessors give a strided view into the file.
+    """
+    require_numpy()
+    fmt, components, count, _, stride = glb.accessor_layout(index)
+    dtype = np.dtype("<" + fmt)
+    view = glb.accessor_view(index)
+    if count == 0:
+        return np.zeros((0, components), dtype=dtype)
+    return np.ndarray(
+        shape=(count, components),
+        dtype=dtype,
+        buffer=view,
+        strides=(stride, dtype.itemsize)
+    )
+
+
+def add_array(
+    builder: GlbBuilder,
+    array: "np.ndarray",
+    target: Optional[int] = ARRAY_BUFFER,
+    normalized: bool = False,
+    with_bounds: bool = False
+) -> int:
+    """Append a (count,) or (count, components) array as a new accessor"""
+    require_numpy()
+    array = np.ascontiguousarray(array)
+    if array.dtype.name not in COMPONENT_TYPES:
+        raise ValueError(f"Unsupported accessor dtype {array.dtype}")
+    components = 1 if array.ndim == 1 else array.shape[1]
+    accessor_type = next(name for name, size in TYPE_COMPONENTS.items() if size == components)
+    bounds = None
+    if with_bounds and len(array):
+        shaped = array.reshape(len(array), components)
+        bounds = (shaped.min(axis=0).tolist(), shaped.max(axis=0).tolist())
+    return builder.add_accessor(
+        array.astype(array.dtype.newbyteorder("<"), copy=False).tobytes(),
+        component_type=COMPONENT_TYPES[array.dtype.name],
+        accessor_type=accessor_type,
+        count=len(array),
+        target=target,
+        normalized=normalized,
+        bounds=bounds
+    )
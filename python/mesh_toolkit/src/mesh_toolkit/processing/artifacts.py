@@ -0,0 +1,52 @@
+"""Bookkeeping shared by stages that derive artifacts from downloaded GLBs"""
+import hashlib
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Sequence, Tuple, Union
+
+from ..persistence.repository import TaskRepository
+from ..persistence.schemas import ArtifactRecord, AssetManifest
+from .glb import GlbFile
+
+
+def glb_artifacts(
+    repository: TaskRepository,
+    species: Optional[str] = None,
+    kinds: Sequence[str] = ("download",)
+) -> Iterator[Tuple[str, str, AssetManifest, ArtifactRecord]]:
+    """(species, spec hash, asset, artifact) for every GLB artifact of the given kinds"""
+    for name in [species] if species else repository.list_species():
+        manifest = repository.load_species_manifest(name)
+        for spec_hash, asset in manifest.asset_specs.items():
+            for artifact in asset.artifacts:
+                if artifact.kind in kinds and artifact.relative_path.endswith(".glb"):
+                    yield name, spec_hash, asset, artifact
+
+
+def derived_path(relative_path: str, suffix: str) -> str:
+    """`dir/<stem><suffix>.glb` for a GLB artifact path"""
+    path = Path(relative_path)
+    return str(path.with_name(f"{path.stem}{suffix}{path.suffix}"))
+
+
+def derived_record(
+    source_relative: str,
+    path: Union[str, Path],
+    kind: str,
+    params: Optional[Dict[str, Any]] = None
+) -> ArtifactRecord:
+    """ArtifactRecord for a GLB written next to its source artifact"""
+    path = Path(path)
+    with GlbFile.open(path) as glb:
+        file_hash = hashlib.sha256(glb.buffer).hexdigest()
+        stats = glb.stats()
+    return ArtifactRecord(
+        relative_path=str(Path(source_relative).with_name(path.name)),
+        sha256_hash=file_hash,
+        file_size_bytes=path.stat().st_size,
+        downloaded_at=datetime.utcnow(),
+        mesh_stats=stats,
+        kind=kind,
+        derived_from=source_relative,
+        params=params or {}
+    )
@@ -0,0 +1,387 @@
+"""Per-species asset bundles with a byte-range index
+
+A bundle packs a species' artifacts into one file the client can fetch in
+a single request, or entry by entry with HTTP range requests:
+    
+    header   "OTBN", version (u32), index offset (u64), index length (u64)
+    entries  each starting on an `alignment` boundary
+    index    JSON: {"species", "alignment", "entries": {name: {"offset",
+             "length", "sha256", "type", "kind"}}}
+
+The index is also written next to the bundle as `<species>.bundle.json`
+so the client can read it first and range-request only what it needs.
+
+Rebuilds are incremental and append-only: entries whose hash is unchanged
+keep their offsets (and the client's cached ranges stay valid), new or
+changed entries and the new index are appended, and the header is
+rewritten last, so a crash mid-build leaves the previous index intact.
+Once dead bytes exceed `compact_ratio` of the file the bundle is rewritten
+from scratch. Unchanged entries are recognised by the sha256 already in
+their ArtifactRecord, so their files are not even read.
+"""
+import hashlib
+import json
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from ..persistence.repository import TaskRepository
+from ..persistence.schemas import ArtifactRecord
+
+BUNDLE_MAGIC = b"OTBN"
+BUNDLE_VERSION = 1
+HEADER = struct.Struct("<4sIQQ")
+
+DEFAULT_ALIGNMENT = 16
+
+MIME_TYPES = {
+    ".glb": "model/gltf-binary",
+    ".gltf": "model/gltf+json",
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".ktx2": "image/ktx2",
+    ".json": "application/json",
+}
+
+
+class BundleError(ValueError):
+    """The file is not a well-formed bundle"""
+    pass
+
+
+@dataclass
+class BundleEntry:
+    """A file to pack"""
+    name: str
+    path: Path
+    sha256: Optional[str] = None  # computed from the file when unknown
+    kind: str = "file"
+
+
+@dataclass
+class BundleReport:
+    """What a build did"""
+    path: str
+    index_path: str
+    entries: int
+    reused: int
+    appended: int
+    bytes_written: int
+    size: int
+    compacted: bool
+
+
+def _align(offset: int, alignment: int) -> int:
+    return offset + (-offset % alignment)
+
+
+def _file_hash(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def read_index(path: Union[str, Path]) -> Dict[str, Any]:
+    """Parse a bundle's header and index
+    
+    Raises:
+        BundleError: If the file is not a bundle or is truncated
+    """
+    with open(path, "rb") as f:
+        header = f.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise BundleError("File too short for a bundle header")
+        magic, version, offset, length = HEADER.unpack(header)
+        if magic != BUNDLE_MAGIC or version != BUNDLE_VERSION:
+            raise BundleError(f"Not a version {BUNDLE_VERSION} bundle")
+        f.seek(offset)
+        data = f.read(length)
+    if len(data) != length:
+        raise BundleError("Bundle index is truncated")
+    index = json.loads(data)
+    index["index_offset"], index["index_length"] = offset, length
+    return index
+
+
+class BundleReader:
+    """Memory-mapped access to bundle entries"""
+    
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.index = read_index(self.path)
+        self._file = open(self.path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+    
+    def __enter__(self) -> "BundleReader":
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        self.close()
+    
+    def close(self) -> None:
+        self._map.close()
+        self._file.close()
+    
+    @property
+    def names(self) -> List[str]:
+        return list(self.index["entries"])
+    
+    def read(self, name: str, verify: bool = True) -> bytes:
+        """Bytes of one entry
+        
+        Raises:
+            KeyError: If the entry does not exist
+            BundleError: If verify is set and the hash does not match
+        """
+        entry = self.index["entries"][name]
+        data = self._map[entry["offset"]:entry["offset"] + entry["length"]]
+        if verify and hashlib.sha256(data).hexdigest() != entry["sha256"]:
+            raise BundleError(f"Entry {name} does not match its hash")
+        return data
+
+
+def pack_bundle(
+    path: Union[str, Path],
+    entries: Sequence[BundleEntry],
+    species: str = "",
+    alignment: int = DEFAULT_ALIGNMENT,
+    compact_ratio: float = 0.5
+) -> BundleReport:
+    """Write or incrementally update a bundle
+    
+    Args:
+        path: Bundle file
+        entries: Files that should be in the bundle (others are dropped)
+        species: Recorded in the index
+        alignment: Byte alignment of every entry
+        compact_ratio: Rewrite from scratch once this fraction is dead bytes
+    
+    Returns:
+        BundleReport
+    """
+    path = Path(path)
+    entries = list(entries)
+    for entry in entries:
+        if entry.sha256 is None:
+            entry.sha256 = _file_hash(entry.path)
+    
+    old: Dict[str, Any] = {}
+    size = 0
+    if path.exists():
+        try:
+            index = read_index(path)
+            if index.get("alignment") == alignment:
+                old = index["entries"]
+                size = index["index_offset"] + index["index_length"]
+        except (BundleError, ValueError, OSError) as e:
+            print(f"⚠️  Rebuilding unreadable bundle {path.name}: {e}")
+    
+    kept = {
+        entry.name: old[entry.name] for entry in entries
+        if entry.name in old and old[entry.name]["sha256"] == entry.sha256
+    }
+    live = sum(item["length"] for item in kept.values())
+    added = sum(entry.path.stat().st_size for entry in entries if entry.name not in kept)
+    compacted = False
+    if old and size and (size - live) > compact_ratio * (size + added):
+        kept, size, compacted = {}, 0, True
+    
+    if not size:
+        return _write_fresh(path, entries, species, alignment, compacted)
+    
+    written = 0
+    index_entries: Dict[str, Any] = {}
+    with open(path, "r+b") as f:
+        offset = size
+        for entry in entries:
+            if entry.name in kept:
+                index_entries[entry.name] = {**kept[entry.name], "kind": entry.kind}
+                continue
+            offset = _align(offset, alignment)
+            f.seek(offset)
+            length = _copy_into(f, entry.path)
+            index_entries[entry.name] = _index_entry(entry, offset, length)
+            offset += length
+            written += length
+        index_offset, index_length = _write_index(f, offset, species, alignment, index_entries)
+        f.flush()
+        os.fsync(f.fileno())
+        f.seek(0)
+        f.write(HEADER.pack(BUNDLE_MAGIC, BUNDLE_VERSION, index_offset, index_length))
+        f.truncate(index_offset + index_length)
+    
+    index_path = _write_sidecar(path, species, alignment, index_entries)
+    return BundleReport(
+        path=str(path),
+        index_path=str(index_path),
+        entries=len(entries),
+        reused=len(kept),
+        appended=len(entries) - len(kept),
+        bytes_written=written + index_length,
+        size=index_offset + index_length,
+        compacted=False
+    )
+
+
+def _write_fresh(
+    path: Path,
+    entries: List[BundleEntry],
+    species: str,
+    alignment: int,
+    compacted: bool
+) -> BundleReport:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    index_entries: Dict[str, Any] = {}
+    fd, temp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "w+b") as f:
+            offset = HEADER.size
+            for entry in entries:
+                offset = _align(offset, alignment)
+                f.seek(offset)
+                length = _copy_into(f, entry.path)
+                index_entries[entry.name] = _index_entry(entry, offset, length)
+                offset += length
+            index_offset, index_length = _write_index(f, offset, species, alignment, index_entries)
+            f.seek(0)
+            f.write(HEADER.pack(BUNDLE_MAGIC, BUNDLE_VERSION, index_offset, index_length))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp, path)
+    except BaseException:
+        os.unlink(temp)
+        raise
+    
+    index_path = _write_sidecar(path, species, alignment, index_entries)
+    size = index_offset + index_length
+    return BundleReport(
+        path=str(path),
+        index_path=str(index_path),
+        entries=len(entries),
+        reused=0,
+        appended=len(entries),
+        bytes_written=size,
+        size=size,
+        compacted=compacted
+    )
+
+
+def _copy_into(f, source: Path) -> int:
+    with open(source, "rb") as src:
+        start = f.tell()
+        shutil.copyfileobj(src, f, 1 << 20)
+        return f.tell() - start
+
+
+def _index_entry(entry: BundleEntry, offset: int, length: int) -> Dict[str, Any]:
+    return {
+        "offset": offset,
+        "length": length,
+        "sha256": entry.sha256,
+        "type": MIME_TYPES.get(entry.path.suffix.lower(), "application/octet-stream"),
+        "kind": entry.kind,
+    }
+
+
+def _index_json(species: str, alignment: int, entries: Dict[str, Any]) -> bytes:
+    return json.dumps(
+        {"version": BUNDLE_VERSION, "species": species, "alignment": alignment, "entries": entries},
+        separators=(",", ":"),
+        sort_keys=True
+    ).encode()
+
+
+def _write_index(f, offset: int, species: str, alignment: int, entries: Dict[str, Any]) -> Tuple[int, int]:
+    offset = _align(offset, alignment)
+    data = _index_json(species, alignment, entries)
+    f.seek(offset)
+    f.write(data)
+    return offset, len(data)
+
+
+def _write_sidecar(path: Path, species: str, alignment: int, entries: Dict[str, Any]) -> Path:
+    """Atomically write <bundle>.json beside the bundle"""
+    index_path = path.with_name(f"{path.name}.json")
+    fd, temp = tempfile.mkstemp(dir=path.parent, prefix=f".{index_path.name}.")
+    with os.fdopen(fd, "wb") as f:
+        f.write(_index_json(species, alignment, entries))
+    os.replace(temp, index_path)
+    return index_path
+
+
+def build_species_bundle(
+    repository: TaskRepository,
+    species: str,
+    output_dir: Optional[Union[str, Path]] = None,
+    kinds: Optional[Sequence[str]] = None,
+    include: Optional[Callable[[ArtifactRecord], bool]] = None,
+    extra_files: Optional[Dict[str, Union[str, Path]]] = None,
+    include_manifest: bool = True,
+    alignment: int = DEFAULT_ALIGNMENT,
+    compact_ratio: float = 0.5
+) -> BundleReport:
+    """Pack a species' artifacts into `<output_dir>/<species>.bundle`
+    
+    The manifests have no review state of their own, so "approved" is
+    whatever `kinds` and `include` select.
+    
+    Args:
+        repository: Repository holding the species manifest
+        species: Species name
+        output_dir: Where to write (default: the species directory)
+        kinds: Artifact kinds to include (default: all)
+        include: Extra filter, e.g. an approval check
+        extra_files: Additional entries, name -> path (textures, JSON...)
+        include_manifest: Add the species manifest as "manifest.json"
+        alignment: Byte alignment of every entry
+        compact_ratio: Dead-byte fraction that triggers a full rewrite
+    
+    Returns:
+        BundleReport
+    """
+    species_dir = repository.base_path / species
+    output_dir = Path(output_dir) if output_dir else species_dir
+    manifest = repository.load_species_manifest(species)
+    
+    entries: Dict[str, BundleEntry] = {}
+    for asset in manifest.asset_specs.values():
+        for artifact in asset.artifacts:
+            if kinds is not None and artifact.kind not in kinds:
+                continue
+            if include is not None and not include(artifact):
+                continue
+            path = species_dir / artifact.relative_path
+            if not path.exists():
+                print(f"⚠️  Skipping missing artifact {species}/{artifact.relative_path}")
+                continue
+            entries[artifact.relative_path] = BundleEntry(
+                name=artifact.relative_path,
+                path=path,
+                sha256=artifact.sha256_hash,
+                kind=artifact.kind
+            )
+    for name, path in (extra_files or {}).items():
+        entries[name] = BundleEntry(name=name, path=Path(path))
+    manifest_path = species_dir / "manifest.json"
+    if include_manifest and manifest_path.exists():
+        entries["manifest.json"] = BundleEntry(name="manifest.json", path=manifest_path, kind="manifest")
+    
+    report = pack_bundle(
+        output_dir / f"{species}.bundle",
+        sorted(entries.values(), key=lambda entry: entry.name),
+        species=species,
+        alignment=alignment,
+        compact_ratio=compact_ratio
+    )
+    print(
+        f"✓ {species}.bundle: {report.entries} entries ({report.reused} reused, "
+        f"{report.appended} written{', compacted' if report.compacted else ''}), {report.size / 1024:.0f} KB"
+    )
+    return report
@@ -0,0 +1,498 @@
+"""Shared meshes for animation GLBs
+
+Every AnimationService result is a complete GLB: the same rigged mesh,
+skin and textures plus one clip. This stage groups the animation GLBs of
+a species by a hash of their mesh-only content (the GLB with its
+animations removed and unreferenced data pruned), so files that repeat
+the same rig land in the same group. Each group is then written either as
+    
+    shared: mesh_<key>.glb with the mesh, skin and textures, plus one
+            animation-only <stem>_clip.glb per source holding just the node
+            hierarchy and keyframes
+    merged: animations_<key>.glb holding the mesh once and every clip
+
+Clip files keep node names and indices, so clips bind to the shared mesh
+by node name (three.js AnimationMixer) or index. Ten animations per
+creature then cost one mesh download instead of ten.
+
+merge_animations groups by the rigged model each animation task was
+submitted against instead, checks every clip's skeleton against the rig
+and writes one animations_<model_id>.glb per model with clips named from
+the AnimationCatalog.
+"""
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from ..catalog import AnimationCatalog
+from ..persistence.repository import TaskRepository
+from ..persistence.schemas import ArtifactRecord, AssetManifest, TaskGraphEntry
+from .artifacts import derived_path, derived_record, glb_artifacts
+from .glb import GlbBuilder, GlbError, GlbFile
+
+SHARED_MESH_KIND = "shared_mesh"
+CLIP_KIND = "clip"
+ANIMATION_SET_KIND = "animation_set"
+
+# Top-level glTF properties an animation-only file does not need
+_MESH_PROPERTIES = ("meshes", "skins", "materials", "textures", "images", "samplers")
+
+
+@dataclass
+class SharedMeshGroup:
+    """Animation GLBs sharing one mesh, and the files written for them"""
+    mesh_key: str
+    sources: List[str]  # animation GLB paths
+    clips: List[str]  # clip name per source
+    outputs: List[str] = field(default_factory=list)  # mesh then clips, or the merged GLB
+    bytes_before: int = 0
+    bytes_after: int = 0
+    
+    @property
+    def saved_fraction(self) -> float:
+        if not self.bytes_before:
+            return 0.0
+        return 1.0 - self.bytes_after / self.bytes_before
+
+
+@dataclass
+class AnimationSet:
+    """Clips of one rigged model merged into a single GLB"""
+    model_id: str
+    path: str
+    clips: List[str] = field(default_factory=list)
+    sources: List[str] = field(default_factory=list)  # animation GLBs merged
+    skipped: Dict[str, str] = field(default_factory=dict)  # animation GLB -> reason
+    bytes_before: int = 0
+    bytes_after: int = 0
+
+
+class SkeletonMismatchError(ValueError):
+    """A clip's node hierarchy or skin joints differ from the mesh's"""
+    pass
+
+
+def check_skeleton(reference: GlbFile, glb: GlbFile) -> None:
+    """Check that a clip's channels would drive the same joints in reference
+    
+    Channels address nodes by index, so node names and the hierarchy must
+    match index for index. Skin joints are compared when both files have
+    skins (clip-only files have none).
+    
+    Raises:
+        SkeletonMismatchError: Describing the first difference
+    """
+    nodes = reference.json.get("nodes", [])
+    other = glb.json.get("nodes", [])
+    if len(nodes) != len(other):
+        raise SkeletonMismatchError(f"{len(other)} nodes, expected {len(nodes)}")
+    for i, (node, clip_node) in enumerate(zip(nodes, other)):
+        if node.get("name") != clip_node.get("name"):
+            raise SkeletonMismatchError(f"Node {i} is {clip_node.get('name')!r}, expected {node.get('name')!r}")
+        if node.get("children", []) != clip_node.get("children", []):
+            raise SkeletonMismatchError(f"Node {i} ({node.get('name')!r}) has different children")
+    
+    skins, clip_skins = reference.json.get("skins", []), glb.json.get("skins", [])
+    if skins and clip_skins and [s.get("joints") for s in skins] != [s.get("joints") for s in clip_skins]:
+        raise SkeletonMismatchError("Skin joints differ")
+
+
+def mesh_only(glb: GlbFile) -> bytes:
+    """The GLB without animations or the data only they referenced"""
+    builder = GlbBuilder.from_glb(glb)
+    builder.gltf.pop("animations", None)
+    return builder.build()
+
+
+def mesh_key(path: Union[str, Path]) -> str:
+    """SHA-256 of a GLB's mesh-only content; top-level for process pools"""
+    with GlbFile.open(path) as glb:
+        return hashlib.sha256(mesh_only(glb)).hexdigest()
+
+
+def clip_only(glb: GlbFile, name: Optional[str] = None) -> bytes:
+    """The GLB reduced to its node hierarchy and animations
+    
+    Args:
+        glb: Animation GLB
+        name: Rename the clip (only applied when the file has one animation)
+    """
+    builder = GlbBuilder.from_glb(glb)
+    gltf = builder.gltf
+    for key in (*_MESH_PROPERTIES, "extensionsUsed", "extensionsRequired"):
+        gltf.pop(key, None)
+    for node in gltf.get("nodes", []):
+        node.pop("mesh", None)
+        node.pop("skin", None)
+        node.pop("weights", None)
+    animations = gltf.get("animations", [])
+    if name and len(animations) == 1:
+        animations[0]["name"] = name
+    return builder.build()
+
+
+def merge_clips(mesh: GlbFile, clips: Sequence[Tuple[str, GlbFile]]) -> bytes:
+    """One GLB with the mesh and the animations of every clip GLB
+    
+    Animations already in the mesh GLB are dropped. Clip GLBs must share
+    the mesh's node hierarchy. A clip file with one animation is named
+    after its clip name; several get `<name>_<i>`.
+    
+    Raises:
+        SkeletonMismatchError: If a clip's skeleton differs from the mesh's
+    """
+    for _, glb in clips:
+        check_skeleton(mesh, glb)
+    builder = GlbBuilder.from_glb(mesh)
+    animations = builder.gltf["animations"] = []
+    for clip_name, glb in clips:
+        source_animations = glb.json.get("animations", [])
+        for i, animation in enumerate(source_animations):
+            samplers = []
+            for sampler in animation.get("samplers", []):
+                samplers.append({
+                    **sampler,
+                    "input": builder.copy_accessor(glb, sampler["input"]),
+                    "output": builder.copy_accessor(glb, sampler["output"]),
+                })
+            name = clip_name if len(source_animations) == 1 else f"{clip_name}_{i}"
+            animations.append({**animation, "name": name, "samplers": samplers})
+    return builder.build()
+
+
+def write_shared_group(
+    sources: Sequence[Union[str, Path]],
+    clips: Sequence[str],
+    key: str,
+    merge: bool = False
+) -> SharedMeshGroup:
+    """Write a group's shared mesh and clip files (or merged GLB) next to the first source
+    
+    Top-level so it can run in a process pool.
+    """
+    sources = [Path(source) for source in sources]
+    directory = sources[0].parent
+    group = SharedMeshGroup(
+        mesh_key=key,
+        sources=[str(source) for source in sources],
+        clips=list(clips),
+        bytes_before=sum(source.stat().st_size for source in sources)
+    )
+    
+    opened = [GlbFile.open(source) for source in sources]
+    try:
+        if merge:
+            path = directory / f"animations_{key[:12]}.glb"
+            path.write_bytes(merge_clips(opened[0], list(zip(clips, opened))))
+            group.outputs.append(str(path))
+        else:
+            path = directory / f"mesh_{key[:12]}.glb"
+            path.write_bytes(mesh_only(opened[0]))
+            group.outputs.append(str(path))
+            for source, clip, glb in zip(sources, clips, opened):
+                path = Path(derived_path(str(source), "_clip"))
+                path.write_bytes(clip_only(glb, clip))
+                group.outputs.append(str(path))
+    finally:
+        for glb in opened:
+            glb.close()
+    
+    group.bytes_after = sum(Path(output).stat().st_size for output in group.outputs)
+    return group
+
+
+def _clip_name(asset: AssetManifest, artifact: ArtifactRecord) -> str:
+    """Webhook endpoint of the animation task (the pipeline's animation name)"""
+    for task in asset.task_graph:
+        callback_url = task.payload.get("callback_url")
+        if task.service == "animation" and callback_url:
+            return callback_url.rstrip("/").rsplit("/", 1)[-1]
+    return Path(artifact.relative_path).stem
+
+
+def extract_shared_meshes(
+    repository: TaskRepository,
+    species: Optional[str] = None,
+    merge: bool = False,
+    max_workers: Optional[int] = None,
+    force: bool = False
+) -> List[SharedMeshGroup]:
+    """Group animation artifacts by mesh and write shared mesh + clip files
+    
+    A group is skipped when every source already has its clip file (or is
+    part of a merged GLB) unless force is set; a new animation for a rig
+    rebuilds that rig's group.
+    
+    Args:
+        repository: Repository whose animation artifacts to process
+        species: Only this species (default: all)
+        merge: Write one multi-clip GLB per group instead of mesh + clips
+        max_workers: Process pool size (default: CPU count)
+        force: Rebuild groups that are already split
+    
+    Returns:
+        Groups that were written; paths are relative to the species directory
+    """
+    sources = []  # (species, spec hash, artifact, clip name)
+    for name, spec_hash, asset, artifact in glb_artifacts(repository, species):
+        if any(task.service == "animation" for task in asset.task_graph):
+            sources.append((name, spec_hash, artifact, _clip_name(asset, artifact)))
+    
+    done = set()
+    for name, _, _, artifact in glb_artifacts(repository, species, kinds=(CLIP_KIND, ANIMATION_SET_KIND)):
+        if artifact.kind == (ANIMATION_SET_KIND if merge else CLIP_KIND):
+            done.add((name, artifact.derived_from))
+            done.update((name, source) for source in artifact.params.get("sources", []))
+    
+    groups: List[SharedMeshGroup] = []
+    if not sources:
+        return groups
+    
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        paths = [repository.base_path / name / artifact.relative_path for name, _, artifact, _ in sources]
+        keys = list(pool.map(mesh_key, paths))
+        
+        by_key: Dict[Tuple[str, str], List[Tuple[str, ArtifactRecord, str]]] = {}
+        for (name, spec_hash, artifact, clip), key in zip(sources, keys):
+            by_key.setdefault((name, key), []).append((spec_hash, artifact, clip))
+        
+        futures = []
+        for (name, key), members in by_key.items():
+            if not force and all((name, artifact.relative_path) in done for _, artifact, _ in members):
+                continue
+            futures.append((name, members, pool.submit(
+                write_shared_group,
+                [repository.base_path / name / artifact.relative_path for _, artifact, _ in members],
+                [clip for _, _, clip in members],
+                key,
+                merge
+            )))
+        
+        for name, members, future in futures:
+            try:
+                group = future.result()
+            except Exception as e:
+                print(f"✗ Shared mesh extraction failed for {name}: {e}")
+                continue
+            _record_group(repository, name, members, group, merge)
+            groups.append(group)
+            print(
+                f"✓ {name}: {len(members)} animation GLBs → {len(group.outputs)} files, "
+                f"{group.bytes_before / 1024:.0f} KB → {group.bytes_after / 1024:.0f} KB"
+            )
+    return groups
+
+
+def _record_group(
+    repository: TaskRepository,
+    species: str,
+    members: List[Tuple[str, ArtifactRecord, str]],
+    group: SharedMeshGroup,
+    merge: bool
+) -> None:
+    """Register a written group and rewrite its paths relative to the species"""
+    species_dir = repository.base_path / species
+    relative = [str(Path(output).relative_to(species_dir)) for output in group.outputs]
+    source_paths = [artifact.relative_path for _, artifact, _ in members]
+    first_hash, first, _ = members[0]
+    
+    if merge:
+        repository.record_artifacts(species, first_hash, [derived_record(
+            first.relative_path, group.outputs[0], ANIMATION_SET_KIND,
+            {"mesh_key": group.mesh_key, "sources": source_paths, "clips": group.clips}
+        )])
+    else:
+        repository.record_artifacts(species, first_hash, [derived_record(
+            first.relative_path, group.outputs[0], SHARED_MESH_KIND,
+            {"mesh_key": group.mesh_key, "sources": source_paths}
+        )])
+        for (spec_hash, artifact, clip), output in zip(members, group.outputs[1:]):
+            repository.record_artifacts(species, spec_hash, [derived_record(
+                artifact.relative_path, output, CLIP_KIND, {"clip": clip, "mesh": relative[0]}
+            )])
+    
+    group.sources = source_paths
+    group.outputs = relative
+
+
+def write_animation_set(
+    model_id: str,
+    reference: Union[str, Path],
+    sources: Sequence[Union[str, Path]],
+    clips: Sequence[str],
+    output: Union[str, Path]
+) -> AnimationSet:
+    """Merge every source whose skeleton matches reference into output
+    
+    The mesh, skin and textures come from reference; sources that fail to
+    parse or have a different skeleton are left out and reported in
+    `skipped`. Top-level so it can run in a process pool.
+    """
+    result = AnimationSet(model_id=model_id, path=str(output))
+    opened: List[Tuple[str, GlbFile]] = []
+    try:
+        with GlbFile.open(reference) as mesh:
+            for source, clip in zip(sources, clips):
+                try:
+                    glb = GlbFile.open(source)
+                except GlbError as e:
+                    result.skipped[str(source)] = str(e)
+                    continue
+                try:
+                    check_skeleton(mesh, glb)
+                except SkeletonMismatchError as e:
+                    glb.close()
+                    result.skipped[str(source)] = str(e)
+                    continue
+                opened.append((clip, glb))
+                result.sources.append(str(source))
+                result.clips.append(clip)
+                result.bytes_before += Path(source).stat().st_size
+            if opened:
+                Path(output).write_bytes(merge_clips(mesh, opened))
+                result.bytes_after = Path(output).stat().st_size
+    finally:
+        for _, glb in opened:
+            glb.close()
+    return result
+
+
+def _animation_task(asset: AssetManifest) -> Optional[TaskGraphEntry]:
+    return next((task for task in asset.task_graph if task.service == "animation"), None)
+
+
+def _catalog_clip_name(animation_id: Any, catalog: AnimationCatalog) -> Optional[str]:
+    try:
+        return catalog.get_by_id(int(animation_id))["name"]
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _rig_path(repository: TaskRepository, species: str, model_id: str) -> Optional[Path]:
+    """Downloaded GLB of the rigging task an animation was applied to"""
+    found = repository.find_task_by_id(model_id, species)
+    if not found:
+        return None
+    for artifact in found[2].artifacts:
+        path = repository.base_path / species / artifact.relative_path
+        if artifact.kind == "download" and artifact.relative_path.endswith(".glb") and path.exists():
+            return path
+    return None
+
+
+def merge_animations(
+    repository: TaskRepository,
+    species: Optional[str] = None,
+    catalog: Optional[AnimationCatalog] = None,
+    max_workers: Optional[int] = None,
+    force: bool = False
+) -> List[AnimationSet]:
+    """Merge each rigged model's animation GLBs into one multi-clip GLB
+    
+    Animation tasks are grouped by the model_id they were submitted with
+    and named after their AnimationCatalog entry (falling back to the
+    webhook endpoint). The rigging task's own GLB, when downloaded, is the
+    reference skeleton and supplies the mesh; otherwise the first clip
+    does. The result is recorded as one "animation_set" artifact on the
+    first animation asset. Tasks recorded before model_id was kept are
+    left to extract_shared_meshes(merge=True), which groups by content.
+    
+    Args:
+        repository: Repository whose animation artifacts to merge
+        species: Only this species (default: all)
+        catalog: Animation catalog for clip names (default: bundled catalog)
+        max_workers: Process pool size (default: CPU count)
+        force: Rebuild sets whose sources have not changed
+    
+    Returns:
+        Animation sets that were written; paths are relative to the species directory
+    """
+    catalog = catalog or AnimationCatalog()
+    groups: Dict[Tuple[str, str], List[Tuple[str, ArtifactRecord, str]]] = {}
+    for name, spec_hash, asset, artifact in glb_artifacts(repository, species):
+        task = _animation_task(asset)
+        if task is None or not task.payload.get("model_id"):
+            continue
+        clip = _catalog_clip_name(task.payload.get("animation_id"), catalog) or _clip_name(asset, artifact)
+        groups.setdefault((name, task.payload["model_id"]), []).append((spec_hash, artifact, clip))
+    
+    done = set()
+    for name, _, _, artifact in glb_artifacts(repository, species, kinds=(ANIMATION_SET_KIND,)):
+        if "model_id" in artifact.params:
+            done.add((name, artifact.params["model_id"], tuple(sorted(artifact.params.get("sources", [])))))
+    
+    sets: List[AnimationSet] = []
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = []
+        for (name, model_id), members in groups.items():
+            members.sort(key=lambda member: member[1].relative_path)
+            sources = tuple(artifact.relative_path for _, artifact, _ in members)
+            if not force and (name, model_id, sources) in done:
+                continue
+            
+            clips = []
+            for _, _, clip in members:
+                unique, i = clip, 2
+                while unique in clips:
+                    unique, i = f"{clip}_{i}", i + 1
+                clips.append(unique)
+            species_dir = repository.base_path / name
+            paths = [species_dir / source for source in sources]
+            futures.append((name, members, pool.submit(
+                write_animation_set,
+                model_id,
+                _rig_path(repository, name, model_id) or paths[0],
+                paths,
+                clips,
+                species_dir / f"animations_{model_id}.glb"
+            )))
+        
+        for name, members, future in futures:
+            try:
+                animation_set = future.result()
+            except Exception as e:
+                print(f"✗ Animation merge failed for {name}: {e}")
+                continue
+            for source, reason in animation_set.skipped.items():
+                print(f"⚠️  {Path(source).name} left out of {Path(animation_set.path).name}: {reason}")
+            if not animation_set.sources:
+                continue
+            _record_animation_set(repository, name, members, animation_set)
+            sets.append(animation_set)
+            print(
+                f"✓ {name}: {len(animation_set.clips)} clips → {animation_set.path}, "
+                f"{animation_set.bytes_before / 1024:.0f} KB → {animation_set.bytes_after / 1024:.0f} KB"
+            )
+    return sets
+
+
+def _record_animation_set(
+    repository: TaskRepository,
+    species: str,
+    members: List[Tuple[str, ArtifactRecord, str]],
+    animation_set: AnimationSet
+) -> None:
+    """Register a written set and rewrite its paths relative to the species"""
+    species_dir = repository.base_path / species
+    
+    def relative(path: str) -> str:
+        return str(Path(path).relative_to(species_dir))
+    
+    first_hash, first, _ = members[0]
+    
+    # Sources are listed even when skipped, so an unchanged group is not retried
+    repository.record_artifacts(species, first_hash, [derived_record(
+        first.relative_path, animation_set.path, ANIMATION_SET_KIND,
+        {
+            "model_id": animation_set.model_id,
+            "sources": [artifact.relative_path for _, artifact, _ in members],
+            "clips": animation_set.clips,
+            "skipped": {relative(source): reason for source, reason in animation_set.skipped.items()},
+        }
+    )])
+    
+    animation_set.path = relative(animation_set.path)
+    animation_set.sources = [relative(source) for source in animation_set.sources]
+    animation_set.skipped = {relative(source): reason for source, reason in animation_set.skipped.items()}
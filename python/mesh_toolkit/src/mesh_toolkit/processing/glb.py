@@ -0,0 +1,475 @@
+"""Zero-copy reader for binary glTF (GLB) files
+
+GlbFile maps the file with mmap and exposes the BIN chunk as a memoryview,
+so inspecting a 50 MB character only reads the pages that accessors
+actually touch. Only the JSON chunk is copied (it is parsed).
+    
+    with GlbFile.open("otter_rigging.glb") as glb:
+        stats = glb.stats()
+        positions = glb.accessor_view(0)  # memoryview into the mapped file
+
+Views handed out are only valid until the file is closed.
+"""
+import json
+import mmap
+import struct
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from ..persistence.schemas import MeshStats
+
+GLB_MAGIC = b"glTF"
+CHUNK_JSON = 0x4E4F534A
+CHUNK_BIN = 0x004E4942
+
+# accessor.componentType -> struct format
+COMPONENT_FORMATS = {
+    5120: "b",  # BYTE
+    5121: "B",  # UNSIGNED_BYTE
+    5122: "h",  # SHORT
+    5123: "H",  # UNSIGNED_SHORT
+    5125: "I",  # UNSIGNED_INT
+    5126: "f",  # FLOAT
+}
+
+FLOAT = 5126
+
+# accessor.type -> components per element
+TYPE_COMPONENTS = {
+    "SCALAR": 1,
+    "VEC2": 2,
+    "VEC3": 3,
+    "VEC4": 4,
+    "MAT2": 4,
+    "MAT3": 9,
+    "MAT4": 16,
+}
+
+# primitive.mode values that produce triangles
+TRIANGLES = 4
+TRIANGLE_STRIP = 5
+TRIANGLE_FAN = 6
+
+
+class GlbError(ValueError):
+    """The data is not a well-formed GLB file"""
+    pass
+
+
+class GlbFile:
+    """A parsed GLB whose binary chunk is viewed in place"""
+    
+    def __init__(self, data: Union[bytes, bytearray, memoryview, mmap.mmap]):
+        """Parse the GLB container
+        
+        Args:
+            data: The whole file; kept referenced, not copied
+        
+        Raises:
+            GlbError: If the header or chunk layout is invalid
+        """
+        self._mmap: Optional[mmap.mmap] = None
+        self._views: List[memoryview] = []
+        self.buffer = self._track(memoryview(data))
+        self.json: Dict[str, Any] = {}
+        self.bin: Optional[memoryview] = None
+        
+        try:
+            self._parse()
+        except Exception:
+            self.close()
+            raise
+    
+    @classmethod
+    def open(cls, path: Union[str, Path]) -> "GlbFile":
+        """Memory-map a GLB file read-only"""
+        with open(path, "rb") as f:
+            try:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # empty file
+                raise GlbError(f"Not a GLB file: {path} is empty")
+        try:
+            glb = cls(mapped)
+        except Exception:
+            mapped.close()
+            raise
+        glb._mmap = mapped
+        return glb
+    
+    def _track(self, view: memoryview) -> memoryview:
+        self._views.append(view)
+        return view
+    
+    def _parse(self) -> None:
+        data = self.buffer
+        if len(data) < 12 or bytes(data[:4]) != GLB_MAGIC:
+            raise GlbError("Not a GLB file")
+        version, length = struct.unpack_from("<II", data, 4)
+        if version != 2:
+            raise GlbError(f"Unsupported GLB version {version}")
+        if length > len(data):
+            raise GlbError(f"GLB truncated: header says {length} bytes, have {len(data)}")
+        
+        offset = 12
+        chunks = []
+        while offset + 8 <= length:
+            chunk_length, chunk_type = struct.unpack_from("<II", data, offset)
+            start = offset + 8
+            if start + chunk_length > length:
+                raise GlbError("GLB chunk runs past end of file")
+            chunks.append((chunk_type, start, chunk_length))
+            offset = start + chunk_length + (-chunk_length % 4)
+        
+        if not chunks or chunks[0][0] != CHUNK_JSON:
+            raise GlbError("GLB does not start with a JSON chunk")
+        _, start, chunk_length = chunks[0]
+        try:
+            self.json = json.loads(bytes(data[start:start + chunk_length]))
+        except ValueError as e:
+            raise GlbError(f"Invalid GLB JSON chunk: {e}")
+        
+        for chunk_type, start, chunk_length in chunks[1:]:
+            if chunk_type == CHUNK_BIN:
+                self.bin = self._track(data[start:start + chunk_length])
+                break
+    
+    def close(self) -> None:
+        """Release all views and unmap the file"""
+        for view in reversed(self._views):
+            view.release()
+        self._views.clear()
+        self.bin = None
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                pass  # a caller still holds a view; unmapped when it is released
+            self._mmap = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *args):
+        self.close()
+    
+    def accessor_layout(self, index: int) -> Tuple[str, int, int, int, int]:
+        """(struct format, components, count, byte offset in BIN, byte stride)"""
+        accessor = self.json["accessors"][index]
+        if "bufferView" not in accessor:
+            raise GlbError(f"Accessor {index} has no bufferView (sparse-only accessors are not supported)")
+        view = self.json["bufferViews"][accessor["bufferView"]]
+        if view.get("buffer", 0) != 0:
+            raise GlbError(f"Accessor {index} references an external buffer")
+        
+        fmt = COMPONENT_FORMATS[accessor["componentType"]]
+        components = TYPE_COMPONENTS[accessor["type"]]
+        element_size = struct.calcsize("<" + fmt) * components
+        offset = view.get("byteOffset", 0) + accessor.get("byteOffset", 0)
+        stride = view.get("byteStride") or element_size
+        return fmt, components, accessor["count"], offset, stride
+    
+    def accessor_view(self, index: int) -> memoryview:
+        """Bytes backing an accessor, viewed in place (includes stride padding)"""
+        if self.bin is None:
+            raise GlbError("GLB has no BIN chunk")
+        fmt, components, count, offset, stride = self.accessor_layout(index)
+        if count == 0:
+            return self._track(self.bin[offset:offset])
+        element_size = struct.calcsize("<" + fmt) * components
+        end = offset + stride * (count - 1) + element_size
+        if end > len(self.bin):
+            raise GlbError(f"Accessor {index} runs past the end of the BIN chunk")
+        return self._track(self.bin[offset:end])
+    
+    def accessor_values(self, index: int) -> Iterator[Tuple]:
+        """Decode an accessor element by element without copying the buffer"""
+        fmt, components, count, _, stride = self.accessor_layout(index)
+        element = struct.Struct(f"<{components}{fmt}")
+        view = self.accessor_view(index)
+        if stride == element.size:
+            yield from element.iter_unpack(view)
+        else:
+            for i in range(count):
+                yield element.unpack_from(view, i * stride)
+    
+    def _accessor_range(self, index: int) -> Tuple[Optional[List[float]], Optional[List[float]]]:
+        """Accessor min/max, read from the buffer when the JSON omits them"""
+        accessor = self.json["accessors"][index]
+        if "min" in accessor and "max" in accessor:
+            return accessor["min"], accessor["max"]
+        if self.bin is None or not accessor.get("count"):
+            return None, None
+        lows = highs = None
+        for values in self.accessor_values(index):
+            if lows is None:
+                lows, highs = list(values), list(values)
+                continue
+            for i, value in enumerate(values):
+                if value < lows[i]:
+                    lows[i] = value
+                elif value > highs[i]:
+                    highs[i] = value
+        return lows, highs
+    
+    def stats(self) -> MeshStats:
+        """Geometry, material, skin and animation summary
+        
+        Bounds are the union of POSITION ranges in mesh space (node
+        transforms are not applied). Quantized positions are left out since
+        their range is only meaningful with the node transform.
+        """
+        gltf = self.json
+        accessors = gltf.get("accessors", [])
+        stats = MeshStats(
+            mesh_count=len(gltf.get("meshes", [])),
+            material_count=len(gltf.get("materials", [])),
+            texture_count=len(gltf.get("textures", [])),
+            image_count=len(gltf.get("images", [])),
+            skin_count=len(gltf.get("skins", [])),
+            joint_count=len({joint for skin in gltf.get("skins", []) for joint in skin.get("joints", [])}),
+        )
+        
+        positions = set()
+        for mesh in gltf.get("meshes", []):
+            for primitive in mesh.get("primitives", []):
+                stats.primitive_count += 1
+                position = primitive.get("attributes", {}).get("POSITION")
+                if position is not None:
+                    positions.add(position)
+                index = primitive.get("indices", position)
+                if index is None:
+                    continue
+                count = accessors[index]["count"]
+                mode = primitive.get("mode", TRIANGLES)
+                if mode == TRIANGLES:
+                    stats.triangle_count += count // 3
+                elif mode in (TRIANGLE_STRIP, TRIANGLE_FAN):
+                    stats.triangle_count += max(0, count - 2)
+        
+        for position in sorted(positions):
+            stats.vertex_count += accessors[position]["count"]
+            if accessors[position]["componentType"] != FLOAT:
+                continue
+            low, high = self._accessor_range(position)
+            if low is None:
+                continue
+            if stats.bounds_min is None:
+                stats.bounds_min, stats.bounds_max = list(low[:3]), list(high[:3])
+            else:
+                stats.bounds_min = [min(a, b) for a, b in zip(stats.bounds_min, low)]
+                stats.bounds_max = [max(a, b) for a, b in zip(stats.bounds_max, high)]
+        
+        for i, animation in enumerate(gltf.get("animations", [])):
+            duration = 0.0
+            for sampler in animation.get("samplers", []):
+                _, high = self._accessor_range(sampler["input"])
+                if high:
+                    duration = max(duration, high[0])
+            name = animation.get("name") or f"animation_{i}"
+            if name in stats.animations:
+                name = f"{name}_{i}"
+            stats.animations[name] = duration
+        
+        return stats
+
+
+def inspect_glb(source: Union[str, Path, bytes, bytearray, memoryview]) -> MeshStats:
+    """Mesh statistics for a GLB file path or in-memory GLB
+    
+    Raises:
+        GlbError: If the data is not a well-formed GLB
+    """
+    if isinstance(source, (str, Path)):
+        glb = GlbFile.open(source)
+    else:
+        glb = GlbFile(source)
+    with glb:
+        return glb.stats()
+
+
+def build_glb(gltf: Dict[str, Any], binary: Optional[bytes] = None) -> bytes:
+    """Serialize a glTF JSON document and optional BIN chunk as GLB
+    
+    buffers[0].byteLength is set to the BIN chunk length.
+    """
+    gltf = dict(gltf)
+    if binary is not None:
+        gltf["buffers"] = [{**(gltf.get("buffers") or [{}])[0], "byteLength": len(binary)}]
+    json_chunk = json.dumps(gltf, separators=(",", ":")).encode()
+    json_chunk += b" " * (-len(json_chunk) % 4)
+    chunks = struct.pack("<II", len(json_chunk), CHUNK_JSON) + json_chunk
+    if binary is not None:
+        bin_chunk = bytes(binary) + b"\0" * (-len(binary) % 4)
+        chunks += struct.pack("<II", len(bin_chunk), CHUNK_BIN) + bin_chunk
+    return struct.pack("<4sII", GLB_MAGIC, 2, 12 + len(chunks)) + chunks
+
+
+def _accessor_refs(gltf: Dict[str, Any]) -> Iterator[Tuple[Dict[str, Any], str]]:
+    """(container, key) for every accessor index stored in the document"""
+    for mesh in gltf.get("meshes", []):
+        for primitive in mesh.get("primitives", []):
+            attributes = primitive.get("attributes", {})
+            for key in attributes:
+                yield attributes, key
+            if "indices" in primitive:
+                yield primitive, "indices"
+            for target in primitive.get("targets", []):
+                for key in target:
+                    yield target, key
+    for skin in gltf.get("skins", []):
+        if "inverseBindMatrices" in skin:
+            yield skin, "inverseBindMatrices"
+    for animation in gltf.get("animations", []):
+        for sampler in animation.get("samplers", []):
+            yield sampler, "input"
+            yield sampler, "output"
+
+
+def _view_refs(gltf: Dict[str, Any]) -> Iterator[Tuple[Dict[str, Any], str]]:
+    """(container, key) for every bufferView index stored in the document"""
+    for accessor in gltf.get("accessors", []):
+        if "bufferView" in accessor:
+            yield accessor, "bufferView"
+        sparse = accessor.get("sparse")
+        if sparse:
+            yield sparse["indices"], "bufferView"
+            yield sparse["values"], "bufferView"
+    for image in gltf.get("images", []):
+        if "bufferView" in image:
+            yield image, "bufferView"
+
+
+class GlbBuilder:
+    """Writes a modified glTF document back to GLB
+    
+    Start from a source GlbFile, edit `gltf` freely and add new data with
+    add_view/add_accessor. build() drops accessors and bufferViews nothing
+    references any more and packs the remaining data into a fresh BIN
+    chunk, copying untouched views straight from the source mapping.
+    build() rewrites indices in place, so call it once per builder.
+    """
+    
+    def __init__(self, gltf: Dict[str, Any], source: Optional[GlbFile] = None):
+        """Initialize builder
+        
+        Args:
+            gltf: Document to write; deep-copied, edit builder.gltf afterwards
+            source: GLB holding the data of the document's existing bufferViews
+        """
+        self.gltf = json.loads(json.dumps(gltf))
+        self.gltf.setdefault("bufferViews", [])
+        self.gltf.setdefault("accessors", [])
+        self.source = source
+        self._data: Dict[int, Union[bytes, memoryview]] = {}  # new view index -> data
+    
+    @classmethod
+    def from_glb(cls, glb: GlbFile) -> "GlbBuilder":
+        return cls(glb.json, source=glb)
+    
+    def add_view(
+        self,
+        data: Union[bytes, bytearray, memoryview],
+        target: Optional[int] = None,
+        byte_stride: Optional[int] = None
+    ) -> int:
+        """Add a bufferView holding data; returns its index"""
+        view: Dict[str, Any] = {"buffer": 0, "byteLength": len(data)}
+        if target is not None:
+            view["target"] = target
+        if byte_stride is not None:
+            view["byteStride"] = byte_stride
+        self.gltf["bufferViews"].append(view)
+        index = len(self.gltf["bufferViews"]) - 1
+        self._data[index] = data
+        return index
+    
+    def add_accessor(
+        self,
+        data: Union[bytes, bytearray, memoryview],
+        component_type: int,
+        accessor_type: str,
+        count: int,
+        target: Optional[int] = None,
+        normalized: bool = False,
+        bounds: Optional[Tuple[List[float], List[float]]] = None
+    ) -> int:
+        """Add a tightly packed accessor in its own bufferView; returns its index"""
+        accessor: Dict[str, Any] = {
+            "bufferView": self.add_view(data, target=target),
+            "componentType": component_type,
+            "count": count,
+            "type": accessor_type,
+        }
+        if normalized:
+            accessor["normalized"] = True
+        if bounds is not None:
+            accessor["min"], accessor["max"] = list(bounds[0]), list(bounds[1])
+        self.gltf["accessors"].append(accessor)
+        return len(self.gltf["accessors"]) - 1
+    
+    def copy_accessor(self, glb: GlbFile, index: int) -> int:
+        """Copy an accessor of another GLB, tightly packed; returns its index"""
+        source = glb.json["accessors"][index]
+        if "sparse" in source:
+            raise GlbError(f"Accessor {index} is sparse; copying sparse accessors is not supported")
+        fmt, components, count, _, stride = glb.accessor_layout(index)
+        element_size = struct.calcsize("<" + fmt) * components
+        view = glb.accessor_view(index)
+        if stride == element_size:
+            data = bytes(view)
+        else:
+            data = b"".join(view[i * stride:i * stride + element_size] for i in range(count))
+        
+        accessor = {k: v for k, v in source.items() if k not in ("bufferView", "byteOffset")}
+        target = glb.json["bufferViews"][source["bufferView"]].get("target")
+        accessor["bufferView"] = self.add_view(data, target=target)
+        self.gltf["accessors"].append(accessor)
+        return len(self.gltf["accessors"]) - 1
+    
+    def _view_data(self, index: int) -> Union[bytes, memoryview]:
+        if index in self._data:
+            return self._data[index]
+        if self.source is None or self.source.bin is None:
+            raise GlbError(f"No data for bufferView {index}")
+        view = self.gltf["bufferViews"][index]
+        if view.get("buffer", 0) != 0:
+            raise GlbError(f"bufferView {index} references an external buffer")
+        start = view.get("byteOffset", 0)
+        return self.source.bin[start:start + view["byteLength"]]
+    
+    def _prune_accessors(self) -> None:
+        refs = list(_accessor_refs(self.gltf))
+        used = sorted({container[key] for container, key in refs})
+        remap = {old: new for new, old in enumerate(used)}
+        self.gltf["accessors"] = [self.gltf["accessors"][old] for old in used]
+        for container, key in refs:
+            container[key] = remap[container[key]]
+        if not used:
+            self.gltf.pop("accessors")
+    
+    def build(self) -> bytes:
+        """Serialize to GLB with unreferenced data removed"""
+        self._prune_accessors()
+        
+        refs = list(_view_refs(self.gltf))
+        used = sorted({container[key] for container, key in refs})
+        views = []
+        binary = bytearray()
+        remap = {}
+        for old in used:
+            data = self._view_data(old)
+            binary += b"\0" * (-len(binary) % 4)
+            view = dict(self.gltf["bufferViews"][old])
+            view.update(buffer=0, byteOffset=len(binary), byteLength=len(data))
+            binary += data
+            remap[old] = len(views)
+            views.append(view)
+        for container, key in refs:
+            container[key] = remap[container[key]]
+        
+        self.gltf["bufferViews"] = views
+        if not views:
+            self.gltf.pop("bufferViews")
+            self.gltf.pop("buffers", None)
+            return build_glb(self.gltf)
+        return build_glb(self.gltf, bytes(binary))
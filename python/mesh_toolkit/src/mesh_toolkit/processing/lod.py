@@ -0,0 +1,288 @@
+"""Level-of-detail chains by vectorized vertex clustering
+
+Each LOD level snaps vertices to a uniform grid, merges every cell into one
+vertex and drops the triangles that collapse. The grid resolution is binary
+searched per primitive until the triangle count fits the level's ratio.
+Merged vertices take the mean position (and renormalized mean normal) of
+their cell; UVs, skin weights and other attributes come from one
+representative vertex, so skinned meshes stay skinned. Clustering also
+merges across UV seams, which is acceptable at the distances LODs are
+shown at.
+
+Levels are written next to the source as `<stem>_lod<N>.glb`; everything
+except mesh geometry (materials, textures, skins, animations) is kept.
+Needs numpy (pip install mesh-toolkit[mesh]).
+"""
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from ..persistence.repository import TaskRepository
+from ..persistence.schemas import ArtifactRecord
+from .arrays import ELEMENT_ARRAY_BUFFER, accessor_array, add_array, np, require_numpy
+from .artifacts import derived_path
+from .glb import TRIANGLES, GlbBuilder, GlbFile
+from .pipeline import PostProcessingPipeline, PostProcessStage, StageOutput
+
+# Fraction of the source triangles kept per level; level 0 is the source itself
+DEFAULT_LOD_RATIOS: Tuple[float, ...] = (1.0, 0.5, 0.2)
+
+LOD_KIND = "lod"
+
+# Binary search steps over grid resolution
+_SEARCH_STEPS = 14
+
+
+@dataclass
+class LodLevel:
+    """One written LOD file"""
+    level: int
+    ratio: float
+    path: str
+    triangle_count: int
+    source_triangle_count: int
+
+
+def cluster_vertices(positions: "np.ndarray", resolution: int) -> Tuple["np.ndarray", int]:
+    """Cluster id per vertex on a grid with `resolution` cells along the longest axis
+    
+    Returns:
+        (cluster index per vertex, number of clusters)
+    """
+    low = positions.min(axis=0)
+    extent = float((positions.max(axis=0) - low).max())
+    cell = extent / resolution if extent > 0 else 1.0
+    keys = np.floor((positions - low) / cell).astype(np.int64)
+    keys = np.minimum(keys, resolution - 1)
+    dims = keys.max(axis=0) + 1
+    linear = (keys[:, 0] * dims[1] + keys[:, 1]) * dims[2] + keys[:, 2]
+    _, cluster = np.unique(linear, return_inverse=True)
+    return cluster.reshape(-1), int(cluster.max()) + 1
+
+
+def collapse_triangles(triangles: "np.ndarray", cluster: "np.ndarray") -> "np.ndarray":
+    """Remap triangles to clusters, dropping degenerate and duplicate ones"""
+    remapped = cluster[triangles]
+    keep = (
+        (remapped[:, 0] != remapped[:, 1])
+        & (remapped[:, 1] != remapped[:, 2])
+        & (remapped[:, 0] != remapped[:, 2])
+    )
+    remapped = remapped[keep]
+    if not len(remapped):
+        return remapped
+    _, first = np.unique(np.sort(remapped, axis=1), axis=0, return_index=True)
+    return remapped[np.sort(first)]
+
+
+def simplify(
+    positions: "np.ndarray",
+    triangles: "np.ndarray",
+    target_triangles: int
+) -> Tuple["np.ndarray", "np.ndarray", int]:
+    """Find the finest clustering with at most target_triangles triangles
+    
+    Args:
+        positions: (N, 3) vertex positions
+        triangles: (M, 3) vertex indices
+        target_triangles: Upper bound on output triangles
+    
+    Returns:
+        (cluster per vertex, collapsed triangles, cluster count)
+    """
+    require_numpy()
+    positions = np.asarray(positions, dtype=np.float64)
+    low, high = 1, 4096
+    best = None
+    for _ in range(_SEARCH_STEPS):
+        if low > high:
+            break
+        resolution = (low + high) // 2
+        cluster, count = cluster_vertices(positions, resolution)
+        collapsed = collapse_triangles(triangles, cluster)
+        if len(collapsed) <= target_triangles:
+            best = (cluster, collapsed, count)
+            low = resolution + 1
+        else:
+            high = resolution - 1
+    if best is None:
+        cluster, count = cluster_vertices(positions, 1)
+        best = (cluster, collapse_triangles(triangles, cluster), count)
+    return best
+
+
+def _representatives(cluster: "np.ndarray", count: int) -> "np.ndarray":
+    """Index of the first vertex in each cluster"""
+    first = np.empty(count, dtype=np.int64)
+    order = np.arange(len(cluster))
+    first[cluster[::-1]] = order[::-1]
+    return first
+
+
+def _cluster_mean(values: "np.ndarray", cluster: "np.ndarray", count: int) -> "np.ndarray":
+    sizes = np.bincount(cluster, minlength=count).astype(np.float64)
+    columns = [
+        np.bincount(cluster, weights=values[:, i].astype(np.float64), minlength=count) / sizes
+        for i in range(values.shape[1])
+    ]
+    return np.stack(columns, axis=1)
+
+
+def _primitive_triangles(glb: GlbFile, primitive: Dict, vertex_count: int) -> "np.ndarray":
+    if "indices" in primitive:
+        return accessor_array(glb, primitive["indices"]).reshape(-1, 3).astype(np.int64)
+    return np.arange(vertex_count - vertex_count % 3, dtype=np.int64).reshape(-1, 3)
+
+
+def _simplify_primitive(glb: GlbFile, builder: GlbBuilder, primitive: Dict, ratio: float) -> Tuple[int, int]:
+    """Replace a primitive's accessors with a simplified copy; returns (before, after) triangles"""
+    attributes = primitive["attributes"]
+    positions = accessor_array(glb, attributes["POSITION"])
+    triangles = _primitive_triangles(glb, primitive, len(positions))
+    before = len(triangles)
+    if not before:
+        return 0, 0
+    
+    cluster, collapsed, count = simplify(positions, triangles, max(1, int(before * ratio)))
+    representative = _representatives(cluster, count)
+    
+    # Only keep clusters that are still referenced by a triangle
+    used = np.unique(collapsed)
+    remap = np.full(count, -1, dtype=np.int64)
+    remap[used] = np.arange(len(used))
+    new_triangles = remap[collapsed]
+    
+    for name, accessor in list(attributes.items()):
+        values = accessor_array(glb, accessor)
+        if name == "POSITION":
+            merged = _cluster_mean(positions, cluster, count)[used].astype(values.dtype)
+            attributes[name] = add_array(builder, merged, with_bounds=True)
+        elif name == "NORMAL":
+            merged = _cluster_mean(values, cluster, count)[used]
+            lengths = np.linalg.norm(merged, axis=1, keepdims=True)
+            merged = np.divide(merged, lengths, out=np.zeros_like(merged), where=lengths > 0)
+            attributes[name] = add_array(builder, merged.astype(values.dtype))
+        else:
+            source = glb.json["accessors"][accessor]
+            attributes[name] = add_array(
+                builder,
+                values[representative[used]],
+                normalized=source.get("normalized", False)
+            )
+    
+    index_dtype = np.uint16 if len(used) < 65536 else np.uint32
+    primitive["indices"] = add_array(
+        builder,
+        new_triangles.reshape(-1).astype(index_dtype),
+        target=ELEMENT_ARRAY_BUFFER
+    )
+    primitive.pop("mode", None)
+    return before, len(new_triangles)
+
+
+def build_lod(glb: GlbFile, ratio: float) -> Tuple[bytes, int, int]:
+    """Simplify every triangle primitive of a GLB to about `ratio` of its triangles
+    
+    Primitives with morph targets or non-triangle modes are left untouched.
+    
+    Returns:
+        (GLB bytes, source triangles, output triangles)
+    """
+    require_numpy()
+    builder = GlbBuilder.from_glb(glb)
+    before = after = 0
+    for mesh in builder.gltf.get("meshes", []):
+        for primitive in mesh.get("primitives", []):
+            if (
+                primitive.get("mode", TRIANGLES) != TRIANGLES
+                or primitive.get("targets")
+                or "POSITION" not in primitive.get("attributes", {})
+            ):
+                continue
+            primitive_before, primitive_after = _simplify_primitive(glb, builder, primitive, ratio)
+            before += primitive_before
+            after += primitive_after
+    return builder.build(), before, after
+
+
+def lod_path(source: Union[str, Path], level: int) -> Path:
+    return Path(derived_path(str(source), f"_lod{level}"))
+
+
+def build_lod_chain(
+    source: Union[str, Path],
+    ratios: Sequence[float] = DEFAULT_LOD_RATIOS
+) -> List[LodLevel]:
+    """Write one GLB per ratio below 1.0 next to the source
+    
+    Top-level so it can run in a process pool.
+    """
+    levels = []
+    with GlbFile.open(source) as glb:
+        for level, ratio in enumerate(ratios):
+            if ratio >= 1.0:
+                continue
+            data, before, after = build_lod(glb, ratio)
+            path = lod_path(source, level)
+            path.write_bytes(data)
+            levels.append(LodLevel(
+                level=level,
+                ratio=ratio,
+                path=str(path),
+                triangle_count=after,
+                source_triangle_count=before
+            ))
+    return levels
+
+
+def lod_outputs(source: str, ratios: Sequence[float] = DEFAULT_LOD_RATIOS) -> List[StageOutput]:
+    """build_lod_chain as a pipeline stage"""
+    return [
+        StageOutput(level.path, {"level": level.level, "ratio": level.ratio}, level)
+        for level in build_lod_chain(source, ratios)
+    ]
+
+
+def _summarize(outputs: List[StageOutput]) -> str:
+    if not outputs:
+        return "no levels"
+    levels = [output.detail for output in outputs]
+    return f"{levels[0].source_triangle_count} → " + ", ".join(str(level.triangle_count) for level in levels)
+
+
+LOD_STAGE = PostProcessStage(
+    name=LOD_KIND,
+    run=lod_outputs,
+    options={"ratios": DEFAULT_LOD_RATIOS},
+    summarize=_summarize
+)
+
+
+def generate_lods(
+    repository: TaskRepository,
+    species: Optional[str] = None,
+    ratios: Sequence[float] = DEFAULT_LOD_RATIOS,
+    max_workers: Optional[int] = None,
+    force: bool = False
+) -> Dict[str, List[ArtifactRecord]]:
+    """Build LOD chains for downloaded GLB artifacts and register them
+    
+    Runs LOD_STAGE alone through a PostProcessingPipeline: sources are
+    processed in a process pool, and a source whose LODs were built from
+    the same file with the same ratios is skipped unless force is set.
+    
+    Args:
+        repository: Repository whose GLB artifacts to process
+        species: Only this species (default: all)
+        ratios: Fraction of triangles kept per level
+        max_workers: Process pool size (default: CPU count)
+        force: Rebuild LODs that already exist
+    
+    Returns:
+        Source relative path -> LOD ArtifactRecords registered for it
+    """
+    require_numpy()
+    stage = replace(LOD_STAGE, options={"ratios": tuple(ratios)})
+    with PostProcessingPipeline(repository, [stage], max_workers=max_workers) as pipeline:
+        runs = pipeline.run(species=species, force=force)
+    return {run.source: run.records for run in runs if run.error is None}
@@ -0,0 +1,69 @@
+"""Perceptual hashes of thumbnails and previews
+
+Best-of-N and retexture runs produce many renders that differ by a few
+pixels. Two 64-bit hashes catch them:
+    
+    dhash   sign of the horizontal gradient on a 9x8 grayscale downscale;
+            robust to brightness and small shifts, cheap
+    phash   low-frequency 8x8 block of a 32x32 DCT thresholded at its
+            median; robust to rescaling, recompression and colour tweaks
+
+Near-duplicates have a small Hamming distance between hashes (a few bits
+out of 64). Hashes are stored hex-encoded in ArtifactRecord.image_hashes
+and queried with TaskRepository.find_near_duplicates. Needs Pillow and
+numpy (pip install mesh-toolkit[images,mesh]).
+"""
+from io import BytesIO
+from pathlib import Path
+from typing import Dict, Union
+
+from .arrays import np
+from .textures import Image, require_imaging
+
+HASH_SIZE = 8
+PHASH_SIZE = 32
+
+
+def _grayscale(source: Union[str, Path, bytes], size) -> "np.ndarray":
+    """(height, width) float array of the image resampled to size"""
+    require_imaging()
+    if isinstance(source, (bytes, bytearray)):
+        source = BytesIO(source)
+    with Image.open(source) as image:
+        image = image.convert("L").resize(size, Image.Resampling.LANCZOS)
+        return np.asarray(image, dtype=np.float64)
+
+
+def _to_hex(bits: "np.ndarray") -> str:
+    return np.packbits(bits.reshape(-1)).tobytes().hex()
+
+
+def dhash(source: Union[str, Path, bytes]) -> str:
+    """64-bit difference hash as 16 hex characters"""
+    pixels = _grayscale(source, (HASH_SIZE + 1, HASH_SIZE))
+    return _to_hex(pixels[:, 1:] > pixels[:, :-1])
+
+
+def _dct_matrix(n: int) -> "np.ndarray":
+    """Orthonormal DCT-II basis; rows are frequencies"""
+    k = np.arange(n)[:, None]
+    matrix = np.cos(np.pi * (2 * np.arange(n)[None, :] + 1) * k / (2 * n)) * np.sqrt(2.0 / n)
+    matrix[0] /= np.sqrt(2.0)
+    return matrix
+
+
+def phash(source: Union[str, Path, bytes]) -> str:
+    """64-bit DCT hash as 16 hex characters"""
+    pixels = _grayscale(source, (PHASH_SIZE, PHASH_SIZE))
+    basis = _dct_matrix(PHASH_SIZE)
+    low = (basis @ pixels @ basis.T)[:HASH_SIZE, :HASH_SIZE]
+    # The DC term only encodes mean brightness
+    median = np.median(low.reshape(-1)[1:])
+    return _to_hex(low > median)
+
+
+def image_hashes(source: Union[str, Path, bytes]) -> Dict[str, str]:
+    """{"dhash": ..., "phash": ...} for an image file or encoded bytes"""
+    if isinstance(source, (str, Path)):
+        source = Path(source).read_bytes()
+    return {"dhash": dhash(source), "phash": phash(source)}
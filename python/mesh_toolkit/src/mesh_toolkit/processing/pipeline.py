@@ -0,0 +1,229 @@
+"""Declarative post-processing of GLB artifacts
+
+A PostProcessStage names a top-level function that turns one artifact file
+into derived files, the artifact kinds it consumes and a version. The
+PostProcessingPipeline runs stages in order in a shared process pool and
+records every output as a derived ArtifactRecord of the stage's kind, so a
+later stage can consume an earlier stage's outputs (quantize runs on LODs).
+This works on local files after download; workflows.pipeline is the
+unrelated DAG of Meshy API tasks that produces them.
+    
+    with PostProcessingPipeline(repository, default_stages()) as pipeline:
+        pipeline.run(species="otter")   # or pipeline.watch()
+
+Each derived record carries a cache key built from the input artifact's
+sha256, the stage name and version and its options. A stage is skipped for
+an input whose derived records all carry the current key, so re-running
+only redoes work whose input, code (bump `version`) or options changed.
+watch() subscribes to the repository's event bus and processes an asset in
+a background thread whenever one of its tasks succeeds, i.e. right after
+the webhook handler has recorded the downloaded artifacts.
+"""
+import hashlib
+import json
+import queue
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from ..persistence.events import TaskEvent
+from ..persistence.repository import TaskRepository
+from ..persistence.schemas import ArtifactRecord
+from .artifacts import derived_record, glb_artifacts
+
+
+class StageOutput(NamedTuple):
+    """A file written by a stage"""
+    path: str
+    params: Dict[str, Any]  # recorded on the derived ArtifactRecord
+    detail: Any = None  # returned to the caller, not recorded (must pickle)
+
+
+@dataclass(frozen=True)
+class PostProcessStage:
+    """A per-artifact post-processing step
+    
+    `run(source_path, **options)` must be a top-level function so it can
+    run in a process pool; it writes its outputs next to the source and
+    returns them as StageOutputs.
+    """
+    name: str  # kind of the derived artifacts
+    run: Callable[..., List[StageOutput]]
+    version: int = 1  # bump when the output for the same input changes
+    inputs: Tuple[str, ...] = ("download",)  # artifact kinds consumed
+    options: Dict[str, Any] = field(default_factory=dict)
+    # Called in the parent with (source, derived) before a record is saved
+    adjust: Optional[Callable[[ArtifactRecord, ArtifactRecord], None]] = None
+    # One-line summary of a stage's outputs for the progress log
+    summarize: Optional[Callable[[List[StageOutput]], str]] = None
+    
+    def cache_key(self, source: ArtifactRecord) -> str:
+        """Key of this stage's outputs for an input artifact"""
+        key = json.dumps(
+            [source.sha256_hash, self.name, self.version, self.options],
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.sha256(key.encode()).hexdigest()[:16]
+
+
+@dataclass
+class PostProcessRun:
+    """One stage applied to one input artifact"""
+    stage: str
+    species: str
+    source: str  # relative path of the input artifact
+    records: List[ArtifactRecord] = field(default_factory=list)
+    details: List[Any] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+def default_stages() -> List[PostProcessStage]:
+    """LODs of every download, then quantized copies of downloads and LODs"""
+    from .lod import LOD_STAGE
+    from .quantize import QUANTIZE_STAGE
+    return [LOD_STAGE, QUANTIZE_STAGE]
+
+
+class PostProcessingPipeline:
+    """Runs declared stages over repository artifacts in a process pool"""
+    
+    def __init__(
+        self,
+        repository: TaskRepository,
+        stages: Sequence[PostProcessStage],
+        max_workers: Optional[int] = None
+    ):
+        """Initialize pipeline
+        
+        Args:
+            repository: Repository whose artifacts to process
+            stages: Stages in run order
+            max_workers: Process pool size (default: CPU count)
+        """
+        self.repository = repository
+        self.stages = list(stages)
+        self.max_workers = max_workers
+        self._pool: Optional[Executor] = None
+        self._pool_lock = threading.Lock()
+    
+    def __enter__(self) -> "PostProcessingPipeline":
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        self.close()
+    
+    def close(self) -> None:
+        """Shut down the process pool"""
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+    
+    def _executor(self) -> Executor:
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._pool
+    
+    def _cached_keys(self, stage: PostProcessStage, species: Optional[str]) -> Dict[Tuple[str, str], set]:
+        """(species, source path) -> cache keys on the stage's existing outputs"""
+        keys: Dict[Tuple[str, str], set] = {}
+        for name, _, _, artifact in glb_artifacts(self.repository, species, kinds=(stage.name,)):
+            keys.setdefault((name, artifact.derived_from), set()).add(artifact.params.get("cache_key"))
+        return keys
+    
+    def run(
+        self,
+        species: Optional[str] = None,
+        spec_hash: Optional[str] = None,
+        force: bool = False
+    ) -> List[PostProcessRun]:
+        """Run every stage over the matching artifacts
+        
+        Args:
+            species: Only this species (default: all)
+            spec_hash: Only this asset (requires species)
+            force: Ignore cached outputs
+        
+        Returns:
+            Runs that executed (cached ones are not listed)
+        """
+        runs: List[PostProcessRun] = []
+        for stage in self.stages:
+            cached = self._cached_keys(stage, species)
+            jobs = []
+            for name, asset_hash, _, artifact in glb_artifacts(self.repository, species, kinds=stage.inputs):
+                if spec_hash and asset_hash != spec_hash:
+                    continue
+                key = stage.cache_key(artifact)
+                if not force and cached.get((name, artifact.relative_path)) == {key}:
+                    continue
+                jobs.append((name, asset_hash, artifact, key))
+            if not jobs:
+                continue
+            
+            pool = self._executor()
+            futures = [
+                (job, pool.submit(stage.run, str(self.repository.base_path / job[0] / job[2].relative_path),
+                                  **stage.options))
+                for job in jobs
+            ]
+            for (name, asset_hash, artifact, key), future in futures:
+                run = PostProcessRun(stage=stage.name, species=name, source=artifact.relative_path)
+                runs.append(run)
+                try:
+                    outputs = future.result()
+                except Exception as e:
+                    run.error = str(e)
+                    print(f"✗ {stage.name} failed for {name}/{artifact.relative_path}: {e}")
+                    continue
+                
+                for output in outputs:
+                    record = derived_record(
+                        artifact.relative_path, output.path, stage.name, {**output.params, "cache_key": key}
+                    )
+                    if stage.adjust:
+                        stage.adjust(artifact, record)
+                    run.records.append(record)
+                    run.details.append(output.detail)
+                self.repository.record_artifacts(
+                    name, asset_hash, run.records, supersedes=(stage.name, artifact.relative_path)
+                )
+                summary = stage.summarize(outputs) if stage.summarize else f"{len(outputs)} files"
+                print(f"✓ {stage.name} {name}/{artifact.relative_path}: {summary}")
+        return runs
+    
+    def watch(self) -> Callable[[], None]:
+        """Process each asset in the background when one of its tasks succeeds
+        
+        Returns:
+            Function that unsubscribes and waits for queued assets to finish
+        """
+        pending: "queue.Queue[Optional[Tuple[str, str]]]" = queue.Queue()
+        
+        def on_event(event: TaskEvent) -> None:
+            if event.status == "SUCCEEDED" and event.species and event.spec_hash:
+                pending.put((event.species, event.spec_hash))
+        
+        def worker() -> None:
+            while True:
+                item = pending.get()
+                if item is None:
+                    return
+                try:
+                    self.run(species=item[0], spec_hash=item[1])
+                except Exception as e:
+                    print(f"✗ Post-processing failed for {item[0]}/{item[1]}: {e}")
+        
+        thread = threading.Thread(target=worker, name="post-processing", daemon=True)
+        thread.start()
+        unsubscribe = self.repository.events.subscribe(on_event)
+        
+        def stop() -> None:
+            unsubscribe()
+            pending.put(None)
+            thread.join()
+        
+        return stop
@@ -0,0 +1,398 @@
+"""Vertex attribute quantization with KHR_mesh_quantization
+
+Meshy GLBs store every attribute as float32. This stage rewrites them as:
+    
+    POSITION    int16 normalized, dequantized by a node transform
+    NORMAL      int8 normalized
+    TANGENT     int8 normalized
+    TEXCOORD_n  uint16 normalized (only when all UVs lie in [0, 1])
+
+Quantized positions are centered on the mesh bounds and scaled uniformly,
+and the inverse transform goes on a new child node that takes over the
+mesh, so parent transforms and animations are untouched. Uniform scale
+keeps normals valid. The transform of a skinned mesh's node is ignored by
+the skinning equation, so skinned meshes (and meshes with morph targets)
+keep float positions; their other attributes are still quantized.
+
+Indexed triangle primitives are also reordered for the GPU: triangles are
+sorted along a Morton curve through their centroids and vertices are
+renumbered in order of first use, which keeps the post-transform cache
+and vertex fetches local. Needs numpy (pip install mesh-toolkit[mesh]).
+"""
+from collections import deque
+from dataclasses import asdict, dataclass, field, replace
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple, Union
+
+from ..persistence.repository import TaskRepository
+from ..persistence.schemas import ArtifactRecord
+from .arrays import ELEMENT_ARRAY_BUFFER, accessor_array, add_array, np, require_numpy
+from .artifacts import derived_path
+from .glb import COMPONENT_FORMATS, FLOAT, TRIANGLES, TYPE_COMPONENTS, GlbBuilder, GlbFile
+from .lod import LOD_KIND
+from .pipeline import PostProcessingPipeline, PostProcessStage, StageOutput
+
+EXTENSION = "KHR_mesh_quantization"
+
+QUANTIZED_KIND = "quantized"
+
+# Post-transform cache size used for the ACMR figures in reports
+CACHE_SIZE = 16
+
+_MORTON_BITS = 10
+
+
+@dataclass
+class QuantizeReport:
+    """Size and cache figures for one quantized GLB"""
+    bytes_before: int
+    bytes_after: int
+    attribute_bytes: Dict[str, List[int]] = field(default_factory=dict)  # semantic -> [before, after]
+    float_position_meshes: int = 0  # skinned or morphed meshes that kept float positions
+    acmr_before: Optional[float] = None  # average cache misses per triangle
+    acmr_after: Optional[float] = None
+    source: str = ""
+    path: str = ""
+    
+    @property
+    def saved_fraction(self) -> float:
+        if not self.bytes_before:
+            return 0.0
+        return 1.0 - self.bytes_after / self.bytes_before
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), "saved_fraction": round(self.saved_fraction, 4)}
+
+
+def cache_misses(indices: "np.ndarray", cache_size: int = CACHE_SIZE) -> int:
+    """Vertex shader invocations for a FIFO post-transform cache"""
+    cache: deque = deque()
+    cached: Set[int] = set()
+    misses = 0
+    for vertex in np.asarray(indices).reshape(-1).tolist():
+        if vertex in cached:
+            continue
+        misses += 1
+        if len(cache) == cache_size:
+            cached.discard(cache.popleft())
+        cache.append(vertex)
+        cached.add(vertex)
+    return misses
+
+
+def _spread_bits(values: "np.ndarray") -> "np.ndarray":
+    """Insert two zero bits between each of the low 10 bits"""
+    values = values.astype(np.uint64)
+    values = (values | (values << np.uint64(16))) & np.uint64(0x030000FF)
+    values = (values | (values << np.uint64(8))) & np.uint64(0x0300F00F)
+    values = (values | (values << np.uint64(4))) & np.uint64(0x030C30C3)
+    values = (values | (values << np.uint64(2))) & np.uint64(0x09249249)
+    return values
+
+
+def optimize_indices(
+    positions: "np.ndarray",
+    triangles: "np.ndarray"
+) -> Tuple["np.ndarray", "np.ndarray"]:
+    """Reorder triangles and vertices for cache locality
+    
+    Args:
+        positions: (N, 3) vertex positions
+        triangles: (M, 3) vertex indices
+    
+    Returns:
+        (remapped triangles, old vertex index for each new vertex);
+        vertices no triangle references are dropped
+    """
+    require_numpy()
+    centroids = np.asarray(positions, dtype=np.float64)[triangles].mean(axis=1)
+    low = centroids.min(axis=0)
+    extent = float((centroids.max(axis=0) - low).max()) or 1.0
+    cells = (1 << _MORTON_BITS) - 1
+    grid = np.round((centroids - low) / extent * cells).astype(np.uint64)
+    codes = (
+        _spread_bits(grid[:, 0])
+        | (_spread_bits(grid[:, 1]) << np.uint64(1))
+        | (_spread_bits(grid[:, 2]) << np.uint64(2))
+    )
+    triangles = triangles[np.argsort(codes, kind="stable")]
+    
+    flat = triangles.reshape(-1)
+    _, first = np.unique(flat, return_index=True)
+    vertex_order = flat[np.sort(first)]
+    remap = np.full(len(positions), -1, dtype=np.int64)
+    remap[vertex_order] = np.arange(len(vertex_order))
+    return remap[triangles], vertex_order
+
+
+def _snorm(values: "np.ndarray", dtype) -> "np.ndarray":
+    limit = np.iinfo(dtype).max
+    return np.round(np.clip(values, -1.0, 1.0) * limit).astype(dtype)
+
+
+def _unorm(values: "np.ndarray", dtype) -> "np.ndarray":
+    limit = np.iinfo(dtype).max
+    return np.round(np.clip(values, 0.0, 1.0) * limit).astype(dtype)
+
+
+def _position_meshes(gltf: Dict[str, Any]) -> Set[int]:
+    """Meshes whose positions can be dequantized by a node transform"""
+    nodes = gltf.get("nodes", [])
+    used = {node["mesh"] for node in nodes if "mesh" in node}
+    skinned = {node["mesh"] for node in nodes if "mesh" in node and "skin" in node}
+    eligible = set()
+    for index in used - skinned:
+        primitives = gltf["meshes"][index].get("primitives", [])
+        if primitives and all(
+            not primitive.get("targets")
+            and "POSITION" in primitive.get("attributes", {})
+            and gltf["accessors"][primitive["attributes"]["POSITION"]]["componentType"] == FLOAT
+            for primitive in primitives
+        ):
+            eligible.add(index)
+    return eligible
+
+
+def _accessor_uses(gltf: Dict[str, Any]) -> Dict[int, int]:
+    uses: Dict[int, int] = {}
+    for mesh in gltf.get("meshes", []):
+        for primitive in mesh.get("primitives", []):
+            for accessor in [*primitive.get("attributes", {}).values(), primitive.get("indices")]:
+                if accessor is not None:
+                    uses[accessor] = uses.get(accessor, 0) + 1
+    return uses
+
+
+def _accessor_bytes(gltf: Dict[str, Any], index: int) -> int:
+    accessor = gltf["accessors"][index]
+    component = np.dtype("<" + COMPONENT_FORMATS[accessor["componentType"]]).itemsize
+    return accessor["count"] * TYPE_COMPONENTS[accessor["type"]] * component
+
+
+class _Quantizer:
+    """Rewrites one GLB; see quantize_glb"""
+    
+    def __init__(self, glb: GlbFile, reorder: bool):
+        self.glb = glb
+        self.reorder = reorder
+        self.builder = GlbBuilder.from_glb(glb)
+        self.gltf = self.builder.gltf
+        self.position_meshes = _position_meshes(glb.json)
+        self.uses = _accessor_uses(glb.json)
+        self.transforms: Dict[int, Tuple[List[float], float]] = {}  # mesh -> (center, scale)
+        self.cache: Dict[Tuple[int, Optional[int]], int] = {}
+        self.report = QuantizeReport(bytes_before=len(glb.buffer), bytes_after=0)
+        self.misses_before = self.misses_after = self.triangles = 0
+        self.extension_needed = False
+    
+    def _count(self, semantic: str, before: int, after: int) -> None:
+        totals = self.report.attribute_bytes.setdefault(semantic, [0, 0])
+        totals[0] += before
+        totals[1] += after
+    
+    def _mesh_transform(self, mesh_index: int) -> Tuple[List[float], float]:
+        if mesh_index not in self.transforms:
+            lows, highs = [], []
+            for primitive in self.gltf["meshes"][mesh_index]["primitives"]:
+                source = accessor_array(self.glb, primitive["attributes"]["POSITION"])
+                if len(source):
+                    lows.append(source.min(axis=0))
+                    highs.append(source.max(axis=0))
+            if lows:
+                low = np.min(lows, axis=0).astype(np.float64)
+                high = np.max(highs, axis=0).astype(np.float64)
+            else:
+                low = high = np.zeros(3)
+            center = (low + high) / 2
+            scale = float((high - low).max()) / 2 or 1.0
+            self.transforms[mesh_index] = (center.tolist(), scale)
+        return self.transforms[mesh_index]
+    
+    def _encode(self, name: str, values: "np.ndarray", source: Dict[str, Any], mesh_index: int) -> int:
+        float_values = source["componentType"] == FLOAT
+        if name == "POSITION" and mesh_index in self.position_meshes:
+            center, scale = self._mesh_transform(mesh_index)
+            quantized = _snorm((values - np.array(center)) / scale, np.int16)
+            self.extension_needed = True
+            return add_array(self.builder, quantized, normalized=True, with_bounds=True)
+        if name in ("NORMAL", "TANGENT") and float_values:
+            self.extension_needed = True
+            return add_array(self.builder, _snorm(values, np.int8), normalized=True)
+        in_unit_range = len(values) and values.min() >= 0.0 and values.max() <= 1.0
+        if name.startswith("TEXCOORD_") and float_values and in_unit_range:
+            return add_array(self.builder, _unorm(values, np.uint16), normalized=True)
+        if values.shape[1] == 1:
+            values = values.reshape(-1)
+        return add_array(
+            self.builder,
+            values,
+            normalized=source.get("normalized", False),
+            with_bounds=name == "POSITION"
+        )
+    
+    def primitive(self, mesh_index: int, primitive: Dict[str, Any]) -> None:
+        attributes = primitive["attributes"]
+        accessors = [*attributes.values(), primitive.get("indices")]
+        shared = any(self.uses.get(a, 0) > 1 for a in accessors if a is not None)
+        vertex_order = None
+        
+        if (
+            self.reorder
+            and not shared
+            and "indices" in primitive
+            and primitive.get("mode", TRIANGLES) == TRIANGLES
+        ):
+            triangles = accessor_array(self.glb, primitive["indices"]).reshape(-1, 3).astype(np.int64)
+            positions = accessor_array(self.glb, attributes["POSITION"])
+            if len(triangles):
+                before = _accessor_bytes(self.glb.json, primitive["indices"])
+                triangles, vertex_order = optimize_indices(positions, triangles)
+                self.misses_before += cache_misses(accessor_array(self.glb, primitive["indices"]))
+                self.misses_after += cache_misses(triangles)
+                self.triangles += len(triangles)
+                index_dtype = np.uint16 if len(vertex_order) < 65536 else np.uint32
+                indices = triangles.reshape(-1).astype(index_dtype)
+                primitive["indices"] = add_array(self.builder, indices, target=ELEMENT_ARRAY_BUFFER)
+                self._count("indices", before, indices.nbytes)
+        
+        for name, accessor in list(attributes.items()):
+            key = (accessor, mesh_index if name == "POSITION" else None)
+            if vertex_order is None and key in self.cache:
+                attributes[name] = self.cache[key]
+                continue
+            source = self.glb.json["accessors"][accessor]
+            values = accessor_array(self.glb, accessor)
+            if vertex_order is not None:
+                values = values[vertex_order]
+            attributes[name] = self._encode(name, values, source, mesh_index)
+            self._count(name, _accessor_bytes(self.glb.json, accessor), _accessor_bytes(self.gltf, attributes[name]))
+            if vertex_order is None:
+                self.cache[key] = attributes[name]
+    
+    def run(self) -> Tuple[bytes, QuantizeReport]:
+        for mesh_index, mesh in enumerate(self.gltf.get("meshes", [])):
+            for primitive in mesh.get("primitives", []):
+                if primitive.get("targets") or "POSITION" not in primitive.get("attributes", {}):
+                    continue
+                self.primitive(mesh_index, primitive)
+        
+        # Move quantized meshes onto child nodes carrying the dequantization transform
+        nodes = self.gltf.get("nodes", [])
+        for node in list(nodes):
+            if node.get("mesh") not in self.transforms:
+                continue
+            center, scale = self.transforms[node["mesh"]]
+            nodes.append({"mesh": node.pop("mesh"), "translation": center, "scale": [scale] * 3})
+            node.setdefault("children", []).append(len(nodes) - 1)
+        
+        if self.extension_needed:
+            for key in ("extensionsUsed", "extensionsRequired"):
+                extensions = self.gltf.setdefault(key, [])
+                if EXTENSION not in extensions:
+                    extensions.append(EXTENSION)
+        
+        data = self.builder.build()
+        report = self.report
+        report.bytes_after = len(data)
+        report.float_position_meshes = sum(
+            1 for index, mesh in enumerate(self.gltf.get("meshes", []))
+            if index not in self.position_meshes
+        )
+        if self.triangles:
+            report.acmr_before = round(self.misses_before / self.triangles, 4)
+            report.acmr_after = round(self.misses_after / self.triangles, 4)
+        return data, report
+
+
+def quantize_glb(glb: GlbFile, reorder: bool = True) -> Tuple[bytes, QuantizeReport]:
+    """Quantize vertex attributes and optionally reorder indices
+    
+    Primitives with morph targets are copied unchanged.
+    
+    Returns:
+        (GLB bytes, size report)
+    """
+    require_numpy()
+    return _Quantizer(glb, reorder).run()
+
+
+def quantized_path(source: Union[str, Path]) -> Path:
+    return Path(derived_path(str(source), "_q"))
+
+
+def quantize_file(source: Union[str, Path], reorder: bool = True) -> QuantizeReport:
+    """Write `<stem>_q.glb` next to the source; top-level for process pools"""
+    with GlbFile.open(source) as glb:
+        data, report = quantize_glb(glb, reorder=reorder)
+    path = quantized_path(source)
+    path.write_bytes(data)
+    report.source = str(source)
+    report.path = str(path)
+    return report
+
+
+def quantize_outputs(source: str, reorder: bool = True) -> List[StageOutput]:
+    """quantize_file as a pipeline stage"""
+    report = quantize_file(source, reorder=reorder)
+    return [StageOutput(report.path, {
+        "bytes_before": report.bytes_before,
+        "bytes_after": report.bytes_after,
+        "acmr_before": report.acmr_before,
+        "acmr_after": report.acmr_after,
+    }, report)]
+
+
+def _keep_source_bounds(source: ArtifactRecord, record: ArtifactRecord) -> None:
+    """Quantized bounds are in normalized units; keep the source's"""
+    if source.mesh_stats and record.mesh_stats:
+        record.mesh_stats.bounds_min = source.mesh_stats.bounds_min
+        record.mesh_stats.bounds_max = source.mesh_stats.bounds_max
+
+
+def _summarize(outputs: List[StageOutput]) -> str:
+    report = outputs[0].detail
+    return (
+        f"{report.bytes_before / 1024:.0f} KB → {report.bytes_after / 1024:.0f} KB "
+        f"(-{report.saved_fraction:.0%})"
+    )
+
+
+QUANTIZE_STAGE = PostProcessStage(
+    name=QUANTIZED_KIND,
+    run=quantize_outputs,
+    inputs=("download", LOD_KIND),
+    options={"reorder": True},
+    adjust=_keep_source_bounds,
+    summarize=_summarize
+)
+
+
+def quantize_artifacts(
+    repository: TaskRepository,
+    species: Optional[str] = None,
+    kinds: Sequence[str] = ("download", LOD_KIND),
+    max_workers: Optional[int] = None,
+    force: bool = False,
+    reorder: bool = True
+) -> Dict[str, QuantizeReport]:
+    """Quantize GLB artifacts in a process pool and register the results
+    
+    Runs QUANTIZE_STAGE alone through a PostProcessingPipeline; artifacts
+    whose quantized copy was made from the same file are skipped.
+    
+    Args:
+        repository: Repository whose GLB artifacts to process
+        species: Only this species (default: all)
+        kinds: Artifact kinds to quantize (downloads and LODs by default)
+        max_workers: Process pool size (default: CPU count)
+        force: Re-quantize artifacts that already have a quantized copy
+        reorder: Also reorder indices for cache locality
+    
+    Returns:
+        Source relative path -> report
+    """
+    require_numpy()
+    stage = replace(QUANTIZE_STAGE, inputs=tuple(kinds), options={"reorder": reorder})
+    with PostProcessingPipeline(repository, [stage], max_workers=max_workers) as pipeline:
+        runs = pipeline.run(species=species, force=force)
+    return {run.source: run.details[0] for run in runs if run.records}
@@ -0,0 +1,385 @@
+"""Batched PBR texture processing for AssetGenerator outputs
+
+AssetGenerator saves each asset's PBR maps (base_color, metallic,
+roughness, normal, ao) as full-resolution PNGs next to its manifest. This
+stage turns them into what the client actually loads:
+    
+    <asset>_orm.png             occlusion (R), roughness (G), metallic (B)
+                                packed the way glTF's metallicRoughness and
+                                occlusion textures read them
+    <asset>_<map>_lod<N>.png    base_color, normal and orm per mesh LOD,
+                                each level half the size of the previous
+
+Downscales come from a box-filtered mip chain computed on the decoded
+arrays; normal maps are renormalized after every step. Small props can
+additionally be packed into shared atlases with a UV offset/scale per
+asset (for KHR_texture_transform). Assets run in a process pool and
+results are written back into the asset manifests. Needs Pillow and numpy
+(pip install mesh-toolkit[images,mesh]).
+"""
+import json
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from .arrays import np
+
+try:
+    from PIL import Image
+except ImportError:  # optional dependency
+    Image = None
+
+
+# Fallbacks when a map is missing: no occlusion, fully rough, dielectric
+ORM_DEFAULTS = {"ao": 255, "roughness": 255, "metallic": 0}
+
+# Maps with per-LOD variants
+LOD_MAPS = ("base_color", "normal", "orm")
+
+# Intents whose textures may be atlased
+PROP_INTENTS = ("prop_decoration", "prop_interactable")
+
+
+def require_imaging() -> None:
+    """Raise a helpful ImportError when Pillow or numpy is missing"""
+    if Image is None or np is None:
+        raise ImportError(
+            "Pillow and numpy are required for texture processing: pip install mesh-toolkit[images,mesh]"
+        )
+
+
+def load_map(path: Union[str, Path], channels: int = 3) -> "np.ndarray":
+    """Decode an image into a (height, width, channels) uint8 array"""
+    require_imaging()
+    mode = {1: "L", 3: "RGB", 4: "RGBA"}[channels]
+    with Image.open(path) as image:
+        array = np.asarray(image.convert(mode))
+    return array.reshape(array.shape[0], array.shape[1], channels)
+
+
+def save_map(array: "np.ndarray", path: Union[str, Path]) -> None:
+    require_imaging()
+    image = Image.fromarray(array[:, :, 0] if array.shape[2] == 1 else array)
+    image.save(path, optimize=True)
+
+
+def resize_map(array: "np.ndarray", size: Tuple[int, int]) -> "np.ndarray":
+    """Resample to (width, height); only used to reconcile mismatched inputs"""
+    require_imaging()
+    if (array.shape[1], array.shape[0]) == tuple(size):
+        return array
+    image = Image.fromarray(array[:, :, 0] if array.shape[2] == 1 else array)
+    resized = np.asarray(image.resize(size, Image.Resampling.LANCZOS))
+    return resized.reshape(size[1], size[0], array.shape[2])
+
+
+def renormalize(normal: "np.ndarray") -> "np.ndarray":
+    """Rescale tangent-space normals (uint8 RGB) back to unit length"""
+    vectors = normal[..., :3].astype(np.float32) / 127.5 - 1.0
+    lengths = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    vectors = np.divide(vectors, lengths, out=np.zeros_like(vectors), where=lengths > 1e-6)
+    vectors[lengths[..., 0] <= 1e-6] = (0.0, 0.0, 1.0)
+    return np.round((vectors + 1.0) * 127.5).clip(0, 255).astype(np.uint8)
+
+
+def downsample(array: "np.ndarray", normal: bool = False) -> "np.ndarray":
+    """Halve both dimensions with a 2x2 box filter (odd edges are repeated)"""
+    height, width = array.shape[:2]
+    if height % 2 or width % 2:
+        array = np.pad(array, ((0, height % 2), (0, width % 2), (0, 0)), mode="edge")
+    height, width, channels = array.shape
+    blocks = array.reshape(height // 2, 2, width // 2, 2, channels).astype(np.float32)
+    result = np.round(blocks.mean(axis=(1, 3))).astype(np.uint8)
+    return renormalize(result) if normal else result
+
+
+def mip_chain(array: "np.ndarray", levels: int, normal: bool = False) -> List["np.ndarray"]:
+    """[full size, 1/2, 1/4, ...] with `levels` entries, stopping at 1x1"""
+    chain = [array]
+    while len(chain) < levels and max(chain[-1].shape[:2]) > 1:
+        chain.append(downsample(chain[-1], normal=normal))
+    return chain
+
+
+def pack_orm(
+    ao: Optional["np.ndarray"],
+    roughness: Optional["np.ndarray"],
+    metallic: Optional["np.ndarray"],
+    size: Optional[Tuple[int, int]] = None
+) -> "np.ndarray":
+    """Pack single-channel maps into an RGB occlusion/roughness/metallic texture
+    
+    Args:
+        ao, roughness, metallic: (H, W, 1) arrays or None for the default
+        size: Output (width, height) (default: the largest input)
+    """
+    require_imaging()
+    maps = {"ao": ao, "roughness": roughness, "metallic": metallic}
+    present = [m for m in maps.values() if m is not None]
+    if size is None:
+        if not present:
+            raise ValueError("pack_orm needs at least one map or an explicit size")
+        largest = max(present, key=lambda m: m.shape[0] * m.shape[1])
+        size = (largest.shape[1], largest.shape[0])
+    orm = np.empty((size[1], size[0], 3), dtype=np.uint8)
+    for channel, name in enumerate(("ao", "roughness", "metallic")):
+        source = maps[name]
+        if source is None:
+            orm[:, :, channel] = ORM_DEFAULTS[name]
+        else:
+            orm[:, :, channel] = resize_map(source, size)[:, :, 0]
+    return orm
+
+
+def process_textures(
+    textures: Dict[str, str],
+    asset_prefix: str,
+    levels: int = 3
+) -> Dict[str, List[str]]:
+    """Write the ORM texture and per-LOD variants for one asset
+    
+    Top-level so it can run in a process pool.
+    
+    Args:
+        textures: Map type -> PNG path (AssetGenerator's texture_paths, absolute)
+        asset_prefix: Output path prefix, e.g. `<dir>/<asset_id>`
+        levels: LOD levels including the full-resolution level 0
+    
+    Returns:
+        Map type -> path per level (level 0 of base_color/normal is the source)
+    """
+    require_imaging()
+    sources: Dict[str, "np.ndarray"] = {}
+    if "base_color" in textures:
+        channels = 4 if _has_alpha(textures["base_color"]) else 3
+        sources["base_color"] = load_map(textures["base_color"], channels=channels)
+    if "normal" in textures:
+        sources["normal"] = load_map(textures["normal"])
+    
+    singles = {name: load_map(textures[name], channels=1) for name in ORM_DEFAULTS if name in textures}
+    if singles:
+        size = None
+        if "base_color" in sources:
+            size = (sources["base_color"].shape[1], sources["base_color"].shape[0])
+        sources["orm"] = pack_orm(singles.get("ao"), singles.get("roughness"), singles.get("metallic"), size)
+        orm_path = Path(f"{asset_prefix}_orm.png")
+        save_map(sources["orm"], orm_path)
+    
+    outputs: Dict[str, List[str]] = {}
+    for map_type, array in sources.items():
+        chain = mip_chain(array, levels, normal=map_type == "normal")
+        paths = [textures.get(map_type) or str(orm_path)]
+        for level, mip in enumerate(chain[1:], start=1):
+            path = Path(f"{asset_prefix}_{map_type}_lod{level}.png")
+            save_map(mip, path)
+            paths.append(str(path))
+        outputs[map_type] = paths
+    return outputs
+
+
+def _has_alpha(path: Union[str, Path]) -> bool:
+    with Image.open(path) as image:
+        return image.mode in ("RGBA", "LA") or "transparency" in image.info
+
+
+def pack_atlas(
+    images: Dict[str, "np.ndarray"],
+    size: int = 2048,
+    padding: int = 4
+) -> Tuple[List["np.ndarray"], List[Dict[str, Tuple[int, int, int, int]]]]:
+    """Shelf-pack images into as many size x size atlases as needed
+    
+    Images are placed tallest first along rows. Each gets `padding`
+    pixels of edge-repeated border against mip bleeding.
+    
+    Returns:
+        (atlas arrays, per atlas: name -> (x, y, width, height))
+    """
+    require_imaging()
+    order = sorted(images, key=lambda name: (-images[name].shape[0], name))
+    atlases: List["np.ndarray"] = []
+    layouts: List[Dict[str, Tuple[int, int, int, int]]] = []
+    x = y = shelf = 0
+    for name in order:
+        image = images[name]
+        height, width = image.shape[:2]
+        padded_w, padded_h = width + 2 * padding, height + 2 * padding
+        if padded_w > size or padded_h > size:
+            raise ValueError(f"{name} ({width}x{height}) does not fit a {size}px atlas")
+        if not atlases or x + padded_w > size:
+            x, y, shelf = 0, y + shelf, 0
+        if not atlases or y + padded_h > size:
+            atlases.append(np.zeros((size, size, image.shape[2]), dtype=np.uint8))
+            layouts.append({})
+            x = y = shelf = 0
+        block = np.pad(image, ((padding, padding), (padding, padding), (0, 0)), mode="edge")
+        atlases[-1][y:y + padded_h, x:x + padded_w] = block
+        layouts[-1][name] = (x + padding, y + padding, width, height)
+        x += padded_w
+        shelf = max(shelf, padded_h)
+    return atlases, layouts
+
+
+def _load_manifests(output_root: Path) -> List[Tuple[Path, Dict[str, Any]]]:
+    manifests = []
+    for path in sorted(output_root.rglob("*_manifest.json")):
+        with open(path) as f:
+            manifests.append((path, json.load(f)))
+    return manifests
+
+
+def _write_manifest(path: Path, manifest: Dict[str, Any]) -> None:
+    with open(path, "w") as f:
+        json.dump(manifest, f, indent=2)
+
+
+def process_asset_textures(
+    output_root: Union[str, Path],
+    levels: int = 3,
+    max_workers: Optional[int] = None,
+    force: bool = False
+) -> Dict[str, Dict[str, List[str]]]:
+    """Pack ORM textures and build per-LOD texture variants for every asset
+    
+    Assets whose manifest already lists texture_lods are skipped unless
+    force is set. Results are stored in each manifest as texture_paths["orm"]
+    and texture_lods (map type -> path per level, relative to output_root).
+    
+    Args:
+        output_root: AssetGenerator output root
+        levels: LOD levels including full resolution
+        max_workers: Process pool size (default: CPU count)
+        force: Reprocess assets that already have texture LODs
+    
+    Returns:
+        Asset id -> texture_lods
+    """
+    require_imaging()
+    output_root = Path(output_root)
+    jobs = [
+        (path, manifest)
+        for path, manifest in _load_manifests(output_root)
+        if manifest.get("texture_paths") and (force or not manifest.get("texture_lods"))
+    ]
+    
+    results: Dict[str, Dict[str, List[str]]] = {}
+    if not jobs:
+        return results
+    
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = []
+        for path, manifest in jobs:
+            textures = {k: str(output_root / v) for k, v in manifest["texture_paths"].items() if k != "orm"}
+            prefix = str(path.with_name(manifest["asset_id"]))
+            futures.append((path, manifest, pool.submit(process_textures, textures, prefix, levels)))
+        
+        for path, manifest, future in futures:
+            try:
+                outputs = future.result()
+            except Exception as e:
+                print(f"✗ Texture processing failed for {manifest['asset_id']}: {e}")
+                continue
+            lods = {
+                map_type: [str(Path(p).relative_to(output_root)) for p in paths]
+                for map_type, paths in outputs.items()
+            }
+            if "orm" in lods:
+                manifest["texture_paths"]["orm"] = lods["orm"][0]
+            manifest["texture_lods"] = lods
+            _write_manifest(path, manifest)
+            results[manifest["asset_id"]] = lods
+            print(f"✓ Textures for {manifest['asset_id']}: {', '.join(f'{k} x{len(v)}' for k, v in lods.items())}")
+    return results
+
+
+def atlas_props(
+    output_root: Union[str, Path],
+    tile_size: int = 256,
+    atlas_size: int = 2048,
+    padding: int = 4,
+    intents: Sequence[str] = PROP_INTENTS,
+    name: str = "props"
+) -> List[str]:
+    """Pack the textures of small props into shared atlases
+    
+    Each prop's base_color (and normal/orm when present) is box-filtered
+    down until it fits tile_size and placed at the same spot in one atlas
+    per map type. Manifests get an `atlas` entry with the atlas paths and
+    the asset's uv_offset/uv_scale for KHR_texture_transform.
+    
+    Args:
+        output_root: AssetGenerator output root
+        tile_size: Largest side of a prop's texture inside the atlas
+        atlas_size: Atlas width and height
+        padding: Border pixels around each tile
+        intents: Asset intents to atlas
+        name: Atlas file prefix under <output_root>/textures/atlases
+    
+    Returns:
+        Written atlas paths relative to output_root
+    """
+    require_imaging()
+    output_root = Path(output_root)
+    props = [
+        (path, manifest)
+        for path, manifest in _load_manifests(output_root)
+        if manifest.get("intent") in intents and "base_color" in (manifest.get("texture_paths") or {})
+    ]
+    if not props:
+        return []
+    
+    tiles: Dict[str, Dict[str, "np.ndarray"]] = {map_type: {} for map_type in LOD_MAPS}
+    for _, manifest in props:
+        for map_type in LOD_MAPS:
+            relative = manifest["texture_paths"].get(map_type)
+            if not relative:
+                continue
+            array = load_map(output_root / relative, channels=4 if map_type == "base_color" else 3)
+            while max(array.shape[:2]) > tile_size:
+                array = downsample(array, normal=map_type == "normal")
+            tiles[map_type][manifest["asset_id"]] = array
+    
+    atlases, layouts = pack_atlas(tiles["base_color"], size=atlas_size, padding=padding)
+    directory = output_root / "textures" / "atlases"
+    directory.mkdir(parents=True, exist_ok=True)
+    
+    written: List[str] = []
+    for index, (atlas, layout) in enumerate(zip(atlases, layouts)):
+        paths = {}
+        for map_type in LOD_MAPS:
+            if map_type == "base_color":
+                image = atlas
+            else:
+                present = {k: v for k, v in tiles[map_type].items() if k in layout}
+                if not present:
+                    continue
+                # Same layout as base_color; props without this map get the glTF default
+                image = np.empty((atlas_size, atlas_size, 3), dtype=np.uint8)
+                if map_type == "normal":
+                    image[:] = (128, 128, 255)
+                else:
+                    image[:] = (ORM_DEFAULTS["ao"], ORM_DEFAULTS["roughness"], ORM_DEFAULTS["metallic"])
+                for asset_id, (x, y, w, h) in layout.items():
+                    if asset_id in present:
+                        tile = resize_map(present[asset_id], (w, h))
+                        block = np.pad(tile, ((padding, padding), (padding, padding), (0, 0)), mode="edge")
+                        image[y - padding:y + h + padding, x - padding:x + w + padding] = block
+            path = directory / f"{name}_{index}_{map_type}.png"
+            save_map(image, path)
+            paths[map_type] = str(path.relative_to(output_root))
+            written.append(paths[map_type])
+        
+        for path, manifest in props:
+            placement = layout.get(manifest["asset_id"])
+            if placement is None:
+                continue
+            x, y, w, h = placement
+            manifest["atlas"] = {
+                "textures": paths,
+                "uv_offset": [x / atlas_size, y / atlas_size],
+                "uv_scale": [w / atlas_size, h / atlas_size],
+            }
+            _write_manifest(path, manifest)
+    
+    print(f"✓ Atlased {len(props)} props into {len(atlases)} atlas(es)")
+    return written
@@ -0,0 +1,254 @@
+"""Streaming structural validation of GLB files
+
+validate_glb reads the 12-byte header, the chunk headers and the JSON
+chunk, then checks every bufferView and accessor against the lengths they
+claim, without mapping or reading the binary payload. The only payload it
+touches is index data, read in fixed-size blocks to check that no index
+points past its primitive's vertices, so memory use does not grow with
+the file. It is cheap enough to run on every download in the webhook path.
+
+Checks:
+    header    magic, version 2, declared length equal to the file size
+    chunks    4-byte aligned lengths, JSON first, at most one BIN chunk,
+              nothing running past the end of the file
+    views     ranges inside buffer 0, byteStride in [4, 252] and aligned
+    accessors known component and element types, component alignment,
+              last element inside its bufferView
+    indices   max index < POSITION count (vectorized with numpy if present)
+"""
+import array
+import json
+import os
+import struct
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from .glb import CHUNK_BIN, CHUNK_JSON, COMPONENT_FORMATS, GLB_MAGIC, TYPE_COMPONENTS
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency; array.array fallback
+    np = None
+
+INDEX_TYPES = (5121, 5123, 5125)
+BLOCK_SIZE = 1 << 20
+MAX_JSON_BYTES = 64 << 20
+
+
+@dataclass
+class ValidationResult:
+    """Outcome of validating one GLB"""
+    path: str
+    errors: List[str] = field(default_factory=list)
+    bytes_read: int = 0
+    
+    @property
+    def valid(self) -> bool:
+        return not self.errors
+
+
+class _Invalid(Exception):
+    """Stops validation at a structural error later checks depend on"""
+    pass
+
+
+def validate_glb(
+    path: Union[str, Path],
+    check_indices: bool = True,
+    max_errors: int = 20
+) -> ValidationResult:
+    """Validate a GLB file's container, accessors and index ranges
+    
+    Args:
+        path: GLB file
+        check_indices: Read index data to check it against vertex counts
+        max_errors: Stop collecting after this many errors
+    
+    Returns:
+        ValidationResult; valid when no errors were found
+    """
+    result = ValidationResult(path=str(path))
+    try:
+        with open(path, "rb") as f:
+            _validate(f, os.fstat(f.fileno()).st_size, result, check_indices, max_errors)
+    except _Invalid as e:
+        result.errors.append(str(e))
+    except (TypeError, KeyError, IndexError, AttributeError, ValueError, OverflowError) as e:
+        # Fields of the wrong JSON type (e.g. "count": "3", a dict of accessors)
+        result.errors.append(f"Malformed glTF JSON: {type(e).__name__}: {e}")
+    except OSError as e:
+        result.errors.append(f"Cannot read file: {e}")
+    return result
+
+
+def _read(f, offset: int, size: int, result: ValidationResult) -> bytes:
+    f.seek(offset)
+    data = f.read(size)
+    result.bytes_read += len(data)
+    return data
+
+
+def _validate(f, file_size: int, result: ValidationResult, check_indices: bool, max_errors: int) -> None:
+    errors = result.errors
+    
+    header = _read(f, 0, 12, result)
+    if len(header) < 12 or header[:4] != GLB_MAGIC:
+        raise _Invalid("Not a GLB file")
+    version, length = struct.unpack_from("<II", header, 4)
+    if version != 2:
+        raise _Invalid(f"Unsupported GLB version {version}")
+    if length != file_size:
+        raise _Invalid(f"Header says {length} bytes, file has {file_size}")
+    if length % 4:
+        errors.append(f"File length {length} is not 4-byte aligned")
+    
+    chunks = []
+    offset = 12
+    while offset < length:
+        chunk_header = _read(f, offset, 8, result)
+        if len(chunk_header) < 8:
+            raise _Invalid(f"Truncated chunk header at byte {offset}")
+        chunk_length, chunk_type = struct.unpack("<II", chunk_header)
+        start = offset + 8
+        if start + chunk_length > length:
+            raise _Invalid(f"Chunk at byte {offset} runs past the end of the file")
+        if chunk_length % 4:
+            errors.append(f"Chunk at byte {offset} has unaligned length {chunk_length}")
+        chunks.append((chunk_type, start, chunk_length))
+        offset = start + chunk_length + (-chunk_length % 4)
+    
+    if not chunks or chunks[0][0] != CHUNK_JSON:
+        raise _Invalid("GLB does not start with a JSON chunk")
+    bin_chunks = [chunk for chunk in chunks[1:] if chunk[0] == CHUNK_BIN]
+    if len(bin_chunks) > 1 or (bin_chunks and chunks[1][0] != CHUNK_BIN):
+        errors.append("BIN chunk must be the second and only binary chunk")
+    
+    _, json_start, json_length = chunks[0]
+    if json_length > MAX_JSON_BYTES:
+        raise _Invalid(f"JSON chunk of {json_length} bytes is too large")
+    try:
+        gltf = json.loads(_read(f, json_start, json_length, result))
+    except ValueError as e:
+        raise _Invalid(f"Invalid JSON chunk: {e}")
+    if not isinstance(gltf, dict):
+        raise _Invalid("JSON chunk is not an object")
+    
+    bin_start, bin_length = (bin_chunks[0][1], bin_chunks[0][2]) if bin_chunks else (0, 0)
+    buffers = gltf.get("buffers", [])
+    if buffers and "uri" not in buffers[0]:
+        declared = buffers[0].get("byteLength", 0)
+        if declared > bin_length:
+            raise _Invalid(f"buffers[0] declares {declared} bytes, BIN chunk has {bin_length}")
+    
+    views = gltf.get("bufferViews", [])
+    for i, view in enumerate(views):
+        if view.get("buffer", 0) != 0 or (buffers and "uri" in buffers[0]):
+            continue  # external data is not part of this file
+        end = view.get("byteOffset", 0) + view.get("byteLength", 0)
+        if end > bin_length:
+            errors.append(f"bufferView {i} ends at {end}, BIN chunk has {bin_length} bytes")
+        stride = view.get("byteStride")
+        if stride is not None and (stride < 4 or stride > 252 or stride % 4):
+            errors.append(f"bufferView {i} has invalid byteStride {stride}")
+    
+    accessors = gltf.get("accessors", [])
+    for i, accessor in enumerate(accessors):
+        if len(errors) >= max_errors:
+            return
+        error = _accessor_error(accessor, views)
+        if error:
+            errors.append(f"Accessor {i}: {error}")
+    
+    if errors or not check_indices or (buffers and "uri" in buffers[0]):
+        return
+    
+    checked: Dict[int, Optional[int]] = {}
+    for m, mesh in enumerate(gltf.get("meshes", [])):
+        for p, primitive in enumerate(mesh.get("primitives", [])):
+            indices = primitive.get("indices")
+            position = primitive.get("attributes", {}).get("POSITION")
+            if indices is None or position is None:
+                continue
+            if not (0 <= indices < len(accessors) and 0 <= position < len(accessors)):
+                errors.append(f"Mesh {m} primitive {p} references a missing accessor")
+                continue
+            if accessors[indices].get("componentType") not in INDEX_TYPES:
+                errors.append(f"Mesh {m} primitive {p}: indices must be unsigned integers")
+                continue
+            if indices not in checked:
+                checked[indices] = _max_index(f, accessors[indices], views, bin_start, result)
+            vertex_count = accessors[position].get("count", 0)
+            if checked[indices] is not None and checked[indices] >= vertex_count:
+                errors.append(
+                    f"Mesh {m} primitive {p}: index {checked[indices]} is out of range "
+                    f"for {vertex_count} vertices"
+                )
+            if len(errors) >= max_errors:
+                return
+
+
+def _accessor_error(accessor: Dict[str, Any], views: List[Dict[str, Any]]) -> Optional[str]:
+    """Why an accessor's layout is invalid, or None"""
+    fmt = COMPONENT_FORMATS.get(accessor.get("componentType"))
+    components = TYPE_COMPONENTS.get(accessor.get("type"))
+    if fmt is None or components is None:
+        return f"unknown componentType/type {accessor.get('componentType')}/{accessor.get('type')}"
+    count = accessor.get("count", 0)
+    if count < 0:
+        return f"negative count {count}"
+    if "bufferView" not in accessor:
+        return None  # zero-filled or sparse-only
+    if not 0 <= accessor["bufferView"] < len(views):
+        return f"missing bufferView {accessor['bufferView']}"
+    view = views[accessor["bufferView"]]
+    
+    component_size = struct.calcsize("<" + fmt)
+    element_size = component_size * components
+    accessor_offset = accessor.get("byteOffset", 0)
+    if (view.get("byteOffset", 0) + accessor_offset) % component_size:
+        return f"data is not aligned to its {component_size}-byte components"
+    if count == 0:
+        return None
+    stride = view.get("byteStride") or element_size
+    end = accessor_offset + stride * (count - 1) + element_size
+    if end > view.get("byteLength", 0):
+        return f"last element ends at {end}, bufferView has {view.get('byteLength', 0)} bytes"
+    return None
+
+
+def _max_index(
+    f,
+    accessor: Dict[str, Any],
+    views: List[Dict[str, Any]],
+    bin_start: int,
+    result: ValidationResult
+) -> Optional[int]:
+    """Largest value in an index accessor, read in blocks"""
+    if "bufferView" not in accessor or not accessor.get("count"):
+        return None
+    fmt = COMPONENT_FORMATS[accessor["componentType"]]
+    item_size = struct.calcsize("<" + fmt)
+    view = views[accessor["bufferView"]]
+    if view.get("buffer", 0) != 0:
+        return None
+    offset = bin_start + view.get("byteOffset", 0) + accessor.get("byteOffset", 0)
+    remaining = accessor["count"] * item_size
+    block_size = BLOCK_SIZE - BLOCK_SIZE % item_size
+    
+    largest = 0
+    while remaining:
+        block = _read(f, offset, min(block_size, remaining), result)
+        if not block:
+            break
+        offset += len(block)
+        remaining -= len(block)
+        if np is not None:
+            largest = max(largest, int(np.frombuffer(block, dtype="<" + fmt).max()))
+        else:
+            values = array.array(fmt, block)
+            if sys.byteorder == "big":
+                values.byteswap()
+            largest = max(largest, max(values))
+    return largest
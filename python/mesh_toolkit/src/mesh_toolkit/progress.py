@@ -0,0 +1,74 @@
+"""Typed progress events streamed by AssetGenerator.stream_model/stream_batch"""
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, ClassVar, Dict, Optional
+
+
+@dataclass
+class ProgressEvent:
+    """Base class for asset generation progress events"""
+    asset_id: str
+    task_id: Optional[str] = None
+    timestamp: float = field(default_factory=time.time)
+    
+    kind: ClassVar[str] = "event"
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {"kind": self.kind, **asdict(self)}
+
+
+@dataclass
+class TaskSubmitted(ProgressEvent):
+    """A Meshy task was created for the asset"""
+    stage: str = "preview"
+    
+    kind: ClassVar[str] = "submitted"
+
+
+@dataclass
+class TaskProgress(ProgressEvent):
+    """Meshy reported a new progress percentage"""
+    percent: int = 0
+    
+    kind: ClassVar[str] = "progress"
+
+
+@dataclass
+class StageChanged(ProgressEvent):
+    """The task moved to a new status (PENDING → IN_PROGRESS → SUCCEEDED)"""
+    stage: str = "preview"
+    status: str = ""
+    previous: Optional[str] = None
+    
+    kind: ClassVar[str] = "stage"
+
+
+@dataclass
+class ArtifactDownloaded(ProgressEvent):
+    """A model, texture or thumbnail file was saved locally"""
+    artifact: str = ""
+    path: str = ""
+    size_bytes: int = 0
+    
+    kind: ClassVar[str] = "artifact"
+
+
+@dataclass
+class AssetCompleted(ProgressEvent):
+    """All files are downloaded and the manifest is written"""
+    manifest: Optional[Any] = None  # jobs.AssetManifest
+    
+    kind: ClassVar[str] = "completed"
+    
+    def to_dict(self) -> Dict[str, Any]:
+        data = super().to_dict()
+        data["manifest"] = self.manifest.to_dict() if self.manifest else None
+        return data
+
+
+@dataclass
+class AssetFailed(ProgressEvent):
+    """Generation stopped; no further events follow for this asset"""
+    error: str = ""
+    
+    kind: ClassVar[str] = "failed"
@@ -0,0 +1,112 @@
+"""Heuristic quality scores for preview models
+
+Used by AssetGenerator.generate_best_of to rank preview candidates before
+spending a refine on one of them. Thumbnail scoring needs Pillow
+(pip install mesh-toolkit[images]); without it only polycount is scored.
+"""
+import math
+from io import BytesIO
+from typing import Callable, Optional
+
+import httpx
+
+from .models import GameAssetSpec, Text3DResult
+from .processing.glb import inspect_glb
+
+try:
+    from PIL import Image, ImageFilter, ImageStat
+except ImportError:  # optional dependency
+    Image = None
+
+
+# Fraction of the thumbnail the model should cover; tiny or frame-filling
+# renders usually mean a collapsed or exploded mesh
+IDEAL_COVERAGE = 0.45
+
+
+def glb_triangle_count(data: bytes) -> int:
+    """Count triangles in a GLB from its accessor metadata"""
+    return inspect_glb(data).triangle_count
+
+
+def polycount_score(triangles: int, target: Optional[int]) -> float:
+    """1.0 at the target polycount, halving per doubling away from it"""
+    if triangles <= 0:
+        return 0.0
+    if not target:
+        return 1.0
+    return 1.0 / (1.0 + abs(math.log2(triangles / target)))
+
+
+def thumbnail_score(data: bytes) -> Optional[float]:
+    """Score a preview render by subject coverage and edge detail
+    
+    Returns:
+        Score in [0, 1], or None if Pillow is not installed
+    """
+    if Image is None:
+        return None
+    
+    image = Image.open(BytesIO(data)).convert("RGB")
+    image.thumbnail((128, 128))
+    width, height = image.size
+    
+    # Background is whatever colour the corners have
+    corners = [image.getpixel(p) for p in ((0, 0), (width - 1, 0), (0, height - 1), (width - 1, height - 1))]
+    background = tuple(sum(c[i] for c in corners) / 4 for i in range(3))
+    pixels = image.tobytes()
+    foreground = sum(
+        1 for offset in range(0, len(pixels), 3)
+        if sum(abs(pixels[offset + i] - background[i]) for i in range(3)) > 48
+    )
+    coverage = foreground / (width * height)
+    coverage_score = max(0.0, 1.0 - abs(coverage - IDEAL_COVERAGE) / IDEAL_COVERAGE)
+    
+    edges = image.convert("L").filter(ImageFilter.FIND_EDGES)
+    detail_score = min(1.0, ImageStat.Stat(edges).mean[0] / 24.0)
+    
+    return 0.7 * coverage_score + 0.3 * detail_score
+
+
+def _fetch(url: str) -> bytes:
+    response = httpx.get(url, timeout=60.0)
+    response.raise_for_status()
+    return response.content
+
+
+class PreviewScorer:
+    """Default preview scorer: polycount vs. target plus thumbnail heuristic
+    
+    Any callable taking (Text3DResult, GameAssetSpec) and returning a float
+    can be passed to generate_best_of instead.
+    """
+    
+    def __init__(
+        self,
+        polycount_weight: float = 0.5,
+        thumbnail_weight: float = 0.5,
+        fetch: Callable[[str], bytes] = _fetch
+    ):
+        """Initialize scorer
+        
+        Args:
+            polycount_weight: Weight of the polycount term
+            thumbnail_weight: Weight of the thumbnail term (dropped without Pillow)
+            fetch: Downloads a URL to bytes
+        """
+        self.polycount_weight = polycount_weight
+        self.thumbnail_weight = thumbnail_weight
+        self.fetch = fetch
+    
+    def __call__(self, result: Text3DResult, spec: GameAssetSpec) -> float:
+        terms = []
+        if result.model_urls and result.model_urls.glb:
+            triangles = glb_triangle_count(self.fetch(result.model_urls.glb))
+            terms.append((self.polycount_weight, polycount_score(triangles, spec.target_polycount)))
+        if result.thumbnail_url and Image is not None:
+            terms.append((self.thumbnail_weight, thumbnail_score(self.fetch(result.thumbnail_url))))
+        
+        total_weight = sum(weight for weight, _ in terms)
+        if not total_weight:
+            return 0.0
+        return sum(weight * score for weight, score in terms) / total_weight
@@ -3,10 +3,12 @@ from .text3d_service import Text3DService
 from .rigging_service import RiggingService
 from .animation_service import AnimationService
 from .retexture_service import RetextureService
+from .utils import BulkSubmissionError
 
 __all__ = [
     "Text3DService",
     "RiggingService", 
     "AnimationService",
-    "RetextureService"
+    "RetextureService",
+    "BulkSubmissionError"
 ]
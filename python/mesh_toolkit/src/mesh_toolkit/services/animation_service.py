@@ -5,9 +5,11 @@ For available animation IDs, use the animation catalog:
     
     animation_id = DefaultAnimations.OTTER_WALK
 """
+from typing import Dict, Any, List
 from ..api.base_client import BaseHttpClient
 from ..persistence.repository import TaskRepository
 from ..persistence.schemas import TaskSubmission, TaskStatus
+from .utils import submit_concurrently
 
 
 class AnimationService:
@@ -22,7 +24,8 @@ class AnimationService:
         species: str,
         model_id: str,
         animation_id: str,
-        callback_url: str
+        callback_url: str,
+        record: bool = True
     ) -> TaskSubmission:
         """Apply animation to a rigged model with webhook callback
         
@@ -31,6 +34,8 @@ class AnimationService:
             model_id: ID of rigged model task
             animation_id: ID from animation library
             callback_url: REQUIRED webhook URL for completion notification
+            record: Write the submission to the repository (submit_many
+                records a whole batch at once instead)
         
         Returns:
             TaskSubmission with task_id and spec_hash for tracking
@@ -62,9 +67,42 @@ class AnimationService:
             species=species,
             service="animation",
             status=TaskStatus.PENDING,
-            callback_url=callback_url
+            callback_url=callback_url,
+            params={"model_id": model_id, "animation_id": animation_id}
         )
         
-        self.repository.record_task_submission(submission)
+        if record:
+            self.repository.record_task_submission(submission)
         
         return submission
+
+    def submit_many(
+        self,
+        requests: List[Dict[str, Any]],
+        max_workers: int = 4
+    ) -> List[TaskSubmission]:
+        """Submit several tasks concurrently with a single manifest write per species
+        
+        Each request holds submit_task keyword arguments. Requests share the
+        client's rate limit, and the new tasks are recorded together once all
+        calls have returned.
+        
+        Example:
+            animation.submit_many([
+                {"species": "otter", "model_id": rig_id,
+                 "animation_id": anim_id, "callback_url": url}
+                for anim_id in animation_ids
+            ])
+        
+        Args:
+            requests: submit_task keyword arguments, one dict per task
+            max_workers: Requests in flight at once
+        
+        Returns:
+            TaskSubmissions in request order
+        
+        Raises:
+            BulkSubmissionError: If any request failed; successful tasks are
+                still recorded and available on the exception
+        """
+        return submit_concurrently(self.submit_task, requests, self.repository, max_workers)
@@ -34,7 +34,9 @@ class ServiceFactory:
         self,
         api_key: Optional[str] = None,
         base_path: str = "client/public/models",
-        webhook_base_url: Optional[str] = None
+        webhook_base_url: Optional[str] = None,
+        cache_ttl: Optional[float] = None,
+        client: Optional[BaseHttpClient] = None
     ):
         """
         Initialize service factory.
@@ -43,16 +45,19 @@ class ServiceFactory:
             api_key: Meshy API key (defaults to MESHY_API_KEY env var)
             base_path: Base path for model storage
             webhook_base_url: Base URL for webhooks (e.g., http://host:8000/webhooks/meshy)
+            cache_ttl: Seconds identical Text3D specs reuse an existing task (None = forever)
+            client: Preconfigured HTTP client (e.g. on a simulated backend)
         """
         self._api_key = api_key
         self._base_path = base_path
+        self._cache_ttl = cache_ttl
         self._webhook_base_url = webhook_base_url or os.getenv(
             "MESHY_WEBHOOK_BASE_URL",
             self.DEFAULT_WEBHOOK_BASE
         )
 
         # Lazy-loaded shared dependencies
-        self._client: Optional[BaseHttpClient] = None
+        self._client: Optional[BaseHttpClient] = client
         self._repository: Optional[TaskRepository] = None
 
     @property
@@ -75,7 +80,7 @@ class ServiceFactory:
 
     def text3d(self) -> Text3DService:
         """Create Text3DService instance."""
-        return Text3DService(client=self.client, repository=self.repository)
+        return Text3DService(client=self.client, repository=self.repository, cache_ttl=self._cache_ttl)
 
     def rigging(self) -> RiggingService:
         """Create RiggingService instance."""
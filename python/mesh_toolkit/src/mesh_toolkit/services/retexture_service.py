@@ -1,8 +1,9 @@
 """Retexturing service for generated models (webhook-only)"""
-from typing import Optional
+from typing import Optional, Dict, Any, List
 from ..api.base_client import BaseHttpClient
 from ..persistence.repository import TaskRepository
 from ..persistence.schemas import TaskSubmission, TaskStatus
+from .utils import submit_concurrently
 
 
 class RetextureService:
@@ -22,7 +23,8 @@ class RetextureService:
         negative_prompt: str = "",
         enable_pbr: bool = True,
         resolution: str = "1024",
-        seed: Optional[int] = None
+        seed: Optional[int] = None,
+        record: bool = True
     ) -> TaskSubmission:
         """Retexture a generated model with new prompt and webhook callback
         
@@ -36,6 +38,8 @@ class RetextureService:
             enable_pbr: Enable PBR materials
             resolution: "1024" or "2048"
             seed: Random seed for reproducibility
+            record: Write the submission to the repository (submit_many
+                records a whole batch at once instead)
         
         Returns:
             TaskSubmission with task_id and spec_hash for tracking
@@ -64,6 +68,9 @@ class RetextureService:
         data = response.json()
         task_id = data["result"]
         
+        if not task_id:
+            raise ValueError("Meshy API returned empty task_id")
+        
         submission = TaskSubmission(
             task_id=task_id,
             spec_hash=self.repository.compute_spec_hash(payload),
@@ -73,6 +80,27 @@ class RetextureService:
             callback_url=callback_url
         )
         
-        self.repository.record_task_submission(submission)
+        if record:
+            self.repository.record_task_submission(submission)
         
         return submission
+
+    def submit_many(
+        self,
+        requests: List[Dict[str, Any]],
+        max_workers: int = 4
+    ) -> List[TaskSubmission]:
+        """Submit several retexture tasks concurrently, recorded in one manifest write per species
+        
+        Args:
+            requests: submit_task keyword arguments, one dict per task
+            max_workers: Requests in flight at once
+        
+        Returns:
+            TaskSubmissions in request order
+        
+        Raises:
+            BulkSubmissionError: If any request failed; successful tasks are
+                still recorded and available on the exception
+        """
+        return submit_concurrently(self.submit_task, requests, self.repository, max_workers)
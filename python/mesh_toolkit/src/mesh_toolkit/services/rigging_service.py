@@ -1,7 +1,9 @@
 """Auto-rigging service for generated models (webhook-only)"""
+from typing import Dict, Any, List
 from ..api.base_client import BaseHttpClient
 from ..persistence.repository import TaskRepository
 from ..persistence.schemas import TaskSubmission, TaskStatus
+from .utils import submit_concurrently
 
 
 class RiggingService:
@@ -15,7 +17,8 @@ class RiggingService:
         self,
         species: str,
         model_id: str,
-        callback_url: str
+        callback_url: str,
+        record: bool = True
     ) -> TaskSubmission:
         """Auto-rig a generated model with webhook callback
         
@@ -23,6 +26,8 @@ class RiggingService:
             species: Species identifier for manifest tracking
             model_id: ID of text-to-3D task to rig
             callback_url: REQUIRED webhook URL for completion notification
+            record: Write the submission to the repository (submit_many
+                records a whole batch at once instead)
         
         Returns:
             TaskSubmission with task_id and spec_hash for tracking
@@ -56,6 +61,27 @@ class RiggingService:
             callback_url=callback_url
         )
         
-        self.repository.record_task_submission(submission)
+        if record:
+            self.repository.record_task_submission(submission)
         
         return submission
+
+    def submit_many(
+        self,
+        requests: List[Dict[str, Any]],
+        max_workers: int = 4
+    ) -> List[TaskSubmission]:
+        """Auto-rig several models concurrently, recorded in one manifest write per species
+        
+        Args:
+            requests: submit_task keyword arguments, one dict per task
+            max_workers: Requests in flight at once
+        
+        Returns:
+            TaskSubmissions in request order
+        
+        Raises:
+            BulkSubmissionError: If any request failed; successful tasks are
+                still recorded and available on the exception
+        """
+        return submit_concurrently(self.submit_task, requests, self.repository, max_workers)
@@ -1,16 +1,84 @@
 """Text-to-3D generation service (webhook-only)"""
-from typing import Optional
+import inspect
+from datetime import timedelta
+from typing import Optional, Dict, Any, List, Tuple
 from ..api.base_client import BaseHttpClient
 from ..persistence.repository import TaskRepository
 from ..persistence.schemas import TaskSubmission, TaskStatus
+from .utils import submit_concurrently
 
 
 class Text3DService:
     """Handles text-to-3D model generation via webhooks"""
     
-    def __init__(self, client: BaseHttpClient, repository: TaskRepository):
+    def __init__(
+        self,
+        client: BaseHttpClient,
+        repository: TaskRepository,
+        cache_ttl: Optional[float] = None
+    ):
+        """Initialize service
+        
+        Args:
+            client: HTTP client
+            repository: TaskRepository for recording and cache lookups
+            cache_ttl: Seconds an existing task stays reusable (None = forever)
+        """
         self.client = client
         self.repository = repository
+        self.cache_ttl = cache_ttl
+    
+    def _cached(self, species: str, spec_hash: str, service: str) -> Optional[TaskSubmission]:
+        """Existing task for an identical spec, if reusable"""
+        ttl = timedelta(seconds=self.cache_ttl) if self.cache_ttl is not None else None
+        return self.repository.find_cached_task(species, spec_hash, service, ttl=ttl)
+    
+    def _spec_hash(self, payload: Dict[str, Any]) -> str:
+        """Hash a request payload, ignoring where the webhook goes"""
+        spec = {k: v for k, v in payload.items() if k != "callback_url"}
+        return self.repository.compute_spec_hash(spec)
+    
+    def _payload(
+        self,
+        prompt: str,
+        callback_url: str,
+        art_style: str,
+        model_version: str,
+        negative_prompt: str,
+        enable_pbr: bool,
+        enable_retexture: bool,
+        seed: Optional[int]
+    ) -> Dict[str, Any]:
+        """Request body for a text-to-3D preview task"""
+        payload = {
+            "mode": "preview",
+            "prompt": prompt,
+            "art_style": art_style,
+            "model_version": model_version,
+            "negative_prompt": negative_prompt,
+            "enable_pbr": enable_pbr,
+            "ai_model": "meshy-4",
+            "topology": "quad",
+            "callback_url": callback_url
+        }
+        
+        if enable_retexture:
+            payload["should_remesh"] = True
+        
+        if seed is not None:
+            payload["seed"] = seed
+        
+        return payload
+    
+    def _request_key(self, request: Dict[str, Any]) -> Tuple[str, str]:
+        """(species, spec hash) that submit_task would use for a request"""
+        bound = inspect.signature(self.submit_task).bind(**request)
+        bound.apply_defaults()
+        arguments = dict(bound.arguments)
+        species = arguments.pop("species")
+        arguments.pop("force")
+        arguments.pop("record")
+        return species, self._spec_hash(self._payload(**arguments))
     
     def submit_task(
         self,
@@ -22,7 +90,9 @@ class Text3DService:
         negative_prompt: str = "",
         enable_pbr: bool = True,
         enable_retexture: bool = True,
-        seed: Optional[int] = None
+        seed: Optional[int] = None,
+        force: bool = False,
+        record: bool = True
     ) -> TaskSubmission:
         """Submit text-to-3D generation task with webhook callback
         
@@ -36,27 +106,25 @@ class Text3DService:
             enable_pbr: Enable PBR materials
             enable_retexture: Allow retexturing later
             seed: Random seed for reproducibility
+            force: Submit even if an identical spec already succeeded or is running
+            record: Write the submission to the repository (submit_many
+                records a whole batch at once instead)
         
         Returns:
-            TaskSubmission with task_id and spec_hash for tracking
+            TaskSubmission with task_id and spec_hash for tracking. If an
+            identical spec was found in the repository no request is made and
+            the existing task is returned with cache_hit=True.
         """
-        payload = {
-            "mode": "preview",
-            "prompt": prompt,
-            "art_style": art_style,
-            "model_version": model_version,
-            "negative_prompt": negative_prompt,
-            "enable_pbr": enable_pbr,
-            "ai_model": "meshy-4",
-            "topology": "quad",
-            "callback_url": callback_url
-        }
+        payload = self._payload(
+            prompt, callback_url, art_style, model_version,
+            negative_prompt, enable_pbr, enable_retexture, seed
+        )
         
-        if enable_retexture:
-            payload["should_remesh"] = True
-        
-        if seed is not None:
-            payload["seed"] = seed
+        spec_hash = self._spec_hash(payload)
+        if not force:
+            cached = self._cached(species, spec_hash, "text3d")
+            if cached:
+                return cached
         
         response = self.client.request(
             "POST",
@@ -71,8 +139,6 @@ class Text3DService:
         if not task_id:
             raise ValueError("Meshy API returned empty task_id")
         
-        spec_hash = self.repository.compute_spec_hash(payload)
-        
         submission = TaskSubmission(
             task_id=task_id,
             spec_hash=spec_hash,
@@ -82,7 +148,8 @@ class Text3DService:
             callback_url=callback_url
         )
         
-        self.repository.record_task_submission(submission)
+        if record:
+            self.repository.record_task_submission(submission)
         
         return submission
     
@@ -90,7 +157,8 @@ class Text3DService:
         self,
         species: str,
         task_id: str,
-        callback_url: str
+        callback_url: str,
+        force: bool = False
     ) -> TaskSubmission:
         """Refine preview to full quality model
         
@@ -98,10 +166,21 @@ class Text3DService:
             species: Species identifier
             task_id: Preview task ID to refine
             callback_url: Webhook URL for completion
+            force: Submit even if this preview was already refined
         
         Returns:
-            TaskSubmission for refinement task
+            TaskSubmission for refinement task (cache_hit=True if reused)
         """
+        refine_payload = {
+            "parent_task_id": task_id,
+            "callback_url": callback_url
+        }
+        spec_hash = self._spec_hash(refine_payload)
+        if not force:
+            cached = self._cached(species, spec_hash, "text3d_refine")
+            if cached:
+                return cached
+        
         response = self.client.request(
             "POST",
             f"text-to-3d/{task_id}/refine",
@@ -115,12 +194,6 @@ class Text3DService:
         if not refine_task_id:
             raise ValueError("Meshy API returned empty task_id")
         
-        refine_payload = {
-            "parent_task_id": task_id,
-            "callback_url": callback_url
-        }
-        spec_hash = self.repository.compute_spec_hash(refine_payload)
-        
         submission = TaskSubmission(
             task_id=refine_task_id,
             spec_hash=spec_hash,
@@ -133,3 +206,29 @@ class Text3DService:
         self.repository.record_task_submission(submission)
         
         return submission
+
+    def submit_many(
+        self,
+        requests: List[Dict[str, Any]],
+        max_workers: int = 4
+    ) -> List[TaskSubmission]:
+        """Submit several text-to-3D tasks concurrently, recorded in one manifest write per species
+        
+        Specs that already have a reusable task come back as cache hits
+        without a request. Requests with the same species and spec hash
+        are submitted once and share one TaskSubmission.
+        
+        Args:
+            requests: submit_task keyword arguments, one dict per task
+            max_workers: Requests in flight at once
+        
+        Returns:
+            TaskSubmissions in request order
+        
+        Raises:
+            BulkSubmissionError: If any request failed; successful tasks are
+                still recorded and available on the exception
+        """
+        return submit_concurrently(
+            self.submit_task, requests, self.repository, max_workers, key=self._request_key
+        )
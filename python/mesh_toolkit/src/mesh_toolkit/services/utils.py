@@ -1,5 +1,35 @@
 """Shared utilities for Meshy services"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
 from ..models import TaskStatus
+from ..persistence.repository import TaskRepository
+from ..persistence.schemas import TaskSubmission
+
+
+class BulkSubmissionError(Exception):
+    """Raised by submit_many when some requests failed
+    
+    The tasks that were created are still recorded, so callers can retry
+    just the failed requests. If recording itself failed, `record_error`
+    is set and `submissions` holds the created tasks that are not yet in
+    the manifest, so they can be recorded again instead of resubmitted.
+    """
+    
+    def __init__(
+        self,
+        submissions: List[Optional[TaskSubmission]],
+        errors: Dict[int, Exception],
+        record_error: Optional[Exception] = None
+    ):
+        self.submissions = submissions  # request order, None where it failed
+        self.errors = errors  # request index -> exception
+        self.record_error = record_error
+        message = f"{len(errors)} of {len(submissions)} submissions failed"
+        if record_error is not None:
+            task_ids = [s.task_id for s in submissions if s is not None]
+            message += f"; recording created tasks {task_ids} failed: {record_error}"
+        super().__init__(message)
 
 
 def map_task_status(api_status: str) -> TaskStatus:
@@ -20,3 +50,67 @@ def map_task_status(api_status: str) -> TaskStatus:
     }
     
     return status_map.get(api_status, TaskStatus.PENDING)
+
+
+def submit_concurrently(
+    submit: Callable[..., TaskSubmission],
+    requests: List[Dict[str, Any]],
+    repository: TaskRepository,
+    max_workers: int = 4,
+    key: Optional[Callable[[Dict[str, Any]], Hashable]] = None
+) -> List[TaskSubmission]:
+    """Submit many tasks concurrently and record them in one write per species
+    
+    Requests with equal keys are submitted once and share the resulting
+    TaskSubmission (or error).
+    
+    Args:
+        submit: A service's submit_task; called with each request's kwargs
+            plus record=False
+        requests: Keyword arguments for each submit call
+        repository: TaskRepository that records the new submissions
+        max_workers: Requests in flight at once (the client's rate limit
+            still spaces them out)
+        key: Identity of a request, e.g. its species and spec hash; None
+            submits every request
+    
+    Returns:
+        TaskSubmissions in request order
+    
+    Raises:
+        BulkSubmissionError: If any request failed; the others are recorded.
+            Also raised, with record_error set, if recording the created
+            tasks failed
+    """
+    submissions: List[Optional[TaskSubmission]] = [None] * len(requests)
+    errors: Dict[int, Exception] = {}
+    
+    # Index of the first request with each key; duplicates reuse its result
+    first: List[int] = list(range(len(requests)))
+    if key is not None:
+        seen: Dict[Hashable, int] = {}
+        first = [seen.setdefault(key(kwargs), index) for index, kwargs in enumerate(requests)]
+    
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        futures = {
+            index: pool.submit(submit, **requests[index], record=False)
+            for index in sorted(set(first))
+        }
+        for index, origin in enumerate(first):
+            try:
+                submissions[index] = futures[origin].result()
+            except Exception as e:
+                errors[index] = e
+    
+    # Cache hits were recorded when they were first submitted
+    try:
+        repository.record_task_submissions(
+            submissions[index] for index in sorted(set(first))
+            if submissions[index] is not None and not submissions[index].cache_hit
+        )
+    except Exception as e:
+        raise BulkSubmissionError(submissions, errors, record_error=e) from e
+    
+    if errors:
+        raise BulkSubmissionError(submissions, errors)
+    return submissions
@@ -0,0 +1,256 @@
+"""Simulated Meshy backend for offline capacity planning
+
+SimulatedMeshy is an in-process fake of the Meshy task API exposed as an
+httpx transport, so MeshyClient, BaseHttpClient and everything built on them
+run unchanged without network access or credits:
+    
+    backend = SimulatedMeshy(SimulationConfig(time_scale=600, seed=1))
+    client = MeshyClient(api_key="sim", transport=backend.transport,
+                         time_scale=backend.config.time_scale)
+
+Task durations are drawn per service from log-normal distributions and
+failures from per-service rates. The account-level limit on running tasks
+makes the rest wait as PENDING, and requests beyond a requests-per-minute
+budget (or a random share of them) get 429 with Retry-After. Time runs
+`time_scale` times faster than the wall clock; all durations and timestamps
+the backend reports are in simulated seconds.
+"""
+import heapq
+import itertools
+import json
+import math
+import random
+import re
+import threading
+import time
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+import httpx
+
+
+@dataclass
+class LatencyModel:
+    """Log-normal task duration in simulated seconds"""
+    median: float
+    sigma: float = 0.3
+    minimum: float = 1.0
+    
+    def sample(self, rng: random.Random) -> float:
+        return max(self.minimum, self.median * math.exp(rng.gauss(0.0, self.sigma)))
+
+
+@dataclass
+class ServiceProfile:
+    """Simulated behaviour of one Meshy service"""
+    duration: LatencyModel
+    failure_rate: float = 0.0
+
+
+# Rough medians observed for meshy-4 tasks
+DEFAULT_PROFILES: Dict[str, ServiceProfile] = {
+    "text3d": ServiceProfile(LatencyModel(median=90)),
+    "text3d_refine": ServiceProfile(LatencyModel(median=240)),
+    "rigging": ServiceProfile(LatencyModel(median=120)),
+    "animation": ServiceProfile(LatencyModel(median=60)),
+    "retexture": ServiceProfile(LatencyModel(median=150)),
+}
+
+
+@dataclass
+class SimulationConfig:
+    """Knobs for the simulated backend"""
+    profiles: Dict[str, ServiceProfile] = field(default_factory=lambda: dict(DEFAULT_PROFILES))
+    time_scale: float = 60.0  # simulated seconds per real second
+    max_running: Optional[int] = 10  # tasks processed at once; the rest queue as PENDING
+    requests_per_minute: Optional[float] = None  # 429 beyond this many calls per simulated minute
+    throttle_rate: float = 0.0  # probability of a 429 on any call
+    retry_after: float = 5.0  # simulated seconds announced in Retry-After
+    seed: Optional[int] = None
+
+
+@dataclass
+class SimulatedTask:
+    """One task inside the simulated backend"""
+    task_id: str
+    service: str
+    created_at: float
+    started_at: float
+    finished_at: float
+    failed: bool = False
+    
+    def status_at(self, now: float) -> Tuple[str, int]:
+        """(status, progress) at simulated time now"""
+        if now < self.started_at:
+            return "PENDING", 0
+        if now < self.finished_at:
+            return "IN_PROGRESS", int(99 * (now - self.started_at) / (self.finished_at - self.started_at))
+        return ("FAILED", 0) if self.failed else ("SUCCEEDED", 100)
+
+
+# /openapi/v2/text-to-3d, /v2/text-to-3d/{id}, /openapi/v2/text-to-3d/{id}/refine, ...
+_ROUTE = re.compile(r"^/(?:openapi/)?v\d+/(?P<resource>[a-z0-9-]+)(?:/(?P<task_id>[^/]+))?(?P<refine>/refine)?/?$")
+
+RESOURCE_SERVICES = {
+    "text-to-3d": "text3d",
+    "rigging": "rigging",
+    "animations": "animation",
+    "retexture": "retexture",
+}
+
+
+def peak_overlap(intervals: List[Tuple[float, float]]) -> int:
+    """Maximum number of [start, end) intervals open at once"""
+    events = sorted([(start, 1) for start, _ in intervals] + [(end, -1) for _, end in intervals])
+    peak = current = 0
+    for _, delta in events:
+        current += delta
+        peak = max(peak, current)
+    return peak
+
+
+class SimulatedMeshy:
+    """In-process fake Meshy API with a synthetic latency model"""
+    
+    def __init__(
+        self,
+        config: Optional[SimulationConfig] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """Initialize backend
+        
+        Args:
+            config: Latency, failure and throttling settings
+            clock: Monotonic real-time source (injectable for tests)
+        """
+        self.config = config or SimulationConfig()
+        self.rng = random.Random(self.config.seed)
+        self.tasks: Dict[str, SimulatedTask] = {}
+        self.api_calls: Counter = Counter()
+        self.throttled = 0
+        
+        self._ids = itertools.count(1)
+        self._slots: List[float] = []  # heap of times running slots free up
+        self._recent: Deque[float] = deque()  # request times in the last simulated minute
+        self._lock = threading.Lock()
+        self._epoch = time.time()
+        self._clock = clock
+        self._start = clock()
+    
+    @property
+    def transport(self) -> httpx.MockTransport:
+        """Transport to pass to MeshyClient/BaseHttpClient"""
+        return httpx.MockTransport(self.handle)
+    
+    def now(self) -> float:
+        """Simulated seconds since the backend was created"""
+        return (self._clock() - self._start) * self.config.time_scale
+    
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        """Serve one API request"""
+        match = _ROUTE.match(request.url.path)
+        if not match or match["resource"] not in RESOURCE_SERVICES:
+            return httpx.Response(404, json={"message": f"No route for {request.url.path}"})
+        
+        with self._lock:
+            now = self.now()
+            call = f"{request.method} {match['resource']}"
+            self.api_calls[call] += 1
+            
+            if self._throttle(now):
+                self.throttled += 1
+                return httpx.Response(
+                    429,
+                    headers={"retry-after": str(self.config.retry_after)},
+                    json={"message": "Too many requests"}
+                )
+            
+            if request.method == "POST":
+                return self._create(match, request, now)
+            if request.method == "GET" and match["task_id"]:
+                task = self.tasks.get(match["task_id"])
+                if not task:
+                    return httpx.Response(404, json={"message": "Task not found"})
+                return httpx.Response(200, json=self._payload(task, now))
+        
+        return httpx.Response(405, json={"message": "Method not allowed"})
+    
+    def _throttle(self, now: float) -> bool:
+        limit = self.config.requests_per_minute
+        if limit:
+            while self._recent and self._recent[0] <= now - 60.0:
+                self._recent.popleft()
+            if len(self._recent) >= limit:
+                return True
+            self._recent.append(now)
+        return self.rng.random() < self.config.throttle_rate
+    
+    def _create(self, match: "re.Match", request: httpx.Request, now: float) -> httpx.Response:
+        service = RESOURCE_SERVICES[match["resource"]]
+        if service == "text3d":
+            mode = _json(request.read()).get("mode")
+            if match["refine"] or mode == "refine":
+                service = "text3d_refine"
+        
+        profile = self.config.profiles.get(service) or DEFAULT_PROFILES[service]
+        started = now
+        if self.config.max_running:
+            if len(self._slots) >= self.config.max_running:
+                started = max(now, heapq.heappop(self._slots))
+        finished = started + profile.duration.sample(self.rng)
+        if self.config.max_running:
+            heapq.heappush(self._slots, finished)
+        
+        task = SimulatedTask(
+            task_id=f"sim-{service}-{next(self._ids)}",
+            service=service,
+            created_at=now,
+            started_at=started,
+            finished_at=finished,
+            failed=self.rng.random() < profile.failure_rate
+        )
+        self.tasks[task.task_id] = task
+        return httpx.Response(202, json={"result": task.task_id})
+    
+    def _payload(self, task: SimulatedTask, now: float) -> Dict[str, Any]:
+        status, progress = task.status_at(now)
+        
+        def stamp(t: float) -> Optional[int]:
+            return int((self._epoch + t) * 1000) if t <= now else None
+        
+        payload = {
+            "id": task.task_id,
+            "status": status,
+            "progress": progress,
+            "created_at": stamp(task.created_at),
+            "started_at": stamp(task.started_at),
+            "finished_at": stamp(task.finished_at),
+        }
+        if status == "FAILED":
+            payload["error"] = "Simulated failure"
+            payload["task_error"] = {"message": "Simulated failure"}
+        return payload
+    
+    def stats(self) -> Dict[str, Any]:
+        """Call counts, task counts and concurrency observed so far"""
+        with self._lock:
+            tasks = list(self.tasks.values())
+            return {
+                "simulated_seconds": self.now(),
+                "api_calls": dict(self.api_calls),
+                "api_calls_total": sum(self.api_calls.values()),
+                "throttled": self.throttled,
+                "tasks": dict(Counter(t.service for t in tasks)),
+                "failed_tasks": sum(t.failed for t in tasks),
+                "peak_running": peak_overlap([(t.started_at, t.finished_at) for t in tasks]),
+                "peak_in_flight": peak_overlap([(t.created_at, t.finished_at) for t in tasks]),
+                "last_task_finished": max((t.finished_at for t in tasks), default=0.0),
+            }
+
+
+def _json(content: bytes) -> Dict[str, Any]:
+    try:
+        return json.loads(content or b"{}")
+    except ValueError:
+        return {}
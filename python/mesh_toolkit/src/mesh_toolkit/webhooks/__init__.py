@@ -1,5 +1,6 @@
 """Webhook handling for Meshy API callbacks"""
 from .handler import WebhookHandler
+from .reconciler import ReconciliationWorker
 from .schemas import MeshyWebhookPayload
 
-__all__ = ["WebhookHandler", "MeshyWebhookPayload"]
+__all__ = ["WebhookHandler", "MeshyWebhookPayload", "ReconciliationWorker"]
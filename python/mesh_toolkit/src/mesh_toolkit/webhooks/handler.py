@@ -1,10 +1,15 @@
 """Webhook handler for Meshy API callbacks"""
 import hashlib
+import os
+import tempfile
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from ..persistence.repository import TaskRepository
-from ..persistence.schemas import ArtifactRecord
+from ..persistence.schemas import ArtifactRecord, MeshStats
+from ..processing.glb import GlbFile, GlbError
+from ..processing.phash import image_hashes
+from ..processing.validate import validate_glb
 from ..api.base_client import BaseHttpClient
 from .schemas import MeshyWebhookPayload
 
@@ -22,7 +27,9 @@ class WebhookHandler:
         self,
         repository: TaskRepository,
         client: Optional[BaseHttpClient] = None,
-        download_artifacts: bool = True
+        download_artifacts: bool = True,
+        validate_artifacts: bool = True,
+        download_attempts: int = 3
     ):
         """Initialize webhook handler
         
@@ -30,16 +37,21 @@ class WebhookHandler:
             repository: TaskRepository for updating state
             client: Optional HTTP client for downloading artifacts
             download_artifacts: Whether to download GLB files on SUCCEEDED
+            validate_artifacts: Validate downloaded GLBs and re-download corrupt ones
+            download_attempts: Downloads tried before a corrupt GLB is given up on
         """
         self.repository = repository
         self.client = client
         self.download_artifacts = download_artifacts
+        self.validate_artifacts = validate_artifacts
+        self.download_attempts = max(1, download_attempts)
     
     def handle_webhook(
         self,
         payload: MeshyWebhookPayload,
         species: Optional[str] = None,
-        spec_hash: Optional[str] = None
+        spec_hash: Optional[str] = None,
+        source: str = "webhook"
     ) -> Dict[str, Any]:
         """Process webhook payload and update repository
         
@@ -47,6 +59,7 @@ class WebhookHandler:
             payload: Parsed webhook payload
             species: Optional species name (will search if not provided)
             spec_hash: Optional spec hash (will search if not provided)
+            source: Update source recorded in status history
         
         Returns:
             Dict with status and details
@@ -101,6 +114,15 @@ class WebhookHandler:
                 )
                 if artifact:
                     artifacts.append(artifact)
+            if payload.thumbnail_url:
+                thumbnail = self._download_thumbnail_artifact(
+                    species=found_species,
+                    spec_hash=found_spec_hash,
+                    service=service_name,
+                    thumbnail_url=payload.thumbnail_url
+                )
+                if thumbnail:
+                    artifacts.append(thumbnail)
         
         # Update repository
         self.repository.record_task_update(
@@ -110,7 +132,7 @@ class WebhookHandler:
             status=payload.status,
             result_paths=result_paths,
             artifacts=artifacts if artifacts else None,
-            source="webhook",
+            source=source,
             error=error_message
         )
         
@@ -133,6 +155,12 @@ class WebhookHandler:
     ) -> Optional[ArtifactRecord]:
         """Download GLB artifact and create record
         
+        Each attempt downloads to a temporary file next to the artifact,
+        which replaces it only once it validates, so a corrupt redelivery
+        never clobbers a GLB an earlier record points to. Corrupt or
+        truncated downloads are fetched again, up to download_attempts
+        times; an artifact that never validates is not recorded.
+        
         Args:
             species: Species name
             spec_hash: Asset spec hash
@@ -145,18 +173,33 @@ class WebhookHandler:
         if not self.client:
             return None
         
+        temp_path = None
         try:
             # Determine output path
             species_dir = self.repository.base_path / species
             filename = f"{spec_hash}_{service}.glb"
             output_path = species_dir / filename
+            species_dir.mkdir(parents=True, exist_ok=True)
+            fd, temp_name = tempfile.mkstemp(dir=species_dir, prefix=f".{filename}.", suffix=".part")
+            os.close(fd)
+            temp_path = Path(temp_name)
             
-            # Download file
-            file_size = self.client.download_file(glb_url, str(output_path))
+            # Download file, retrying while it fails validation
+            for attempt in range(1, self.download_attempts + 1):
+                file_size = self.client.download_file(glb_url, str(temp_path))
+                if not self.validate_artifacts:
+                    break
+                validation = validate_glb(temp_path)
+                if validation.valid:
+                    break
+                print(f"⚠️  {filename} failed validation (attempt {attempt}): {'; '.join(validation.errors)}")
+            else:
+                print(f"✗ Giving up on {filename} after {self.download_attempts} corrupt downloads")
+                return None
+            os.replace(temp_path, output_path)
             
-            # Compute hash
-            with open(output_path, 'rb') as f:
-                file_hash = hashlib.sha256(f.read()).hexdigest()
+            # Compute hash and mesh statistics
+            file_hash, mesh_stats = self._inspect_artifact(output_path)
             
             # Create artifact record
             return ArtifactRecord(
@@ -164,12 +207,74 @@ class WebhookHandler:
                 sha256_hash=file_hash,
                 file_size_bytes=file_size,
                 downloaded_at=datetime.utcnow(),
-                source_url=glb_url
+                source_url=glb_url,
+                mesh_stats=mesh_stats
             )
         
         except Exception as e:
             print(f"Error downloading artifact: {e}")
             return None
+        
+        finally:
+            if temp_path is not None:
+                temp_path.unlink(missing_ok=True)
+    
+    def _download_thumbnail_artifact(
+        self,
+        species: str,
+        spec_hash: str,
+        service: str,
+        thumbnail_url: str
+    ) -> Optional[ArtifactRecord]:
+        """Download a task's thumbnail and record its perceptual hashes
+        
+        The hashes let reviewers cluster near-identical results with
+        TaskRepository.find_near_duplicates. Without Pillow and numpy the
+        thumbnail is still recorded, unhashed.
+        
+        Returns:
+            ArtifactRecord of kind "thumbnail" if successful, None otherwise
+        """
+        try:
+            filename = f"{spec_hash}_{service}_thumb.png"
+            output_path = self.repository.base_path / species / filename
+            file_size = self.client.download_file(thumbnail_url, str(output_path))
+            data = output_path.read_bytes()
+            
+            hashes: Dict[str, str] = {}
+            try:
+                hashes = image_hashes(data)
+            except ImportError:
+                pass
+            except Exception as e:
+                print(f"⚠️  Could not hash {filename}: {e}")
+            
+            return ArtifactRecord(
+                relative_path=filename,
+                sha256_hash=hashlib.sha256(data).hexdigest(),
+                file_size_bytes=file_size,
+                downloaded_at=datetime.utcnow(),
+                source_url=thumbnail_url,
+                kind="thumbnail",
+                image_hashes=hashes
+            )
+        
+        except Exception as e:
+            print(f"Error downloading thumbnail: {e}")
+            return None
+    
+    def _inspect_artifact(self, path: Path) -> Tuple[str, Optional[MeshStats]]:
+        """SHA-256 and mesh statistics of a downloaded GLB, read via one mmap
+        
+        A file that does not parse as GLB still gets a hash, with no stats.
+        """
+        try:
+            with GlbFile.open(path) as glb:
+                return hashlib.sha256(glb.buffer).hexdigest(), glb.stats()
+        except GlbError as e:
+            print(f"⚠️  {path.name} is not a valid GLB: {e}")
+        with open(path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest(), None
     
     def verify_signature(self, payload: bytes, signature: str) -> bool:
         """Verify webhook signature (stubbed for testing)
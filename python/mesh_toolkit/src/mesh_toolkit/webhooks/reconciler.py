@@ -0,0 +1,178 @@
+"""Reconciliation worker for webhooks that never arrived
+
+If the tunnel or proxy is down when Meshy fires a callback, the task stays
+PENDING in the repository forever. The reconciler periodically looks for
+non-terminal tasks that have gone quiet, fetches their real status from the
+API and replays it through WebhookHandler, so state converges exactly as if
+the webhook had been delivered.
+"""
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..api.base_client import BaseHttpClient
+from ..persistence.repository import TaskRepository
+from ..persistence.schemas import TaskGraphEntry
+from .handler import WebhookHandler
+from .schemas import MeshyWebhookPayload
+
+# service name -> (endpoint, api_version) for task status lookups
+SERVICE_ENDPOINTS: Dict[str, Tuple[str, str]] = {
+    "text3d": ("text-to-3d", "v2"),
+    "text3d_refine": ("text-to-3d", "v2"),
+    "rigging": ("rigging", "v1"),
+    "animation": ("animations", "v1"),
+    "retexture": ("retexture", "v1"),
+}
+
+
+class ReconciliationWorker:
+    """Self-healing loop that replays missed webhooks from the API"""
+    
+    def __init__(
+        self,
+        repository: TaskRepository,
+        client: BaseHttpClient,
+        handler: Optional[WebhookHandler] = None,
+        stale_after: float = 900.0,
+        interval: float = 300.0,
+        jitter: float = 0.2,
+        max_concurrent: int = 4,
+        species: Optional[str] = None
+    ):
+        """Initialize reconciliation worker
+        
+        Args:
+            repository: TaskRepository to scan for stale tasks
+            client: HTTP client used to fetch task status
+            handler: WebhookHandler to feed results through (built from
+                repository and client if not provided)
+            stale_after: Seconds without an update before a task is reconciled
+            interval: Mean seconds between reconciliation passes
+            jitter: Fraction of interval to randomize each sleep by (0.2 = ±20%)
+            max_concurrent: Maximum status fetches in flight
+            species: Optional species to limit reconciliation to
+        """
+        self.repository = repository
+        self.client = client
+        self.handler = handler or WebhookHandler(repository=repository, client=client)
+        self.stale_after = stale_after
+        self.interval = interval
+        self.jitter = jitter
+        self.max_concurrent = max_concurrent
+        self.species = species
+        self._stop_event = threading.Event()
+    
+    def fetch_status(self, service: str, task_id: str) -> MeshyWebhookPayload:
+        """Fetch current task state from the API as a webhook payload
+        
+        Args:
+            service: Service name recorded in the task graph
+            task_id: Meshy task ID
+        
+        Returns:
+            MeshyWebhookPayload built from the API response
+        
+        Raises:
+            ValueError: If the service has no known status endpoint
+        """
+        if service not in SERVICE_ENDPOINTS:
+            raise ValueError(f"No status endpoint for service: {service}")
+        
+        endpoint, api_version = SERVICE_ENDPOINTS[service]
+        response = self.client.request(
+            "GET",
+            f"{endpoint}/{task_id}",
+            api_version=api_version
+        )
+        return MeshyWebhookPayload.model_validate(response.json())
+    
+    def _reconcile_task(
+        self,
+        species: str,
+        spec_hash: str,
+        task: TaskGraphEntry
+    ) -> Dict[str, Any]:
+        """Fetch one task and replay it through the handler if it moved"""
+        try:
+            payload = self.fetch_status(task.service, task.task_id)
+        except Exception as e:
+            return {"status": "error", "task_id": task.task_id, "message": str(e)}
+        
+        if payload.status == task.status:
+            # Still running upstream - nothing to replay
+            return {"status": "unchanged", "task_id": task.task_id, "task_status": task.status}
+        
+        return self.handler.handle_webhook(
+            payload,
+            species=species,
+            spec_hash=spec_hash,
+            source="reconciler"
+        )
+    
+    def reconcile_once(self) -> List[Dict[str, Any]]:
+        """Run a single reconciliation pass
+        
+        Returns:
+            One result dict per stale task (handler result, "unchanged" or "error")
+        """
+        stale = self.repository.list_stale_tasks(
+            older_than=timedelta(seconds=self.stale_after),
+            species=self.species
+        )
+        return self.reconcile_tasks(stale)
+    
+    def reconcile_tasks(
+        self,
+        tasks: List[Tuple[str, str, TaskGraphEntry]]
+    ) -> List[Dict[str, Any]]:
+        """Fetch and replay a specific set of tasks
+        
+        Args:
+            tasks: (species, spec_hash, TaskGraphEntry) tuples, as returned
+                by TaskRepository.list_stale_tasks
+        
+        Returns:
+            One result dict per task (handler result, "unchanged" or "error")
+        """
+        if not tasks:
+            return []
+        
+        with ThreadPoolExecutor(max_workers=self.max_concurrent) as pool:
+            futures = [
+                pool.submit(self._reconcile_task, species, spec_hash, task)
+                for species, spec_hash, task in tasks
+            ]
+            return [future.result() for future in futures]
+    
+    def next_delay(self) -> float:
+        """Seconds until the next pass, randomized so workers don't synchronize"""
+        spread = self.interval * self.jitter
+        return max(0.0, self.interval + random.uniform(-spread, spread))
+    
+    def run_forever(self) -> None:
+        """Reconcile on a jittered schedule until stop() is called"""
+        # Initial offset spreads out workers started at the same time
+        if self._stop_event.wait(random.uniform(0, self.interval * self.jitter)):
+            return
+        
+        while not self._stop_event.is_set():
+            try:
+                results = self.reconcile_once()
+                changed = [r for r in results if r.get("status") == "success"]
+                errors = [r for r in results if r.get("status") == "error"]
+                if results:
+                    print(
+                        f"Reconciled {len(results)} stale tasks: "
+                        f"{len(changed)} updated, {len(errors)} errors"
+                    )
+            except Exception as e:
+                print(f"Reconciliation pass failed: {e}")
+            
+            self._stop_event.wait(self.next_delay())
+    
+    def stop(self) -> None:
+        """Signal run_forever to exit after the current pass"""
+        self._stop_event.set()
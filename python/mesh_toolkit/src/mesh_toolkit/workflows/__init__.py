@@ -0,0 +1,25 @@
+"""Workflow orchestration for multi-stage asset pipelines"""
+from .executor import DEFAULT_STAGE_LIMITS, RESUME_TOKEN_KEY, PipelineExecutor
+from .pipeline import AssetPipelineSpec, PipelineRun, StageRun, StageSpec
+from .scheduler import (
+    DEFAULT_INTENT_PRIORITY,
+    DEFAULT_SERVICE_COSTS,
+    CreditBudget,
+    ScheduledJob,
+    SubmissionScheduler,
+)
+
+__all__ = [
+    "AssetPipelineSpec",
+    "StageSpec",
+    "PipelineRun",
+    "StageRun",
+    "PipelineExecutor",
+    "DEFAULT_STAGE_LIMITS",
+    "RESUME_TOKEN_KEY",
+    "SubmissionScheduler",
+    "ScheduledJob",
+    "CreditBudget",
+    "DEFAULT_INTENT_PRIORITY",
+    "DEFAULT_SERVICE_COSTS"
+]
@@ -0,0 +1,480 @@
+"""Dependency-aware executor for asset pipelines
+
+Each asset is a DAG of service stages (see AssetPipelineSpec). A stage is
+submitted as soon as all of its parents have SUCCEEDED and its service has a
+free concurrency slot, so many species move through every stage at once.
+
+Completion is driven by the repository's task events: webhooks recorded by
+WebhookHandler (in-process or relayed via SocketEventBridge) wake the
+executor immediately. When no webhooks can reach this machine, pass a
+ReconciliationWorker as `poller` and in-flight tasks are fetched from the API
+every `poll_interval` seconds instead.
+
+Pipeline state is checkpointed into the repository as
+AssetManifest.resume_tokens["pipeline"] on an asset keyed by the pipeline
+hash. After a crash, resume() (or start() with the same spec) rebuilds the
+runs from those checkpoints and continues from the last completed stage
+without resubmitting tasks that were already created.
+"""
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from ..persistence.events import TaskEvent
+from ..persistence.repository import TERMINAL_STATUSES
+from ..persistence.schemas import TaskSubmission
+from ..services.factory import ServiceFactory
+from ..webhooks.reconciler import ReconciliationWorker
+from .pipeline import (
+    FAILED,
+    READY,
+    SKIPPED,
+    SUBMITTED,
+    SUCCEEDED,
+    WAITING,
+    AssetPipelineSpec,
+    PipelineRun,
+    StageRun,
+)
+
+# resume_tokens key holding PipelineRun.to_token()
+RESUME_TOKEN_KEY = "pipeline"
+
+# Maximum tasks in flight per service across all pipelines
+DEFAULT_STAGE_LIMITS: Dict[str, int] = {
+    "text3d": 10,
+    "text3d_refine": 10,
+    "rigging": 5,
+    "animation": 10,
+    "retexture": 5,
+}
+
+
+class PipelineExecutor:
+    """Runs many asset pipelines concurrently with per-stage limits"""
+    
+    def __init__(
+        self,
+        factory: ServiceFactory,
+        stage_limits: Optional[Dict[str, int]] = None,
+        poller: Optional[ReconciliationWorker] = None,
+        poll_interval: float = 30.0,
+        submit_workers: int = 4
+    ):
+        """Initialize executor
+        
+        Args:
+            factory: ServiceFactory providing services, repository and callback URLs
+            stage_limits: Per-service in-flight limits (merged over DEFAULT_STAGE_LIMITS)
+            poller: Optional ReconciliationWorker used to poll in-flight tasks
+            poll_interval: Seconds between polls when a poller is set
+            submit_workers: Threads used for task submission HTTP calls
+        """
+        self.factory = factory
+        self.repository = factory.repository
+        self.stage_limits = {**DEFAULT_STAGE_LIMITS, **(stage_limits or {})}
+        self.poller = poller
+        self.poll_interval = poll_interval
+        
+        self.runs: Dict[str, PipelineRun] = {}
+        # Several stages can share a task when the Text3D cache reuses it
+        self._by_task: Dict[str, List[Tuple[PipelineRun, StageRun]]] = defaultdict(list)
+        self._ready: Deque[Tuple[PipelineRun, StageRun]] = deque()
+        self._in_flight: Dict[str, int] = defaultdict(int)
+        self._cond = threading.Condition()
+        self._checkpoint_lock = threading.Lock()
+        self._services: Dict[str, Any] = {}
+        self._pool = ThreadPoolExecutor(max_workers=submit_workers)
+        self._unsubscribe = self.repository.events.subscribe(self._on_event)
+    
+    def start(self, spec: AssetPipelineSpec) -> PipelineRun:
+        """Start a pipeline, continuing from its checkpoint if one exists
+        
+        Starting a spec that is already running returns the running pipeline;
+        starting one that was checkpointed by an earlier process resumes it.
+        
+        Args:
+            spec: Pipeline definition
+        
+        Returns:
+            PipelineRun tracking the pipeline's stages
+        """
+        with self._cond:
+            existing = self.runs.get(spec.pipeline_id)
+            if existing:
+                return existing
+        
+        asset = self.repository.get_asset_record(spec.species, spec.pipeline_id)
+        if asset and RESUME_TOKEN_KEY in asset.resume_tokens:
+            return self._restore(PipelineRun.from_token(asset.resume_tokens[RESUME_TOKEN_KEY]))
+        
+        run = PipelineRun.from_spec(spec)
+        with self._cond:
+            self.runs[run.pipeline_id] = run
+            for stage in run.stages.values():
+                if not stage.spec.parents:
+                    stage.state = READY
+                    self._ready.append((run, stage))
+        
+        self._checkpoint(run)
+        self._dispatch()
+        return run
+    
+    def resume(self, species: Optional[str] = None) -> List[PipelineRun]:
+        """Continue every unfinished pipeline checkpointed in the repository
+        
+        Args:
+            species: Optional species to limit resumption to
+        
+        Returns:
+            PipelineRuns that were resumed
+        """
+        resumed = []
+        for _, pipeline_id, token in self.repository.list_resume_tokens(RESUME_TOKEN_KEY, species=species):
+            with self._cond:
+                if pipeline_id in self.runs:
+                    continue
+            run = PipelineRun.from_token(token)
+            if run.finished:
+                continue
+            resumed.append(self._restore(run))
+        return resumed
+    
+    def wait(self, timeout: Optional[float] = None) -> List[PipelineRun]:
+        """Block until every started pipeline has finished
+        
+        Args:
+            timeout: Seconds to wait (None = forever)
+        
+        Returns:
+            All PipelineRuns, in start order
+        
+        Raises:
+            TimeoutError: If pipelines are still running at the deadline
+        """
+        deadline = time.time() + timeout if timeout is not None else None
+        last_poll = time.time()
+        
+        while True:
+            with self._cond:
+                if all(run.finished for run in self.runs.values()):
+                    return list(self.runs.values())
+                
+                waits = []
+                if deadline is not None:
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        raise TimeoutError(
+                            f"{sum(not r.finished for r in self.runs.values())} pipelines still running"
+                        )
+                    waits.append(remaining)
+                if self.poller:
+                    waits.append(max(0.0, last_poll + self.poll_interval - time.time()))
+                self._cond.wait(min(waits) if waits else None)
+            
+            if self.poller and time.time() - last_poll >= self.poll_interval:
+                self.poll_once()
+                last_poll = time.time()
+    
+    def poll_once(self) -> List[Dict[str, Any]]:
+        """Fetch in-flight tasks from the API through the poller
+        
+        Status changes are recorded by the poller's handler, which publishes
+        the task events that advance the pipelines.
+        
+        Returns:
+            Poller results, one per in-flight task
+        """
+        if not self.poller:
+            return []
+        
+        with self._cond:
+            in_flight = list({
+                stage.task_id: (run.spec.species, stage.spec_hash, stage.task_id)
+                for tracked in self._by_task.values()
+                for run, stage in tracked
+                if stage.state == SUBMITTED
+            }.values())
+        
+        tasks = []
+        for species, spec_hash, task_id in in_flight:
+            asset = self.repository.get_asset_record(species, spec_hash)
+            entry = next((t for t in asset.task_graph if t.task_id == task_id), None) if asset else None
+            if entry:
+                tasks.append((species, spec_hash, entry))
+        
+        return self.poller.reconcile_tasks(tasks)
+    
+    def status(self) -> List[Dict[str, Any]]:
+        """Snapshot of every pipeline's stage states"""
+        with self._cond:
+            return [run.to_dict() for run in self.runs.values()]
+    
+    def close(self) -> None:
+        """Stop listening for events and wait for pending submissions"""
+        self._unsubscribe()
+        self._pool.shutdown(wait=True)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *args):
+        self.close()
+    
+    def _restore(self, run: PipelineRun) -> PipelineRun:
+        """Register a checkpointed run and reconcile it with the repository"""
+        species = run.spec.species
+        
+        # Stages are in topological order, so parents settle before children
+        for stage in run.stages.values():
+            if stage.state == SUBMITTED and not stage.task_id:
+                adopted = self._adopt_orphan(run, stage)
+                if adopted:
+                    stage.task_id, stage.spec_hash = adopted
+                else:
+                    # Crashed before the API call - safe to submit again
+                    stage.state = WAITING
+            
+            if stage.state == SUBMITTED:
+                current = self.repository.get_task_event(stage.task_id, species=species)
+                if current and current.status in TERMINAL_STATUSES:
+                    stage.state = SUCCEEDED if current.status == SUCCEEDED else FAILED
+                    if stage.state == FAILED:
+                        stage.error = f"Task {stage.task_id} ended {current.status}"
+            
+            if stage.state in (WAITING, READY):
+                parent_states = [run.stages[p].state for p in stage.spec.parents]
+                if any(ps in (FAILED, SKIPPED) for ps in parent_states):
+                    stage.state = SKIPPED
+                    stage.error = "Parent stage failed"
+                elif all(ps == SUCCEEDED for ps in parent_states):
+                    stage.state = READY
+                else:
+                    stage.state = WAITING
+        
+        in_flight = []
+        with self._cond:
+            self.runs[run.pipeline_id] = run
+            for stage in run.stages.values():
+                if stage.state == SUBMITTED:
+                    self._by_task[stage.task_id].append((run, stage))
+                    self._in_flight[stage.spec.service] += 1
+                    in_flight.append(stage.task_id)
+                elif stage.state == READY:
+                    self._ready.append((run, stage))
+            self._cond.notify_all()
+        
+        self._checkpoint(run)
+        
+        # Catch webhooks recorded between the repository check and registration
+        for task_id in in_flight:
+            latest = self.repository.events.latest(task_id)
+            if latest:
+                self._on_event(latest)
+        
+        self._dispatch()
+        return run
+    
+    def _adopt_orphan(self, run: PipelineRun, stage: StageRun) -> Optional[Tuple[str, str]]:
+        """Find the task a crashed submission created, if it got that far
+        
+        Services record every submission before returning, so a task for this
+        stage's service and callback URL created after the checkpointed
+        submit time, and not claimed by another pipeline, belongs to us.
+        
+        Returns:
+            (task_id, spec_hash) if found
+        """
+        if not stage.submitting_since:
+            return None
+        
+        species = run.spec.species
+        since = datetime.fromisoformat(stage.submitting_since)
+        callback_url = self.factory.webhook_url(species, stage.spec.endpoint)
+        
+        claimed = {
+            state.get("task_id")
+            for _, _, token in self.repository.list_resume_tokens(RESUME_TOKEN_KEY, species=species)
+            for state in token.get("stages", {}).values()
+        }
+        with self._cond:
+            claimed.update(self._by_task)
+        
+        manifest = self.repository.load_species_manifest(species)
+        candidates = [
+            (task.created_at, task.task_id, spec_hash)
+            for spec_hash, asset in manifest.asset_specs.items()
+            for task in asset.task_graph
+            if task.service == stage.spec.service
+            and task.payload.get("callback_url") == callback_url
+            and task.created_at >= since
+            and task.task_id not in claimed
+        ]
+        if not candidates:
+            return None
+        
+        _, task_id, spec_hash = min(candidates)
+        return task_id, spec_hash
+    
+    def _checkpoint(self, run: PipelineRun) -> None:
+        """Persist the run's stage states to its resume token"""
+        with self._checkpoint_lock:
+            with self._cond:
+                token = run.to_token()
+            try:
+                self.repository.set_resume_token(
+                    run.spec.species,
+                    run.pipeline_id,
+                    RESUME_TOKEN_KEY,
+                    token,
+                    spec_fingerprint=run.spec.fingerprint
+                )
+            except Exception as e:
+                print(f"Failed to checkpoint pipeline {run.pipeline_id}: {e}")
+    
+    def _on_event(self, event: TaskEvent) -> None:
+        """Advance the owning pipeline when a tracked task finishes"""
+        if event.status not in TERMINAL_STATUSES:
+            return
+        
+        with self._cond:
+            finished = [
+                (run, stage) for run, stage in self._by_task.get(event.task_id, [])
+                if stage.state == SUBMITTED
+            ]
+            for run, stage in finished:
+                self._finish_stage(run, stage, event.status)
+        
+        if not finished:
+            return
+        for run in {id(run): run for run, _ in finished}.values():
+            self._checkpoint(run)
+        self._dispatch()
+    
+    def _finish_stage(
+        self,
+        run: PipelineRun,
+        stage: StageRun,
+        status: str,
+        error: Optional[str] = None
+    ) -> None:
+        """Record a stage outcome and release its children (lock held)"""
+        self._in_flight[stage.spec.service] -= 1
+        
+        if status == SUCCEEDED:
+            stage.state = SUCCEEDED
+            for child in run.children(stage.spec.name):
+                parents_done = all(run.stages[p].state == SUCCEEDED for p in child.spec.parents)
+                if child.state == WAITING and parents_done:
+                    child.state = READY
+                    self._ready.append((run, child))
+        else:
+            stage.state = FAILED
+            stage.error = error or f"Task {stage.task_id} ended {status}"
+            self._skip_descendants(run, stage.spec.name)
+        
+        self._cond.notify_all()
+    
+    def _skip_descendants(self, run: PipelineRun, name: str) -> None:
+        for child in run.children(name):
+            if child.state == WAITING:
+                child.state = SKIPPED
+                child.error = f"Parent stage {name} failed"
+                self._skip_descendants(run, child.spec.name)
+    
+    def _dispatch(self) -> None:
+        """Submit ready stages that fit within their service's limit"""
+        launch = []
+        with self._cond:
+            waiting: Deque[Tuple[PipelineRun, StageRun]] = deque()
+            while self._ready:
+                run, stage = self._ready.popleft()
+                service = stage.spec.service
+                if self._in_flight[service] < self.stage_limits.get(service, 1):
+                    self._in_flight[service] += 1
+                    stage.state = SUBMITTED
+                    stage.submitting_since = datetime.utcnow().isoformat()
+                    launch.append((run, stage))
+                else:
+                    waiting.append((run, stage))
+            self._ready = waiting
+        
+        for run, stage in launch:
+            self._pool.submit(self._submit_stage, run, stage)
+    
+    def _submit_stage(self, run: PipelineRun, stage: StageRun) -> None:
+        """Create the stage's Meshy task (runs on the submit pool)"""
+        # Write-ahead: record the submit attempt so a crash can be reconciled
+        self._checkpoint(run)
+        
+        try:
+            submission = self._submit(run, stage)
+        except Exception as e:
+            with self._cond:
+                self._finish_stage(run, stage, FAILED, error=f"Submission failed: {e}")
+            self._checkpoint(run)
+            self._dispatch()
+            return
+        
+        with self._cond:
+            stage.task_id = submission.task_id
+            stage.spec_hash = submission.spec_hash
+            self._by_task[submission.task_id].append((run, stage))
+        self._checkpoint(run)
+        
+        # A webhook may have landed before the task was registered above, and
+        # a cache hit may already be finished with no webhook coming at all
+        latest = self.repository.events.latest(submission.task_id)
+        if not latest and submission.cache_hit:
+            latest = self.repository.get_task_event(submission.task_id, species=run.spec.species)
+        if latest:
+            self._on_event(latest)
+    
+    def _service(self, name: str):
+        if name not in self._services:
+            self._services[name] = getattr(self.factory, name)()
+        return self._services[name]
+    
+    def _submit(self, run: PipelineRun, stage: StageRun) -> TaskSubmission:
+        """Call the service for a stage"""
+        species = run.spec.species
+        spec = stage.spec
+        callback_url = self.factory.webhook_url(species, spec.endpoint)
+        model_id = run.stages[spec.input_stage].task_id if spec.input_stage else None
+        
+        if spec.service == "text3d":
+            return self._service("text3d").submit_task(
+                species=species,
+                callback_url=callback_url,
+                **spec.params
+            )
+        if spec.service == "text3d_refine":
+            return self._service("text3d").refine_task(
+                species=species,
+                task_id=model_id,
+                callback_url=callback_url
+            )
+        if spec.service == "rigging":
+            return self._service("rigging").submit_task(
+                species=species,
+                model_id=model_id,
+                callback_url=callback_url
+            )
+        if spec.service == "animation":
+            return self._service("animation").submit_task(
+                species=species,
+                model_id=model_id,
+                callback_url=callback_url,
+                **spec.params
+            )
+        if spec.service == "retexture":
+            return self._service("retexture").submit_task(
+                species=species,
+                model_id=model_id,
+                callback_url=callback_url,
+                **spec.params
+            )
+        raise ValueError(f"Unknown pipeline service: {spec.service}")
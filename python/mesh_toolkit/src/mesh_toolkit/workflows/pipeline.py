@@ -0,0 +1,200 @@
+"""Asset pipeline definitions as stage DAGs"""
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional
+
+from ..persistence.utils import canonicalize_spec, compute_spec_hash
+
+# Stage lifecycle inside the executor
+WAITING = "WAITING"        # parents not finished
+READY = "READY"            # parents succeeded, waiting for a concurrency slot
+SUBMITTED = "SUBMITTED"    # task created, waiting for a terminal status
+SUCCEEDED = "SUCCEEDED"
+FAILED = "FAILED"
+SKIPPED = "SKIPPED"        # an ancestor failed
+
+FINISHED_STAGE_STATES = {SUCCEEDED, FAILED, SKIPPED}
+
+
+@dataclass
+class StageSpec:
+    """One service call in an asset pipeline"""
+    name: str
+    service: str  # text3d, text3d_refine, rigging, animation, retexture
+    endpoint: str  # webhook callback endpoint (static, rigged, walk, ...)
+    parents: List[str] = field(default_factory=list)
+    input_stage: Optional[str] = None  # parent whose task_id is the model_id
+    params: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class AssetPipelineSpec:
+    """Text3D → refine → rigging → N animations → retexture for one species
+    
+    Retexture only needs the model, so it runs alongside rigging and the
+    animations rather than after them.
+    """
+    species: str
+    prompt: str
+    animations: Dict[str, str] = field(default_factory=dict)  # name -> animation_id
+    retexture_prompt: Optional[str] = None
+    refine: bool = True
+    rig: bool = True
+    text3d_options: Dict[str, Any] = field(default_factory=dict)
+    retexture_options: Dict[str, Any] = field(default_factory=dict)
+    
+    @property
+    def pipeline_id(self) -> str:
+        """Stable hash of the pipeline definition"""
+        return compute_spec_hash(asdict(self))
+    
+    @property
+    def fingerprint(self) -> str:
+        """Canonical JSON of the pipeline definition"""
+        return canonicalize_spec(asdict(self))
+    
+    def build_stages(self) -> List[StageSpec]:
+        """Expand the spec into stages in topological order
+        
+        Raises:
+            ValueError: If animations are requested without rigging
+        """
+        if self.animations and not self.rig:
+            raise ValueError(
+                f"Pipeline for {self.species} requests animations "
+                f"({', '.join(self.animations)}) but rig=False; animations need a rigged model"
+            )
+        stages = [StageSpec(
+            name="text3d",
+            service="text3d",
+            endpoint="static",
+            params={"prompt": self.prompt, **self.text3d_options}
+        )]
+        model_stage = "text3d"
+        
+        if self.refine:
+            stages.append(StageSpec(
+                name="refine",
+                service="text3d_refine",
+                endpoint="refined",
+                parents=["text3d"],
+                input_stage="text3d"
+            ))
+            model_stage = "refine"
+        
+        if self.rig:
+            stages.append(StageSpec(
+                name="rigging",
+                service="rigging",
+                endpoint="rigged",
+                parents=[model_stage],
+                input_stage=model_stage
+            ))
+            for anim_name, animation_id in self.animations.items():
+                stages.append(StageSpec(
+                    name=f"animation:{anim_name}",
+                    service="animation",
+                    endpoint=anim_name,
+                    parents=["rigging"],
+                    input_stage="rigging",
+                    params={"animation_id": animation_id}
+                ))
+        
+        if self.retexture_prompt:
+            stages.append(StageSpec(
+                name="retexture",
+                service="retexture",
+                endpoint="retextured",
+                parents=[model_stage],
+                input_stage=model_stage,
+                params={"prompt": self.retexture_prompt, **self.retexture_options}
+            ))
+        
+        return stages
+
+
+@dataclass
+class StageRun:
+    """Execution state of one stage"""
+    spec: StageSpec
+    state: str = WAITING
+    task_id: Optional[str] = None
+    spec_hash: Optional[str] = None
+    error: Optional[str] = None
+    # ISO time a submission was started, checkpointed before the API call so
+    # a crash mid-submit can be matched to the task it created
+    submitting_since: Optional[str] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.spec.name,
+            "service": self.spec.service,
+            "state": self.state,
+            "task_id": self.task_id,
+            "spec_hash": self.spec_hash,
+            "error": self.error,
+        }
+    
+    def to_token(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "task_id": self.task_id,
+            "spec_hash": self.spec_hash,
+            "error": self.error,
+            "submitting_since": self.submitting_since,
+        }
+
+
+@dataclass
+class PipelineRun:
+    """Execution state of one asset pipeline"""
+    spec: AssetPipelineSpec
+    stages: Dict[str, StageRun] = field(default_factory=dict)
+    
+    @classmethod
+    def from_spec(cls, spec: AssetPipelineSpec) -> "PipelineRun":
+        return cls(spec=spec, stages={s.name: StageRun(spec=s) for s in spec.build_stages()})
+    
+    @classmethod
+    def from_token(cls, token: Dict[str, Any]) -> "PipelineRun":
+        """Rebuild a run from a checkpoint written by to_token"""
+        run = cls.from_spec(AssetPipelineSpec(**token["spec"]))
+        for name, state in token.get("stages", {}).items():
+            stage = run.stages.get(name)
+            if stage:
+                stage.state = state.get("state", WAITING)
+                stage.task_id = state.get("task_id")
+                stage.spec_hash = state.get("spec_hash")
+                stage.error = state.get("error")
+                stage.submitting_since = state.get("submitting_since")
+        return run
+    
+    @property
+    def pipeline_id(self) -> str:
+        return self.spec.pipeline_id
+    
+    @property
+    def finished(self) -> bool:
+        return all(s.state in FINISHED_STAGE_STATES for s in self.stages.values())
+    
+    @property
+    def succeeded(self) -> bool:
+        return all(s.state == SUCCEEDED for s in self.stages.values())
+    
+    def children(self, name: str) -> List[StageRun]:
+        return [s for s in self.stages.values() if name in s.spec.parents]
+    
+    def to_token(self) -> Dict[str, Any]:
+        """Checkpoint stored in AssetManifest.resume_tokens["pipeline"]"""
+        return {
+            "spec": asdict(self.spec),
+            "stages": {name: stage.to_token() for name, stage in self.stages.items()},
+        }
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "pipeline_id": self.pipeline_id,
+            "species": self.spec.species,
+            "finished": self.finished,
+            "succeeded": self.succeeded,
+            "stages": [s.to_dict() for s in self.stages.values()],
+        }
@@ -0,0 +1,322 @@
+"""Priority and credit-budget aware submission scheduler
+
+Submissions are queued per AssetIntent and released highest priority first,
+at the rate a shared RateLimiter allows, while a CreditBudget keeps the
+estimated spend under a per-run and per-day cap. A job that no longer fits
+the remaining budget stays queued so cheaper work can still go ahead; it is
+released on a later run or day.
+"""
+import itertools
+import json
+import os
+import tempfile
+import threading
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Union
+
+from ..api.rate_limiter import RateLimiter
+from ..models import AssetIntent
+from ..persistence.schemas import TaskSubmission
+from ..services.factory import ServiceFactory
+
+# Higher is released first
+DEFAULT_INTENT_PRIORITY: Dict[AssetIntent, int] = {
+    AssetIntent.PLAYER_CHARACTER: 100,
+    AssetIntent.NPC_CHARACTER: 80,
+    AssetIntent.CREATURE_PREDATOR: 60,
+    AssetIntent.CREATURE_PREY: 60,
+    AssetIntent.PROP_INTERACTABLE: 40,
+    AssetIntent.TERRAIN_ELEMENT: 30,
+    AssetIntent.TEXTURE_MATERIAL: 20,
+    AssetIntent.TEXTURE_TERRAIN: 20,
+    AssetIntent.PROP_DECORATION: 10,
+}
+
+# Estimated Meshy credits per task
+DEFAULT_SERVICE_COSTS: Dict[str, float] = {
+    "text3d": 5,
+    "text3d_refine": 10,
+    "rigging": 5,
+    "animation": 3,
+    "retexture": 10,
+}
+
+# Scheduler service name -> (ServiceFactory method, service method)
+SERVICE_METHODS = {
+    "text3d": ("text3d", "submit_task"),
+    "text3d_refine": ("text3d", "refine_task"),
+    "rigging": ("rigging", "submit_task"),
+    "animation": ("animation", "submit_task"),
+    "retexture": ("retexture", "submit_task"),
+}
+
+QUEUED = "QUEUED"
+SUBMITTED = "SUBMITTED"
+FAILED = "FAILED"
+
+
+@dataclass
+class ScheduledJob:
+    """One queued service call"""
+    service: str
+    intent: AssetIntent
+    kwargs: Dict[str, Any]
+    cost: float
+    priority: int
+    seq: int
+    state: str = QUEUED
+    submission: Optional[TaskSubmission] = None
+    error: Optional[str] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "service": self.service,
+            "intent": self.intent.value,
+            "species": self.kwargs.get("species"),
+            "cost": self.cost,
+            "priority": self.priority,
+            "state": self.state,
+            "task_id": self.submission.task_id if self.submission else None,
+            "cache_hit": self.submission.cache_hit if self.submission else False,
+            "error": self.error,
+        }
+
+
+class CreditBudget:
+    """Credit cap per run and per UTC day
+    
+    Daily spend is kept in a JSON ledger ({"YYYY-MM-DD": credits}) so caps
+    hold across processes run on the same day. Without a ledger_path the
+    daily total only covers this process.
+    """
+    
+    def __init__(
+        self,
+        per_run: Optional[float] = None,
+        per_day: Optional[float] = None,
+        ledger_path: Optional[str] = None
+    ):
+        """Initialize budget
+        
+        Args:
+            per_run: Credits this budget object may spend (None = unlimited)
+            per_day: Credits per UTC day across runs (None = unlimited)
+            ledger_path: JSON file recording daily spend
+        """
+        self.per_run = per_run
+        self.per_day = per_day
+        self.ledger_path = Path(ledger_path) if ledger_path else None
+        self.run_spent = 0.0
+        self._ledger: Dict[str, float] = {}
+        self._lock = threading.Lock()
+    
+    def _today(self) -> str:
+        return datetime.utcnow().date().isoformat()
+    
+    def _load_ledger(self) -> Dict[str, float]:
+        if self.ledger_path and self.ledger_path.exists():
+            with open(self.ledger_path, 'r') as f:
+                return json.load(f)
+        return dict(self._ledger)
+    
+    def _save_ledger(self, ledger: Dict[str, float]) -> None:
+        self._ledger = ledger
+        if not self.ledger_path:
+            return
+        self.ledger_path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            mode='w',
+            dir=self.ledger_path.parent,
+            delete=False,
+            suffix='.tmp'
+        ) as tmp_file:
+            json.dump(ledger, tmp_file, indent=2, sort_keys=True)
+            tmp_path = tmp_file.name
+        os.replace(tmp_path, self.ledger_path)
+    
+    def spent_today(self) -> float:
+        """Credits charged today across all runs sharing the ledger"""
+        with self._lock:
+            return self._load_ledger().get(self._today(), 0.0)
+    
+    def remaining(self) -> Optional[float]:
+        """Credits left under the tighter cap (None = unlimited)"""
+        with self._lock:
+            return self._remaining(self._load_ledger())
+    
+    def _remaining(self, ledger: Dict[str, float]) -> Optional[float]:
+        limits = []
+        if self.per_run is not None:
+            limits.append(self.per_run - self.run_spent)
+        if self.per_day is not None:
+            limits.append(self.per_day - ledger.get(self._today(), 0.0))
+        return min(limits) if limits else None
+    
+    def reserve(self, cost: float) -> bool:
+        """Charge cost if it fits under both caps
+        
+        Returns:
+            False (and charges nothing) if cost exceeds what is left
+        """
+        with self._lock:
+            ledger = self._load_ledger()
+            remaining = self._remaining(ledger)
+            if remaining is not None and cost > remaining:
+                return False
+            self.run_spent += cost
+            today = self._today()
+            ledger[today] = ledger.get(today, 0.0) + cost
+            self._save_ledger(ledger)
+            return True
+    
+    def refund(self, cost: float) -> None:
+        """Return credits for a reservation that was not spent"""
+        with self._lock:
+            ledger = self._load_ledger()
+            self.run_spent -= cost
+            today = self._today()
+            ledger[today] = max(0.0, ledger.get(today, 0.0) - cost)
+            self._save_ledger(ledger)
+
+
+class SubmissionScheduler:
+    """Releases queued submissions by priority within rate and credit limits
+    
+    Example:
+        scheduler = SubmissionScheduler(factory, budget=CreditBudget(per_day=500))
+        scheduler.enqueue("text3d", AssetIntent.PROP_DECORATION,
+                          species="reed", prompt="...", callback_url=url)
+        scheduler.enqueue("text3d", AssetIntent.PLAYER_CHARACTER,
+                          species="otter", prompt="...", callback_url=url)
+        scheduler.run()  # otter first
+    """
+    
+    def __init__(
+        self,
+        factory: ServiceFactory,
+        budget: Optional[CreditBudget] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        priorities: Optional[Dict[AssetIntent, int]] = None,
+        costs: Optional[Dict[str, float]] = None
+    ):
+        """Initialize scheduler
+        
+        Args:
+            factory: ServiceFactory providing the services
+            budget: Credit caps (default: unlimited)
+            rate_limiter: Token bucket pacing releases (default: 100 req/min)
+            priorities: Per-intent priorities merged over DEFAULT_INTENT_PRIORITY
+            costs: Per-service credit estimates merged over DEFAULT_SERVICE_COSTS
+        """
+        self.factory = factory
+        self.budget = budget or CreditBudget()
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.priorities = {**DEFAULT_INTENT_PRIORITY, **(priorities or {})}
+        self.costs = {**DEFAULT_SERVICE_COSTS, **(costs or {})}
+        
+        self._queues: Dict[AssetIntent, Deque[ScheduledJob]] = defaultdict(deque)
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._services: Dict[str, Any] = {}
+    
+    def enqueue(
+        self,
+        service: str,
+        intent: Union[AssetIntent, str],
+        cost: Optional[float] = None,
+        **kwargs
+    ) -> ScheduledJob:
+        """Queue a service call
+        
+        Args:
+            service: text3d, text3d_refine, rigging, animation or retexture
+            intent: AssetIntent deciding the job's priority
+            cost: Credit estimate overriding the service default
+            **kwargs: Arguments for the service's submit call
+        
+        Returns:
+            The queued ScheduledJob, updated in place once released
+        """
+        if service not in SERVICE_METHODS:
+            raise ValueError(f"Unknown service: {service}")
+        intent = AssetIntent(intent)
+        
+        job = ScheduledJob(
+            service=service,
+            intent=intent,
+            kwargs=kwargs,
+            cost=self.costs[service] if cost is None else cost,
+            priority=self.priorities.get(intent, 0),
+            seq=next(self._seq)
+        )
+        with self._lock:
+            self._queues[intent].append(job)
+        return job
+    
+    @property
+    def pending(self) -> List[ScheduledJob]:
+        """Queued jobs in release order"""
+        with self._lock:
+            return self._ordered()
+    
+    def _ordered(self) -> List[ScheduledJob]:
+        jobs = [job for queue in self._queues.values() for job in queue]
+        return sorted(jobs, key=lambda job: (-job.priority, job.seq))
+    
+    def _take_next(self) -> Optional[ScheduledJob]:
+        """Dequeue the highest priority job that fits the budget, charging it"""
+        with self._lock:
+            remaining = self.budget.remaining()
+            for job in self._ordered():
+                if remaining is not None and job.cost > remaining:
+                    continue
+                if self.budget.reserve(job.cost):
+                    self._queues[job.intent].remove(job)
+                    return job
+        return None
+    
+    def release_next(self) -> Optional[ScheduledJob]:
+        """Submit the next job once the rate limiter allows it
+        
+        Returns:
+            The released job (SUBMITTED or FAILED), or None when nothing
+            queued fits the remaining budget
+        """
+        job = self._take_next()
+        if job is None:
+            return None
+        
+        self.rate_limiter.acquire()
+        try:
+            job.submission = self._submit(job)
+            job.state = SUBMITTED
+        except Exception as e:
+            job.state = FAILED
+            job.error = str(e)
+            self.budget.refund(job.cost)
+            return job
+        
+        if job.submission.cache_hit:
+            # No new task was created, so no credits were spent
+            self.budget.refund(job.cost)
+        return job
+    
+    def run(self) -> List[ScheduledJob]:
+        """Release jobs until the queue is empty or the budget is exhausted
+        
+        Returns:
+            Released jobs in release order; whatever did not fit stays in pending
+        """
+        released = []
+        while (job := self.release_next()) is not None:
+            released.append(job)
+        return released
+    
+    def _submit(self, job: ScheduledJob) -> TaskSubmission:
+        factory_method, method = SERVICE_METHODS[job.service]
+        if factory_method not in self._services:
+            self._services[factory_method] = getattr(self.factory, factory_method)()
+        return getattr(self._services[factory_method], method)(**job.kwargs)
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""List near-duplicate thumbnails per species by perceptual hash
+
+Clusters image artifacts whose hashes are within --max-distance bits of
+each other, so a reviewer can keep one result per cluster. Hashes are
+recorded by the webhook handler when thumbnails are downloaded; use
+--backfill to hash thumbnails downloaded before that.
+
+Environment variables:
+    MODELS_PATH: Manifest root (default: client/public/models)
+"""
+
+import argparse
+import os
+
+from mesh_toolkit.persistence.repository import TaskRepository
+from mesh_toolkit.processing.phash import image_hashes
+
+IMAGE_SUFFIXES = (".png", ".jpg", ".jpeg", ".webp")
+
+
+def backfill(repository: TaskRepository, species: str) -> int:
+    """Hash image artifacts that have no hashes yet"""
+    manifest = repository.load_species_manifest(species)
+    hashed = 0
+    for spec_hash, asset_record in manifest.asset_specs.items():
+        updated = []
+        for artifact in asset_record.artifacts:
+            path = repository.base_path / species / artifact.relative_path
+            if artifact.image_hashes or not artifact.relative_path.lower().endswith(IMAGE_SUFFIXES):
+                continue
+            if not path.exists():
+                continue
+            updated.append(artifact.model_copy(update={"image_hashes": image_hashes(path)}))
+        if updated:
+            repository.record_artifacts(species, spec_hash, updated)
+            hashed += len(updated)
+    return hashed
+
+
+def main():
+    """Print near-duplicate clusters for all (or one) species"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--models-path", default=os.environ.get("MODELS_PATH", "client/public/models"))
+    parser.add_argument("--species", default=None, help="Only check this species")
+    parser.add_argument("--max-distance", type=int, default=6, help="Hamming distance (of 64 bits)")
+    parser.add_argument("--algorithm", choices=["phash", "dhash"], default="phash")
+    parser.add_argument("--backfill", action="store_true", help="Hash image artifacts missing hashes first")
+    args = parser.parse_args()
+
+    repository = TaskRepository(base_path=args.models_path)
+    species_names = [args.species] if args.species else repository.list_species()
+
+    total = 0
+    for species in species_names:
+        if args.backfill:
+            hashed = backfill(repository, species)
+            if hashed:
+                print(f"✓ {species}: hashed {hashed} images")
+        clusters = repository.find_near_duplicates(
+            species,
+            max_distance=args.max_distance,
+            algorithm=args.algorithm
+        )
+        for cluster in clusters:
+            print(f"\n{species}: {len(cluster)} near-duplicates")
+            for spec_hash, artifact in cluster:
+                print(f"  {spec_hash}  {artifact.relative_path}")
+        total += len(clusters)
+
+    print(f"\n{total} clusters" if total else "No near-duplicates found")
+
+
+if __name__ == "__main__":
+    main()
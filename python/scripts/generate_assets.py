@@ -1,14 +1,12 @@
 #!/usr/bin/env python3
 """Generate game assets using Meshy SDK"""
 
-import sys
-from pathlib import Path
+import asyncio
+import argparse
 
-# Add tools to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
-from tools.meshy import (
+from mesh_toolkit import (
     AssetGenerator,
+    SpecMatrix,
     otter_player_spec,
     otter_npc_male_spec,
     otter_npc_female_spec,
@@ -18,8 +16,51 @@ from tools.meshy import (
 )
 
 
+def describe(event):
+    """One log line per progress event"""
+    if event.kind == "submitted":
+        return f"submitted {event.task_id}"
+    if event.kind == "stage":
+        return f"{event.previous or 'new'} → {event.status}"
+    if event.kind == "progress":
+        return f"{event.percent}%"
+    if event.kind == "artifact":
+        return f"downloaded {event.artifact} ({event.size_bytes / 1024:.0f} KB)"
+    if event.kind == "completed":
+        return f"✓ done: {event.manifest.model_path}"
+    return f"✗ failed: {event.error}"
+
+
+async def stream(generator, specs, args):
+    """Print events as they arrive instead of waiting for the batch"""
+    succeeded = 0
+    async for event in generator.stream_batch(
+        specs,
+        max_concurrent=args.max_concurrent,
+        poll_interval=args.poll_interval
+    ):
+        succeeded += event.kind == "completed"
+        print(f"   [{event.asset_id}] {describe(event)}", flush=True)
+    return succeeded
+
+
 def main():
     """Generate core game assets"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--max-concurrent", type=int, default=3, help="Assets generated in parallel")
+    parser.add_argument("--poll-interval", type=float, default=5.0, help="Seconds between status polls")
+    parser.add_argument("--best-of", type=int, default=1,
+                        help="Generate N preview seeds per asset and refine only the best")
+    parser.add_argument("--stream", action="store_true", help="Log progress events as they happen")
+    parser.add_argument("--matrix", help="JSON spec matrix to expand instead of the preset assets")
+    parser.add_argument("--changed-only", action="store_true",
+                        help="With --matrix, skip combinations already generated from an identical spec")
+    args = parser.parse_args()
+    
+    if args.stream and args.best_of > 1:
+        parser.error("--stream does not support --best-of")
+    if args.changed_only and not args.matrix:
+        parser.error("--changed-only requires --matrix")
     
     print("🎨 Generating Rivermarsh Game Assets")
     print("=" * 60)
@@ -27,37 +68,53 @@ def main():
     generator = AssetGenerator(output_root="client/public")
     
     # Define asset queue
-    specs = [
-        ("Player Otter", otter_player_spec()),
-        ("NPC Male Otter", otter_npc_male_spec()),
-        ("NPC Female Otter", otter_npc_female_spec()),
-        ("Bass Fish", fish_bass_spec()),
-        ("Cattail Reeds", cattail_reeds_spec()),
-        ("Wooden Dock", wooden_dock_spec()),
-    ]
+    if args.matrix:
+        matrix = SpecMatrix.from_file(args.matrix)
+        specs = [
+            (spec.asset_id, spec)
+            for spec in matrix.specs(changed_only=args.changed_only, output_root="client/public")
+        ]
+        print(f"\nMatrix: {len(specs)} of {len(matrix)} combinations to generate")
+    else:
+        specs = [
+            ("Player Otter", otter_player_spec()),
+            ("NPC Male Otter", otter_npc_male_spec()),
+            ("NPC Female Otter", otter_npc_female_spec()),
+            ("Bass Fish", fish_bass_spec()),
+            ("Cattail Reeds", cattail_reeds_spec()),
+            ("Wooden Dock", wooden_dock_spec()),
+        ]
+    
+    print(f"\nGenerating {len(specs)} assets, {args.max_concurrent} at a time...")
+    if args.best_of > 1:
+        print(f"Picking the best of {args.best_of} previews per asset before refining.")
+    print("Each asset takes 2-5 minutes.\n")
+    
+    if args.stream:
+        succeeded = asyncio.run(stream(generator, [spec for _, spec in specs], args))
+        print("=" * 60)
+        print(f"✅ Generated {succeeded}/{len(specs)} assets")
+        return
     
-    print(f"\nGenerating {len(specs)} assets...")
-    print("This will take 2-5 minutes per asset.\n")
+    report = generator.batch_generate(
+        [spec for _, spec in specs],
+        max_concurrent=args.max_concurrent,
+        poll_interval=args.poll_interval,
+        best_of=args.best_of
+    )
     
-    manifests = []
-    for name, spec in specs:
-        print(f"🔨 Generating: {name}")
-        print(f"   Prompt: {spec.description[:60]}...")
-        
-        try:
-            manifest = generator.generate_model(spec, wait=True, poll_interval=5.0)
-            manifests.append(manifest)
-            
-            print(f"   ✓ Model: {manifest.model_path}")
+    print()
+    for (name, _), result in zip(specs, report.results):
+        if result.succeeded:
+            manifest = result.manifest
+            print(f"   ✓ {name}: {manifest.model_path}")
             if manifest.texture_paths:
-                print(f"   ✓ Textures: {len(manifest.texture_paths)} maps")
-            print()
-            
-        except Exception as e:
-            print(f"   ✗ Error: {e}\n")
+                print(f"     Textures: {len(manifest.texture_paths)} maps")
+        else:
+            print(f"   ✗ {name}: {result.error}")
     
     print("=" * 60)
-    print(f"✅ Generated {len(manifests)}/{len(specs)} assets")
+    print(f"✅ Generated {len(report.succeeded)}/{len(specs)} assets in {report.wall_seconds:.0f}s")
     print(f"\nAssets saved to: client/public/models/")
     print("Manifests include GLB paths, textures, and metadata for ECS integration.")
 
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""Pack each species' artifacts into one bundle with a byte-range index
+
+Writes <species>.bundle and <species>.bundle.json per species. Rebuilds
+only append new or changed files, so unchanged entries keep their byte
+ranges and the client's cached ranges stay valid.
+
+Environment variables:
+    MODELS_PATH: Manifest root (default: client/public/models)
+"""
+
+import argparse
+import os
+
+from mesh_toolkit.persistence.repository import TaskRepository
+from mesh_toolkit.processing.bundle import DEFAULT_ALIGNMENT, build_species_bundle
+
+
+def main():
+    """Build or update bundles for all (or one) species"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--models-path", default=os.environ.get("MODELS_PATH", "client/public/models"))
+    parser.add_argument("--species", default=None, help="Only bundle this species")
+    parser.add_argument("--kinds", nargs="+", default=None, help="Artifact kinds to include (default: all)")
+    parser.add_argument("--output-dir", default=None, help="Write bundles here (default: species directories)")
+    parser.add_argument("--alignment", type=int, default=DEFAULT_ALIGNMENT, help="Entry alignment in bytes")
+    args = parser.parse_args()
+
+    repository = TaskRepository(base_path=args.models_path)
+    species_names = [args.species] if args.species else repository.list_species()
+    if not species_names:
+        print("Nothing to do")
+        return
+
+    total = 0
+    for species in species_names:
+        report = build_species_bundle(
+            repository,
+            species,
+            output_dir=args.output_dir,
+            kinds=args.kinds,
+            alignment=args.alignment
+        )
+        total += report.size
+    print(f"\n{len(species_names)} bundles, {total / 1024:.0f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""Build LOD chains for downloaded GLB models
+
+Simplifies every downloaded GLB artifact into `<stem>_lod<N>.glb` files
+next to it and registers them in the species manifests. Needs numpy
+(pip install mesh-toolkit[mesh]).
+
+Environment variables:
+    MODELS_PATH: Manifest root (default: client/public/models)
+"""
+
+import argparse
+import os
+
+from mesh_toolkit.persistence.repository import TaskRepository
+from mesh_toolkit.processing.lod import DEFAULT_LOD_RATIOS, generate_lods
+
+
+def main():
+    """Generate LODs for all (or one species') models"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--models-path", default=os.environ.get("MODELS_PATH", "client/public/models"))
+    parser.add_argument("--species", default=None, help="Only process this species")
+    parser.add_argument("--ratios", type=float, nargs="+", default=list(DEFAULT_LOD_RATIOS),
+                        help="Fraction of triangles kept per level, level 0 first")
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="Rebuild LODs that already exist")
+    args = parser.parse_args()
+
+    repository = TaskRepository(base_path=args.models_path)
+    results = generate_lods(
+        repository,
+        species=args.species,
+        ratios=args.ratios,
+        max_workers=args.workers,
+        force=args.force
+    )
+    print(f"Built LODs for {len(results)} models")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""Merge each rigged model's animation GLBs into one multi-clip GLB
+
+Groups animation downloads by the rigged model they were applied to,
+checks that every clip's skeleton matches the rig, names clips after the
+Meshy animation library and registers one animations_<model_id>.glb per
+model in the species manifests.
+
+Environment variables:
+    MODELS_PATH: Manifest root (default: client/public/models)
+"""
+
+import argparse
+import os
+
+from mesh_toolkit.persistence.repository import TaskRepository
+from mesh_toolkit.processing.clips import merge_animations
+
+
+def main():
+    """Merge animations for all (or one species') rigged models"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--models-path", default=os.environ.get("MODELS_PATH", "client/public/models"))
+    parser.add_argument("--species", default=None, help="Only process this species")
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="Rebuild sets whose clips have not changed")
+    args = parser.parse_args()
+
+    repository = TaskRepository(base_path=args.models_path)
+    sets = merge_animations(
+        repository,
+        species=args.species,
+        max_workers=args.workers,
+        force=args.force
+    )
+
+    if sets:
+        clips = sum(len(animation_set.clips) for animation_set in sets)
+        skipped = sum(len(animation_set.skipped) for animation_set in sets)
+        print(f"\n{len(sets)} models: {clips} clips merged, {skipped} left out")
+    else:
+        print("Nothing to do")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""Plan Meshy batch capacity against a simulated backend
+
+Runs a batch through the real generator or pipeline executor, with every
+API call served by mesh_toolkit.simulation.SimulatedMeshy, and reports the
+makespan, API call counts and peak concurrency. Nothing touches the network
+and no credits are spent.
+
+assets:    AssetGenerator.batch_generate, once per --concurrency value
+pipelines: PipelineExecutor over AssetPipelineSpecs, polling for status
+
+Examples:
+    plan_capacity.py assets --count 40 --concurrency 1,3,5,10
+    plan_capacity.py pipelines --count 12 --animations 4 --max-running 5 \\
+        --duration rigging=300:0.5 --failure-rate animation=0.05
+    plan_capacity.py pipelines specs.json --rate-limit 60 --json
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+
+from mesh_toolkit.api.base_client import BaseHttpClient
+from mesh_toolkit.models import AssetIntent, GameAssetSpec
+from mesh_toolkit.services.factory import ServiceFactory
+from mesh_toolkit.simulation import (
+    DEFAULT_PROFILES,
+    LatencyModel,
+    ServiceProfile,
+    SimulatedMeshy,
+    SimulationConfig,
+)
+from mesh_toolkit.webhooks.handler import WebhookHandler
+from mesh_toolkit.webhooks.reconciler import ReconciliationWorker
+from mesh_toolkit.workflows import AssetPipelineSpec, PipelineExecutor
+
+from mesh_toolkit import AssetGenerator, MeshyClient
+
+
+def parse_profiles(durations, failure_rates):
+    """Apply --duration service=median[:sigma] and --failure-rate service=p"""
+    profiles = {
+        name: ServiceProfile(LatencyModel(**vars(p.duration)), p.failure_rate)
+        for name, p in DEFAULT_PROFILES.items()
+    }
+    for value in durations or []:
+        service, _, spec = value.partition("=")
+        median, _, sigma = spec.partition(":")
+        profiles[service].duration.median = float(median)
+        if sigma:
+            profiles[service].duration.sigma = float(sigma)
+    for value in failure_rates or []:
+        service, _, rate = value.partition("=")
+        profiles[service].failure_rate = float(rate)
+    return profiles
+
+
+def parse_limits(values):
+    """Parse repeated --limit service=N options"""
+    limits = {}
+    for value in values or []:
+        service, _, count = value.partition("=")
+        limits[service] = int(count)
+    return limits
+
+
+def synthetic_assets(count):
+    """Distinct asset specs so the Text3D cache never short-circuits"""
+    return [
+        GameAssetSpec(
+            intent=AssetIntent.PROP_DECORATION,
+            description=f"simulated asset {i}",
+            asset_id=f"sim_asset_{i}",
+            output_path="models/sim"
+        )
+        for i in range(count)
+    ]
+
+
+def synthetic_pipelines(count, animations):
+    """One pipeline per synthetic species with N animations each"""
+    return [
+        AssetPipelineSpec(
+            species=f"sim_species_{i}",
+            prompt=f"simulated creature {i}",
+            animations={f"clip_{n}": str(n) for n in range(animations)},
+            retexture_prompt="simulated variant"
+        )
+        for i in range(count)
+    ]
+
+
+def simulate_assets(config, count, concurrency, poll_interval):
+    """Run batch_generate on a fresh backend"""
+    backend = SimulatedMeshy(config)
+    client = MeshyClient(api_key="sim", transport=backend.transport, time_scale=config.time_scale)
+    with tempfile.TemporaryDirectory() as output_root:
+        report = AssetGenerator(client=client, output_root=output_root).batch_generate(
+            synthetic_assets(count),
+            max_concurrent=concurrency,
+            poll_interval=poll_interval / config.time_scale
+        )
+    client.close()
+    return backend, len(report.succeeded), len(report.failed)
+
+
+def simulate_pipelines(config, specs, limits, poll_interval):
+    """Run every pipeline to completion on a fresh backend"""
+    backend = SimulatedMeshy(config)
+    client = BaseHttpClient(api_key="sim", transport=backend.transport, time_scale=config.time_scale)
+    with tempfile.TemporaryDirectory() as models_path:
+        factory = ServiceFactory(base_path=models_path, webhook_base_url="http://sim.invalid", client=client)
+        handler = WebhookHandler(repository=factory.repository, client=client, download_artifacts=False)
+        poller = ReconciliationWorker(repository=factory.repository, client=client, handler=handler)
+        with factory, PipelineExecutor(
+            factory,
+            stage_limits=limits,
+            poller=poller,
+            poll_interval=poll_interval / config.time_scale
+        ) as executor:
+            for spec in specs:
+                executor.start(spec)
+            runs = executor.wait()
+    succeeded = sum(run.succeeded for run in runs)
+    return backend, succeeded, len(runs) - succeeded
+
+
+def summarize(label, backend, succeeded, failed, wall_seconds):
+    stats = backend.stats()
+    stats.update(label=label, succeeded=succeeded, failed=failed, wall_seconds=wall_seconds)
+    stats["makespan_seconds"] = stats.pop("simulated_seconds")
+    return stats
+
+
+def print_report(result):
+    makespan = result["makespan_seconds"]
+    print(f"\n📊 {result['label']}")
+    print(f"   makespan:        {makespan / 60:.1f} min ({makespan:.0f}s simulated, "
+          f"{result['wall_seconds']:.1f}s real)")
+    print(f"   outcome:         {result['succeeded']} succeeded, {result['failed']} failed "
+          f"({result['failed_tasks']} task failures)")
+    print(f"   tasks:           {', '.join(f'{k}={v}' for k, v in sorted(result['tasks'].items()))}")
+    print(f"   peak running:    {result['peak_running']}  (in flight incl. queued: {result['peak_in_flight']})")
+    print(f"   API calls:       {result['api_calls_total']} ({result['throttled']} throttled)")
+    for call, count in sorted(result["api_calls"].items()):
+        print(f"      {call:<24} {count}")
+
+
+def main():
+    """Simulate a batch and report capacity numbers"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("mode", choices=["assets", "pipelines"])
+    parser.add_argument("specs", nargs="?", help="JSON AssetPipelineSpec list (pipelines only)")
+    parser.add_argument("--count", type=int, default=10, help="Synthetic assets/pipelines when no spec file")
+    parser.add_argument("--animations", type=int, default=3, help="Animations per synthetic pipeline")
+    parser.add_argument("--concurrency", default="3", help="Comma-separated max_concurrent values (assets)")
+    parser.add_argument("--limit", action="append", help="Per-service in-flight limit, e.g. rigging=3 (pipelines)")
+    parser.add_argument("--duration", action="append", help="Service duration: service=median[:sigma] seconds")
+    parser.add_argument("--failure-rate", action="append", help="Service failure probability: service=p")
+    parser.add_argument("--max-running", type=int, default=10, help="Tasks Meshy processes at once per account")
+    parser.add_argument("--rate-limit", type=float, default=None, help="Requests per minute before 429s")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Probability of a random 429")
+    parser.add_argument("--poll-interval", type=float, default=5.0, help="Simulated seconds between polls")
+    parser.add_argument("--time-scale", type=float, default=600.0, help="Simulated seconds per real second")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    if args.specs and args.mode != "pipelines":
+        parser.error("a spec file is only used in pipelines mode")
+
+    config_kwargs = dict(
+        time_scale=args.time_scale,
+        max_running=args.max_running,
+        requests_per_minute=args.rate_limit,
+        throttle_rate=args.throttle_rate,
+        seed=args.seed
+    )
+
+    results = []
+    if args.mode == "assets":
+        for concurrency in (int(c) for c in args.concurrency.split(",")):
+            config = SimulationConfig(profiles=parse_profiles(args.duration, args.failure_rate), **config_kwargs)
+            start = time.time()
+            backend, succeeded, failed = simulate_assets(config, args.count, concurrency, args.poll_interval)
+            results.append(summarize(
+                f"{args.count} assets, max_concurrent={concurrency}",
+                backend, succeeded, failed, time.time() - start
+            ))
+    else:
+        if args.specs:
+            with open(args.specs) as f:
+                specs = [AssetPipelineSpec(**item) for item in json.load(f)]
+        else:
+            specs = synthetic_pipelines(args.count, args.animations)
+        config = SimulationConfig(profiles=parse_profiles(args.duration, args.failure_rate), **config_kwargs)
+        start = time.time()
+        backend, succeeded, failed = simulate_pipelines(
+            config, specs, parse_limits(args.limit), args.poll_interval
+        )
+        results.append(summarize(f"{len(specs)} pipelines", backend, succeeded, failed, time.time() - start))
+
+    if args.json:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    else:
+        for result in results:
+            print_report(result)
+
+
+if __name__ == "__main__":
+    main()
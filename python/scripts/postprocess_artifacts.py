@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""Run the artifact post-processing stages (LODs, then quantization)
+
+Processes every GLB artifact whose stage outputs are missing or stale, then
+exits. With --watch it stays up and processes each asset as soon as one of
+its tasks succeeds. Task events come over UDP from the process that records
+them: start run_reconciler.py or run_pipelines.py with
+--forward-events HOST:PORT pointing at this script's --listen address.
+
+Environment variables:
+    MODELS_PATH: Manifest root (default: client/public/models)
+"""
+
+import argparse
+import os
+import time
+
+from mesh_toolkit.persistence.events import SocketEventBridge
+from mesh_toolkit.persistence.repository import TaskRepository
+from mesh_toolkit.processing.pipeline import PostProcessingPipeline, default_stages
+
+
+def main():
+    """Process artifacts once, or keep processing as tasks succeed"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--models-path", default=os.environ.get("MODELS_PATH", "client/public/models"))
+    parser.add_argument("--species", default=None, help="Only process this species")
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="Ignore cached stage outputs")
+    parser.add_argument("--watch", action="store_true", help="Keep running and process new artifacts")
+    parser.add_argument("--listen", default=f"127.0.0.1:{SocketEventBridge.DEFAULT_PORT}", metavar="HOST:PORT",
+                        help="UDP address for task events from --forward-events")
+    args = parser.parse_args()
+
+    repository = TaskRepository(base_path=args.models_path)
+    with PostProcessingPipeline(repository, default_stages(), max_workers=args.workers) as pipeline:
+        bridge = stop = None
+        if args.watch:
+            # Listen before the catch-up pass so tasks finishing during it are not missed
+            listen = SocketEventBridge.parse_address(args.listen)
+            bridge = SocketEventBridge(repository.events, listen=listen).start()
+            stop = pipeline.watch()
+
+        try:
+            runs = pipeline.run(species=args.species, force=args.force)
+            failed = sum(1 for run in runs if run.error)
+            print(f"\n{len(runs) - failed} stage runs, {failed} failed")
+
+            if stop:
+                print(f"Watching for finished tasks on {listen[0]}:{listen[1]} (Ctrl-C to stop)")
+                while True:
+                    time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if stop:
+                stop()
+                bridge.close()
+
+
+if __name__ == "__main__":
+    main()
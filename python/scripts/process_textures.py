@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""Pack ORM textures, build per-LOD texture variants and atlas props
+
+Works on AssetGenerator output: every asset manifest under the output root
+with PBR maps gets an <asset>_orm.png and half-size variants per LOD. With
+--atlas, small props are also packed into shared atlases. Needs Pillow and
+numpy (pip install mesh-toolkit[images,mesh]).
+"""
+
+import argparse
+
+from mesh_toolkit.processing.textures import atlas_props, process_asset_textures
+
+
+def main():
+    """Process textures of all generated assets"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output-root", default="client/public", help="AssetGenerator output root")
+    parser.add_argument("--levels", type=int, default=3, help="Texture LOD levels including full size")
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="Reprocess assets that already have texture LODs")
+    parser.add_argument("--atlas", action="store_true", help="Pack prop textures into shared atlases")
+    parser.add_argument("--tile-size", type=int, default=256, help="Largest prop texture side inside an atlas")
+    parser.add_argument("--atlas-size", type=int, default=2048, help="Atlas width and height")
+    args = parser.parse_args()
+
+    results = process_asset_textures(
+        args.output_root,
+        levels=args.levels,
+        max_workers=args.workers,
+        force=args.force
+    )
+    print(f"Processed textures for {len(results)} assets")
+
+    if args.atlas:
+        written = atlas_props(args.output_root, tile_size=args.tile_size, atlas_size=args.atlas_size)
+        for path in written:
+            print(f"  {path}")
+
+
+if __name__ == "__main__":
+    main()
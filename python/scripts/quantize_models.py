@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""Quantize downloaded GLB models with KHR_mesh_quantization
+
+Writes `<stem>_q.glb` next to each downloaded model (and its LODs),
+registers it in the species manifest and prints a size report. Needs numpy
+(pip install mesh-toolkit[mesh]).
+
+Environment variables:
+    MODELS_PATH: Manifest root (default: client/public/models)
+"""
+
+import argparse
+import json
+import os
+
+from mesh_toolkit.persistence.repository import TaskRepository
+from mesh_toolkit.processing.quantize import quantize_artifacts
+
+
+def main():
+    """Quantize all (or one species') models and report the savings"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--models-path", default=os.environ.get("MODELS_PATH", "client/public/models"))
+    parser.add_argument("--species", default=None, help="Only process this species")
+    parser.add_argument("--kinds", nargs="+", default=["download", "lod"], help="Artifact kinds to quantize")
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size (default: CPU count)")
+    parser.add_argument("--no-reorder", action="store_true", help="Keep the original index order")
+    parser.add_argument("--force", action="store_true", help="Re-quantize models that already have a copy")
+    parser.add_argument("--json", action="store_true", help="Print reports as JSON")
+    args = parser.parse_args()
+
+    repository = TaskRepository(base_path=args.models_path)
+    reports = quantize_artifacts(
+        repository,
+        species=args.species,
+        kinds=args.kinds,
+        max_workers=args.workers,
+        force=args.force,
+        reorder=not args.no_reorder
+    )
+
+    if args.json:
+        print(json.dumps({path: report.to_dict() for path, report in reports.items()}, indent=2))
+        return
+
+    before = sum(report.bytes_before for report in reports.values())
+    after = sum(report.bytes_after for report in reports.values())
+    print(f"\n{'model':<48} {'before':>10} {'after':>10} {'saved':>7} {'ACMR':>11}")
+    for path, report in sorted(reports.items()):
+        acmr = f"{report.acmr_before:.2f}→{report.acmr_after:.2f}" if report.acmr_before else "-"
+        print(f"{path:<48} {report.bytes_before / 1024:>8.0f}KB {report.bytes_after / 1024:>8.0f}KB "
+              f"{report.saved_fraction:>6.0%} {acmr:>11}")
+    if reports:
+        print(f"{'total':<48} {before / 1024:>8.0f}KB {after / 1024:>8.0f}KB {1 - after / before:>6.0%}")
+
+
+if __name__ == "__main__":
+    main()
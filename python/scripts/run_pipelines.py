@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""Run or resume multi-stage Meshy asset pipelines
+
+start:  submit the pipelines described in a JSON file and follow them to
+        completion. Pipelines that were already checkpointed continue from
+        where they stopped instead of being resubmitted.
+resume: continue every unfinished pipeline found in the manifests, e.g.
+        after the previous run crashed or was interrupted.
+
+--forward-events sends every task event to another process over UDP, e.g.
+`postprocess_artifacts.py --watch`, which post-processes models as they land.
+
+Spec file format (list of AssetPipelineSpec fields):
+    [
+      {"species": "otter", "prompt": "...", "animations": {"walk": "1"},
+       "retexture_prompt": "winter fur"}
+    ]
+
+Environment variables:
+    MESHY_API_KEY: Meshy API key
+    MESHY_WEBHOOK_BASE_URL: Callback base URL
+    MODELS_PATH: Manifest root (default: client/public/models)
+"""
+
+import argparse
+import json
+import os
+from contextlib import nullcontext
+
+from mesh_toolkit.persistence.events import SocketEventBridge
+from mesh_toolkit.services.factory import ServiceFactory
+from mesh_toolkit.webhooks.reconciler import ReconciliationWorker
+from mesh_toolkit.workflows import AssetPipelineSpec, PipelineExecutor
+
+
+def parse_limits(values):
+    """Parse repeated --limit service=N options"""
+    limits = {}
+    for value in values or []:
+        service, _, count = value.partition("=")
+        limits[service] = int(count)
+    return limits
+
+
+def print_summary(runs):
+    """Print one line per stage"""
+    for run in runs:
+        print(f"\n{run.spec.species} ({run.pipeline_id}): "
+              f"{'✓ done' if run.succeeded else '✗ incomplete'}")
+        for name, stage in run.stages.items():
+            detail = stage.task_id or ""
+            if stage.error:
+                detail = f"{detail} {stage.error}".strip()
+            print(f"   {stage.state:<10} {name:<24} {detail}")
+
+
+def main():
+    """Start or resume pipelines and wait for them"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("command", choices=["start", "resume"])
+    parser.add_argument("specs", nargs="?", help="JSON spec file (start only)")
+    parser.add_argument("--models-path", default=os.environ.get("MODELS_PATH", "client/public/models"))
+    parser.add_argument("--webhook-base-url", default=None)
+    parser.add_argument("--species", default=None, help="Only resume this species")
+    parser.add_argument("--limit", action="append", help="Per-service in-flight limit, e.g. rigging=3")
+    parser.add_argument("--poll-interval", type=float, default=0.0,
+                        help="Poll the API every N seconds instead of relying on webhooks")
+    parser.add_argument("--timeout", type=float, default=None, help="Give up waiting after N seconds")
+    parser.add_argument("--forward-events", action="append", default=[], metavar="HOST:PORT",
+                        help="Send task events to a listening process (repeatable)")
+    args = parser.parse_args()
+
+    if args.command == "start" and not args.specs:
+        parser.error("start requires a spec file")
+
+    factory = ServiceFactory(base_path=args.models_path, webhook_base_url=args.webhook_base_url)
+    poller = None
+    if args.poll_interval > 0:
+        poller = ReconciliationWorker(repository=factory.repository, client=factory.client)
+
+    bridge = nullcontext()
+    if args.forward_events:
+        peers = [SocketEventBridge.parse_address(value) for value in args.forward_events]
+        bridge = SocketEventBridge(factory.repository.events, peers=peers)
+
+    with factory, bridge, PipelineExecutor(
+        factory,
+        stage_limits=parse_limits(args.limit),
+        poller=poller,
+        poll_interval=args.poll_interval or 30.0
+    ) as executor:
+        if args.command == "start":
+            with open(args.specs) as f:
+                specs = [AssetPipelineSpec(**item) for item in json.load(f)]
+            for spec in specs:
+                executor.start(spec)
+            print(f"🚀 Started {len(specs)} pipelines")
+        else:
+            resumed = executor.resume(species=args.species)
+            print(f"🔁 Resumed {len(resumed)} unfinished pipelines")
+
+        try:
+            runs = executor.wait(timeout=args.timeout)
+        except (TimeoutError, KeyboardInterrupt):
+            runs = list(executor.runs.values())
+            print("\n⏸  Stopped waiting; progress is checkpointed, run 'resume' to continue")
+
+        print_summary(runs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Run the missed-webhook reconciliation daemon
+
+Finds tasks that are still PENDING/IN_PROGRESS in the manifests long after
+submission, fetches their status from Meshy and replays it through the
+webhook handler. With --forward-events, every status change it records is
+also sent over UDP to another process, e.g. `postprocess_artifacts.py
+--watch`, which post-processes the downloaded models.
+
+Environment variables:
+    MESHY_API_KEY: Meshy API key
+    MODELS_PATH: Manifest root (default: client/public/models)
+"""
+
+import argparse
+import os
+
+from mesh_toolkit.api.base_client import BaseHttpClient
+from mesh_toolkit.persistence.events import SocketEventBridge
+from mesh_toolkit.persistence.repository import TaskRepository
+from mesh_toolkit.webhooks.reconciler import ReconciliationWorker
+
+
+def main():
+    """Start reconciliation loop"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--models-path", default=os.environ.get("MODELS_PATH", "client/public/models"))
+    parser.add_argument("--species", default=None, help="Only reconcile this species")
+    parser.add_argument("--stale-after", type=float, default=900.0, help="Seconds before a quiet task is reconciled")
+    parser.add_argument("--interval", type=float, default=300.0, help="Mean seconds between passes")
+    parser.add_argument("--jitter", type=float, default=0.2, help="Fractional jitter on the interval")
+    parser.add_argument("--max-concurrent", type=int, default=4, help="Status fetches in flight")
+    parser.add_argument("--once", action="store_true", help="Run a single pass and exit")
+    parser.add_argument("--forward-events", action="append", default=[], metavar="HOST:PORT",
+                        help="Send task events to a listening process (repeatable)")
+    args = parser.parse_args()
+
+    repository = TaskRepository(base_path=args.models_path)
+    client = BaseHttpClient()
+    worker = ReconciliationWorker(
+        repository=repository,
+        client=client,
+        stale_after=args.stale_after,
+        interval=args.interval,
+        jitter=args.jitter,
+        max_concurrent=args.max_concurrent,
+        species=args.species
+    )
+
+    bridge = None
+    if args.forward_events:
+        peers = [SocketEventBridge.parse_address(value) for value in args.forward_events]
+        bridge = SocketEventBridge(repository.events, peers=peers)
+
+    try:
+        if args.once:
+            for result in worker.reconcile_once():
+                print(result)
+            return
+
+        print(f"🔁 Reconciling {args.models_path} every ~{args.interval:.0f}s")
+        worker.run_forever()
+    except KeyboardInterrupt:
+        worker.stop()
+    finally:
+        if bridge:
+            bridge.close()
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""Split animation GLBs into one shared mesh plus clip-only files
+
+Groups each species' animation downloads by rig, writes the mesh once and
+a small animation-only GLB per clip (or, with --merge, one GLB holding the
+mesh and every clip) and registers the results in the species manifests.
+
+Environment variables:
+    MODELS_PATH: Manifest root (default: client/public/models)
+"""
+
+import argparse
+import os
+
+from mesh_toolkit.persistence.repository import TaskRepository
+from mesh_toolkit.processing.clips import extract_shared_meshes
+
+
+def main():
+    """Extract shared meshes for all (or one species') animations"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--models-path", default=os.environ.get("MODELS_PATH", "client/public/models"))
+    parser.add_argument("--species", default=None, help="Only process this species")
+    parser.add_argument("--merge", action="store_true", help="Write one multi-clip GLB per rig")
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="Rebuild groups that are already split")
+    args = parser.parse_args()
+
+    repository = TaskRepository(base_path=args.models_path)
+    groups = extract_shared_meshes(
+        repository,
+        species=args.species,
+        merge=args.merge,
+        max_workers=args.workers,
+        force=args.force
+    )
+
+    before = sum(group.bytes_before for group in groups)
+    after = sum(group.bytes_after for group in groups)
+    if groups:
+        print(f"\n{len(groups)} rigs: {before / 1024:.0f} KB → {after / 1024:.0f} KB ({1 - after / before:.0%} saved)")
+    else:
+        print("Nothing to do")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+"""Replay and load-test harness for the Meshy webhook path
+
+Synthesizes webhook deliveries from the recorded fixtures in
+tests/integration/fixtures/webhooks and fires them at a configurable rate and
+concurrency, either straight into WebhookHandler (in-process) or at an HTTP
+endpoint such as webhook_proxy.py. Artifact URLs are rewritten to a local fake
+artifact server that serves the fixture GLB (and a generated PNG for thumbnail
+URLs, so thumbnail hashing runs as it would in production), so the whole run is
+offline.
+
+Reports throughput, latency percentiles and the size of the resulting species
+manifests, which is where whole-file rewrites start to hurt as task counts grow.
+
+Examples:
+    # 500 tasks across 4 species, 16 handlers in parallel, as fast as possible
+    python scripts/webhook_loadtest.py --tasks 500 --species 4 --concurrency 16
+
+    # Open-loop 50 req/s against a running proxy
+    python scripts/webhook_loadtest.py --mode http \\
+        --target http://localhost:8000/webhooks/meshy --rate 50
+"""
+
+import argparse
+import copy
+import json
+import os
+import shutil
+import struct
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from mesh_toolkit.api.base_client import BaseHttpClient
+from mesh_toolkit.persistence.repository import TaskRepository
+from mesh_toolkit.persistence.schemas import TaskStatus, TaskSubmission
+from mesh_toolkit.webhooks.handler import WebhookHandler
+from mesh_toolkit.webhooks.schemas import MeshyWebhookPayload
+
+FIXTURES_DIR = Path(__file__).resolve().parent.parent / "tests" / "integration" / "fixtures"
+
+# fixture file -> (service recorded in the task graph, webhook stage in the URL)
+FIXTURE_SERVICES = {
+    "text3d_success.json": ("text3d", "static"),
+    "rigging_success.json": ("rigging", "rigged"),
+    "animation_success.json": ("animation", "animated"),
+    "retexture_success.json": ("retexture", "retextured"),
+}
+
+# (species, stage, service, payload)
+Event = Tuple[str, str, str, Dict[str, Any]]
+
+
+def placeholder_png(width: int = 64, height: int = 64) -> bytes:
+    """Encode a grayscale gradient as a PNG without any imaging library"""
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data))
+
+    rows = b"".join(
+        b"\0" + bytes((x * 255 // (width - 1) + y) % 256 for x in range(width))
+        for y in range(height)
+    )
+    header = struct.pack(">IIBBBBB", width, height, 8, 0, 0, 0, 0)  # 8-bit grayscale
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", header)
+        + chunk(b"IDAT", zlib.compress(rows))
+        + chunk(b"IEND", b"")
+    )
+
+
+class ArtifactServer:
+    """Local stand-in for assets.meshy.ai: a PNG for image paths, the GLB otherwise"""
+
+    def __init__(self, glb_path: Path, latency: float = 0.0):
+        glb = glb_path.read_bytes()
+        png = placeholder_png()
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                if latency:
+                    time.sleep(latency)
+                if self.path.lower().endswith(".png"):
+                    body, content_type = png, "image/png"
+                else:
+                    body, content_type = glb, "model/gltf-binary"
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def rewrite_urls(value: Any, base_url: str) -> Any:
+    """Point every absolute URL in a payload at the fake artifact server"""
+    if isinstance(value, dict):
+        return {k: rewrite_urls(v, base_url) for k, v in value.items()}
+    if isinstance(value, list):
+        return [rewrite_urls(v, base_url) for v in value]
+    if isinstance(value, str) and value.startswith(("http://", "https://")):
+        path = value.split("://", 1)[1].split("/", 1)[-1]
+        return f"{base_url}/{path}"
+    return value
+
+
+def build_workload(
+    fixtures_dir: Path,
+    tasks: int,
+    species_count: int,
+    progress_updates: int,
+    artifact_base_url: str
+) -> List[Event]:
+    """Synthesize webhook deliveries from the recorded fixtures
+
+    Each task cycles through the fixture types and gets `progress_updates`
+    IN_PROGRESS deliveries before its terminal one. Deliveries are ordered in
+    rounds (all first updates, then all second updates, ...) so updates for
+    one task usually arrive in order but interleave with other tasks.
+    """
+    templates = []
+    for filename, (service, stage) in FIXTURE_SERVICES.items():
+        path = fixtures_dir / "webhooks" / filename
+        if path.exists():
+            templates.append((service, stage, json.loads(path.read_text())))
+    if not templates:
+        raise FileNotFoundError(f"No webhook fixtures found in {fixtures_dir / 'webhooks'}")
+
+    rounds: List[List[Event]] = [[] for _ in range(progress_updates + 1)]
+    for i in range(tasks):
+        service, stage, template = templates[i % len(templates)]
+        species = f"loadtest{i % species_count}"
+        final = rewrite_urls(copy.deepcopy(template), artifact_base_url)
+        final["id"] = f"loadtest-{i:06d}-{service}"
+
+        for step in range(progress_updates):
+            rounds[step].append((species, stage, service, {
+                "id": final["id"],
+                "status": "IN_PROGRESS",
+                "progress": int(100 * (step + 1) / (progress_updates + 1)),
+                "created_at": final.get("created_at", 0),
+            }))
+        rounds[-1].append((species, stage, service, final))
+
+    return [event for round_events in rounds for event in round_events]
+
+
+def seed_repository(repository: TaskRepository, events: List[Event]) -> int:
+    """Register every task in the workload as a PENDING submission
+
+    Returns:
+        Number of tasks registered
+    """
+    seen = set()
+    for species, stage, service, payload in events:
+        task_id = payload["id"]
+        if task_id in seen:
+            continue
+        seen.add(task_id)
+        repository.record_task_submission(TaskSubmission(
+            task_id=task_id,
+            spec_hash=repository.compute_spec_hash({"loadtest_task": task_id}),
+            species=species,
+            service=service,
+            status=TaskStatus.PENDING,
+            callback_url=f"https://loadtest.invalid/webhooks/meshy/{species}/{stage}",
+            created_at=datetime.utcnow(),
+            updated_at=datetime.utcnow()
+        ))
+    return len(seen)
+
+
+def make_inprocess_sender(handler: WebhookHandler):
+    """Deliver events by calling WebhookHandler directly"""
+    def send(event: Event) -> bool:
+        species, _stage, _service, payload = event
+        result = handler.handle_webhook(
+            MeshyWebhookPayload.model_validate(payload),
+            species=species,
+            source="loadtest"
+        )
+        return result.get("status") == "success"
+    return send
+
+
+def make_http_sender(target: str, timeout: float):
+    """Deliver events by POSTing to {target}/{species}/{stage}"""
+    target = target.rstrip("/")
+
+    def send(event: Event) -> bool:
+        species, stage, _service, payload = event
+        request = urllib.request.Request(
+            f"{target}/{species}/{stage}",
+            data=json.dumps(payload).encode(),
+            headers={"Content-Type": "application/json"},
+            method="POST"
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                response.read()
+                return 200 <= response.status < 300
+        except (urllib.error.URLError, OSError):
+            return False
+    return send
+
+
+def run_load(
+    events: List[Event],
+    send,
+    rate: float,
+    concurrency: int
+) -> Dict[str, Any]:
+    """Fire events and collect per-delivery latency
+
+    With a target rate the run is open-loop: latency is measured from each
+    delivery's scheduled send time, so time spent queued behind slow
+    deliveries is counted rather than hidden.
+    """
+    latencies: List[float] = []
+    failures = 0
+    lock = threading.Lock()
+
+    def deliver(event: Event, scheduled: float):
+        nonlocal failures
+        try:
+            ok = send(event)
+        except Exception as e:
+            print(f"✗ {event[3].get('id')}: {e}")
+            ok = False
+        elapsed = time.perf_counter() - scheduled
+        with lock:
+            latencies.append(elapsed)
+            if not ok:
+                failures += 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for i, event in enumerate(events):
+            if rate > 0:
+                scheduled = start + i / rate
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                pool.submit(deliver, event, scheduled)
+            else:
+                pool.submit(lambda e=event: deliver(e, time.perf_counter()))
+    wall = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "deliveries": len(events),
+        "failures": failures,
+        "wall_seconds": wall,
+        "throughput_per_sec": len(events) / wall if wall else 0.0,
+        "latency_ms": {
+            "p50": percentile(latencies, 50) * 1000,
+            "p90": percentile(latencies, 90) * 1000,
+            "p99": percentile(latencies, 99) * 1000,
+            "max": (latencies[-1] if latencies else 0.0) * 1000,
+        },
+    }
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def manifest_report(repository: TaskRepository) -> Dict[str, Any]:
+    """Summarize manifest and artifact sizes per species"""
+    species_stats = {}
+    for species in repository.list_species():
+        manifest = repository.load_species_manifest(species)
+        species_dir = repository.base_path / species
+        species_stats[species] = {
+            "manifest_bytes": (species_dir / "manifest.json").stat().st_size,
+            "assets": len(manifest.asset_specs),
+            "tasks": sum(len(a.task_graph) for a in manifest.asset_specs.values()),
+            "history_entries": sum(len(a.history) for a in manifest.asset_specs.values()),
+            "artifact_bytes": sum(p.stat().st_size for p in species_dir.glob("*.glb")),
+        }
+    return {
+        "species": species_stats,
+        "total_manifest_bytes": sum(s["manifest_bytes"] for s in species_stats.values()),
+        "total_artifact_bytes": sum(s["artifact_bytes"] for s in species_stats.values()),
+    }
+
+
+def print_report(config: Dict[str, Any], load: Dict[str, Any], manifests: Optional[Dict[str, Any]]):
+    """Human-readable summary"""
+    print(f"\n📊 Webhook load test ({config['mode']}, {config['tasks']} tasks, "
+          f"concurrency {config['concurrency']}, rate {config['rate'] or 'unbounded'})")
+    print(f"   Deliveries:  {load['deliveries']} ({load['failures']} failed)")
+    print(f"   Wall time:   {load['wall_seconds']:.2f}s")
+    print(f"   Throughput:  {load['throughput_per_sec']:.1f} deliveries/s")
+    lat = load["latency_ms"]
+    print(f"   Latency:     p50 {lat['p50']:.1f}ms  p90 {lat['p90']:.1f}ms  "
+          f"p99 {lat['p99']:.1f}ms  max {lat['max']:.1f}ms")
+
+    if manifests:
+        print("   Manifests:")
+        for species, stats in manifests["species"].items():
+            print(f"     {species}: {stats['manifest_bytes'] / 1024:.1f} KiB, "
+                  f"{stats['tasks']} tasks, {stats['history_entries']} history entries, "
+                  f"{stats['artifact_bytes'] / 1024 / 1024:.1f} MiB artifacts")
+        print(f"   Total manifest bytes: {manifests['total_manifest_bytes']}")
+
+
+def main():
+    """Run the load test"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mode", choices=["inprocess", "http"], default="inprocess")
+    parser.add_argument("--target", default="http://localhost:8000/webhooks/meshy",
+                        help="Base URL for --mode http; events go to {target}/{species}/{stage}")
+    parser.add_argument("--tasks", type=int, default=200, help="Number of synthetic tasks")
+    parser.add_argument("--species", type=int, default=2, help="Number of synthetic species")
+    parser.add_argument("--progress-updates", type=int, default=1,
+                        help="IN_PROGRESS deliveries per task before the terminal one")
+    parser.add_argument("--rate", type=float, default=0.0, help="Deliveries per second (0 = unbounded)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Deliveries in flight")
+    parser.add_argument("--no-download", action="store_true", help="Skip GLB downloads (in-process mode)")
+    parser.add_argument("--artifact-latency", type=float, default=0.0,
+                        help="Seconds the fake artifact server waits before responding")
+    parser.add_argument("--models-path", default=None,
+                        help="Manifest root to seed and report on (default: temp dir, removed after)")
+    parser.add_argument("--fixtures", default=str(FIXTURES_DIR), help="Fixture directory")
+    parser.add_argument("--timeout", type=float, default=30.0, help="HTTP timeout per delivery")
+    parser.add_argument("--json", dest="json_out", default=None, help="Also write the report as JSON")
+    args = parser.parse_args()
+
+    fixtures_dir = Path(args.fixtures)
+    models_path = args.models_path or tempfile.mkdtemp(prefix="webhook_loadtest_")
+    repository = TaskRepository(base_path=models_path)
+
+    with ArtifactServer(fixtures_dir / "glb" / "otter_sculptured.glb", args.artifact_latency) as artifacts:
+        events = build_workload(
+            fixtures_dir,
+            tasks=args.tasks,
+            species_count=args.species,
+            progress_updates=args.progress_updates,
+            artifact_base_url=artifacts.base_url
+        )
+        seeded = seed_repository(repository, events)
+        print(f"🌱 Seeded {seeded} tasks into {models_path}")
+
+        client = None
+        if args.mode == "inprocess":
+            client = BaseHttpClient(api_key=os.environ.get("MESHY_API_KEY", "loadtest"))
+            handler = WebhookHandler(
+                repository=repository,
+                client=client,
+                download_artifacts=not args.no_download
+            )
+            send = make_inprocess_sender(handler)
+        else:
+            send = make_http_sender(args.target, args.timeout)
+
+        try:
+            load = run_load(events, send, rate=args.rate, concurrency=args.concurrency)
+        finally:
+            if client:
+                client.close()
+
+    # In HTTP mode the server owns the manifests unless it shares --models-path
+    manifests = manifest_report(repository) if args.mode == "inprocess" or args.models_path else None
+    config = {k: v for k, v in vars(args).items() if k in ("mode", "tasks", "concurrency", "rate")}
+    print_report(config, load, manifests)
+
+    if args.json_out:
+        Path(args.json_out).write_text(json.dumps(
+            {"config": vars(args), "load": load, "manifests": manifests}, indent=2
+        ))
+
+    if not args.models_path:
+        shutil.rmtree(models_path, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
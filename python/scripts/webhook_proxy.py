@@ -5,6 +5,16 @@ Webhook Proxy Server - Routes Meshy API webhooks to GitHub Actions
 This server receives webhooks from Meshy API and triggers GitHub Actions
 workflows via repository_dispatch events.
 
+Incoming webhooks are written to a disk-backed spool and acknowledged
+immediately; a pool of dispatch workers drains the spool over keep-alive
+connections to the GitHub API, retrying with exponential backoff when GitHub
+is slow or unavailable. Spooled dispatches survive a proxy restart.
+
+Webhooks for coalesced event types are held for a short window and sent as
+one dispatch per species and event type, carrying every task in
+``client_payload.tasks``, so a batch run starts one workflow per group instead
+of one per callback.
+
 Run locally with ngrok for development:
     ngrok http 8000
     GITHUB_TOKEN=xxx python webhook_proxy.py
@@ -15,16 +25,31 @@ Environment variables:
     GITHUB_TOKEN: Personal access token or GitHub App token with repo scope
     GITHUB_REPO: Repository in format "owner/repo"
     WEBHOOK_SECRET: Optional shared secret for webhook verification
+    SPOOL_DIR: Directory for pending dispatches (default: .webhook_spool)
+    DISPATCH_WORKERS: Concurrent GitHub dispatch workers (default: 4)
+    DISPATCH_MAX_ATTEMPTS: Attempts before a dispatch is dead-lettered (default: 8)
+    COALESCE_EVENTS: Comma-separated event types to coalesce, or "*" for all
+        (default: meshy_webhook_animated)
+    COALESCE_WINDOW: Seconds to hold the first webhook of a group (default: 15)
+    COALESCE_MAX_TASKS: Tasks per dispatch before flushing early (default: 25)
+    COALESCE_MAX_BYTES: Serialized client_payload size limit (default: 60000)
 """
 
 import os
+import sys
 import json
 import hmac
+import heapq
+import queue
+import random
 import hashlib
-from typing import Optional
-from http.server import HTTPServer, BaseHTTPRequestHandler
-import urllib.request
-import urllib.error
+import itertools
+import threading
+import time
+import http.client
+from pathlib import Path
+from typing import Optional, Tuple
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 
 
 # Configuration
@@ -32,17 +57,42 @@ GITHUB_TOKEN = os.environ.get("GITHUB_TOKEN")
 GITHUB_REPO = os.environ.get("GITHUB_REPO")  # Required - must be set explicitly
 WEBHOOK_SECRET = os.environ.get("WEBHOOK_SECRET", "")
 PORT = int(os.environ.get("PORT", 8000))
+SPOOL_DIR = Path(os.environ.get("SPOOL_DIR", ".webhook_spool"))
+DISPATCH_WORKERS = int(os.environ.get("DISPATCH_WORKERS", 4))
+DISPATCH_MAX_ATTEMPTS = int(os.environ.get("DISPATCH_MAX_ATTEMPTS", 8))
+COALESCE_EVENTS = {
+    e.strip() for e in os.environ.get("COALESCE_EVENTS", "meshy_webhook_animated").split(",") if e.strip()
+}
+COALESCE_WINDOW = float(os.environ.get("COALESCE_WINDOW", 15))
+COALESCE_MAX_TASKS = int(os.environ.get("COALESCE_MAX_TASKS", 25))
+COALESCE_MAX_BYTES = int(os.environ.get("COALESCE_MAX_BYTES", 60000))
+
+GITHUB_API_HOST = "api.github.com"
+BACKOFF_BASE = 2.0  # seconds
+BACKOFF_MAX = 300.0  # seconds
+
+_entry_counter = itertools.count()
+_entry_lock = threading.Lock()
+
+# Map stage to GitHub event type
+EVENT_TYPE_MAP = {
+    "static": "meshy_webhook_static",
+    "rigged": "meshy_webhook_rigged",
+    "walk": "meshy_webhook_animated",
+    "attack": "meshy_webhook_animated",
+    "idle": "meshy_webhook_animated",
+    "retextured": "meshy_webhook_retextured",
+}
 
 
 def verify_signature(payload: bytes, signature: str) -> bool:
     """Verify webhook signature if secret is configured.
-    
+
     WARNING: If WEBHOOK_SECRET is not set, signature verification is bypassed.
     This allows any external party to trigger GitHub Actions workflows.
     Always set WEBHOOK_SECRET in production environments.
     """
     if not WEBHOOK_SECRET:
-        import sys
         print("WARNING: WEBHOOK_SECRET not configured - signature verification disabled!", file=sys.stderr)
         print("WARNING: Any source can trigger workflows. Set WEBHOOK_SECRET in production.", file=sys.stderr)
         return True
@@ -56,44 +106,354 @@ def verify_signature(payload: bytes, signature: str) -> bool:
     return hmac.compare_digest(f"sha256={expected}", signature)
 
 
-def trigger_github_dispatch(event_type: str, payload: dict) -> bool:
-    """Trigger GitHub repository_dispatch event."""
-    if not GITHUB_TOKEN:
-        print("ERROR: GITHUB_TOKEN not set")
-        return False
+def new_entry_id() -> str:
+    """Spool entry id that sorts in arrival order.
+
+    Nanosecond time orders entries across restarts; the process-wide counter
+    breaks ties between entries created within the same clock tick.
+    """
+    with _entry_lock:
+        return f"{time.time_ns():020d}-{next(_entry_counter):08d}"
+
+
+def should_coalesce(event_type: str) -> bool:
+    """Whether webhooks of this event type are batched into one dispatch."""
+    return "*" in COALESCE_EVENTS or event_type in COALESCE_EVENTS
 
-    url = f"https://api.github.com/repos/{GITHUB_REPO}/dispatches"
 
-    data = json.dumps({
-        "event_type": event_type,
-        "client_payload": payload
-    }).encode()
+def build_batch_payload(payloads: list) -> dict:
+    """Merge per-task payloads of one group into a single client_payload.
 
-    request = urllib.request.Request(
-        url,
-        data=data,
-        headers={
+    Top-level fields mirror the first task so single-task consumers keep
+    working; every task (including the first) is listed in ``tasks``.
+    GitHub allows at most 10 top-level client_payload keys.
+    """
+    first = payloads[0]
+    return {
+        "task_id": first["task_id"],
+        "status": first["status"],
+        "species": first["species"],
+        "stage": first["stage"],
+        "animation_type": first["animation_type"],
+        "spec_hash": first["spec_hash"],
+        "model_url": first["model_url"],
+        "task_count": len(payloads),
+        "tasks": [
+            {k: v for k, v in payload.items() if k != "species"}
+            for payload in payloads
+        ],
+    }
+
+
+class GitHubConnectionPool:
+    """Pool of keep-alive HTTPS connections to the GitHub API."""
+
+    def __init__(self, host: str = GITHUB_API_HOST, size: int = DISPATCH_WORKERS, timeout: float = 15.0):
+        self.host = host
+        self.timeout = timeout
+        self._idle: "queue.LifoQueue[http.client.HTTPSConnection]" = queue.LifoQueue(maxsize=size)
+
+    def _acquire(self) -> http.client.HTTPSConnection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return http.client.HTTPSConnection(self.host, timeout=self.timeout)
+
+    def _release(self, conn: http.client.HTTPSConnection) -> None:
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def post(self, path: str, body: bytes, headers: dict) -> Tuple[int, bytes, dict]:
+        """POST on a pooled connection. Returns (status, body, headers).
+
+        A connection that errors is discarded rather than returned to the pool;
+        one retry on a fresh connection covers keep-alive sockets the server
+        closed while idle.
+        """
+        for attempt in range(2):
+            conn = self._acquire()
+            try:
+                conn.request("POST", path, body=body, headers=headers)
+                response = conn.getresponse()
+                data = response.read()
+                response_headers = {k.lower(): v for k, v in response.getheaders()}
+            except (http.client.HTTPException, OSError):
+                conn.close()
+                if attempt == 1:
+                    raise
+                continue
+            if response_headers.get("connection", "").lower() == "close":
+                conn.close()
+            else:
+                self._release(conn)
+            return response.status, data, response_headers
+        raise RuntimeError("unreachable")
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class DispatchSpool:
+    """Disk-backed queue of pending repository_dispatch events.
+
+    Each entry is one JSON file, written atomically, so a crash between
+    acknowledging Meshy and reaching GitHub loses nothing. Entries that keep
+    failing are moved to ``dead/`` for manual replay.
+
+    Entries may carry a coalescing ``group``. When a grouped entry comes due,
+    every other queued entry of the same group is claimed with it (up to the
+    task and byte limits) and the batch is dispatched together; the window is
+    therefore measured from the first webhook of a group.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.dead_dir = self.directory / "dead"
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.dead_dir.mkdir(parents=True, exist_ok=True)
+        self._heap: list = []  # (due_at, entry_id)
+        self._queued: dict = {}  # entry_id -> group, for entries not yet claimed
+        self._cond = threading.Condition()
+        self._closed = False
+
+        # Recover entries left over from a previous run, oldest first
+        for path in sorted(self.directory.glob("*.json")):
+            try:
+                entry = json.loads(path.read_text())
+            except (OSError, json.JSONDecodeError):
+                path.rename(self.dead_dir / path.name)
+                continue
+            self._queued[entry["id"]] = entry.get("group")
+            heapq.heappush(self._heap, (entry.get("next_attempt_at", 0.0), entry["id"]))
+
+    def _path(self, entry_id: str) -> Path:
+        return self.directory / f"{entry_id}.json"
+
+    def _write(self, entry: dict) -> None:
+        path = self._path(entry["id"])
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(entry))
+        os.replace(tmp_path, path)
+
+    def _read(self, entry_id: str) -> Optional[dict]:
+        try:
+            return json.loads(self._path(entry_id).read_text())
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def put(
+        self,
+        event_type: str,
+        payload: dict,
+        group: Optional[str] = None,
+        window: float = 0.0
+    ) -> str:
+        """Persist a dispatch and wake a worker. Returns the entry id.
+
+        Args:
+            event_type: repository_dispatch event type
+            payload: client_payload for a single task
+            group: Coalescing key; entries sharing it are dispatched together
+            window: Seconds to wait for more entries of the group
+        """
+        entry = {
+            "id": new_entry_id(),
+            "event_type": event_type,
+            "payload": payload,
+            "group": group,
+            "attempts": 0,
+            "next_attempt_at": time.time() + window if group else 0.0,
+            "last_error": None,
+        }
+        self._write(entry)
+        with self._cond:
+            self._queued[entry["id"]] = group
+            due_at = entry["next_attempt_at"]
+            if group and sum(1 for g in self._queued.values() if g == group) >= COALESCE_MAX_TASKS:
+                due_at = 0.0  # Group is full - flush without waiting out the window
+            heapq.heappush(self._heap, (due_at, entry["id"]))
+            self._cond.notify()
+        return entry["id"]
+
+    def _claim_group(self, first: dict) -> list:
+        """Claim queued entries sharing ``first``'s group, within batch limits."""
+        batch = [first]
+        size = len(json.dumps(first["payload"]))
+        for entry_id, group in list(self._queued.items()):
+            if len(batch) >= COALESCE_MAX_TASKS:
+                break
+            if group != first["group"]:
+                continue
+            entry = self._read(entry_id)
+            if entry is None:
+                del self._queued[entry_id]
+                continue
+            entry_size = len(json.dumps(entry["payload"]))
+            if size + entry_size > COALESCE_MAX_BYTES:
+                break
+            del self._queued[entry_id]
+            batch.append(entry)
+            size += entry_size
+        # Entry ids sort in arrival order (see new_entry_id)
+        return sorted(batch, key=lambda e: e["id"])
+
+    def get(self) -> Optional[list]:
+        """Block until an entry is due and return it with its coalesced group.
+
+        Returns None once the spool is closed.
+        """
+        with self._cond:
+            while True:
+                if self._closed:
+                    return None
+                if self._heap:
+                    due_at, entry_id = self._heap[0]
+                    if entry_id not in self._queued:
+                        heapq.heappop(self._heap)  # Already claimed with its group
+                        continue
+                    delay = due_at - time.time()
+                    if delay <= 0:
+                        heapq.heappop(self._heap)
+                        group = self._queued.pop(entry_id)
+                        entry = self._read(entry_id)
+                        if entry is None:
+                            continue
+                        return self._claim_group(entry) if group else [entry]
+                    self._cond.wait(timeout=delay)
+                else:
+                    self._cond.wait()
+
+    def ack(self, entry: dict) -> None:
+        """Remove a successfully dispatched entry."""
+        self._path(entry["id"]).unlink(missing_ok=True)
+
+    def retry(self, entry: dict, error: str) -> bool:
+        """Reschedule with exponential backoff. Returns False if dead-lettered."""
+        entry["attempts"] += 1
+        entry["last_error"] = error
+        if entry["attempts"] >= DISPATCH_MAX_ATTEMPTS:
+            self.dead_letter(entry, error)
+            return False
+
+        backoff = min(BACKOFF_MAX, BACKOFF_BASE * (2 ** (entry["attempts"] - 1)))
+        entry["next_attempt_at"] = time.time() + backoff * random.uniform(0.5, 1.0)
+        self._write(entry)
+        with self._cond:
+            self._queued[entry["id"]] = entry.get("group")
+            heapq.heappush(self._heap, (entry["next_attempt_at"], entry["id"]))
+            self._cond.notify()
+        return True
+
+    def dead_letter(self, entry: dict, error: str) -> None:
+        """Move an entry out of the live spool."""
+        entry["last_error"] = error
+        (self.dead_dir / f"{entry['id']}.json").write_text(json.dumps(entry))
+        self._path(entry["id"]).unlink(missing_ok=True)
+
+    def depth(self) -> int:
+        with self._cond:
+            return len(self._queued)
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+
+class GitHubDispatcher:
+    """Drains the spool into repository_dispatch calls on worker threads."""
+
+    def __init__(self, spool: DispatchSpool, pool: GitHubConnectionPool, workers: int = DISPATCH_WORKERS):
+        self.spool = spool
+        self.pool = pool
+        self.path = f"/repos/{GITHUB_REPO}/dispatches"
+        self._threads = [
+            threading.Thread(target=self._run, name=f"dispatch-{i}", daemon=True)
+            for i in range(workers)
+        ]
+
+    def start(self) -> None:
+        for thread in self._threads:
+            thread.start()
+
+    def dispatch(self, event_type: str, payload: dict) -> Tuple[bool, bool, str]:
+        """Send one repository_dispatch. Returns (ok, retryable, detail)."""
+        if not GITHUB_TOKEN:
+            return False, True, "GITHUB_TOKEN not set"
+
+        body = json.dumps({
+            "event_type": event_type,
+            "client_payload": payload
+        }).encode()
+        headers = {
             "Accept": "application/vnd.github.v3+json",
             "Authorization": f"Bearer {GITHUB_TOKEN}",
             "Content-Type": "application/json",
+            "Content-Length": str(len(body)),
+            "User-Agent": "otterfall-webhook-proxy",
             "X-GitHub-Api-Version": "2022-11-28"
-        },
-        method="POST"
-    )
+        }
 
-    try:
-        with urllib.request.urlopen(request) as response:
-            print(f"GitHub dispatch triggered: {event_type} -> {response.status}")
-            return response.status == 204
-    except urllib.error.HTTPError as e:
-        print(f"GitHub dispatch failed: {e.code} {e.reason}")
-        print(e.read().decode())
-        return False
+        try:
+            status, data, _ = self.pool.post(self.path, body, headers)
+        except (http.client.HTTPException, OSError) as e:
+            return False, True, f"connection error: {e}"
+
+        if status == 204:
+            return True, False, "dispatched"
+        # 429 and secondary rate limits (403) are transient, as are 5xx
+        retryable = status in (403, 429) or status >= 500
+        return False, retryable, f"{status} {data.decode(errors='replace')[:200]}"
+
+    def _run(self) -> None:
+        while True:
+            batch = self.spool.get()
+            if batch is None:
+                return
+
+            event_type = batch[0]["event_type"]
+            if batch[0].get("group"):
+                payload = build_batch_payload([entry["payload"] for entry in batch])
+            else:
+                payload = batch[0]["payload"]
+
+            ok, retryable, detail = self.dispatch(event_type, payload)
+            for entry in batch:
+                if ok:
+                    self.spool.ack(entry)
+                elif retryable and self.spool.retry(entry, detail):
+                    pass
+                else:
+                    if not retryable:
+                        self.spool.dead_letter(entry, detail)
+                    print(f"GitHub dispatch dead-lettered {entry['id']}: {detail}", file=sys.stderr)
+
+            if ok:
+                print(f"GitHub dispatch triggered: {event_type} ({len(batch)} tasks)")
+            elif retryable:
+                print(f"GitHub dispatch failed, will retry {len(batch)} tasks: {detail}")
 
 
 class WebhookHandler(BaseHTTPRequestHandler):
     """Handle incoming Meshy webhooks."""
 
+    protocol_version = "HTTP/1.1"
+    spool: Optional[DispatchSpool] = None
+
+    def _send_json(self, status: int, body: dict) -> None:
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
     def do_POST(self):
         """Process POST webhook from Meshy API."""
         # Read body
@@ -122,55 +482,49 @@ class WebhookHandler(BaseHTTPRequestHandler):
         species = path_parts[2]
         stage = path_parts[3]  # static, rigged, walk, attack, retextured
 
-        # Map stage to GitHub event type
-        event_type_map = {
-            "static": "meshy_webhook_static",
-            "rigged": "meshy_webhook_rigged",
-            "walk": "meshy_webhook_animated",
-            "attack": "meshy_webhook_animated",
-            "idle": "meshy_webhook_animated",
-            "retextured": "meshy_webhook_retextured",
-        }
-
-        event_type = event_type_map.get(stage, "meshy_webhook_unknown")
+        event_type = EVENT_TYPE_MAP.get(stage, "meshy_webhook_unknown")
 
         # Build payload for GitHub
         github_payload = {
-            "task_id": data.get("task_id") or data.get("result"),
+            "task_id": data.get("task_id") or data.get("id") or data.get("result"),
             "status": data.get("status", "UNKNOWN"),
             "species": species,
             "stage": stage,
             "animation_type": stage if stage in ["walk", "attack", "idle"] else None,
             "spec_hash": data.get("spec_hash", ""),
-            "model_url": data.get("model_url") or data.get("model_urls", {}).get("glb"),
+            "model_url": data.get("model_url") or (data.get("model_urls") or {}).get("glb"),
             "raw_payload": data
         }
 
         print(f"Received webhook: {species}/{stage} -> {event_type}")
         print(f"Task ID: {github_payload['task_id']}, Status: {github_payload['status']}")
 
-        # Trigger GitHub Action
-        success = trigger_github_dispatch(event_type, github_payload)
+        # Spool and acknowledge; GitHub delivery happens on the dispatch workers
+        group = f"{event_type}:{species}" if should_coalesce(event_type) else None
+        try:
+            entry_id = self.spool.put(
+                event_type,
+                github_payload,
+                group=group,
+                window=COALESCE_WINDOW
+            )
+        except OSError as e:
+            print(f"Failed to spool webhook: {e}", file=sys.stderr)
+            self.send_error(500, "Failed to spool webhook")
+            return
 
-        if success:
-            self.send_response(200)
-            self.send_header("Content-Type", "application/json")
-            self.end_headers()
-            self.wfile.write(json.dumps({"status": "dispatched"}).encode())
-        else:
-            self.send_error(500, "Failed to dispatch to GitHub")
+        self._send_json(202, {"status": "queued", "dispatch_id": entry_id})
 
     def do_GET(self):
         """Health check endpoint."""
         if self.path == "/health":
-            self.send_response(200)
-            self.send_header("Content-Type", "application/json")
-            self.end_headers()
-            self.wfile.write(json.dumps({
+            self._send_json(200, {
                 "status": "healthy",
                 "github_repo": GITHUB_REPO,
-                "github_token_set": bool(GITHUB_TOKEN)
-            }).encode())
+                "github_token_set": bool(GITHUB_TOKEN),
+                "spool_depth": self.spool.depth() if self.spool else 0,
+                "dead_letters": len(list(self.spool.dead_dir.glob("*.json"))) if self.spool else 0
+            })
         else:
             self.send_error(404)
 
@@ -178,20 +532,36 @@ class WebhookHandler(BaseHTTPRequestHandler):
 def main():
     """Run webhook proxy server."""
     if not GITHUB_TOKEN:
-        print("ERROR: GITHUB_TOKEN not set - dispatches will fail")
-        
+        print("ERROR: GITHUB_TOKEN not set - dispatches will be spooled until it is")
+
     if not GITHUB_REPO:
         print("ERROR: GITHUB_REPO not set - must be in format 'owner/repo'")
         print("Set GITHUB_REPO environment variable before starting the server.")
-        import sys
         sys.exit(1)
 
+    spool = DispatchSpool(SPOOL_DIR)
+    pool = GitHubConnectionPool(size=DISPATCH_WORKERS)
+    dispatcher = GitHubDispatcher(spool, pool, workers=DISPATCH_WORKERS)
+    WebhookHandler.spool = spool
+
     print(f"Starting webhook proxy on port {PORT}")
     print(f"GitHub repo: {GITHUB_REPO}")
     print(f"Webhook secret: {'configured' if WEBHOOK_SECRET else 'NOT CONFIGURED (insecure!)'}")
+    print(f"Spool: {SPOOL_DIR} ({spool.depth()} pending), {DISPATCH_WORKERS} dispatch workers")
+    print(f"Coalescing: {', '.join(sorted(COALESCE_EVENTS)) or 'disabled'} "
+          f"(window {COALESCE_WINDOW:.0f}s, max {COALESCE_MAX_TASKS} tasks)")
 
-    server = HTTPServer(("0.0.0.0", PORT), WebhookHandler)
-    server.serve_forever()
+    dispatcher.start()
+    server = ThreadingHTTPServer(("0.0.0.0", PORT), WebhookHandler)
+    server.daemon_threads = True
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        spool.close()
+        pool.close()
 
 
 if __name__ == "__main__":
@@ -1,11 +1,14 @@
 """Pytest configuration and shared fixtures"""
 import os
+import hashlib
 import json
 import pytest
 import tempfile
 import shutil
+from datetime import datetime
 from pathlib import Path
 from mesh_toolkit.persistence.repository import TaskRepository
+from mesh_toolkit.persistence.schemas import ArtifactRecord, AssetManifest
 from mesh_toolkit.webhooks.handler import WebhookHandler
 from mesh_toolkit.webhooks.schemas import MeshyWebhookPayload
 
@@ -74,6 +77,126 @@ def webhook_payload_loader(webhook_fixtures_dir):
     return load_payload
 
 
+class FakeClock:
+    """Clock advanced by hand or by the sleeps of the code under test"""
+    
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+    
+    def __call__(self):
+        return self.now
+    
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    """FakeClock starting at 0"""
+    return FakeClock()
+
+
+def grid_mesh(size=16, wave=0.0, shuffle=False):
+    """Positions and (T, 3) triangles of a size x size quad grid on [0, 1]²
+    
+    Args:
+        size: Quads per side
+        wave: Amplitude of a sine bump along x, so the grid is not flat
+        shuffle: Shuffle triangles to ruin vertex cache locality
+    """
+    np = pytest.importorskip("numpy")
+    xs, zs = np.meshgrid(np.linspace(0, 1, size + 1), np.linspace(0, 1, size + 1))
+    positions = np.stack([xs.ravel(), wave * np.sin(4 * xs.ravel()), zs.ravel()], axis=1).astype(np.float32)
+    row = size + 1
+    triangles = np.array([
+        tri
+        for z in range(size) for x in range(size)
+        for tri in ((z * row + x, z * row + x + 1, (z + 1) * row + x + 1),
+                    (z * row + x, (z + 1) * row + x + 1, (z + 1) * row + x))
+    ], dtype=np.int64)
+    if shuffle:
+        triangles = triangles[np.random.default_rng(1).permutation(len(triangles))]
+    return positions, triangles
+
+
+def make_grid_glb(
+    size=16,
+    wave=0.0,
+    shuffle=False,
+    normal=None,
+    uvs=False,
+    skinned=False,
+    index_type="uint16",
+    translation=None
+):
+    """GLB of grid_mesh built with GlbBuilder and add_array
+    
+    Accessors are added in order POSITION, NORMAL, TEXCOORD_0, JOINTS_0,
+    WEIGHTS_0, indices. A skinned grid is bound to node 1, a single joint.
+    
+    Args:
+        normal: Constant normal for every vertex, or None for no NORMAL
+        uvs: Add TEXCOORD_0 (the x/z position)
+        skinned: Add JOINTS_0/WEIGHTS_0 and a one-joint skin
+        index_type: numpy dtype of the indices
+        translation: Translation of the mesh node
+    """
+    np = pytest.importorskip("numpy")
+    from mesh_toolkit.processing.arrays import ELEMENT_ARRAY_BUFFER, add_array
+    from mesh_toolkit.processing.glb import GlbBuilder
+    
+    positions, triangles = grid_mesh(size, wave, shuffle)
+    builder = GlbBuilder({"asset": {"version": "2.0"}})
+    attributes = {"POSITION": add_array(builder, positions, with_bounds=True)}
+    if normal is not None:
+        attributes["NORMAL"] = add_array(builder, np.tile(np.float32(normal), (len(positions), 1)))
+    if uvs:
+        attributes["TEXCOORD_0"] = add_array(builder, positions[:, [0, 2]].copy())
+    if skinned:
+        attributes["JOINTS_0"] = add_array(builder, np.zeros((len(positions), 4), dtype=np.uint8))
+        attributes["WEIGHTS_0"] = add_array(builder, np.tile(np.float32([1, 0, 0, 0]), (len(positions), 1)))
+    indices = add_array(builder, triangles.reshape(-1).astype(index_type), target=ELEMENT_ARRAY_BUFFER)
+    
+    builder.gltf["meshes"] = [{"primitives": [{"attributes": attributes, "indices": indices}]}]
+    builder.gltf["nodes"] = [{"mesh": 0}]
+    if translation is not None:
+        builder.gltf["nodes"][0]["translation"] = list(translation)
+    if skinned:
+        builder.gltf["nodes"][0]["skin"] = 0
+        builder.gltf["nodes"].append({"name": "root"})
+        builder.gltf["skins"] = [{"joints": [1]}]
+    return builder.build()
+
+
+def seed_artifact(repository, name, data, kind="download"):
+    """Write a file into the otter directory and register it on hash_otter
+    
+    Creates the asset if needed and replaces an earlier record of the same
+    file, as a fresh download would.
+    
+    Returns:
+        The ArtifactRecord that was registered
+    """
+    species_dir = repository.base_path / "otter"
+    species_dir.mkdir(parents=True, exist_ok=True)
+    (species_dir / name).write_bytes(data)
+    record = ArtifactRecord(
+        relative_path=name,
+        sha256_hash=hashlib.sha256(data).hexdigest(),
+        file_size_bytes=len(data),
+        downloaded_at=datetime.utcnow(),
+        kind=kind
+    )
+    asset = repository.get_asset_record("otter", "hash_otter") or AssetManifest(
+        asset_spec_hash="hash_otter", spec_fingerprint="{}", species="otter", asset_intent="creature"
+    )
+    asset.artifacts = [a for a in asset.artifacts if a.relative_path != name] + [record]
+    repository.upsert_asset_record("otter", asset)
+    return record
+
+
 def pytest_configure(config):
     """Register custom markers"""
     config.addinivalue_line(
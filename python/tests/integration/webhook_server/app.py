@@ -5,8 +5,13 @@ from datetime import datetime
 from fastapi import FastAPI, Request, Response
 from pydantic import BaseModel
 
+from mesh_toolkit.persistence.events import TaskEvent, TaskEventBus
+
 app = FastAPI()
 
+# Notifies WebhookRecorder.get_payload as soon as a payload is stored
+webhook_events = TaskEventBus()
+
 webhook_storage_dir = Path(__file__).parent.parent / "cassettes" / "webhooks"
 webhook_storage_dir.mkdir(parents=True, exist_ok=True)
 
@@ -32,7 +37,7 @@ async def receive_webhook(species: str, task_type: str, request: Request):
     headers = dict(request.headers)
     
     webhook_data = WebhookPayload(
-        task_id=payload.get("task_id", ""),
+        task_id=payload.get("task_id") or payload.get("id", ""),
         status=payload.get("status", ""),
         progress=payload.get("progress", 0),
         task_type=payload.get("task_type", task_type),
@@ -45,6 +50,14 @@ async def receive_webhook(species: str, task_type: str, request: Request):
     storage_file = webhook_storage_dir / f"{species}_{task_type}_{webhook_data.task_id}.json"
     storage_file.write_text(webhook_data.model_dump_json(indent=2))
     
+    webhook_events.publish(TaskEvent(
+        task_id=webhook_data.task_id,
+        status=webhook_data.status,
+        species=species,
+        service=task_type,
+        source="webhook"
+    ))
+    
     print(f"[WEBHOOK] Received {task_type} webhook for {species}: {payload.get('status')}")
     print(f"[WEBHOOK] Stored at: {storage_file}")
     
@@ -1,14 +1,19 @@
 """Pytest fixtures for webhook recording infrastructure"""
 import os
+import json
 import time
 import threading
 from pathlib import Path
 from contextlib import contextmanager
+from typing import Iterable, Optional
 
 import pytest
 import uvicorn
 from pyngrok import ngrok
 
+from mesh_toolkit.persistence.events import TaskEvent
+from mesh_toolkit.persistence.schemas import TaskStatus
+
 
 @contextmanager
 def webhook_server(port: int = 8000):
@@ -80,18 +85,43 @@ class WebhookRecorder:
         """Get callback URL for Meshy"""
         return f"{self.base_url}/webhook/{species}/{task_type}"
     
-    def get_payload(self, species: str, task_type: str, task_id: str, timeout: int = 300) -> dict:
-        """Wait for and retrieve webhook payload"""
+    def get_payload(
+        self,
+        species: str,
+        task_type: str,
+        task_id: str,
+        timeout: int = 300,
+        statuses: Optional[Iterable[str]] = None
+    ) -> dict:
+        """Wait for and retrieve webhook payload
+        
+        Wakes as soon as the in-process webhook server stores a payload for
+        the task; an existing cassette file satisfies the wait immediately.
+        
+        Args:
+            species: Species in the callback URL
+            task_type: Task type in the callback URL
+            task_id: Meshy task ID
+            timeout: Seconds to wait
+            statuses: Statuses to wait for (default: any)
+        """
+        from python.tests.integration.webhook_server.app import webhook_events
+        
         storage_file = self.storage_dir / f"{species}_{task_type}_{task_id}.json"
+        wanted = set(statuses) if statuses else {s.value for s in TaskStatus}
+        
+        def stored() -> Optional[TaskEvent]:
+            if not storage_file.exists():
+                return None
+            data = json.loads(storage_file.read_text())
+            return TaskEvent(task_id=task_id, status=data.get("status", ""), source="cassette")
         
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            if storage_file.exists():
-                import json
-                return json.loads(storage_file.read_text())
-            time.sleep(2)
+        try:
+            webhook_events.wait(task_id, wanted, timeout=timeout, current=stored)
+        except TimeoutError:
+            raise TimeoutError(f"Webhook not received within {timeout}s for {task_id}") from None
         
-        raise TimeoutError(f"Webhook not received within {timeout}s for {task_id}")
+        return json.loads(storage_file.read_text())
 
 
 def pytest_addoption(parser):
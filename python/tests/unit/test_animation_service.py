@@ -3,6 +3,7 @@ import pytest
 from unittest.mock import Mock
 import httpx
 from mesh_toolkit.services.animation_service import AnimationService
+from mesh_toolkit.services.utils import BulkSubmissionError
 from mesh_toolkit.api.base_client import BaseHttpClient
 from mesh_toolkit.persistence.repository import TaskRepository
 from mesh_toolkit.persistence.schemas import TaskSubmission, TaskStatus
@@ -62,6 +63,7 @@ class TestAnimationService:
         assert recorded_submission.service == "animation"
         assert recorded_submission.status == TaskStatus.PENDING
         assert recorded_submission.spec_hash == "spec_hash_123"
+        assert recorded_submission.params == {"model_id": "rigged_model_456", "animation_id": "4"}
         
         assert submission.task_id == "anim_task_123"
         assert submission.species == "otter"
@@ -103,3 +105,69 @@ class TestAnimationService:
                 animation_id="99",
                 callback_url="http://test.com/cb"
             )
+
+
+class TestAnimationSubmitMany:
+    """Test bulk animation submission against a real repository"""
+    
+    @pytest.fixture
+    def mock_client(self):
+        """Client returning a task ID derived from the animation ID"""
+        client = Mock(spec=BaseHttpClient)
+        
+        def request(method, endpoint, api_version="v2", json=None):
+            if json["animation_id"] == "bad":
+                raise httpx.ConnectError("down")
+            response = Mock(spec=httpx.Response)
+            response.json.return_value = {"result": f"anim_{json['animation_id']}"}
+            return response
+        
+        client.request.side_effect = request
+        return client
+    
+    def _requests(self, animation_ids):
+        return [
+            {"species": "otter", "model_id": "rig_1", "animation_id": anim_id,
+             "callback_url": f"http://test.com/otter/{anim_id}"}
+            for anim_id in animation_ids
+        ]
+    
+    def test_variants_recorded_in_one_write(self, mock_client, test_repository, mocker):
+        """50 animation variants cost one manifest rewrite"""
+        test_repository.load_species_manifest("otter")
+        save = mocker.spy(test_repository, "save_species_manifest")
+        service = AnimationService(mock_client, test_repository)
+        
+        submissions = service.submit_many(self._requests([str(i) for i in range(50)]), max_workers=8)
+        
+        assert [s.task_id for s in submissions] == [f"anim_{i}" for i in range(50)]
+        assert mock_client.request.call_count == 50
+        assert save.call_count == 1
+        assert all(test_repository.find_task_by_id(s.task_id) for s in submissions)
+    
+    def test_partial_failure_records_successes(self, mock_client, test_repository):
+        """Failed requests are reported while created tasks are still recorded"""
+        service = AnimationService(mock_client, test_repository)
+        
+        with pytest.raises(BulkSubmissionError) as exc_info:
+            service.submit_many(self._requests(["1", "bad", "3"]))
+        
+        error = exc_info.value
+        assert list(error.errors) == [1]
+        assert error.submissions[1] is None
+        assert test_repository.find_task_by_id("anim_1") is not None
+        assert test_repository.find_task_by_id("anim_3") is not None
+    
+    def test_record_failure_reports_created_tasks(self, mock_client, test_repository, mocker):
+        """Tasks created before the manifest write failed are handed back"""
+        service = AnimationService(mock_client, test_repository)
+        mocker.patch.object(test_repository, "record_task_submissions", side_effect=OSError("disk full"))
+        
+        with pytest.raises(BulkSubmissionError) as exc_info:
+            service.submit_many(self._requests(["1", "2"]))
+        
+        error = exc_info.value
+        assert error.errors == {}
+        assert isinstance(error.record_error, OSError)
+        assert [s.task_id for s in error.submissions] == ["anim_1", "anim_2"]
+        assert "anim_2" in str(error)
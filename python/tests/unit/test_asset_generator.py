@@ -0,0 +1,241 @@
+"""Unit tests for AssetGenerator batch generation"""
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+from mesh_toolkit.client import MeshyClient
+from mesh_toolkit.jobs import AssetGenerator, AssetManifest
+from mesh_toolkit.models import AssetIntent, GameAssetSpec, ModelUrls, TaskStatus, Text3DResult
+
+
+def _spec(asset_id: str) -> GameAssetSpec:
+    return GameAssetSpec(
+        asset_id=asset_id,
+        intent=AssetIntent.PROP_DECORATION,
+        description=f"Test asset {asset_id}",
+        output_path="models/test"
+    )
+
+
+class TestBatchGenerate:
+    """Test concurrent batch_generate"""
+    
+    @pytest.fixture
+    def generator(self, tmp_path):
+        """Generator whose generate_model is replaced per test"""
+        return AssetGenerator(client=Mock(spec=MeshyClient), output_root=str(tmp_path))
+    
+    def test_runs_up_to_max_concurrent(self, generator):
+        """No more than max_concurrent assets are in flight at once"""
+        lock = threading.Lock()
+        in_flight = 0
+        peak = 0
+        
+        def fake_generate(spec, wait=True, poll_interval=5.0):
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(0.05)
+            with lock:
+                in_flight -= 1
+            return AssetManifest(asset_id=spec.asset_id, intent=spec.intent.value,
+                                 description=spec.description, art_style="realistic")
+        
+        generator.generate_model = fake_generate
+        
+        report = generator.batch_generate([_spec(f"a{i}") for i in range(6)], max_concurrent=3)
+        
+        assert peak == 3, f"Expected 3 assets in flight at peak, saw {peak}"
+        assert len(report.succeeded) == 6
+    
+    def test_failures_are_isolated_and_ordered(self, generator):
+        """One failing asset is reported without affecting the others"""
+        def fake_generate(spec, wait=True, poll_interval=5.0):
+            if spec.asset_id == "broken":
+                raise RuntimeError("Task failed: bad prompt")
+            return AssetManifest(asset_id=spec.asset_id, intent=spec.intent.value,
+                                 description=spec.description, art_style="realistic")
+        
+        generator.generate_model = fake_generate
+        
+        report = generator.batch_generate([_spec("a"), _spec("broken"), _spec("c")], max_concurrent=2)
+        
+        assert [r.asset_id for r in report.results] == ["a", "broken", "c"]
+        assert [m.asset_id for m in report.manifests] == ["a", "c"]
+        assert report.failed[0].error == "Task failed: bad prompt"
+        assert report.to_dict()["failed"] == 1
+    
+    def test_pulls_specs_lazily(self, generator):
+        """Specs are taken from the iterable only as workers free up"""
+        pulled = []
+        started = []
+        
+        def source():
+            for i in range(5):
+                pulled.append(i)
+                yield _spec(f"a{i}")
+        
+        def fake_generate(spec, wait=True, poll_interval=5.0):
+            started.append(len(pulled))
+            return AssetManifest(asset_id=spec.asset_id, intent=spec.intent.value,
+                                 description=spec.description, art_style="realistic")
+        
+        generator.generate_model = fake_generate
+        
+        report = generator.batch_generate(source(), max_concurrent=2)
+        
+        assert len(report.succeeded) == 5
+        assert started[0] <= 2
+
+
+class TestGenerateBestOf:
+    """Test best-of-N preview selection and refine gating"""
+    
+    @pytest.fixture
+    def client(self):
+        """Client whose previews finish according to self.finish_after"""
+        client = Mock(spec=MeshyClient)
+        client.create_text_to_3d.side_effect = lambda request: f"preview_{request.seed}"
+        client.refine_text_to_3d.return_value = "refine_1"
+        client.poll_until_complete.side_effect = lambda task_id, **kwargs: Text3DResult(
+            id=task_id, status=TaskStatus.SUCCEEDED, created_at=0
+        )
+        return client
+    
+    def _statuses(self, client, outcomes):
+        """Make preview_<seed> report outcomes[seed] from poll number `after` on"""
+        polls = {}
+        
+        def get(task_id):
+            polls[task_id] = polls.get(task_id, 0) + 1
+            status, after = outcomes[int(task_id.split("_")[1])]
+            current = status if polls[task_id] >= after else TaskStatus.IN_PROGRESS
+            return Text3DResult(id=task_id, status=current, created_at=0,
+                                error="boom" if current == TaskStatus.FAILED else None)
+        
+        client.get_text_to_3d.side_effect = get
+        return polls
+    
+    def test_refines_highest_scoring_preview(self, client, tmp_path):
+        """All previews are scored and only the best one is refined"""
+        self._statuses(client, {1: (TaskStatus.SUCCEEDED, 1), 2: (TaskStatus.SUCCEEDED, 2),
+                                3: (TaskStatus.FAILED, 1)})
+        scores = {"preview_1": 0.4, "preview_2": 0.7}
+        generator = AssetGenerator(client=client, output_root=str(tmp_path))
+        
+        manifest = generator.generate_best_of(
+            _spec("otter"), n=3, scorer=lambda result, spec: scores[result.id], poll_interval=0
+        )
+        
+        client.refine_text_to_3d.assert_called_once_with("preview_2", enable_pbr=True)
+        assert manifest.task_id == "refine_1"
+        assert manifest.metadata["preview_task_id"] == "preview_2"
+        statuses = {c["seed"]: c["status"] for c in manifest.metadata["candidates"]}
+        assert statuses == {1: "SUCCEEDED", 2: "SUCCEEDED", 3: "FAILED"}
+        assert (tmp_path / "models/test/otter_manifest.json").exists()
+    
+    def test_accept_score_stops_tracking_losers(self, client, tmp_path):
+        """A good enough preview wins immediately and the rest are canceled"""
+        polls = self._statuses(client, {1: (TaskStatus.SUCCEEDED, 1), 2: (TaskStatus.SUCCEEDED, 5),
+                                        3: (TaskStatus.SUCCEEDED, 5)})
+        generator = AssetGenerator(client=client, output_root=str(tmp_path))
+        
+        manifest = generator.generate_best_of(
+            _spec("otter"), n=3, scorer=lambda result, spec: 0.9, accept_score=0.8, poll_interval=0
+        )
+        
+        assert manifest.metadata["preview_task_id"] == "preview_1"
+        assert [c["status"] for c in manifest.metadata["candidates"]] == ["SUCCEEDED", "CANCELED", "CANCELED"]
+        assert polls == {"preview_1": 1, "preview_2": 1, "preview_3": 1}
+    
+    def test_all_previews_failing_skips_refine(self, client, tmp_path):
+        """No refine credits are spent when every preview failed"""
+        self._statuses(client, {1: (TaskStatus.FAILED, 1), 2: (TaskStatus.FAILED, 1)})
+        generator = AssetGenerator(client=client, output_root=str(tmp_path))
+        
+        with pytest.raises(RuntimeError, match="All 2 previews failed"):
+            generator.generate_best_of(_spec("otter"), n=2, scorer=lambda r, s: 1.0, poll_interval=0)
+        
+        client.refine_text_to_3d.assert_not_called()
+
+
+class TestStreamModel:
+    """Test the async progress event stream"""
+    
+    @pytest.fixture
+    def client(self):
+        """Client whose task for asset X goes PENDING → IN_PROGRESS → SUCCEEDED"""
+        client = Mock(spec=MeshyClient)
+        client.create_text_to_3d.side_effect = lambda request: f"task_{request.prompt.split()[-1]}"
+        polls = {}
+        
+        def get(task_id):
+            polls[task_id] = polls.get(task_id, 0) + 1
+            if task_id == "task_broken":
+                return Text3DResult(id=task_id, status=TaskStatus.FAILED, created_at=0, error="bad prompt")
+            status, progress = [(TaskStatus.PENDING, 0), (TaskStatus.IN_PROGRESS, 50),
+                                (TaskStatus.SUCCEEDED, 100)][min(polls[task_id], 3) - 1]
+            return Text3DResult(id=task_id, status=status, progress=progress, created_at=0,
+                                model_urls=ModelUrls(glb=f"https://assets.test/{task_id}.glb"))
+        
+        client.get_text_to_3d.side_effect = get
+        client.watch_task = MeshyClient.watch_task.__get__(client)
+        client._get_func.side_effect = lambda task_type: client.get_text_to_3d
+        client.download_file.return_value = 2048
+        return client
+    
+    @pytest.mark.asyncio
+    async def test_single_asset_events(self, client, tmp_path):
+        """One asset yields submitted, stage/progress changes, artifact and completion"""
+        generator = AssetGenerator(client=client, output_root=str(tmp_path))
+        
+        events = [e async for e in generator.stream_model(_spec("otter"), poll_interval=0)]
+        
+        assert [e.kind for e in events] == [
+            "submitted", "stage", "progress", "stage", "progress", "stage", "progress", "artifact", "completed"
+        ]
+        assert [e.status for e in events if e.kind == "stage"] == ["PENDING", "IN_PROGRESS", "SUCCEEDED"]
+        assert events[-2].artifact == "model" and events[-2].size_bytes == 2048
+        assert events[-1].manifest.model_path == "models/test/otter.glb"
+        assert events[-1].to_dict()["kind"] == "completed"
+    
+    @pytest.mark.asyncio
+    async def test_batch_interleaves_and_isolates_failures(self, client, tmp_path):
+        """Each asset in a batch ends with completed or failed"""
+        generator = AssetGenerator(client=client, output_root=str(tmp_path))
+        specs = [_spec("otter"), _spec("broken"), _spec("beaver")]
+        
+        events = [e async for e in generator.stream_batch(specs, max_concurrent=3, poll_interval=0)]
+        
+        final = {e.asset_id: e for e in events if e.kind in ("completed", "failed")}
+        assert final["otter"].kind == "completed"
+        assert final["beaver"].kind == "completed"
+        assert final["broken"].kind == "failed"
+        assert final["broken"].error == "bad prompt"
+
+
+class TestMeshyClientRateLimit:
+    """Test the shared rate limit under concurrency"""
+    
+    def test_concurrent_requests_are_spaced(self):
+        """Threads sharing a client are spaced min_request_interval apart"""
+        client = MeshyClient(api_key="test-key")
+        client.min_request_interval = 0.05
+        stamps = []
+        
+        def call():
+            client._rate_limit()
+            stamps.append(time.time())
+        
+        threads = [threading.Thread(target=call) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        client.close()
+        
+        stamps.sort()
+        gaps = [b - a for a, b in zip(stamps, stamps[1:])]
+        assert all(gap >= 0.04 for gap in gaps), f"Requests not spaced: {gaps}"
@@ -1,4 +1,6 @@
 """Unit tests for BaseHttpClient"""
+import threading
+import time
 import pytest
 from unittest.mock import Mock, patch
 import httpx
@@ -100,3 +102,23 @@ class TestBaseHttpClient:
         
         with pytest.raises(httpx.HTTPStatusError):
             client.request("GET", "test-endpoint")
+
+    def test_rate_limit_spaces_concurrent_callers(self, mocker):
+        """Threads sharing a client reserve distinct request slots"""
+        mocker.patch.dict("os.environ", {"MESHY_API_KEY": "test_key"})
+        client = BaseHttpClient(min_request_interval=0.05)
+        stamps = []
+        
+        def call():
+            client._rate_limit()
+            stamps.append(time.time())
+        
+        threads = [threading.Thread(target=call) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        
+        stamps.sort()
+        gaps = [b - a for a, b in zip(stamps, stamps[1:])]
+        assert all(gap >= 0.04 for gap in gaps), f"Requests not spaced: {gaps}"
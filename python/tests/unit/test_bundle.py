@@ -0,0 +1,72 @@
+"""Unit tests for per-species bundles"""
+import json
+
+import pytest
+from mesh_toolkit.processing.bundle import (
+    BundleError,
+    BundleReader,
+    build_species_bundle,
+    read_index,
+)
+
+from tests.conftest import seed_artifact
+
+
+class TestSpeciesBundle:
+    """Test packing, range reads and incremental rebuilds"""
+    
+    @pytest.fixture
+    def repository(self, test_repository):
+        seed_artifact(test_repository, "otter.glb", b"glTF" + b"\1" * 1001)
+        seed_artifact(test_repository, "otter_lod1.glb", b"glTF" + b"\2" * 333, kind="lod")
+        seed_artifact(test_repository, "otter_walk_clip.glb", b"glTF" + b"\3" * 50, kind="clip")
+        return test_repository
+    
+    def test_entries_are_aligned_and_readable(self, repository, tmp_path):
+        texture = tmp_path / "fur.png"
+        texture.write_bytes(b"\x89PNG" + b"\0" * 77)
+        
+        report = build_species_bundle(repository, "otter", kinds=["download", "lod"],
+                                      extra_files={"textures/fur.png": texture})
+        
+        index = read_index(report.path)
+        assert set(index["entries"]) == {"otter.glb", "otter_lod1.glb", "textures/fur.png", "manifest.json"}
+        assert all(entry["offset"] % 16 == 0 for entry in index["entries"].values())
+        assert index["entries"]["textures/fur.png"]["type"] == "image/png"
+        with BundleReader(report.path) as bundle:
+            assert bundle.read("otter_lod1.glb") == b"glTF" + b"\2" * 333
+            assert bundle.read("textures/fur.png") == texture.read_bytes()
+        sidecar = json.loads((repository.base_path / "otter" / "otter.bundle.json").read_text())
+        assert sidecar["entries"] == index["entries"]
+    
+    def test_incremental_rebuild_appends_changed_entries(self, repository):
+        build_species_bundle(repository, "otter", include_manifest=False)
+        before = read_index(repository.base_path / "otter" / "otter.bundle")["entries"]
+        
+        seed_artifact(repository, "otter_lod1.glb", b"glTF" + b"\4" * 200, kind="lod")
+        report = build_species_bundle(repository, "otter", include_manifest=False)
+        
+        after = read_index(report.path)["entries"]
+        assert (report.reused, report.appended, report.compacted) == (2, 1, False)
+        assert after["otter.glb"]["offset"] == before["otter.glb"]["offset"]
+        assert after["otter_lod1.glb"]["offset"] > before["otter_lod1.glb"]["offset"]
+        assert report.bytes_written == 204 + read_index(report.path)["index_length"]
+        with BundleReader(report.path) as bundle:
+            assert bundle.read("otter_lod1.glb") == b"glTF" + b"\4" * 200
+            assert bundle.read("otter.glb") == b"glTF" + b"\1" * 1001
+    
+    def test_compacts_when_mostly_dead(self, repository):
+        build_species_bundle(repository, "otter", include_manifest=False)
+        for fill in (b"\5", b"\6", b"\7"):
+            seed_artifact(repository, "otter.glb", b"glTF" + fill * 1001)
+            report = build_species_bundle(repository, "otter", include_manifest=False)
+        
+        assert report.compacted
+        index = read_index(report.path)
+        assert report.size == index["index_offset"] + index["index_length"] < 2 * 1500
+    
+    def test_rejects_non_bundles(self, tmp_path):
+        path = tmp_path / "x.bundle"
+        path.write_bytes(b"glTF" + b"\0" * 40)
+        with pytest.raises(BundleError, match="Not a version 1 bundle"):
+            read_index(path)
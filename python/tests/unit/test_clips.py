@@ -0,0 +1,183 @@
+"""Unit tests for shared-mesh extraction from animation GLBs"""
+import struct
+from datetime import datetime
+
+import pytest
+from mesh_toolkit.persistence.schemas import ArtifactRecord, AssetManifest, TaskGraphEntry
+from mesh_toolkit.processing.clips import (
+    SkeletonMismatchError,
+    clip_only,
+    extract_shared_meshes,
+    merge_animations,
+    merge_clips,
+    mesh_only,
+)
+from mesh_toolkit.processing.glb import GlbBuilder, GlbFile, inspect_glb
+
+
+def make_animation_glb(clip="Walk", duration=1.0, mesh_scale=1.0, spine="spine"):
+    """Rigged quad with an embedded texture and one translation clip"""
+    builder = GlbBuilder({
+        "asset": {"version": "2.0"},
+        "nodes": [{"name": "body", "mesh": 0, "skin": 0}, {"name": "hips", "children": [2]}, {"name": spine}],
+        "skins": [{"joints": [1, 2]}],
+        "materials": [{"pbrMetallicRoughness": {"baseColorTexture": {"index": 0}}}],
+        "textures": [{"source": 0}],
+        "scenes": [{"nodes": [0, 1]}],
+    })
+    corners = [(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0)]
+    position = builder.add_accessor(
+        b"".join(struct.pack("<3f", *(c * mesh_scale for c in corner)) for corner in corners),
+        5126, "VEC3", 4, bounds=([0, 0, 0], [mesh_scale, mesh_scale, 0])
+    )
+    indices = builder.add_accessor(struct.pack("<6H", 0, 1, 2, 0, 2, 3), 5123, "SCALAR", 6)
+    builder.gltf["meshes"] = [{"primitives": [{"attributes": {"POSITION": position}, "indices": indices, "material": 0}]}]
+    builder.gltf["images"] = [{"bufferView": builder.add_view(b"\x89PNG" + b"\0" * 4092), "mimeType": "image/png"}]
+    
+    times = builder.add_accessor(struct.pack("<2f", 0, duration), 5126, "SCALAR", 2, bounds=([0], [duration]))
+    values = builder.add_accessor(struct.pack("<6f", 0, 0, 0, 0, duration, 0), 5126, "VEC3", 2)
+    builder.gltf["animations"] = [{
+        "name": clip,
+        "samplers": [{"input": times, "output": values}],
+        "channels": [{"sampler": 0, "target": {"node": 1, "path": "translation"}}],
+    }]
+    return builder.build()
+
+
+def add_animation_asset(repository, spec_hash, endpoint, data, service="animation", **params):
+    """Animation task asset whose downloaded GLB is `data`"""
+    species_dir = repository.base_path / "otter"
+    species_dir.mkdir(parents=True, exist_ok=True)
+    filename = f"{spec_hash}_{service}.glb"
+    (species_dir / filename).write_bytes(data)
+    repository.upsert_asset_record("otter", AssetManifest(
+        asset_spec_hash=spec_hash,
+        spec_fingerprint="{}",
+        species="otter",
+        asset_intent="creature",
+        task_graph=[TaskGraphEntry(
+            task_id=params.get("task_id", f"task_{spec_hash}"),
+            service=service,
+            status="SUCCEEDED",
+            created_at=datetime.utcnow(),
+            updated_at=datetime.utcnow(),
+            payload={"callback_url": f"http://localhost:8000/webhooks/otter/{endpoint}", **params}
+        )],
+        artifacts=[ArtifactRecord(
+            relative_path=filename,
+            sha256_hash="0" * 64,
+            file_size_bytes=len(data),
+            downloaded_at=datetime.utcnow()
+        )]
+    ))
+
+
+class TestSplitting:
+    """Test mesh-only, clip-only and merged GLBs"""
+    
+    def test_mesh_part_is_identical_across_clips(self):
+        with GlbFile(make_animation_glb("Walk", 1.0)) as walk, GlbFile(make_animation_glb("Run", 0.5)) as run:
+            assert mesh_only(walk) == mesh_only(run)
+            assert "animations" not in GlbFile(mesh_only(walk)).json
+    
+    def test_clip_only_keeps_hierarchy_and_keyframes(self):
+        with GlbFile(make_animation_glb("Walk", 1.2)) as glb:
+            clip = clip_only(glb, "walk")
+        
+        stats = inspect_glb(clip)
+        assert stats.animations == {"walk": 1.2}
+        assert (stats.mesh_count, stats.image_count, stats.skin_count) == (0, 0, 0)
+        with GlbFile(clip) as parsed:
+            assert [node.get("name") for node in parsed.json["nodes"]] == ["body", "hips", "spine"]
+            assert "mesh" not in parsed.json["nodes"][0]
+        assert len(clip) < 1024
+    
+    def test_merge_clips(self):
+        with GlbFile(make_animation_glb("Walk", 1.0)) as walk, GlbFile(make_animation_glb("Run", 0.5)) as run:
+            merged = merge_clips(walk, [("walk", walk), ("run", run)])
+        
+        stats = inspect_glb(merged)
+        assert stats.animations == {"walk": 1.0, "run": 0.5}
+        assert (stats.mesh_count, stats.image_count) == (1, 1)
+        assert len(merged) < len(make_animation_glb()) + 512
+    
+    def test_merge_rejects_other_skeletons(self):
+        with GlbFile(make_animation_glb()) as walk, GlbFile(make_animation_glb(spine="tail")) as other:
+            with pytest.raises(SkeletonMismatchError, match="Node 2 is 'tail', expected 'spine'"):
+                merge_clips(walk, [("walk", walk), ("swim", other)])
+
+
+class TestExtractSharedMeshes:
+    """Test grouping and registration in the repository"""
+    
+    @pytest.fixture
+    def repository(self, test_repository):
+        add_animation_asset(test_repository, "hash_walk", "walk", make_animation_glb("Armature|Take", 1.0))
+        add_animation_asset(test_repository, "hash_run", "run", make_animation_glb("Armature|Take", 0.5))
+        add_animation_asset(test_repository, "hash_big_walk", "walk", make_animation_glb("Take", 1.0, mesh_scale=2))
+        return test_repository
+    
+    def test_shared_mesh_and_clips(self, repository):
+        groups = extract_shared_meshes(repository, max_workers=1)
+        
+        assert sorted(len(group.sources) for group in groups) == [1, 2]
+        pair = next(group for group in groups if len(group.sources) == 2)
+        assert pair.clips == ["walk", "run"]
+        assert pair.bytes_after < pair.bytes_before * 0.6
+        
+        artifacts = repository.get_asset_record("otter", "hash_run").artifacts
+        clip = next(a for a in artifacts if a.kind == "clip")
+        assert clip.relative_path == "hash_run_animation_clip.glb"
+        assert clip.params == {"clip": "run", "mesh": pair.outputs[0]}
+        assert clip.mesh_stats.animations == {"run": 0.5}
+        mesh = next(a for a in repository.get_asset_record("otter", "hash_walk").artifacts if a.kind == "shared_mesh")
+        assert mesh.relative_path == pair.outputs[0]
+        assert mesh.params["sources"] == pair.sources
+        
+        assert extract_shared_meshes(repository, max_workers=1) == []
+    
+    def test_merged(self, repository):
+        groups = extract_shared_meshes(repository, merge=True, max_workers=1)
+        
+        pair = next(group for group in groups if len(group.sources) == 2)
+        assert len(pair.outputs) == 1
+        record = next(
+            a for a in repository.get_asset_record("otter", "hash_walk").artifacts
+            if a.kind == "animation_set"
+        )
+        assert record.params["clips"] == ["walk", "run"]
+        assert record.mesh_stats.animations == {"walk": 1.0, "run": 0.5}
+        assert extract_shared_meshes(repository, merge=True, max_workers=1) == []
+
+
+class TestMergeAnimations:
+    """Test one multi-clip GLB per rigged model"""
+    
+    def test_merges_clips_per_rig(self, test_repository):
+        add_animation_asset(test_repository, "hash_rig", "rigged", make_animation_glb("Rig", 2.0), service="rigging",
+                            task_id="rig_1")
+        add_animation_asset(test_repository, "hash_walk", "walk", make_animation_glb("Armature|Take", 1.0),
+                            model_id="rig_1", animation_id="1")
+        add_animation_asset(test_repository, "hash_attack", "attack", make_animation_glb("Armature|Take", 0.5),
+                            model_id="rig_1", animation_id="4")
+        add_animation_asset(test_repository, "hash_swim", "swim", make_animation_glb("Take", 0.8, spine="tail"),
+                            model_id="rig_1", animation_id="999999")
+        
+        sets = merge_animations(test_repository, max_workers=1)
+        
+        assert len(sets) == 1
+        animation_set = sets[0]
+        assert animation_set.path == "animations_rig_1.glb"
+        assert animation_set.clips == ["Attack", "Walking_Woman"]
+        assert list(animation_set.skipped) == ["hash_swim_animation.glb"]
+        records = [
+            artifact
+            for spec_hash in ("hash_attack", "hash_walk", "hash_swim")
+            for artifact in test_repository.get_asset_record("otter", spec_hash).artifacts
+            if artifact.kind == "animation_set"
+        ]
+        assert len(records) == 1
+        assert records[0].mesh_stats.animations == {"Attack": 0.5, "Walking_Woman": 1.0}
+        assert records[0].params["model_id"] == "rig_1"
+        
+        assert merge_animations(test_repository, max_workers=1) == []
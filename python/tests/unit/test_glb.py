@@ -0,0 +1,144 @@
+"""Unit tests for the zero-copy GLB inspector"""
+import struct
+from datetime import datetime
+from unittest.mock import Mock
+
+import pytest
+from mesh_toolkit.api.base_client import BaseHttpClient
+from mesh_toolkit.persistence.schemas import AssetManifest, TaskGraphEntry
+from mesh_toolkit.processing.glb import GlbError, GlbFile, build_glb, inspect_glb
+from mesh_toolkit.webhooks.handler import WebhookHandler
+from mesh_toolkit.webhooks.schemas import MeshyWebhookPayload
+
+
+def make_rigged_glb(interleaved=False):
+    """Quad with a 2-joint skin and a 1.5s clip; POSITION has no min/max"""
+    positions = [(-1.0, 0.0, -2.0), (1.0, 0.0, -2.0), (1.0, 3.0, 2.0), (-1.0, 3.0, 2.0)]
+    if interleaved:
+        # POSITION + 4 bytes padding per vertex (stride 16)
+        vertex_bytes = b"".join(struct.pack("<3f4x", *p) for p in positions)
+        position_view = {"buffer": 0, "byteOffset": 0, "byteLength": len(vertex_bytes), "byteStride": 16}
+    else:
+        vertex_bytes = b"".join(struct.pack("<3f", *p) for p in positions)
+        position_view = {"buffer": 0, "byteOffset": 0, "byteLength": len(vertex_bytes)}
+    index_bytes = struct.pack("<6H", 0, 1, 2, 0, 2, 3)
+    time_bytes = struct.pack("<3f", 0.0, 0.75, 1.5)
+    binary = vertex_bytes + index_bytes + time_bytes
+    
+    gltf = {
+        "asset": {"version": "2.0"},
+        "buffers": [{}],
+        "bufferViews": [
+            position_view,
+            {"buffer": 0, "byteOffset": len(vertex_bytes), "byteLength": len(index_bytes)},
+            {"buffer": 0, "byteOffset": len(vertex_bytes) + len(index_bytes), "byteLength": len(time_bytes)},
+        ],
+        "accessors": [
+            {"bufferView": 0, "componentType": 5126, "count": 4, "type": "VEC3"},
+            {"bufferView": 1, "componentType": 5123, "count": 6, "type": "SCALAR"},
+            {"bufferView": 2, "componentType": 5126, "count": 3, "type": "SCALAR"},
+        ],
+        "meshes": [{"primitives": [{"attributes": {"POSITION": 0}, "indices": 1, "material": 0}]}],
+        "materials": [{"name": "fur"}],
+        "images": [{"uri": "fur.png"}],
+        "textures": [{"source": 0}],
+        "nodes": [{"mesh": 0, "skin": 0}, {"name": "hips"}, {"name": "spine"}],
+        "skins": [{"joints": [1, 2]}],
+        "animations": [{
+            "name": "Walk",
+            "samplers": [{"input": 2, "output": 2}],
+            "channels": [{"sampler": 0, "target": {"node": 1, "path": "translation"}}],
+        }],
+    }
+    return build_glb(gltf, binary)
+
+
+class TestGlbFile:
+    """Test parsing, accessor views and statistics"""
+    
+    @pytest.mark.parametrize("interleaved", [False, True])
+    def test_stats(self, interleaved):
+        """Counts come from JSON; bounds and clip length fall back to the buffer"""
+        stats = inspect_glb(make_rigged_glb(interleaved))
+        
+        assert stats.triangle_count == 2
+        assert stats.vertex_count == 4
+        assert stats.mesh_count == stats.primitive_count == 1
+        assert stats.bounds_min == [-1.0, 0.0, -2.0]
+        assert stats.bounds_max == [1.0, 3.0, 2.0]
+        assert (stats.material_count, stats.texture_count, stats.image_count) == (1, 1, 1)
+        assert (stats.skin_count, stats.joint_count) == (1, 2)
+        assert stats.animations == {"Walk": 1.5}
+    
+    def test_mapped_views_do_not_copy(self, tmp_path):
+        """accessor_view points into the mmap; closing releases it"""
+        path = tmp_path / "quad.glb"
+        path.write_bytes(make_rigged_glb())
+        
+        with GlbFile.open(path) as glb:
+            view = glb.accessor_view(1)
+            assert view.obj is glb.buffer.obj
+            assert struct.unpack("<6H", view) == (0, 1, 2, 0, 2, 3)
+            assert inspect_glb(path).triangle_count == 2
+        
+        with pytest.raises(ValueError):
+            view.tobytes()  # released with the file
+    
+    @pytest.mark.parametrize("data,message", [
+        (b"", "empty"),
+        (b"\x89PNG" + b"\0" * 20, "Not a GLB"),
+        (struct.pack("<4sII", b"glTF", 2, 4096), "truncated"),
+    ])
+    def test_rejects_malformed_files(self, tmp_path, data, message):
+        path = tmp_path / "bad.glb"
+        path.write_bytes(data)
+        with pytest.raises(GlbError, match=message):
+            inspect_glb(path)
+    
+    def test_accessor_past_end_of_buffer(self):
+        data = make_rigged_glb()
+        with GlbFile(data) as glb:
+            glb.json["accessors"][1]["count"] = 600
+            with pytest.raises(GlbError, match="past the end"):
+                glb.accessor_view(1)
+
+
+class TestHandlerMeshStats:
+    """Downloaded GLBs are inspected into ArtifactRecord.mesh_stats"""
+    
+    def test_webhook_download_records_stats(self, test_repository):
+        test_repository.upsert_asset_record("otter", AssetManifest(
+            asset_spec_hash="hash_otter",
+            spec_fingerprint="{}",
+            species="otter",
+            asset_intent="creature",
+            task_graph=[TaskGraphEntry(
+                task_id="task_rig",
+                service="rigging",
+                status="IN_PROGRESS",
+                created_at=datetime.utcnow(),
+                updated_at=datetime.utcnow()
+            )]
+        ))
+        glb = make_rigged_glb()
+        
+        def download_file(url, output_path):
+            with open(output_path, "wb") as f:
+                f.write(glb)
+            return len(glb)
+        
+        client = Mock(spec=BaseHttpClient)
+        client.download_file.side_effect = download_file
+        handler = WebhookHandler(repository=test_repository, client=client)
+        
+        result = handler.handle_webhook(MeshyWebhookPayload(
+            id="task_rig",
+            status="SUCCEEDED",
+            created_at=0,
+            result={"rigged_character_glb_url": "https://assets.meshy.ai/rig.glb"}
+        ))
+        
+        assert result["artifacts_downloaded"] == 1
+        artifact = test_repository.get_asset_record("otter", "hash_otter").artifacts[0]
+        assert artifact.mesh_stats.triangle_count == 2
+        assert artifact.mesh_stats.animations == {"Walk": 1.5}
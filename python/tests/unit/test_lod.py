@@ -0,0 +1,93 @@
+"""Unit tests for vectorized LOD generation"""
+import struct
+
+import pytest
+from mesh_toolkit.processing.arrays import accessor_array
+from mesh_toolkit.processing.glb import GlbBuilder, GlbFile, inspect_glb
+from mesh_toolkit.processing.lod import build_lod, generate_lods, simplify
+
+from tests.conftest import make_grid_glb, seed_artifact
+
+np = pytest.importorskip("numpy")
+
+
+def make_lod_grid(size=24):
+    """Grid with normals, UVs and a one-joint skin"""
+    return make_grid_glb(size, normal=(0, 1, 0), uvs=True, skinned=True)
+
+
+class TestSimplify:
+    """Test clustering and LOD building"""
+    
+    def test_simplify_respects_target(self):
+        with GlbFile(make_lod_grid()) as glb:
+            positions = accessor_array(glb, 0)
+            triangles = accessor_array(glb, 5).reshape(-1, 3).astype(np.int64)
+            cluster, collapsed, count = simplify(positions, triangles, 200)
+        
+        assert 100 < len(collapsed) <= 200
+        assert count < len(positions) and cluster.max() == count - 1
+    
+    @pytest.mark.parametrize("ratio", [0.5, 0.2])
+    def test_build_lod_keeps_attributes_and_skin(self, ratio):
+        """Output fits the ratio and keeps every attribute, normals unit length"""
+        with GlbFile(make_lod_grid()) as glb:
+            data, before, after = build_lod(glb, ratio)
+        
+        assert before == 24 * 24 * 2
+        assert 0 < after <= before * ratio
+        
+        with GlbFile(data) as lod:
+            primitive = lod.json["meshes"][0]["primitives"][0]
+            assert set(primitive["attributes"]) == {"POSITION", "NORMAL", "TEXCOORD_0", "JOINTS_0", "WEIGHTS_0"}
+            assert lod.json["skins"] == [{"joints": [1]}]
+            assert len(lod.json["accessors"]) == 6
+            normals = accessor_array(lod, primitive["attributes"]["NORMAL"])
+            assert np.allclose(np.linalg.norm(normals, axis=1), 1.0)
+            assert accessor_array(lod, primitive["indices"]).max() < lod.stats().vertex_count
+        
+        stats = inspect_glb(data)
+        assert stats.triangle_count == after
+        assert 0.0 <= stats.bounds_min[0] < stats.bounds_max[0] <= 1.0
+
+
+class TestGlbBuilder:
+    """Test pruning and repacking"""
+    
+    def test_replaced_accessors_are_pruned(self):
+        """Replacing an attribute drops the old accessor and its bufferView"""
+        with GlbFile(make_lod_grid(2)) as glb:
+            builder = GlbBuilder.from_glb(glb)
+            primitive = builder.gltf["meshes"][0]["primitives"][0]
+            del primitive["attributes"]["TEXCOORD_0"]
+            primitive["attributes"]["NORMAL"] = builder.add_accessor(
+                struct.pack("<3f", 0, 1, 0) * 9, 5126, "VEC3", 9
+            )
+            data = builder.build()
+        
+        with GlbFile(data) as rebuilt:
+            assert len(rebuilt.json["accessors"]) == len(rebuilt.json["bufferViews"]) == 5
+            attributes = rebuilt.json["meshes"][0]["primitives"][0]["attributes"]
+            assert accessor_array(rebuilt, attributes["NORMAL"]).tolist()[0] == [0, 1, 0]
+            assert all(view["byteOffset"] % 4 == 0 for view in rebuilt.json["bufferViews"])
+            assert rebuilt.stats().triangle_count == 8
+
+
+class TestGenerateLods:
+    """Test LOD registration in the repository"""
+    
+    def test_registers_lods_once(self, test_repository):
+        seed_artifact(test_repository, "otter.glb", make_lod_grid())
+        
+        results = generate_lods(test_repository, ratios=(1.0, 0.5, 0.2), max_workers=1)
+        
+        artifacts = test_repository.get_asset_record("otter", "hash_otter").artifacts
+        lods = [a for a in artifacts if a.kind == "lod"]
+        assert [a.relative_path for a in lods] == ["otter_lod1.glb", "otter_lod2.glb"]
+        assert [a.params["ratio"] for a in lods] == [0.5, 0.2]
+        assert all(a.derived_from == "otter.glb" for a in lods)
+        assert lods[1].mesh_stats.triangle_count < lods[0].mesh_stats.triangle_count
+        assert (test_repository.base_path / "otter" / "otter_lod2.glb").exists()
+        assert len(results["otter.glb"]) == 2
+        
+        assert generate_lods(test_repository, ratios=(1.0, 0.5, 0.2), max_workers=1) == {}
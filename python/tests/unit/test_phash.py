@@ -0,0 +1,166 @@
+"""Unit tests for perceptual hashing and near-duplicate queries"""
+import random
+from datetime import datetime, timedelta
+from io import BytesIO
+from unittest.mock import Mock
+
+import pytest
+from mesh_toolkit.api.base_client import BaseHttpClient
+from mesh_toolkit.persistence.schemas import ArtifactRecord, AssetManifest, TaskGraphEntry
+from mesh_toolkit.persistence.similarity import BKTree, hamming_distance
+from mesh_toolkit.processing.phash import dhash, image_hashes, phash
+from mesh_toolkit.webhooks.handler import WebhookHandler
+from mesh_toolkit.webhooks.schemas import MeshyWebhookPayload
+
+np = pytest.importorskip("numpy")
+Image = pytest.importorskip("PIL.Image")
+
+
+def render(center=(0.5, 0.45), radius=0.3, size=256, tint=0, fmt="PNG"):
+    """A shaded disc on a gradient background, encoded as an image file"""
+    ys, xs = np.mgrid[0:size, 0:size] / size
+    background = 200 - 80 * ys
+    disc = (xs - center[0]) ** 2 + (ys - center[1]) ** 2 < radius ** 2
+    gray = np.where(disc, 60 + 120 * xs, background) + tint
+    rgb = np.clip(np.stack([gray, gray * 0.9, gray * 0.8], axis=-1), 0, 255).astype(np.uint8)
+    buffer = BytesIO()
+    Image.fromarray(rgb).save(buffer, fmt)
+    return buffer.getvalue()
+
+
+class TestHashes:
+    """Test that hashes survive re-encoding but separate different renders"""
+    
+    @pytest.mark.parametrize("hash_function", [dhash, phash])
+    def test_near_duplicates_are_close(self, hash_function):
+        original = hash_function(render())
+        variants = [render(fmt="JPEG"), render(tint=12), render(center=(0.51, 0.45))]
+        different = hash_function(render(center=(0.3, 0.7), radius=0.15))
+        
+        assert len(original) == 16
+        assert all(hamming_distance(original, hash_function(v)) <= 6 for v in variants)
+        assert hamming_distance(original, different) > 12
+    
+    def test_image_hashes_of_file(self, tmp_path):
+        path = tmp_path / "thumb.png"
+        path.write_bytes(render())
+        assert image_hashes(path) == {"dhash": dhash(render()), "phash": phash(render())}
+
+
+class TestBKTree:
+    """Test radius queries against brute force"""
+    
+    def test_search_matches_brute_force(self):
+        rng = random.Random(3)
+        keys = [rng.getrandbits(64) for _ in range(300)]
+        # Plant some near neighbours of the first key
+        keys += [keys[0] ^ (1 << rng.randrange(64)) ^ (1 << rng.randrange(64)) for _ in range(5)]
+        tree = BKTree()
+        for i, key in enumerate(keys):
+            tree.add(key, i)
+        
+        for query in keys[:20]:
+            expected = sorted(i for i, key in enumerate(keys) if hamming_distance(query, key) <= 10)
+            found = tree.search(f"{query:016x}", 10)
+            assert sorted(i for _, i in found) == expected
+            assert [d for d, _ in found] == sorted(d for d, _ in found)
+        assert len(tree) == len(keys)
+
+
+def hashed_thumbnail(name, data):
+    return ArtifactRecord(
+        relative_path=name,
+        sha256_hash="0" * 64,
+        file_size_bytes=len(data),
+        downloaded_at=datetime.utcnow(),
+        kind="thumbnail",
+        image_hashes=image_hashes(data)
+    )
+
+
+class TestRepositoryQueries:
+    """Test near-duplicate clustering across a species"""
+    
+    def test_clusters_across_assets(self, test_repository):
+        renders = {
+            "a_thumb.png": render(),
+            "b_thumb.png": render(fmt="JPEG"),
+            "c_thumb.png": render(tint=10),
+            "d_thumb.png": render(center=(0.3, 0.7), radius=0.15),
+        }
+        for i, (name, data) in enumerate(renders.items()):
+            test_repository.upsert_asset_record("otter", AssetManifest(
+                asset_spec_hash=f"hash_{i}",
+                spec_fingerprint="{}",
+                species="otter",
+                asset_intent="creature",
+                artifacts=[hashed_thumbnail(name, data)]
+            ))
+        
+        clusters = test_repository.find_near_duplicates("otter")
+        
+        assert len(clusters) == 1
+        assert sorted(artifact.relative_path for _, artifact in clusters[0]) == \
+            ["a_thumb.png", "b_thumb.png", "c_thumb.png"]
+        query = phash(render(center=(0.31, 0.7), radius=0.15))
+        similar = test_repository.find_similar_images("otter", query, max_distance=6)
+        assert [(spec_hash, artifact.relative_path) for _, spec_hash, artifact in similar] == \
+            [("hash_3", "d_thumb.png")]
+    
+    def test_duplicate_records_of_one_file_are_not_a_cluster(self, test_repository):
+        """A thumbnail recorded twice by a redelivered webhook is indexed once"""
+        older = hashed_thumbnail("a_thumb.png", render())
+        newer = older.model_copy(update={"downloaded_at": older.downloaded_at + timedelta(minutes=5)})
+        test_repository.upsert_asset_record("otter", AssetManifest(
+            asset_spec_hash="hash_0",
+            spec_fingerprint="{}",
+            species="otter",
+            asset_intent="creature",
+            artifacts=[older, newer]
+        ))
+        
+        assert test_repository.find_near_duplicates("otter") == []
+        similar = test_repository.find_similar_images("otter", older.image_hashes["phash"], max_distance=0)
+        assert [artifact.downloaded_at for _, _, artifact in similar] == [newer.downloaded_at]
+
+
+class TestHandlerThumbnails:
+    """Thumbnails are downloaded and hashed with the model"""
+    
+    def test_webhook_records_thumbnail_hashes(self, test_repository):
+        test_repository.upsert_asset_record("otter", AssetManifest(
+            asset_spec_hash="hash_otter",
+            spec_fingerprint="{}",
+            species="otter",
+            asset_intent="creature",
+            task_graph=[TaskGraphEntry(
+                task_id="task_preview",
+                service="text3d",
+                status="IN_PROGRESS",
+                created_at=datetime.utcnow(),
+                updated_at=datetime.utcnow()
+            )]
+        ))
+        thumbnail = render()
+        
+        def download_file(url, output_path):
+            with open(output_path, "wb") as f:
+                f.write(thumbnail)
+            return len(thumbnail)
+        
+        client = Mock(spec=BaseHttpClient)
+        client.download_file.side_effect = download_file
+        handler = WebhookHandler(repository=test_repository, client=client)
+        
+        result = handler.handle_webhook(MeshyWebhookPayload(
+            id="task_preview",
+            status="SUCCEEDED",
+            created_at=0,
+            thumbnail_url="https://assets.meshy.ai/preview.png"
+        ))
+        
+        assert result["artifacts_downloaded"] == 1
+        artifact = test_repository.get_asset_record("otter", "hash_otter").artifacts[0]
+        assert artifact.relative_path == "hash_otter_text3d_thumb.png"
+        assert artifact.kind == "thumbnail"
+        assert artifact.image_hashes == image_hashes(thumbnail)
@@ -0,0 +1,141 @@
+"""Unit tests for the post-processing stage pipeline"""
+import time
+from dataclasses import replace
+from datetime import datetime
+from unittest.mock import Mock
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from mesh_toolkit.api.base_client import BaseHttpClient
+from mesh_toolkit.persistence.events import SocketEventBridge
+from mesh_toolkit.persistence.repository import TaskRepository
+from mesh_toolkit.persistence.schemas import AssetManifest, TaskGraphEntry
+from mesh_toolkit.processing.lod import LOD_STAGE
+from mesh_toolkit.processing.pipeline import PostProcessingPipeline, default_stages
+from mesh_toolkit.webhooks.handler import WebhookHandler
+from mesh_toolkit.webhooks.schemas import MeshyWebhookPayload
+
+from tests.conftest import make_grid_glb, seed_artifact
+
+
+@pytest.fixture
+def repository(test_repository):
+    seed_artifact(test_repository, "otter.glb", make_grid_glb(wave=0.1))
+    return test_repository
+
+
+def kinds(repository):
+    return sorted(a.kind for a in repository.get_asset_record("otter", "hash_otter").artifacts)
+
+
+class TestPostProcessingPipeline:
+    """Test stage chaining and caching"""
+    
+    def test_stages_chain_and_cache(self, repository):
+        with PostProcessingPipeline(repository, default_stages(), max_workers=1) as pipeline:
+            runs = pipeline.run()
+            
+            assert [(run.stage, run.source) for run in runs] == [
+                ("lod", "otter.glb"),
+                ("quantized", "otter.glb"),
+                ("quantized", "otter_lod1.glb"),
+                ("quantized", "otter_lod2.glb"),
+            ]
+            assert kinds(repository) == ["download", "lod", "lod", "quantized", "quantized", "quantized"]
+            quantized = {a.derived_from: a for a in repository.get_asset_record("otter", "hash_otter").artifacts
+                         if a.kind == "quantized"}
+            assert quantized["otter_lod1.glb"].relative_path == "otter_lod1_q.glb"
+            assert len(quantized["otter.glb"].params["cache_key"]) == 16
+            
+            assert pipeline.run() == []
+            
+            # A new download re-runs what depends on it; identical LODs stay cached
+            source = repository.get_asset_record("otter", "hash_otter").artifacts[0]
+            redownload = source.model_copy(update={"sha256_hash": "1" * 64})
+            repository.record_artifacts("otter", "hash_otter", [redownload])
+            runs = pipeline.run()
+            assert [(run.stage, run.source) for run in runs] == [("lod", "otter.glb"), ("quantized", "otter.glb")]
+    
+    def test_version_and_options_invalidate(self, repository):
+        with PostProcessingPipeline(repository, [LOD_STAGE], max_workers=1) as pipeline:
+            pipeline.run()
+        
+        for stage in (LOD_STAGE, replace(LOD_STAGE, version=2), replace(LOD_STAGE, options={"ratios": (1.0, 0.5)})):
+            with PostProcessingPipeline(repository, [stage], max_workers=1) as pipeline:
+                assert len(pipeline.run()) == (0 if stage is LOD_STAGE else 1)
+        # Fewer levels drop the stale one
+        assert kinds(repository) == ["download", "lod"]
+    
+    def test_watch_processes_succeeded_tasks(self, repository):
+        asset = repository.get_asset_record("otter", "hash_otter")
+        asset.task_graph = [TaskGraphEntry(
+            task_id="task_mesh",
+            service="text3d",
+            status="IN_PROGRESS",
+            created_at=datetime.utcnow(),
+            updated_at=datetime.utcnow()
+        )]
+        repository.upsert_asset_record("otter", asset)
+        
+        with PostProcessingPipeline(repository, [LOD_STAGE], max_workers=1) as pipeline:
+            stop = pipeline.watch()
+            assert kinds(repository) == ["download"]
+            repository.record_task_update(
+                species="otter",
+                spec_hash="hash_otter",
+                task_id="task_mesh",
+                status="SUCCEEDED",
+                source="webhook"
+            )
+            stop()
+        
+        assert kinds(repository) == ["download", "lod", "lod"]
+    
+    def test_watch_receives_events_forwarded_from_another_process(self, test_repository):
+        """Webhook host forwards over UDP; a separate repository's watcher runs the stages"""
+        test_repository.upsert_asset_record("otter", AssetManifest(
+            asset_spec_hash="hash_otter",
+            spec_fingerprint="{}",
+            species="otter",
+            asset_intent="creature",
+            task_graph=[TaskGraphEntry(
+                task_id="task_mesh",
+                service="text3d",
+                status="IN_PROGRESS",
+                created_at=datetime.utcnow(),
+                updated_at=datetime.utcnow()
+            )]
+        ))
+        data = make_grid_glb(wave=0.1)
+        
+        def download_file(url, output_path):
+            with open(output_path, "wb") as f:
+                f.write(data)
+            return len(data)
+        
+        client = Mock(spec=BaseHttpClient)
+        client.download_file.side_effect = download_file
+        handler = WebhookHandler(repository=test_repository, client=client)
+        # The watcher only shares the manifests on disk with the webhook host
+        watcher_repository = TaskRepository(base_path=str(test_repository.base_path))
+        
+        with SocketEventBridge(watcher_repository.events, listen=("127.0.0.1", 0)) as listener, \
+                SocketEventBridge(test_repository.events, peers=[listener.address]), \
+                PostProcessingPipeline(watcher_repository, [LOD_STAGE], max_workers=1) as pipeline:
+            stop = pipeline.watch()
+            handler.handle_webhook(MeshyWebhookPayload(
+                id="task_mesh",
+                status="SUCCEEDED",
+                created_at=0,
+                model_urls={"glb": "https://assets.meshy.ai/model.glb"}
+            ))
+            deadline = time.monotonic() + 30
+            while kinds(test_repository) != ["download", "lod", "lod"] and time.monotonic() < deadline:
+                time.sleep(0.05)
+            stop()
+        
+        assert kinds(test_repository) == ["download", "lod", "lod"]
+        lods = [a for a in test_repository.get_asset_record("otter", "hash_otter").artifacts if a.kind == "lod"]
+        assert {a.derived_from for a in lods} == {"hash_otter_text3d.glb"}
@@ -0,0 +1,267 @@
+"""Unit tests for the pipeline DAG executor"""
+import itertools
+import time
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+
+import httpx
+import pytest
+from mesh_toolkit.api.base_client import BaseHttpClient
+from mesh_toolkit.services.factory import ServiceFactory
+from mesh_toolkit.webhooks.handler import WebhookHandler
+from mesh_toolkit.webhooks.reconciler import ReconciliationWorker
+from mesh_toolkit.workflows import AssetPipelineSpec, PipelineExecutor, PipelineRun
+
+
+def _wait_until(predicate, timeout=2.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return
+        time.sleep(0.01)
+    raise AssertionError("Condition not reached")
+
+
+@pytest.fixture
+def mock_client():
+    """Client that returns a fresh task ID for every submission"""
+    client = Mock(spec=BaseHttpClient)
+    counter = itertools.count()
+    
+    def request(method, endpoint, api_version="v2", **kwargs):
+        response = Mock(spec=httpx.Response)
+        response.json.return_value = {"result": f"task_{next(counter)}"}
+        return response
+    
+    client.request.side_effect = request
+    return client
+
+
+@pytest.fixture
+def factory(test_repository, mock_client):
+    """ServiceFactory wired to the mock client and temp repository"""
+    factory = ServiceFactory(api_key="test-key", webhook_base_url="https://hooks.test/meshy")
+    factory._client = mock_client
+    factory._repository = test_repository
+    return factory
+
+
+class TestPipelineExecutor:
+    """Test stage ordering, limits and failure propagation"""
+    
+    @pytest.fixture
+    def spec(self):
+        return AssetPipelineSpec(
+            species="otter",
+            prompt="an otter",
+            animations={"walk": "1", "attack": "4"},
+            retexture_prompt="winter fur"
+        )
+    
+    def _complete(self, executor, run, stage_name, status="SUCCEEDED"):
+        """Simulate the webhook for a stage landing in the repository"""
+        stage = run.stages[stage_name]
+        _wait_until(lambda: stage.task_id is not None)
+        executor.repository.record_task_update(
+            run.spec.species, stage.spec_hash, stage.task_id, status, source="webhook"
+        )
+    
+    def _states(self, run):
+        return {name: stage.state for name, stage in run.stages.items()}
+    
+    def test_animations_require_rigging(self):
+        """Animations on an unrigged pipeline are rejected rather than dropped"""
+        spec = AssetPipelineSpec(species="otter", prompt="an otter", animations={"walk": "1"}, rig=False)
+        with pytest.raises(ValueError, match="rig=False"):
+            PipelineRun.from_spec(spec)
+    
+    def test_stages_launch_when_parents_succeed(self, factory, spec):
+        """Children are submitted only after their parents succeed"""
+        with PipelineExecutor(factory) as executor:
+            run = executor.start(spec)
+            _wait_until(lambda: run.stages["text3d"].task_id)
+            assert self._states(run)["refine"] == "WAITING"
+            
+            self._complete(executor, run, "text3d")
+            self._complete(executor, run, "refine")
+            
+            # Rigging and retexture both only need the refined model
+            _wait_until(lambda: run.stages["retexture"].task_id and run.stages["rigging"].task_id)
+            assert run.stages["animation:walk"].state == "WAITING"
+            
+            self._complete(executor, run, "rigging")
+            for name in ("animation:walk", "animation:attack", "retexture"):
+                self._complete(executor, run, name)
+            
+            runs = executor.wait(timeout=2)
+        
+        assert runs[0].succeeded
+        rigging_call = next(c for c in factory.client.request.call_args_list if c.args[1] == "rigging")
+        rigging_payload = rigging_call.kwargs["json"]
+        assert rigging_payload["model_id"] == run.stages["refine"].task_id
+        assert rigging_payload["callback_url"] == "https://hooks.test/meshy/otter/rigged"
+    
+    def test_stage_limits_cap_in_flight_tasks(self, factory):
+        """No more than the stage limit is submitted at once"""
+        with PipelineExecutor(factory, stage_limits={"text3d": 2}) as executor:
+            runs = [
+                executor.start(AssetPipelineSpec(species=f"sp{i}", prompt="p", refine=False, rig=False))
+                for i in range(3)
+            ]
+            _wait_until(lambda: sum(r.stages["text3d"].task_id is not None for r in runs) == 2)
+            time.sleep(0.05)
+            assert runs[2].stages["text3d"].state == "READY"
+            
+            self._complete(executor, runs[0], "text3d")
+            _wait_until(lambda: runs[2].stages["text3d"].task_id is not None)
+    
+    def test_failure_skips_descendants_only(self, factory, spec):
+        """A failed stage skips its subtree but siblings keep running"""
+        with PipelineExecutor(factory) as executor:
+            run = executor.start(spec)
+            self._complete(executor, run, "text3d")
+            self._complete(executor, run, "refine")
+            self._complete(executor, run, "rigging", status="FAILED")
+            self._complete(executor, run, "retexture")
+            
+            executor.wait(timeout=2)
+        
+        states = self._states(run)
+        assert states["rigging"] == "FAILED"
+        assert states["animation:walk"] == "SKIPPED"
+        assert states["retexture"] == "SUCCEEDED"
+        assert not run.succeeded
+    
+    def test_submission_error_fails_stage(self, factory, mock_client):
+        """HTTP errors during submission fail the stage instead of hanging"""
+        mock_client.request.side_effect = httpx.ConnectError("down")
+        
+        with PipelineExecutor(factory) as executor:
+            run = executor.start(AssetPipelineSpec(species="otter", prompt="p"))
+            executor.wait(timeout=2)
+        
+        assert run.stages["text3d"].state == "FAILED"
+        assert "Submission failed" in run.stages["text3d"].error
+        assert run.stages["refine"].state == "SKIPPED"
+    
+    def test_cached_text3d_is_shared_between_pipelines(self, factory, mock_client):
+        """Pipelines reusing one cached Text3D task both advance on its webhook"""
+        with PipelineExecutor(factory) as executor:
+            walk = executor.start(AssetPipelineSpec(species="otter", prompt="p", animations={"walk": "1"}))
+            _wait_until(lambda: walk.stages["text3d"].task_id)
+            swim = executor.start(AssetPipelineSpec(species="otter", prompt="p", animations={"swim": "2"}))
+            _wait_until(lambda: swim.stages["text3d"].task_id)
+            
+            assert swim.stages["text3d"].task_id == walk.stages["text3d"].task_id
+            self._complete(executor, walk, "text3d")
+            _wait_until(lambda: walk.stages["refine"].task_id and swim.stages["refine"].task_id)
+        
+        endpoints = [call.args[1] for call in mock_client.request.call_args_list]
+        assert endpoints.count("text-to-3d") == 1
+    
+    def test_poll_once_advances_pipeline(self, factory, mock_client):
+        """Without webhooks, polling through the reconciler drives stages"""
+        poller = ReconciliationWorker(
+            repository=factory.repository,
+            client=mock_client,
+            handler=WebhookHandler(repository=factory.repository, download_artifacts=False)
+        )
+        
+        with PipelineExecutor(factory, poller=poller) as executor:
+            run = executor.start(AssetPipelineSpec(species="otter", prompt="p", refine=False, rig=False))
+            _wait_until(lambda: run.stages["text3d"].task_id)
+            
+            task_id = run.stages["text3d"].task_id
+            mock_client.request.side_effect = None
+            mock_client.request.return_value.json.return_value = {
+                "id": task_id, "status": "SUCCEEDED", "progress": 100, "created_at": 1700000000
+            }
+            results = executor.poll_once()
+        
+        assert results[0]["status"] == "success"
+        assert run.stages["text3d"].state == "SUCCEEDED"
+
+
+class TestPipelineResume:
+    """Test checkpointing into resume_tokens and crash recovery"""
+    
+    @pytest.fixture
+    def spec(self):
+        return AssetPipelineSpec(species="otter", prompt="an otter", animations={"walk": "1"})
+    
+    def _complete(self, repository, run, stage_name, status="SUCCEEDED"):
+        stage = run.stages[stage_name]
+        _wait_until(lambda: stage.task_id is not None)
+        repository.record_task_update(run.spec.species, stage.spec_hash, stage.task_id, status)
+    
+    def _submitted_endpoints(self, client):
+        return [call.args[1] for call in client.request.call_args_list]
+    
+    def test_progress_is_checkpointed(self, factory, spec):
+        """Stage states and task IDs land in the pipeline's resume token"""
+        with PipelineExecutor(factory) as executor:
+            run = executor.start(spec)
+            self._complete(factory.repository, run, "text3d")
+            _wait_until(lambda: run.stages["refine"].task_id)
+        
+        asset = factory.repository.get_asset_record("otter", spec.pipeline_id)
+        token = asset.resume_tokens["pipeline"]
+        
+        assert asset.spec_fingerprint == spec.fingerprint
+        assert token["spec"]["prompt"] == "an otter"
+        assert token["stages"]["text3d"]["state"] == "SUCCEEDED"
+        assert token["stages"]["refine"]["task_id"] == run.stages["refine"].task_id
+    
+    def test_restart_continues_without_resubmitting(self, factory, spec, mock_client):
+        """Tasks finished while the process was down advance the resumed run"""
+        with PipelineExecutor(factory) as executor:
+            first = executor.start(spec)
+            self._complete(factory.repository, first, "text3d")
+            _wait_until(lambda: first.stages["refine"].task_id)
+        
+        # Process is gone; the refine webhook still lands in the manifest
+        self._complete(factory.repository, first, "refine")
+        
+        with PipelineExecutor(factory) as executor:
+            run = executor.start(spec)
+            _wait_until(lambda: run.stages["rigging"].task_id)
+        
+        assert run.stages["refine"].state == "SUCCEEDED"
+        assert run.stages["refine"].task_id == first.stages["refine"].task_id
+        assert self._submitted_endpoints(mock_client).count("text-to-3d") == 1
+        assert self._submitted_endpoints(mock_client).count("rigging") == 1
+    
+    def test_resume_adopts_task_from_interrupted_submit(self, factory, spec, mock_client):
+        """A crash between the API call and the checkpoint doesn't duplicate the task"""
+        run = PipelineRun.from_spec(spec)
+        run.stages["text3d"].state = "SUBMITTED"
+        run.stages["text3d"].submitting_since = (datetime.utcnow() - timedelta(seconds=1)).isoformat()
+        factory.repository.set_resume_token("otter", spec.pipeline_id, "pipeline", run.to_token())
+        
+        # The submission reached Meshy and was recorded before the crash
+        submission = factory.text3d().submit_task(
+            species="otter",
+            prompt="an otter",
+            callback_url=factory.webhook_url("otter", "static")
+        )
+        
+        with PipelineExecutor(factory) as executor:
+            resumed = executor.resume()
+        
+        assert len(resumed) == 1
+        assert resumed[0].stages["text3d"].task_id == submission.task_id
+        assert resumed[0].stages["text3d"].state == "SUBMITTED"
+        assert mock_client.request.call_count == 1
+    
+    def test_resume_resubmits_when_crash_preceded_api_call(self, factory, spec, mock_client):
+        """Without a recorded task the interrupted stage is submitted again"""
+        run = PipelineRun.from_spec(spec)
+        run.stages["text3d"].state = "SUBMITTED"
+        run.stages["text3d"].submitting_since = datetime.utcnow().isoformat()
+        factory.repository.set_resume_token("otter", spec.pipeline_id, "pipeline", run.to_token())
+        
+        with PipelineExecutor(factory) as executor:
+            resumed = executor.resume()
+            _wait_until(lambda: resumed[0].stages["text3d"].task_id)
+        
+        assert mock_client.request.call_count == 1
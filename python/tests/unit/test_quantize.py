@@ -0,0 +1,112 @@
+"""Unit tests for KHR_mesh_quantization rewriting"""
+import pytest
+from mesh_toolkit.processing.arrays import accessor_array
+from mesh_toolkit.processing.glb import GlbFile
+from mesh_toolkit.processing.quantize import (
+    EXTENSION,
+    cache_misses,
+    optimize_indices,
+    quantize_artifacts,
+    quantize_glb,
+)
+
+from tests.conftest import grid_mesh, make_grid_glb, seed_artifact
+
+np = pytest.importorskip("numpy")
+
+
+def make_glb(skinned=False):
+    """Curved grid away from the origin with shuffled uint32 indices"""
+    return make_grid_glb(
+        wave=0.5, shuffle=True, normal=(0, 0.6, 0.8), uvs=True, skinned=skinned,
+        index_type="uint32", translation=(0, 1, 0)
+    )
+
+
+def world_triangles(glb):
+    """Sorted (T, 3, 3) dequantized triangle corners in the mesh node's parent space"""
+    mesh_node = next(node for node in glb.json["nodes"] if "mesh" in node)
+    primitive = glb.json["meshes"][0]["primitives"][0]
+    accessor = glb.json["accessors"][primitive["attributes"]["POSITION"]]
+    positions = accessor_array(glb, primitive["attributes"]["POSITION"]).astype(np.float64)
+    if accessor["componentType"] == 5122:
+        positions = positions / 32767 * mesh_node["scale"][0] + mesh_node["translation"]
+    triangles = accessor_array(glb, primitive["indices"]).reshape(-1, 3)
+    # Order vertices within each triangle, then triangles; quantization is
+    # monotonic per axis, so the order survives it
+    return np.array(sorted(sorted(map(tuple, corners)) for corners in positions[triangles]))
+
+
+class TestOptimizeIndices:
+    """Test triangle and vertex reordering"""
+    
+    def test_reorder_keeps_triangles_and_cuts_cache_misses(self):
+        positions, triangles = grid_mesh(wave=0.5, shuffle=True)
+        
+        reordered, vertex_order = optimize_indices(positions, triangles)
+        
+        assert sorted(map(tuple, np.sort(vertex_order[reordered], axis=1))) == \
+            sorted(map(tuple, np.sort(triangles, axis=1)))
+        assert cache_misses(reordered) < cache_misses(triangles) * 0.6
+        # Vertices are numbered in order of first use
+        _, first_use = np.unique(reordered.reshape(-1), return_index=True)
+        assert np.all(np.diff(first_use) > 0)
+
+
+class TestQuantizeGlb:
+    """Test attribute encodings and node transforms"""
+    
+    def test_static_mesh_is_fully_quantized(self):
+        source = make_glb()
+        with GlbFile(source) as glb:
+            data, report = quantize_glb(glb)
+            original = world_triangles(glb)
+        
+        with GlbFile(data) as quantized:
+            gltf = quantized.json
+            attributes = gltf["meshes"][0]["primitives"][0]["attributes"]
+            types = {name: (gltf["accessors"][i]["componentType"], gltf["accessors"][i].get("normalized"))
+                     for name, i in attributes.items()}
+            assert types == {"POSITION": (5122, True), "NORMAL": (5120, True), "TEXCOORD_0": (5123, True)}
+            assert EXTENSION in gltf["extensionsRequired"]
+            # Parent keeps its transform; the mesh moved to a dequantizing child
+            assert gltf["nodes"][0] == {"translation": [0, 1, 0], "children": [1]}
+            assert np.allclose(world_triangles(quantized), original, atol=1e-3)
+            normal = accessor_array(quantized, attributes["NORMAL"])[0] / 127
+            assert np.allclose(normal, [0, 0.6, 0.8], atol=0.01)
+            assert quantized.stats().bounds_min is None
+        
+        assert report.bytes_after < report.bytes_before * 0.6
+        assert report.attribute_bytes["POSITION"][1] * 2 == report.attribute_bytes["POSITION"][0]
+        assert report.attribute_bytes["indices"][1] * 2 == report.attribute_bytes["indices"][0]
+        assert report.acmr_after < report.acmr_before
+        assert report.float_position_meshes == 0
+    
+    def test_skinned_mesh_keeps_float_positions(self):
+        with GlbFile(make_glb(skinned=True)) as glb:
+            data, report = quantize_glb(glb)
+        
+        with GlbFile(data) as quantized:
+            gltf = quantized.json
+            attributes = gltf["meshes"][0]["primitives"][0]["attributes"]
+            assert gltf["accessors"][attributes["POSITION"]]["componentType"] == 5126
+            assert gltf["accessors"][attributes["NORMAL"]]["componentType"] == 5120
+            assert gltf["nodes"][0]["mesh"] == 0 and gltf["nodes"][0]["skin"] == 0
+            bounds_min = quantized.stats().bounds_min
+            assert (bounds_min[0], bounds_min[2]) == (0.0, 0.0)
+        assert report.float_position_meshes == 1
+
+
+class TestQuantizeArtifacts:
+    """Test registration of quantized artifacts"""
+    
+    def test_records_report_once(self, test_repository):
+        seed_artifact(test_repository, "otter.glb", make_glb())
+        
+        reports = quantize_artifacts(test_repository, max_workers=1)
+        
+        record = test_repository.get_asset_record("otter", "hash_otter").artifacts[-1]
+        assert record.kind == "quantized" and record.relative_path == "otter_q.glb"
+        assert record.derived_from == "otter.glb"
+        assert record.params["bytes_after"] == reports["otter.glb"].bytes_after == record.file_size_bytes
+        assert quantize_artifacts(test_repository, max_workers=1) == {}
@@ -0,0 +1,45 @@
+"""Unit tests for the token bucket RateLimiter"""
+import pytest
+from mesh_toolkit.api.rate_limiter import RateLimiter
+
+
+class TestRateLimiter:
+    """Test token refill, bursts and timeouts"""
+    
+    def test_burst_then_steady_rate(self, clock):
+        """Up to burst requests go through at once, then one per 1/rate seconds"""
+        limiter = RateLimiter(requests_per_minute=60, burst=3, clock=clock, sleep=clock.sleep)
+        
+        for _ in range(3):
+            limiter.acquire()
+        assert clock.now == 0.0
+        
+        limiter.acquire()
+        limiter.acquire()
+        assert clock.now == pytest.approx(2.0)
+    
+    def test_tokens_refill_while_idle(self, clock):
+        """Idle time refills the bucket up to its capacity"""
+        limiter = RateLimiter(requests_per_minute=60, burst=2, clock=clock, sleep=clock.sleep)
+        limiter.acquire()
+        limiter.acquire()
+        assert not limiter.try_acquire()
+        
+        clock.now += 10
+        assert limiter.try_acquire()
+        assert limiter.try_acquire()
+        assert not limiter.try_acquire()
+        assert limiter.time_until_available() == pytest.approx(1.0)
+    
+    def test_acquire_timeout(self, clock):
+        """acquire raises instead of waiting past the timeout"""
+        limiter = RateLimiter(requests_per_minute=6, burst=1, clock=clock, sleep=clock.sleep)
+        limiter.acquire()
+        
+        with pytest.raises(TimeoutError):
+            limiter.acquire(timeout=5)
+        assert clock.sleeps == []
+    
+    def test_invalid_rate(self):
+        with pytest.raises(ValueError):
+            RateLimiter(requests_per_minute=0)
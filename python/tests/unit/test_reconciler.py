@@ -0,0 +1,129 @@
+"""Unit tests for ReconciliationWorker"""
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+
+import httpx
+import pytest
+from mesh_toolkit.api.base_client import BaseHttpClient
+from mesh_toolkit.persistence.schemas import AssetManifest, TaskGraphEntry
+from mesh_toolkit.webhooks.handler import WebhookHandler
+from mesh_toolkit.webhooks.reconciler import ReconciliationWorker
+
+
+def _api_response(data):
+    response = Mock(spec=httpx.Response)
+    response.json.return_value = data
+    return response
+
+
+class TestReconciliationWorker:
+    """Test replaying missed webhooks from API status"""
+    
+    @pytest.fixture
+    def mock_client(self):
+        """Mock BaseHttpClient"""
+        return Mock(spec=BaseHttpClient)
+    
+    @pytest.fixture
+    def stale_repo(self, test_repository):
+        """Repository with one stale and one fresh pending task"""
+        old = datetime.utcnow() - timedelta(hours=2)
+        asset = AssetManifest(
+            asset_spec_hash="hash_stale",
+            spec_fingerprint="{}",
+            species="otter",
+            asset_intent="creature",
+            task_graph=[
+                TaskGraphEntry(
+                    task_id="task_stale",
+                    service="rigging",
+                    status="PENDING",
+                    created_at=old,
+                    updated_at=old
+                ),
+                TaskGraphEntry(
+                    task_id="task_fresh",
+                    service="text3d",
+                    status="IN_PROGRESS",
+                    created_at=datetime.utcnow(),
+                    updated_at=datetime.utcnow()
+                )
+            ]
+        )
+        test_repository.upsert_asset_record("otter", asset)
+        return test_repository
+    
+    @pytest.fixture
+    def worker(self, stale_repo, mock_client):
+        """Worker that never downloads artifacts"""
+        handler = WebhookHandler(repository=stale_repo, client=None, download_artifacts=False)
+        return ReconciliationWorker(
+            repository=stale_repo,
+            client=mock_client,
+            handler=handler,
+            stale_after=600
+        )
+    
+    def test_list_stale_tasks_skips_fresh_and_terminal(self, stale_repo):
+        """Only non-terminal tasks older than the threshold are returned"""
+        stale = stale_repo.list_stale_tasks(older_than=timedelta(minutes=10))
+        
+        assert [task.task_id for _, _, task in stale] == ["task_stale"], \
+            f"Expected only task_stale, got {stale}"
+    
+    def test_reconcile_replays_terminal_status(self, worker, stale_repo, mock_client):
+        """A task that finished upstream is updated through the handler"""
+        mock_client.request.return_value = _api_response({
+            "id": "task_stale",
+            "status": "SUCCEEDED",
+            "progress": 100,
+            "created_at": 1700000000,
+            "result": {"rigged_character_glb_url": "https://assets.meshy.ai/rigged.glb"}
+        })
+        
+        results = worker.reconcile_once()
+        
+        mock_client.request.assert_called_once_with("GET", "rigging/task_stale", api_version="v1")
+        assert results[0]["status"] == "success"
+        
+        asset = stale_repo.get_asset_record("otter", "hash_stale")
+        task = next(t for t in asset.task_graph if t.task_id == "task_stale")
+        assert task.status == "SUCCEEDED"
+        assert task.result_paths["glb"] == "https://assets.meshy.ai/rigged.glb"
+        assert asset.history[-1].source == "reconciler"
+    
+    def test_reconcile_unchanged_status_is_not_recorded(self, worker, stale_repo, mock_client):
+        """A task still pending upstream leaves the manifest untouched"""
+        mock_client.request.return_value = _api_response({
+            "id": "task_stale",
+            "status": "PENDING",
+            "created_at": 1700000000
+        })
+        
+        results = worker.reconcile_once()
+        
+        assert results == [{"status": "unchanged", "task_id": "task_stale", "task_status": "PENDING"}]
+        assert stale_repo.get_asset_record("otter", "hash_stale").history == []
+    
+    def test_reconcile_isolates_fetch_errors(self, worker, mock_client):
+        """API failures are reported per task instead of aborting the pass"""
+        mock_client.request.side_effect = httpx.TimeoutException("timeout")
+        
+        results = worker.reconcile_once()
+        
+        assert results[0]["status"] == "error"
+        assert results[0]["task_id"] == "task_stale"
+    
+    def test_unknown_service_raises(self, worker):
+        """Services without a status endpoint are rejected"""
+        with pytest.raises(ValueError, match="No status endpoint"):
+            worker.fetch_status("mystery", "task_1")
+    
+    def test_next_delay_stays_within_jitter(self, worker):
+        """Jittered delay stays within ±jitter of the interval"""
+        worker.interval = 100.0
+        worker.jitter = 0.2
+        
+        delays = [worker.next_delay() for _ in range(50)]
+        
+        assert all(80.0 <= d <= 120.0 for d in delays)
@@ -1,6 +1,7 @@
 """Unit tests for TaskRepository"""
 import pytest
 import json
+import multiprocessing
 import tempfile
 import shutil
 from pathlib import Path
@@ -12,10 +13,22 @@ from mesh_toolkit.persistence.schemas import (
     AssetManifest,
     TaskGraphEntry,
     ArtifactRecord,
-    StatusHistoryEntry
+    StatusHistoryEntry,
+    TaskSubmission,
+    TaskStatus
 )
 
 
+def _submit_from_process(base_path, worker, count):
+    """Record tasks from a separate process with its own repository"""
+    repo = TaskRepository(base_path=base_path)
+    for i in range(count):
+        repo.record_task_submission(TaskSubmission(
+            task_id=f"task_{worker}_{i}", spec_hash=f"hash_{worker}_{i}", species="otter",
+            service="text3d", status=TaskStatus.PENDING, callback_url="http://cb"
+        ))
+
+
 class TestTaskRepository:
     """Test TaskRepository manifest operations"""
     
@@ -530,3 +543,51 @@ class TestTaskRepository:
         
         assert species_dir.exists()
         assert (species_dir / "manifest.json").exists()
+
+    def test_record_task_submissions_one_write_per_species(self, temp_repo, mocker):
+        """Bulk submissions save each species manifest once"""
+        for species in ("otter", "beaver"):
+            temp_repo.load_species_manifest(species)
+        save = mocker.spy(temp_repo, "save_species_manifest")
+        submissions = [
+            TaskSubmission(task_id=f"{species}_{i}", spec_hash=f"{species}_hash_{i}", species=species,
+                           service="animation", status=TaskStatus.PENDING, callback_url="http://cb")
+            for species in ("otter", "beaver") for i in range(3)
+        ]
+        
+        temp_repo.record_task_submissions(submissions)
+        
+        assert save.call_count == 2
+        assert temp_repo.find_task_by_id("beaver_2")[0] == "beaver"
+        assert len(temp_repo.load_species_manifest("otter").asset_specs) == 3
+    
+    def test_record_task_submissions_validates_before_writing(self, temp_repo):
+        """An invalid submission aborts the batch before anything is saved"""
+        good = TaskSubmission(task_id="t1", spec_hash="h1", species="otter",
+                              service="rigging", status=TaskStatus.PENDING, callback_url="http://cb")
+        bad = TaskSubmission(task_id="", spec_hash="h2", species="otter",
+                             service="rigging", status=TaskStatus.PENDING, callback_url="http://cb")
+        
+        with pytest.raises(ValueError, match="task_id cannot be empty"):
+            temp_repo.record_task_submissions([good, bad])
+        
+        assert temp_repo.find_task_by_id("t1") is None
+
+    @pytest.mark.skipif(
+        "fork" not in multiprocessing.get_all_start_methods(), reason="needs fork"
+    )
+    def test_concurrent_processes_do_not_lose_writes(self, temp_repo):
+        """Repositories in separate processes serialize through the manifest file lock"""
+        context = multiprocessing.get_context("fork")
+        workers = [
+            context.Process(target=_submit_from_process, args=(str(temp_repo.base_path), worker, 15))
+            for worker in range(4)
+        ]
+        for process in workers:
+            process.start()
+        for process in workers:
+            process.join(timeout=60)
+            assert process.exitcode == 0
+        
+        assert len(temp_repo.load_species_manifest("otter").asset_specs) == 60
+        assert (temp_repo.base_path / "otter" / "manifest.json.lock").exists()
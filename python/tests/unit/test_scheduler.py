@@ -0,0 +1,128 @@
+"""Unit tests for the priority and budget aware SubmissionScheduler"""
+import itertools
+import json
+from unittest.mock import Mock
+
+import httpx
+import pytest
+from mesh_toolkit.api.base_client import BaseHttpClient
+from mesh_toolkit.api.rate_limiter import RateLimiter
+from mesh_toolkit.models import AssetIntent
+from mesh_toolkit.services.factory import ServiceFactory
+from mesh_toolkit.workflows import CreditBudget, SubmissionScheduler
+
+
+@pytest.fixture
+def mock_client():
+    """Client that returns a fresh task ID for every submission"""
+    client = Mock(spec=BaseHttpClient)
+    counter = itertools.count()
+    
+    def request(method, endpoint, api_version="v2", **kwargs):
+        response = Mock(spec=httpx.Response)
+        response.json.return_value = {"result": f"task_{next(counter)}"}
+        return response
+    
+    client.request.side_effect = request
+    return client
+
+
+@pytest.fixture
+def factory(test_repository, mock_client):
+    factory = ServiceFactory(api_key="test-key", webhook_base_url="https://hooks.test/meshy")
+    factory._client = mock_client
+    factory._repository = test_repository
+    return factory
+
+
+@pytest.fixture
+def limiter():
+    """Limiter that never blocks"""
+    return RateLimiter(requests_per_minute=6000, burst=1000)
+
+
+def _enqueue_text3d(scheduler, species, intent):
+    return scheduler.enqueue(
+        "text3d", intent,
+        species=species,
+        prompt=f"a {species}",
+        callback_url=f"https://hooks.test/meshy/{species}/static"
+    )
+
+
+class TestSubmissionScheduler:
+    """Test release order, budget caps and rate pacing"""
+    
+    def test_higher_priority_intents_released_first(self, factory, limiter):
+        """Player characters jump ahead of props queued earlier"""
+        scheduler = SubmissionScheduler(factory, rate_limiter=limiter)
+        _enqueue_text3d(scheduler, "reed", AssetIntent.PROP_DECORATION)
+        _enqueue_text3d(scheduler, "heron", AssetIntent.CREATURE_PREDATOR)
+        _enqueue_text3d(scheduler, "otter", AssetIntent.PLAYER_CHARACTER)
+        
+        released = scheduler.run()
+        
+        assert [job.kwargs["species"] for job in released] == ["otter", "heron", "reed"]
+        assert all(job.state == "SUBMITTED" for job in released)
+    
+    def test_budget_cap_leaves_low_priority_queued(self, factory, limiter):
+        """Work beyond the run budget stays pending; cheaper jobs still fit"""
+        scheduler = SubmissionScheduler(factory, budget=CreditBudget(per_run=12), rate_limiter=limiter)
+        _enqueue_text3d(scheduler, "reed", AssetIntent.PROP_DECORATION)
+        scheduler.enqueue("retexture", AssetIntent.NPC_CHARACTER, species="fox", model_id="m",
+                          prompt="fur", callback_url="https://hooks.test/meshy/fox/retextured")
+        _enqueue_text3d(scheduler, "otter", AssetIntent.PLAYER_CHARACTER)
+        
+        released = scheduler.run()
+        
+        # otter (5) fits, fox's retexture (10) does not, reed (5) still does
+        assert [job.kwargs["species"] for job in released] == ["otter", "reed"]
+        assert [job.kwargs["species"] for job in scheduler.pending] == ["fox"]
+        assert scheduler.budget.remaining() == 2
+    
+    def test_daily_ledger_shared_across_runs(self, factory, limiter, tmp_path):
+        """A second run the same day sees what the first one spent"""
+        ledger = tmp_path / "credits.json"
+        
+        first = SubmissionScheduler(factory, budget=CreditBudget(per_day=8, ledger_path=str(ledger)),
+                                    rate_limiter=limiter)
+        _enqueue_text3d(first, "otter", AssetIntent.PLAYER_CHARACTER)
+        assert len(first.run()) == 1
+        
+        second = SubmissionScheduler(factory, budget=CreditBudget(per_day=8, ledger_path=str(ledger)),
+                                     rate_limiter=limiter)
+        _enqueue_text3d(second, "beaver", AssetIntent.PLAYER_CHARACTER)
+        assert second.run() == []
+        assert list(json.loads(ledger.read_text()).values()) == [5]
+    
+    def test_failed_and_cached_submissions_are_refunded(self, factory, mock_client, limiter):
+        """Credits are only kept for tasks that were actually created"""
+        scheduler = SubmissionScheduler(factory, budget=CreditBudget(per_run=100), rate_limiter=limiter)
+        _enqueue_text3d(scheduler, "otter", AssetIntent.PLAYER_CHARACTER)
+        _enqueue_text3d(scheduler, "otter", AssetIntent.PLAYER_CHARACTER)
+        scheduler.run()
+        
+        assert scheduler.budget.run_spent == 5  # second one was a cache hit
+        
+        mock_client.request.side_effect = httpx.ConnectError("down")
+        job = _enqueue_text3d(scheduler, "beaver", AssetIntent.NPC_CHARACTER)
+        scheduler.run()
+        
+        assert job.state == "FAILED"
+        assert scheduler.budget.run_spent == 5
+    
+    def test_releases_wait_for_rate_limiter(self, factory):
+        """Each release takes a token from the limiter"""
+        limiter = Mock(spec=RateLimiter)
+        scheduler = SubmissionScheduler(factory, rate_limiter=limiter)
+        for species in ("a", "b", "c"):
+            _enqueue_text3d(scheduler, species, AssetIntent.CREATURE_PREY)
+        
+        scheduler.run()
+        
+        assert limiter.acquire.call_count == 3
+    
+    def test_unknown_service_rejected(self, factory, limiter):
+        scheduler = SubmissionScheduler(factory, rate_limiter=limiter)
+        with pytest.raises(ValueError, match="Unknown service"):
+            scheduler.enqueue("sculpt", AssetIntent.PROP_DECORATION, species="x")
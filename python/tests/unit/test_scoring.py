@@ -0,0 +1,50 @@
+"""Unit tests for preview scoring heuristics"""
+from io import BytesIO
+
+import pytest
+from mesh_toolkit.models import AssetIntent, GameAssetSpec, ModelUrls, TaskStatus, Text3DResult
+from mesh_toolkit.scoring import PreviewScorer, glb_triangle_count, polycount_score, thumbnail_score
+
+from tests.conftest import make_grid_glb
+
+
+class TestScoring:
+    """Test triangle counting and score terms"""
+    
+    def test_glb_triangle_count(self):
+        assert glb_triangle_count(make_grid_glb(size=10)) == 200
+    
+    def test_glb_triangle_count_rejects_other_files(self):
+        with pytest.raises(ValueError, match="Not a GLB"):
+            glb_triangle_count(b"\x89PNG\r\n\x1a\n" + b"\0" * 20)
+    
+    def test_polycount_score_peaks_at_target(self):
+        assert polycount_score(5000, 5000) == 1.0
+        assert polycount_score(10000, 5000) == pytest.approx(0.5)
+        assert polycount_score(2500, 5000) == pytest.approx(0.5)
+        assert polycount_score(0, 5000) == 0.0
+        assert polycount_score(1234, None) == 1.0
+    
+    def test_thumbnail_prefers_centered_subject(self):
+        """A framed subject beats an empty render"""
+        Image = pytest.importorskip("PIL.Image")
+        
+        def render(box):
+            image = Image.new("RGB", (64, 64), "white")
+            if box:
+                image.paste((90, 60, 30), box)
+            buffer = BytesIO()
+            image.save(buffer, format="PNG")
+            return buffer.getvalue()
+        
+        assert thumbnail_score(render((14, 14, 50, 50))) > thumbnail_score(render(None))
+    
+    def test_preview_scorer_uses_polycount(self):
+        """Without a thumbnail the score is the polycount term alone"""
+        spec = GameAssetSpec(intent=AssetIntent.CREATURE_PREY, description="frog",
+                             target_polycount=400, output_path="models/test")
+        result = Text3DResult(id="t", status=TaskStatus.SUCCEEDED, created_at=0,
+                              model_urls=ModelUrls(glb="https://assets.test/frog.glb"))
+        scorer = PreviewScorer(fetch=lambda url: make_grid_glb(size=20))
+        
+        assert scorer(result, spec) == pytest.approx(0.5)
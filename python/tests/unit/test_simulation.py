@@ -0,0 +1,139 @@
+"""Unit tests for the simulated Meshy backend"""
+import random
+
+import httpx
+import pytest
+import tenacity
+from mesh_toolkit.api.base_client import BaseHttpClient, RateLimitError
+from mesh_toolkit.client import MeshyClient
+from mesh_toolkit.models import TaskStatus, Text3DRequest
+from mesh_toolkit.simulation import (
+    LatencyModel,
+    ServiceProfile,
+    SimulatedMeshy,
+    SimulationConfig,
+    peak_overlap,
+)
+
+
+def fixed_profiles(seconds=100.0, failure_rate=0.0):
+    """Every service takes exactly `seconds`"""
+    return {
+        name: ServiceProfile(LatencyModel(median=seconds, sigma=0.0), failure_rate)
+        for name in ("text3d", "text3d_refine", "rigging", "animation", "retexture")
+    }
+
+
+class TestSimulatedMeshy:
+    """Test task lifecycle, queueing, failures and throttling"""
+    
+    def make_client(self, backend):
+        return MeshyClient(api_key="sim", transport=backend.transport, time_scale=backend.config.time_scale)
+    
+    def test_latency_model_is_seeded(self):
+        """Same seed, same durations; never below the minimum"""
+        model = LatencyModel(median=60, sigma=1.0, minimum=5.0)
+        first = [model.sample(random.Random(7)) for _ in range(3)]
+        assert first == [model.sample(random.Random(7)) for _ in range(3)]
+        assert min(model.sample(random.Random(i)) for i in range(200)) >= 5.0
+    
+    def test_task_progresses_with_simulated_time(self, clock):
+        """Status follows the simulated clock (time_scale x real time)"""
+        backend = SimulatedMeshy(SimulationConfig(profiles=fixed_profiles(100), time_scale=10), clock=clock)
+        client = self.make_client(backend)
+        
+        task_id = client.create_text_to_3d(Text3DRequest(prompt="otter"))
+        assert client.get_text_to_3d(task_id).status == TaskStatus.IN_PROGRESS
+        
+        clock.now = 5.0  # 50 simulated seconds
+        result = client.get_text_to_3d(task_id)
+        assert result.status == TaskStatus.IN_PROGRESS
+        assert result.progress == 49
+        
+        clock.now = 10.0
+        result = client.get_text_to_3d(task_id)
+        assert result.status == TaskStatus.SUCCEEDED
+        assert result.finished_at is not None
+        assert backend.stats()["api_calls"] == {"POST text-to-3d": 1, "GET text-to-3d": 3}
+    
+    def test_refine_is_a_separate_service(self, clock):
+        """Both refine request forms are timed with the text3d_refine profile"""
+        profiles = fixed_profiles(100)
+        profiles["text3d_refine"] = ServiceProfile(LatencyModel(median=300, sigma=0.0))
+        backend = SimulatedMeshy(SimulationConfig(profiles=profiles), clock=clock)
+        
+        client = self.make_client(backend)
+        client.refine_text_to_3d("preview-1")
+        BaseHttpClient(api_key="sim", transport=backend.transport).request(
+            "POST", "text-to-3d/preview-1/refine", api_version="v2", json={}
+        )
+        
+        tasks = list(backend.tasks.values())
+        assert [t.service for t in tasks] == ["text3d_refine", "text3d_refine"]
+        assert all(t.finished_at - t.started_at == 300 for t in tasks)
+    
+    def test_account_limit_queues_tasks(self, clock):
+        """Tasks beyond max_running stay PENDING until a slot frees up"""
+        backend = SimulatedMeshy(
+            SimulationConfig(profiles=fixed_profiles(100), time_scale=1, max_running=2),
+            clock=clock
+        )
+        client = self.make_client(backend)
+        task_ids = [client.create_text_to_3d(Text3DRequest(prompt=f"otter {i}")) for i in range(3)]
+        
+        assert client.get_text_to_3d(task_ids[2]).status == TaskStatus.PENDING
+        clock.now = 150.0
+        assert client.get_text_to_3d(task_ids[2]).status == TaskStatus.IN_PROGRESS
+        
+        stats = backend.stats()
+        assert stats["peak_running"] == 2
+        assert stats["peak_in_flight"] == 3
+        assert stats["last_task_finished"] == 200
+    
+    def test_failed_tasks_raise_in_poll(self, clock):
+        """failure_rate=1 fails every task with an error message"""
+        backend = SimulatedMeshy(SimulationConfig(profiles=fixed_profiles(1, failure_rate=1.0)), clock=clock)
+        client = self.make_client(backend)
+        task_id = client.create_text_to_3d(Text3DRequest(prompt="otter"))
+        
+        clock.now = 1.0
+        with pytest.raises(RuntimeError, match="Simulated failure"):
+            client.poll_until_complete(task_id, poll_interval=0)
+        assert backend.stats()["failed_tasks"] == 1
+    
+    def test_rate_limit_returns_429_with_retry_after(self, clock):
+        """Calls beyond requests_per_minute in a simulated minute get 429"""
+        backend = SimulatedMeshy(
+            SimulationConfig(time_scale=1, requests_per_minute=2, retry_after=7),
+            clock=clock
+        )
+        http = httpx.Client(transport=backend.transport, base_url="https://api.meshy.ai")
+        
+        assert http.get("/openapi/v2/text-to-3d/missing").status_code == 404
+        assert http.get("/openapi/v2/text-to-3d/missing").status_code == 404
+        throttled = http.get("/openapi/v2/text-to-3d/missing")
+        assert throttled.status_code == 429
+        assert throttled.headers["retry-after"] == "7"
+        
+        clock.now = 61.0
+        assert http.get("/openapi/v2/text-to-3d/missing").status_code == 404
+        assert backend.stats()["throttled"] == 1
+    
+    def test_clients_give_up_when_always_throttled(self, clock):
+        """BaseHttpClient retries 429s on the scaled clock, then raises"""
+        backend = SimulatedMeshy(
+            SimulationConfig(throttle_rate=1.0, retry_after=1, time_scale=1e6),
+            clock=clock
+        )
+        client = BaseHttpClient(api_key="sim", transport=backend.transport, time_scale=1e6)
+        
+        with pytest.raises(tenacity.RetryError) as exc_info:
+            client.request("GET", "text-to-3d/abc", api_version="v2")
+        assert isinstance(exc_info.value.last_attempt.exception(), RateLimitError)
+        assert backend.stats()["api_calls_total"] == 5
+    
+    def test_peak_overlap(self):
+        """Touching intervals do not overlap"""
+        assert peak_overlap([]) == 0
+        assert peak_overlap([(0, 10), (10, 20)]) == 1
+        assert peak_overlap([(0, 10), (5, 15), (6, 7)]) == 3
@@ -0,0 +1,144 @@
+"""Unit tests for SpecMatrix expansion and change detection"""
+import json
+from unittest.mock import Mock
+
+import pytest
+from mesh_toolkit.client import MeshyClient
+from mesh_toolkit.jobs import AssetGenerator, AssetManifest
+from mesh_toolkit.matrix import SpeciesEntry, SpecMatrix, VariantEntry, asset_spec_hash
+from mesh_toolkit.models import ArtStyle, AssetIntent
+
+
+def _matrix(**kwargs):
+    return SpecMatrix(
+        species=[
+            SpeciesEntry("otter", "River otter", intents=[AssetIntent.PLAYER_CHARACTER, AssetIntent.NPC_CHARACTER]),
+            SpeciesEntry("reed", "Cattail reeds", intents=[AssetIntent.PROP_DECORATION], variants=["base"]),
+        ],
+        variants=[VariantEntry("base"), VariantEntry("winter", "thick winter coat", {"target_polycount": 9000})],
+        styles=[ArtStyle.REALISTIC, ArtStyle.CARTOON],
+        defaults={"target_polycount": 12000},
+        **kwargs
+    )
+
+
+def _write_manifest(output_root, entry, model_path="model.glb", spec_hash=None):
+    manifest = AssetManifest(
+        asset_id=entry.asset_id,
+        intent=entry.intent.value,
+        description=entry.spec.description,
+        art_style=entry.style.value,
+        model_path=model_path,
+        spec_hash=spec_hash or entry.spec_hash
+    )
+    path = entry.manifest_path(output_root)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(manifest.to_dict()))
+
+
+class TestSpecMatrix:
+    """Test expansion, precedence, hashing and change detection"""
+    
+    def test_expands_product_per_species(self):
+        """otter: 2 intents x 2 styles x 2 variants; reed: 1 x 2 x 1"""
+        matrix = _matrix()
+        entries = list(matrix)
+        
+        assert len(matrix) == len(entries) == 10
+        assert len({e.asset_id for e in entries}) == 10
+        assert "otter_npc_character_cartoon_winter" in {e.asset_id for e in entries}
+        assert {e.variant for e in entries if e.species == "reed"} == {"base"}
+    
+    def test_fields_resolve_by_precedence(self):
+        """Variant overrides beat defaults; prompt joins description, variant and suffix"""
+        matrix = _matrix(intent_defaults={AssetIntent.NPC_CHARACTER: {"target_polycount": 8000}})
+        base = next(matrix.entries(species="otter", intent=AssetIntent.PLAYER_CHARACTER, variant="base"))
+        npc = next(matrix.entries(species="otter", intent=AssetIntent.NPC_CHARACTER, variant="base"))
+        winter = next(matrix.entries(species="otter", intent=AssetIntent.NPC_CHARACTER, variant="winter"))
+        
+        assert base.spec.target_polycount == 12000
+        assert base.spec.output_path == "models/characters"
+        assert npc.spec.target_polycount == 8000
+        assert winter.spec.target_polycount == 9000
+        assert winter.spec.description == "River otter, thick winter coat, game-ready low-poly"
+        assert winter.spec.metadata["matrix"] == {"species": "otter", "style": "realistic", "variant": "winter"}
+    
+    def test_expansion_is_lazy(self):
+        """Taking one entry does not expand the rest"""
+        matrix = _matrix()
+        expanded = []
+        original = matrix._expand
+        matrix._expand = lambda *args: expanded.append(args) or original(*args)
+        
+        next(iter(matrix))
+        assert len(expanded) == 1
+    
+    def test_hashes_change_only_for_edited_combinations(self):
+        """Editing one variant prompt changes only that variant's hashes"""
+        before = {e.asset_id: e.spec_hash for e in _matrix()}
+        assert before == {e.asset_id: e.spec_hash for e in _matrix()}
+        
+        edited = _matrix()
+        edited.variants[1].prompt = "snowy winter coat"
+        after = {e.asset_id: e.spec_hash for e in edited}
+        
+        changed = {asset_id for asset_id in before if before[asset_id] != after[asset_id]}
+        assert changed == {asset_id for asset_id in before if asset_id.endswith("_winter")}
+    
+    def test_changed_skips_current_manifests(self, tmp_path):
+        """Only missing, modelless or stale manifests are regenerated"""
+        matrix = _matrix()
+        entries = list(matrix)
+        _write_manifest(tmp_path, entries[0])
+        _write_manifest(tmp_path, entries[1], spec_hash="stale")
+        _write_manifest(tmp_path, entries[2], model_path=None)
+        
+        changed = [e.asset_id for e in matrix.changed(tmp_path)]
+        assert changed == [e.asset_id for e in entries[1:]]
+        assert len(list(matrix.specs(changed_only=True, output_root=tmp_path))) == 9
+    
+    def test_generator_manifest_records_spec_hash(self, tmp_path):
+        """Manifests written by AssetGenerator make the entry current"""
+        entry = next(iter(_matrix()))
+        client = Mock(spec=MeshyClient)
+        client.create_text_to_3d.return_value = "task-1"
+        generator = AssetGenerator(client=client, output_root=str(tmp_path))
+        
+        manifest = generator.generate_model(entry.spec, wait=False)
+        manifest.model_path = "models/characters/x.glb"
+        generator._write_manifest(entry.spec, manifest)
+        
+        assert manifest.spec_hash == asset_spec_hash(entry.spec)
+        assert entry.is_current(tmp_path)
+    
+    def test_pipeline_specs_rig_characters_only(self):
+        """Characters get animations; props stop after the model"""
+        specs = list(_matrix().pipeline_specs(animations={"walk": "1"}, style=ArtStyle.CARTOON, variant="base"))
+        
+        # Player and NPC otters share a definition, so only one pipeline runs
+        assert [s.species for s in specs] == ["otter", "reed"]
+        otter, reed = specs
+        assert otter.rig and otter.animations == {"walk": "1"}
+        assert not reed.rig and reed.animations == {}
+        assert otter.text3d_options["art_style"] == "cartoon"
+    
+    def test_pipeline_specs_group_combinations_by_species(self):
+        """Every combination runs under its species with a distinct pipeline id"""
+        specs = list(_matrix().pipeline_specs(species="otter", intent=AssetIntent.NPC_CHARACTER))
+        
+        assert len(specs) == 4
+        assert {s.species for s in specs} == {"otter"}
+        assert len({s.pipeline_id for s in specs}) == 4
+    
+    def test_from_dict_and_validation(self):
+        """JSON form round-trips; unknown variants and axis overrides are rejected"""
+        matrix = SpecMatrix.from_dict({
+            "species": [{"name": "bass", "description": "Bass", "intents": ["creature_prey"]}],
+            "styles": ["low-poly"],
+        })
+        assert [e.asset_id for e in matrix] == ["bass_creature_prey_low_poly_base"]
+        
+        with pytest.raises(ValueError, match="unknown variants"):
+            SpecMatrix(species=[SpeciesEntry("bass", "Bass", variants=["summer"])])
+        with pytest.raises(ValueError, match="may not set"):
+            SpecMatrix(species=[SpeciesEntry("bass", "Bass")], defaults={"art_style": "cartoon"})
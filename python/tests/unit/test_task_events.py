@@ -0,0 +1,167 @@
+"""Unit tests for task status notifications"""
+import threading
+import time
+from datetime import datetime
+
+import pytest
+from mesh_toolkit.persistence.events import SocketEventBridge, TaskEvent, TaskEventBus
+from mesh_toolkit.persistence.schemas import TaskStatus, TaskSubmission
+
+
+def _submit(repository, task_id="task_1", species="otter"):
+    repository.record_task_submission(TaskSubmission(
+        task_id=task_id,
+        spec_hash="hash_1",
+        species=species,
+        service="text3d",
+        status=TaskStatus.PENDING,
+        callback_url="https://example.com/webhook",
+        created_at=datetime.utcnow(),
+        updated_at=datetime.utcnow()
+    ))
+
+
+class TestTaskEventBus:
+    """Test in-process pub/sub"""
+    
+    def test_subscribe_filters_by_task(self):
+        """Task-scoped subscribers only see their task, global ones see all"""
+        bus = TaskEventBus()
+        scoped, everything = [], []
+        bus.subscribe(scoped.append, task_id="task_1")
+        bus.subscribe(everything.append)
+        
+        bus.publish(TaskEvent(task_id="task_1", status="IN_PROGRESS"))
+        bus.publish(TaskEvent(task_id="task_2", status="SUCCEEDED"))
+        
+        assert [e.task_id for e in scoped] == ["task_1"]
+        assert [e.task_id for e in everything] == ["task_1", "task_2"]
+    
+    def test_unsubscribe_stops_delivery(self):
+        """Removed subscribers receive nothing further"""
+        bus = TaskEventBus()
+        received = []
+        unsubscribe = bus.subscribe(received.append)
+        unsubscribe()
+        
+        bus.publish(TaskEvent(task_id="task_1", status="SUCCEEDED"))
+        
+        assert received == []
+    
+    def test_wait_returns_retained_event(self):
+        """A status published before waiting still satisfies the wait"""
+        bus = TaskEventBus()
+        bus.publish(TaskEvent(task_id="task_1", status="SUCCEEDED"))
+        
+        event = bus.wait("task_1", {"SUCCEEDED"}, timeout=0.1)
+        
+        assert event.status == "SUCCEEDED"
+    
+    def test_wait_wakes_on_publish_from_other_thread(self):
+        """Blocking waiters wake on the matching status, not earlier ones"""
+        bus = TaskEventBus()
+        
+        def publish_later():
+            time.sleep(0.05)
+            bus.publish(TaskEvent(task_id="task_1", status="IN_PROGRESS"))
+            bus.publish(TaskEvent(task_id="task_1", status="FAILED"))
+        
+        threading.Thread(target=publish_later).start()
+        event = bus.wait("task_1", {"SUCCEEDED", "FAILED"}, timeout=2)
+        
+        assert event.status == "FAILED"
+    
+    def test_wait_times_out(self):
+        """Waits without a matching event raise TimeoutError"""
+        bus = TaskEventBus()
+        
+        with pytest.raises(TimeoutError, match="task_1"):
+            bus.wait("task_1", {"SUCCEEDED"}, timeout=0.05)
+    
+    def test_retention_is_bounded(self):
+        """Only the most recent tasks are retained"""
+        bus = TaskEventBus(max_retained=2)
+        for i in range(3):
+            bus.publish(TaskEvent(task_id=f"task_{i}", status="SUCCEEDED"))
+        
+        assert bus.latest("task_0") is None
+        assert bus.latest("task_2").status == "SUCCEEDED"
+
+
+class TestRepositoryWaitFor:
+    """Test TaskRepository publishing and wait_for"""
+    
+    def test_repository_publishes_updates(self, test_repository):
+        """Submissions and status updates are published with context"""
+        received = []
+        test_repository.events.subscribe(received.append)
+        
+        _submit(test_repository)
+        test_repository.record_task_update("otter", "hash_1", "task_1", "SUCCEEDED", source="webhook")
+        
+        assert [(e.old_status, e.status) for e in received] == [("", "PENDING"), ("PENDING", "SUCCEEDED")]
+        assert received[-1].species == "otter"
+        assert received[-1].service == "text3d"
+        assert received[-1].source == "webhook"
+    
+    @pytest.mark.asyncio
+    async def test_wait_for_wakes_on_update(self, test_repository):
+        """wait_for resolves when another thread records a terminal status"""
+        _submit(test_repository)
+        
+        def finish_later():
+            time.sleep(0.05)
+            test_repository.record_task_update("otter", "hash_1", "task_1", "SUCCEEDED")
+        
+        threading.Thread(target=finish_later).start()
+        event = await test_repository.wait_for("task_1", timeout=2)
+        
+        assert event.status == "SUCCEEDED"
+    
+    @pytest.mark.asyncio
+    async def test_wait_for_uses_persisted_status(self, tmp_path):
+        """A task already terminal on disk returns without any event"""
+        from mesh_toolkit.persistence.repository import TaskRepository
+        
+        _submit(TaskRepository(base_path=str(tmp_path)))
+        writer = TaskRepository(base_path=str(tmp_path))
+        writer.record_task_update("otter", "hash_1", "task_1", "SUCCEEDED")
+        
+        # Fresh repository with its own bus has seen no events
+        reader = TaskRepository(base_path=str(tmp_path))
+        event = await reader.wait_for("task_1", statuses={"SUCCEEDED"}, timeout=0.1)
+        
+        assert event.status == "SUCCEEDED"
+        assert event.spec_hash == "hash_1"
+    
+    @pytest.mark.asyncio
+    async def test_wait_for_times_out(self, test_repository):
+        """Tasks that never finish raise TimeoutError"""
+        _submit(test_repository)
+        
+        with pytest.raises(TimeoutError):
+            await test_repository.wait_for("task_1", timeout=0.05)
+
+
+class TestSocketEventBridge:
+    """Test cross-process relay"""
+    
+    def test_bridge_relays_events_without_echo(self):
+        """Events forwarded over UDP are republished once and not sent back"""
+        source_bus, target_bus = TaskEventBus(), TaskEventBus()
+        
+        with SocketEventBridge(target_bus, listen=("127.0.0.1", 0)) as listener:
+            with SocketEventBridge(source_bus, peers=[listener.address]):
+                source_bus.publish(TaskEvent(task_id="task_1", status="SUCCEEDED", species="otter"))
+                event = target_bus.wait("task_1", {"SUCCEEDED"}, timeout=2)
+        
+        assert event.remote is True
+        assert event.species == "otter"
+        assert source_bus.latest("task_1").remote is False
+    
+    def test_parse_address(self):
+        assert SocketEventBridge.parse_address("10.0.0.2:5000") == ("10.0.0.2", 5000)
+        assert SocketEventBridge.parse_address("5000") == ("127.0.0.1", 5000)
+        assert SocketEventBridge.parse_address("relay:") == ("relay", SocketEventBridge.DEFAULT_PORT)
+        with pytest.raises(ValueError):
+            SocketEventBridge.parse_address("relay:http")
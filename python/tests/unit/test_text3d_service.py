@@ -1,5 +1,6 @@
 """Unit tests for Text3DService"""
 import pytest
+from datetime import datetime, timedelta
 from unittest.mock import Mock
 import httpx
 from mesh_toolkit.services.text3d_service import Text3DService
@@ -23,6 +24,7 @@ class TestText3DService:
         """Mock TaskRepository"""
         repo = Mock(spec=TaskRepository)
         repo.compute_spec_hash.return_value = "hash123"
+        repo.find_cached_task.return_value = None
         return repo
     
     @pytest.fixture
@@ -163,3 +165,107 @@ class TestText3DService:
         assert submission.spec_hash == "hash123"
         
         mock_repository.record_task_submission.assert_called_once()
+
+
+class TestText3DSpecCache:
+    """Test reuse of identical Text3D specs"""
+    
+    @pytest.fixture
+    def mock_client(self):
+        client = Mock(spec=BaseHttpClient)
+        response = Mock(spec=httpx.Response)
+        response.json.return_value = {"result": "task_new"}
+        client.request.return_value = response
+        return client
+    
+    @pytest.fixture
+    def service(self, mock_client, test_repository):
+        return Text3DService(mock_client, test_repository)
+    
+    def _submit(self, service, callback_url="http://a.test/cb", **kwargs):
+        return service.submit_task(species="otter", prompt="an otter", callback_url=callback_url, **kwargs)
+    
+    def test_identical_spec_reuses_in_flight_task(self, service, mock_client):
+        """A second identical submission makes no API call"""
+        first = self._submit(service)
+        second = self._submit(service, callback_url="http://b.test/cb")
+        
+        assert mock_client.request.call_count == 1
+        assert second.cache_hit is True
+        assert second.task_id == first.task_id
+        assert second.status == TaskStatus.PENDING
+    
+    def test_succeeded_task_returns_artifacts(self, service, mock_client, test_repository):
+        """Cache hits on finished tasks carry the downloaded artifacts"""
+        from mesh_toolkit.persistence.schemas import ArtifactRecord
+        
+        first = self._submit(service)
+        test_repository.record_task_update(
+            "otter", first.spec_hash, first.task_id, "SUCCEEDED",
+            artifacts=[ArtifactRecord(
+                relative_path=f"{first.spec_hash}_text3d.glb",
+                sha256_hash="abc",
+                file_size_bytes=10,
+                downloaded_at=datetime.utcnow()
+            )]
+        )
+        
+        cached = self._submit(service)
+        
+        assert cached.status == TaskStatus.SUCCEEDED
+        assert [a.relative_path for a in cached.artifacts] == [f"{first.spec_hash}_text3d.glb"]
+    
+    def test_failed_task_is_not_reused(self, service, mock_client, test_repository):
+        """Failed generations are submitted again"""
+        first = self._submit(service)
+        test_repository.record_task_update("otter", first.spec_hash, first.task_id, "FAILED")
+        mock_client.request.return_value.json.return_value = {"result": "task_retry"}
+        
+        retry = self._submit(service)
+        
+        assert retry.cache_hit is False
+        assert retry.task_id == "task_retry"
+    
+    def test_force_and_changed_spec_bypass_cache(self, service, mock_client):
+        """force=True and any spec change (e.g. seed) submit a new task"""
+        self._submit(service)
+        self._submit(service, force=True)
+        self._submit(service, seed=7)
+        
+        assert mock_client.request.call_count == 3
+    
+    def test_ttl_expires_old_tasks(self, mock_client, test_repository):
+        """Tasks older than cache_ttl are not reused"""
+        service = Text3DService(mock_client, test_repository, cache_ttl=60)
+        first = self._submit(service)
+        
+        asset = test_repository.get_asset_record("otter", first.spec_hash)
+        asset.task_graph[0].created_at = datetime.utcnow() - timedelta(minutes=5)
+        test_repository.upsert_asset_record("otter", asset)
+        
+        self._submit(service)
+        
+        assert mock_client.request.call_count == 2
+    
+    def test_refine_reuses_existing_refinement(self, service, mock_client):
+        """Refining the same preview twice makes one API call"""
+        service.refine_task(species="otter", task_id="preview_1", callback_url="http://a.test/cb")
+        cached = service.refine_task(species="otter", task_id="preview_1", callback_url="http://a.test/cb")
+        
+        assert mock_client.request.call_count == 1
+        assert cached.cache_hit is True
+    
+    def test_submit_many_dedupes_identical_specs(self, service, mock_client, test_repository):
+        """Identical specs in one batch are submitted once and share a submission"""
+        requests = [
+            {"species": "otter", "prompt": "an otter", "callback_url": "http://a.test/cb"},
+            {"species": "otter", "prompt": "an otter", "callback_url": "http://b.test/cb", "art_style": "sculpture"},
+            {"species": "beaver", "prompt": "an otter", "callback_url": "http://a.test/cb"},
+        ]
+        
+        submissions = service.submit_many(requests)
+        
+        assert mock_client.request.call_count == 2
+        assert submissions[0] is submissions[1]
+        assert submissions[2].species == "beaver"
+        assert len(test_repository.load_species_manifest("otter").asset_specs) == 1
@@ -0,0 +1,115 @@
+"""Unit tests for the batched texture pipeline"""
+import json
+
+import pytest
+from mesh_toolkit.processing.textures import (
+    atlas_props,
+    downsample,
+    pack_atlas,
+    pack_orm,
+    process_asset_textures,
+)
+
+np = pytest.importorskip("numpy")
+Image = pytest.importorskip("PIL.Image")
+
+
+def write_png(path, array):
+    Image.fromarray(array).save(path)
+
+
+def write_asset(root, asset_id, intent="creature_prey", size=64, color=(200, 100, 50), maps=None):
+    """Asset manifest plus PBR maps as AssetGenerator would save them"""
+    directory = root / "models" / "test"
+    directory.mkdir(parents=True, exist_ok=True)
+    maps = maps or ["base_color", "metallic", "roughness", "normal", "ao"]
+    grey = {"metallic": 10, "roughness": 200, "ao": 90}
+    texture_paths = {}
+    for map_type in maps:
+        if map_type == "base_color":
+            array = np.empty((size, size, 3), dtype=np.uint8)
+            array[:] = color
+        elif map_type == "normal":
+            array = np.empty((size, size, 3), dtype=np.uint8)
+            array[:] = (128, 128, 255)
+            array[:, ::2] = (218, 128, 218)  # alternating tilted normals
+        else:
+            array = np.full((size // 2, size // 2), grey[map_type], dtype=np.uint8)
+        write_png(directory / f"{asset_id}_{map_type}.png", array)
+        texture_paths[map_type] = f"models/test/{asset_id}_{map_type}.png"
+    manifest = {"asset_id": asset_id, "intent": intent, "texture_paths": texture_paths}
+    path = directory / f"{asset_id}_manifest.json"
+    path.write_text(json.dumps(manifest))
+    return path
+
+
+class TestArrays:
+    """Test vectorized resampling and packing"""
+    
+    def test_downsample_odd_and_normals(self):
+        array = np.arange(5 * 7 * 3, dtype=np.uint8).reshape(5, 7, 3)
+        assert downsample(array).shape == (3, 4, 3)
+        
+        normals = np.empty((2, 2, 3), dtype=np.uint8)
+        normals[:, 0] = (128, 128, 255)
+        normals[:, 1] = (255, 128, 128)
+        vector = downsample(normals, normal=True)[0, 0].astype(float) / 127.5 - 1
+        assert np.linalg.norm(vector) == pytest.approx(1.0, abs=0.02)
+    
+    def test_pack_orm_channels_and_defaults(self):
+        roughness = np.full((4, 4, 1), 200, dtype=np.uint8)
+        orm = pack_orm(None, roughness, None, size=(8, 8))
+        assert orm.shape == (8, 8, 3)
+        assert orm[0, 0].tolist() == [255, 200, 0]
+    
+    def test_pack_atlas_overflows_into_second_atlas(self):
+        images = {f"p{i}": np.full((60, 60, 3), i, dtype=np.uint8) for i in range(5)}
+        atlases, layouts = pack_atlas(images, size=128, padding=2)
+        
+        assert len(atlases) == 2
+        assert sorted(name for layout in layouts for name in layout) == sorted(images)
+        x, y, w, h = layouts[0]["p1"]
+        assert atlases[0][y:y + h, x:x + w].max() == atlases[0][y:y + h, x:x + w].min() == 1
+
+
+class TestProcessAssetTextures:
+    """Test ORM packing, LOD variants and manifest updates"""
+    
+    def test_writes_orm_and_lods(self, tmp_path):
+        manifest_path = write_asset(tmp_path, "otter")
+        
+        results = process_asset_textures(tmp_path, levels=3, max_workers=1)
+        
+        lods = results["otter"]
+        assert set(lods) == {"base_color", "normal", "orm"}
+        assert lods["base_color"][0] == "models/test/otter_base_color.png"
+        assert lods["orm"][2] == "models/test/otter_orm_lod2.png"
+        with Image.open(tmp_path / lods["normal"][1]) as image:
+            assert image.size == (32, 32)
+        with Image.open(tmp_path / "models/test/otter_orm.png") as image:
+            assert image.size == (64, 64)
+            assert image.getpixel((5, 5)) == (90, 200, 10)
+        
+        manifest = json.loads(manifest_path.read_text())
+        assert manifest["texture_paths"]["orm"] == "models/test/otter_orm.png"
+        assert manifest["texture_lods"] == lods
+        assert process_asset_textures(tmp_path, max_workers=1) == {}
+
+
+class TestAtlasProps:
+    """Test prop atlasing"""
+    
+    def test_props_share_an_atlas(self, tmp_path):
+        write_asset(tmp_path, "rock", intent="prop_decoration", color=(10, 20, 30), maps=["base_color"])
+        write_asset(tmp_path, "log", intent="prop_decoration", size=512, color=(90, 60, 30), maps=["base_color"])
+        write_asset(tmp_path, "otter", maps=["base_color"])
+        
+        written = atlas_props(tmp_path, tile_size=128, atlas_size=512)
+        
+        assert written == ["textures/atlases/props_0_base_color.png"]
+        log = json.loads((tmp_path / "models/test/log_manifest.json").read_text())
+        assert "atlas" not in json.loads((tmp_path / "models/test/otter_manifest.json").read_text())
+        assert log["atlas"]["uv_scale"] == [0.25, 0.25]
+        x, y = (int(v * 512) for v in log["atlas"]["uv_offset"])
+        with Image.open(tmp_path / written[0]) as atlas:
+            assert atlas.getpixel((x + 5, y + 5))[:3] == (90, 60, 30)
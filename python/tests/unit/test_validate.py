@@ -0,0 +1,167 @@
+"""Unit tests for streaming GLB validation"""
+import copy
+import struct
+from datetime import datetime
+from unittest.mock import Mock
+
+import pytest
+from mesh_toolkit.api.base_client import BaseHttpClient
+from mesh_toolkit.persistence.schemas import AssetManifest, TaskGraphEntry
+from mesh_toolkit.processing.glb import GlbFile, build_glb
+from mesh_toolkit.processing.validate import validate_glb
+from mesh_toolkit.webhooks.handler import WebhookHandler
+from mesh_toolkit.webhooks.schemas import MeshyWebhookPayload
+
+from tests.conftest import make_grid_glb
+
+
+def make_glb(edit=None):
+    """Indexed quad (POSITION is accessor 0, indices accessor 1)
+    
+    Args:
+        edit: Called with (gltf, binary) to corrupt the file before packing
+    """
+    with GlbFile(make_grid_glb(size=1)) as glb:
+        gltf, binary = copy.deepcopy(glb.json), bytearray(glb.bin)
+    if edit:
+        edit(gltf, binary)
+    return build_glb(gltf, bytes(binary))
+
+
+def set_index(gltf, binary, position, value):
+    view = gltf["bufferViews"][gltf["accessors"][1]["bufferView"]]
+    struct.pack_into("<H", binary, view.get("byteOffset", 0) + 2 * position, value)
+
+
+def write(tmp_path, data):
+    path = tmp_path / "model.glb"
+    path.write_bytes(data)
+    return path
+
+
+class TestValidateGlb:
+    """Test container, accessor and index checks"""
+    
+    def test_valid_file_reads_only_json_and_indices(self, tmp_path):
+        data = make_glb()
+        
+        result = validate_glb(write(tmp_path, data))
+        
+        assert result.valid, result.errors
+        # Positions (48 bytes) are never read
+        assert result.bytes_read == len(data) - 48
+    
+    @pytest.mark.parametrize("data,message", [
+        (b"\x89PNG" + b"\0" * 20, "Not a GLB"),
+        (make_glb()[:-8], "Header says"),
+        (make_glb()[:12] + struct.pack("<I", 1 << 20) + make_glb()[16:], "runs past the end"),
+        (make_glb(lambda gltf, _: gltf["accessors"][1].update(count=40)), "Accessor 1: last element ends at 80"),
+        (make_glb(lambda gltf, _: gltf["bufferViews"][0].update(byteStride=6)), "invalid byteStride 6"),
+        (make_glb(lambda gltf, binary: set_index(gltf, binary, 5, 9)), "index 9 is out of range for 4 vertices"),
+    ])
+    def test_rejects_corrupt_files(self, tmp_path, data, message):
+        result = validate_glb(write(tmp_path, data))
+        
+        assert not result.valid
+        assert message in "; ".join(result.errors)
+    
+    @pytest.mark.parametrize("edit", [
+        lambda gltf, _: gltf["accessors"][1].update(count="3"),
+        lambda gltf, _: gltf["accessors"][1].update(bufferView="1"),
+        lambda gltf, _: gltf["accessors"][1].update(bufferView=-9),
+        lambda gltf, _: gltf["meshes"][0]["primitives"][0].update(indices=1.5),
+        lambda gltf, _: gltf["meshes"][0]["primitives"][0].update(indices=-1),
+        lambda gltf, _: gltf.update(accessors={"0": {}}),
+        lambda gltf, _: gltf.update(bufferViews=[None]),
+        lambda gltf, _: gltf.update(meshes=[{"primitives": "none"}]),
+    ])
+    def test_malformed_json_types_are_errors(self, tmp_path, edit):
+        """Fields of the wrong type are reported instead of raising"""
+        result = validate_glb(write(tmp_path, make_glb(edit)))
+        
+        assert not result.valid
+    
+    def test_unaligned_chunk(self, tmp_path):
+        data = bytearray(make_glb())
+        json_length = struct.unpack_from("<I", data, 12)[0]
+        struct.pack_into("<I", data, 12, json_length - 1)
+        
+        result = validate_glb(write(tmp_path, bytes(data)))
+        
+        assert any("unaligned length" in error for error in result.errors)
+
+
+class TestHandlerValidation:
+    """Corrupt downloads are fetched again before being recorded"""
+    
+    def handle(self, repository, responses):
+        repository.upsert_asset_record("otter", AssetManifest(
+            asset_spec_hash="hash_otter",
+            spec_fingerprint="{}",
+            species="otter",
+            asset_intent="creature",
+            task_graph=[TaskGraphEntry(
+                task_id="task_mesh",
+                service="text3d",
+                status="IN_PROGRESS",
+                created_at=datetime.utcnow(),
+                updated_at=datetime.utcnow()
+            )]
+        ))
+        responses = iter(responses)
+        
+        def download_file(url, output_path):
+            data = next(responses)
+            with open(output_path, "wb") as f:
+                f.write(data)
+            return len(data)
+        
+        client = Mock(spec=BaseHttpClient)
+        client.download_file.side_effect = download_file
+        handler = WebhookHandler(repository=repository, client=client, download_attempts=2)
+        result = handler.handle_webhook(MeshyWebhookPayload(
+            id="task_mesh",
+            status="SUCCEEDED",
+            created_at=0,
+            model_urls={"glb": "https://assets.meshy.ai/model.glb"}
+        ))
+        return result, client
+    
+    def test_truncated_download_is_retried(self, test_repository):
+        good = make_glb()
+        
+        result, client = self.handle(test_repository, [good[:-16], good])
+        
+        assert client.download_file.call_count == 2
+        assert result["artifacts_downloaded"] == 1
+        artifact = test_repository.get_asset_record("otter", "hash_otter").artifacts[0]
+        assert artifact.file_size_bytes == len(good)
+        assert artifact.mesh_stats.triangle_count == 2
+    
+    def test_malformed_json_download_is_retried(self, test_repository):
+        good = make_glb()
+        malformed = make_glb(lambda gltf, _: gltf["accessors"][0].update(count="4"))
+        
+        result, client = self.handle(test_repository, [malformed, good])
+        
+        assert client.download_file.call_count == 2
+        assert result["artifacts_downloaded"] == 1
+    
+    def test_gives_up_after_attempts(self, test_repository):
+        result, client = self.handle(test_repository, [b"glTF" + b"\0" * 60] * 2)
+        
+        assert client.download_file.call_count == 2
+        assert result["artifacts_downloaded"] == 0
+        assert result["task_status"] == "SUCCEEDED"
+        assert not (test_repository.base_path / "otter" / "hash_otter_text3d.glb").exists()
+    
+    def test_corrupt_redelivery_keeps_existing_artifact(self, test_repository):
+        good = make_glb()
+        self.handle(test_repository, [good])
+        output_path = test_repository.base_path / "otter" / "hash_otter_text3d.glb"
+        
+        result, _ = self.handle(test_repository, [good[:-16]] * 2)
+        
+        assert result["artifacts_downloaded"] == 0
+        assert output_path.read_bytes() == good
+        assert [p.name for p in output_path.parent.iterdir() if p.suffix == ".part"] == []
@@ -0,0 +1,197 @@
+"""Unit tests for the webhook proxy's dispatch spool and GitHub dispatcher"""
+import importlib.util
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+SCRIPT = Path(__file__).resolve().parents[2] / "scripts" / "webhook_proxy.py"
+
+
+@pytest.fixture(scope="module")
+def proxy():
+    """The webhook_proxy script loaded as a module"""
+    spec = importlib.util.spec_from_file_location("webhook_proxy", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def spool(proxy, tmp_path):
+    spool = proxy.DispatchSpool(tmp_path / "spool")
+    yield spool
+    spool.close()
+
+
+def _payload(task_id, status="SUCCEEDED"):
+    return {
+        "task_id": task_id,
+        "status": status,
+        "species": "otter",
+        "stage": "walk",
+        "animation_type": "walk",
+        "spec_hash": f"hash-{task_id}",
+        "model_url": None,
+    }
+
+
+class FakePool:
+    """Connection pool answering every POST with canned responses"""
+    
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+    
+    def post(self, path, body, headers):
+        self.requests.append(json.loads(body))
+        response = self.responses.pop(0) if len(self.responses) > 1 else self.responses[0]
+        if isinstance(response, Exception):
+            raise response
+        return response, b"", {}
+
+
+class TestDispatchSpool:
+    """Test ordering, recovery and coalescing limits"""
+    
+    def test_entry_ids_sort_in_arrival_order_within_one_tick(self, proxy, monkeypatch):
+        """Ids created in the same clock tick still sort by creation"""
+        monkeypatch.setattr(proxy.time, "time_ns", lambda: 1_700_000_000_000_000_000)
+        ids = [proxy.new_entry_id() for _ in range(50)]
+        assert sorted(ids) == ids
+    
+    def test_claimed_batch_keeps_arrival_order(self, proxy, spool, monkeypatch):
+        """A coalesced batch lists tasks, and mirrors the first, in arrival order"""
+        monkeypatch.setattr(proxy.time, "time_ns", lambda: 1_700_000_000_000_000_000)
+        for i in range(5):
+            spool.put("meshy_webhook_animated", _payload(f"task-{i}"), group="g", window=0.0)
+        
+        batch = spool.get()
+        assert [entry["payload"]["task_id"] for entry in batch] == [f"task-{i}" for i in range(5)]
+        
+        payload = proxy.build_batch_payload([entry["payload"] for entry in batch])
+        assert payload["task_id"] == "task-0"
+        assert payload["task_count"] == 5
+        assert [task["task_id"] for task in payload["tasks"]] == [f"task-{i}" for i in range(5)]
+        assert all("species" not in task for task in payload["tasks"])
+    
+    def test_recovers_unacknowledged_entries_after_crash(self, proxy, spool, tmp_path):
+        """Entries that were never acked are queued again by a new spool"""
+        for i in range(3):
+            spool.put("meshy_webhook_static", _payload(f"task-{i}"))
+        spool.ack(spool.get()[0])
+        (tmp_path / "spool" / "corrupt.json").write_text("{not json")
+        
+        recovered = proxy.DispatchSpool(tmp_path / "spool")
+        assert recovered.depth() == 2
+        assert [recovered.get()[0]["payload"]["task_id"] for _ in range(2)] == ["task-1", "task-2"]
+        assert (tmp_path / "spool" / "dead" / "corrupt.json").exists()
+        recovered.close()
+    
+    def test_group_waits_out_its_window(self, spool):
+        """The first webhook of a group is held for the window"""
+        start = time.monotonic()
+        spool.put("meshy_webhook_animated", _payload("task-0"), group="g", window=0.3)
+        spool.put("meshy_webhook_animated", _payload("task-1"), group="g", window=0.3)
+        
+        batch = spool.get()
+        assert time.monotonic() - start >= 0.25
+        assert len(batch) == 2
+    
+    def test_full_group_flushes_early_and_caps_batch(self, proxy, spool, monkeypatch):
+        """Reaching the task limit flushes without waiting, and batches are capped"""
+        monkeypatch.setattr(proxy, "COALESCE_MAX_TASKS", 2)
+        for i in range(3):
+            spool.put("meshy_webhook_animated", _payload(f"task-{i}"), group="g", window=60.0)
+        
+        start = time.monotonic()
+        batch = spool.get()
+        assert time.monotonic() - start < 1.0
+        assert [entry["payload"]["task_id"] for entry in batch] == ["task-0", "task-1"]
+        assert spool.depth() == 1
+    
+    def test_batch_respects_byte_limit(self, proxy, spool, monkeypatch):
+        """Entries that would push the payload past the byte limit stay queued"""
+        size = len(json.dumps(_payload("task-0")))
+        monkeypatch.setattr(proxy, "COALESCE_MAX_BYTES", size * 2)
+        for i in range(3):
+            spool.put("meshy_webhook_animated", _payload(f"task-{i}"), group="g", window=0.0)
+        
+        assert len(spool.get()) == 2
+        assert spool.depth() == 1
+    
+    def test_other_groups_are_not_claimed(self, spool):
+        """Only entries of the due entry's group join its batch"""
+        spool.put("meshy_webhook_animated", _payload("otter"), group="a", window=0.0)
+        spool.put("meshy_webhook_animated", _payload("beaver"), group="b", window=60.0)
+        
+        assert [entry["payload"]["task_id"] for entry in spool.get()] == ["otter"]
+        assert spool.depth() == 1
+
+
+class TestGitHubDispatcher:
+    """Test classification and handling of dispatch failures"""
+    
+    @pytest.fixture(autouse=True)
+    def token(self, proxy, monkeypatch):
+        monkeypatch.setattr(proxy, "GITHUB_TOKEN", "token")
+    
+    @pytest.mark.parametrize("status,ok,retryable", [
+        (204, True, False),
+        (403, False, True),
+        (429, False, True),
+        (502, False, True),
+        (404, False, False),
+        (422, False, False),
+    ])
+    def test_dispatch_classifies_status(self, proxy, spool, status, ok, retryable):
+        """Rate limits and server errors are retryable, other client errors are not"""
+        dispatcher = proxy.GitHubDispatcher(spool, FakePool(status), workers=0)
+        assert dispatcher.dispatch("meshy_webhook_static", _payload("task-0"))[:2] == (ok, retryable)
+    
+    def test_connection_error_is_retryable(self, proxy, spool):
+        dispatcher = proxy.GitHubDispatcher(spool, FakePool(OSError("reset")), workers=0)
+        ok, retryable, detail = dispatcher.dispatch("meshy_webhook_static", _payload("task-0"))
+        assert (ok, retryable) == (False, True)
+        assert "reset" in detail
+    
+    def _drain(self, proxy, spool, pool):
+        """Run one worker until it has made a request, then stop it
+        
+        The worker finishes handling its batch before it sees the closed spool.
+        """
+        dispatcher = proxy.GitHubDispatcher(spool, pool, workers=1)
+        dispatcher.start()
+        deadline = time.monotonic() + 5
+        while not pool.requests and time.monotonic() < deadline:
+            time.sleep(0.01)
+        spool.close()
+        dispatcher._threads[0].join(timeout=5)
+    
+    def test_permanent_failure_is_dead_lettered(self, proxy, spool, tmp_path):
+        entry_id = spool.put("meshy_webhook_static", _payload("task-0"))
+        self._drain(proxy, spool, FakePool(422))
+        
+        assert not (tmp_path / "spool" / f"{entry_id}.json").exists()
+        dead = json.loads((tmp_path / "spool" / "dead" / f"{entry_id}.json").read_text())
+        assert dead["last_error"].startswith("422")
+    
+    def test_retryable_failure_is_rescheduled(self, proxy, spool, tmp_path):
+        entry_id = spool.put("meshy_webhook_static", _payload("task-0"))
+        self._drain(proxy, spool, FakePool(503))
+        
+        entry = json.loads((tmp_path / "spool" / f"{entry_id}.json").read_text())
+        assert entry["attempts"] == 1
+        assert entry["next_attempt_at"] > time.time()
+        assert not list((tmp_path / "spool" / "dead").iterdir())
+    
+    def test_batch_is_dispatched_once_and_acked(self, proxy, spool, tmp_path):
+        for i in range(3):
+            spool.put("meshy_webhook_animated", _payload(f"task-{i}"), group="g", window=0.0)
+        pool = FakePool(204)
+        self._drain(proxy, spool, pool)
+        
+        assert len(pool.requests) == 1
+        assert pool.requests[0]["client_payload"]["task_count"] == 3
+        assert not list((tmp_path / "spool").glob("*.json"))